@@ -0,0 +1,28 @@
+"""version_productos
+
+Revision ID: 2a6f8d1c4b90
+Revises: e7a3c5f90d12
+Create Date: 2026-10-19 18:47:10.112655
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a6f8d1c4b90'
+down_revision: Union[str, Sequence[str], None] = 'e7a3c5f90d12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('productos', sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('productos', 'version')
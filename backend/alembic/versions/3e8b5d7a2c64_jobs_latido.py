@@ -0,0 +1,30 @@
+"""jobs_latido
+
+Revision ID: 3e8b5d7a2c64
+Revises: 7c3e9b2f5a18
+Create Date: 2026-10-20 10:12:37.401522
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8b5d7a2c64'
+down_revision: Union[str, Sequence[str], None] = '7c3e9b2f5a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('propietario', sa.String(), nullable=True))
+    op.add_column('jobs', sa.Column('latido', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('jobs', 'latido')
+    op.drop_column('jobs', 'propietario')
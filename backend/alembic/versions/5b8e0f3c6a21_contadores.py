@@ -0,0 +1,36 @@
+"""contadores
+
+Revision ID: 5b8e0f3c6a21
+Revises: c4e1d2a9f7b3
+Create Date: 2026-10-19 11:40:03.517920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e0f3c6a21'
+down_revision: Union[str, Sequence[str], None] = 'c4e1d2a9f7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('contadores',
+    sa.Column('nombre', sa.String(), nullable=False),
+    sa.Column('valor', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('nombre')
+    )
+    op.create_index(op.f('ix_contadores_id'), 'contadores', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_contadores_id'), table_name='contadores')
+    op.drop_table('contadores')
@@ -0,0 +1,48 @@
+"""jobs
+
+Revision ID: 7c3e9b2f5a18
+Revises: 2a6f8d1c4b90
+Create Date: 2026-10-19 21:05:42.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e9b2f5a18'
+down_revision: Union[str, Sequence[str], None] = '2a6f8d1c4b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('jobs',
+    sa.Column('tipo', sa.String(), nullable=False),
+    sa.Column('estado', sa.String(), nullable=False),
+    sa.Column('parametros', sa.JSON(), nullable=False),
+    sa.Column('progreso', sa.Float(), nullable=False),
+    sa.Column('mensaje', sa.String(), nullable=True),
+    sa.Column('resultado', sa.JSON(), nullable=True),
+    sa.Column('resultado_path', sa.String(), nullable=True),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('cancelacion_solicitada', sa.Boolean(), nullable=False),
+    sa.Column('creado_por', sa.String(), nullable=True),
+    sa.Column('creado', sa.DateTime(), nullable=False),
+    sa.Column('iniciado', sa.DateTime(), nullable=True),
+    sa.Column('finalizado', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_jobs_estado'), 'jobs', ['estado'], unique=False)
+    op.create_index(op.f('ix_jobs_id'), 'jobs', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_jobs_id'), table_name='jobs')
+    op.drop_index(op.f('ix_jobs_estado'), table_name='jobs')
+    op.drop_table('jobs')
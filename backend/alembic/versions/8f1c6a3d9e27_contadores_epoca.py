@@ -0,0 +1,42 @@
+"""contadores_epoca
+
+Revision ID: 8f1c6a3d9e27
+Revises: 3e8b5d7a2c64
+Create Date: 2026-10-20 16:05:48.213907
+
+"""
+import secrets
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f1c6a3d9e27'
+down_revision: Union[str, Sequence[str], None] = '3e8b5d7a2c64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mismo nombre y rango que app.db.models.contador (la migración no importa la app)
+EPOCA = 'epoca'
+contadores = sa.table('contadores', sa.column('nombre', sa.String), sa.column('valor', sa.Integer))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # INSERT ... SELECT ... WHERE NOT EXISTS: sin consultar antes, así también sirve con `upgrade --sql`
+    valor = secrets.randbelow(2**31 - 1) + 1
+    op.execute(
+        contadores.insert().from_select(
+            ['nombre', 'valor'],
+            sa.select(sa.literal(EPOCA), sa.literal(valor)).where(
+                ~sa.exists().where(contadores.c.nombre == EPOCA)
+            ),
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(contadores.delete().where(contadores.c.nombre == EPOCA))
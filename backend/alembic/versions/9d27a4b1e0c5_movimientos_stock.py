@@ -0,0 +1,41 @@
+"""movimientos_stock
+
+Revision ID: 9d27a4b1e0c5
+Revises: 5b8e0f3c6a21
+Create Date: 2026-10-19 14:05:27.734112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d27a4b1e0c5'
+down_revision: Union[str, Sequence[str], None] = '5b8e0f3c6a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('movimientos_stock',
+    sa.Column('producto_id', sa.Integer(), nullable=False),
+    sa.Column('cantidad', sa.Integer(), nullable=False),
+    sa.Column('motivo', sa.String(), nullable=True),
+    sa.Column('stock_resultante', sa.Integer(), nullable=False),
+    sa.Column('fecha', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['producto_id'], ['productos.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_movimientos_stock_id'), 'movimientos_stock', ['id'], unique=False)
+    op.create_index(op.f('ix_movimientos_stock_producto_id'), 'movimientos_stock', ['producto_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_movimientos_stock_producto_id'), table_name='movimientos_stock')
+    op.drop_index(op.f('ix_movimientos_stock_id'), table_name='movimientos_stock')
+    op.drop_table('movimientos_stock')
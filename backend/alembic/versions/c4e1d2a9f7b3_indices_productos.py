@@ -0,0 +1,86 @@
+"""indices_productos
+
+Revision ID: c4e1d2a9f7b3
+Revises: ab1b6dbbe75f
+Create Date: 2026-10-19 09:12:41.208334
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1d2a9f7b3'
+down_revision: Union[str, Sequence[str], None] = 'ab1b6dbbe75f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+productos = sa.table('productos', sa.column('id', sa.Integer), sa.column('nombre', sa.String))
+
+
+def _renombrar_duplicados() -> None:
+    """Deja el nombre al producto de menor id y agrega ' (<id>)' al resto de cada grupo repetido."""
+    conexion = op.get_bind()
+    repetidos = (
+        sa.select(productos.c.nombre)
+        .group_by(productos.c.nombre)
+        .having(sa.func.count() > 1)
+    )
+    filas = conexion.execute(
+        sa.select(productos.c.id, productos.c.nombre)
+        .where(productos.c.nombre.in_(repetidos))
+        .order_by(productos.c.nombre, productos.c.id)
+    ).all()
+    anterior = None
+    for id_, nombre in filas:
+        if nombre != anterior:  # el primero (menor id) de cada grupo conserva el nombre
+            anterior = nombre
+            continue
+        nuevo, k = f"{nombre} ({id_})", 1
+        while conexion.execute(sa.select(productos.c.id).where(productos.c.nombre == nuevo)).first():
+            k += 1
+            nuevo = f"{nombre} ({id_}-{k})"
+        conexion.execute(productos.update().where(productos.c.id == id_).values(nombre=nuevo))
+
+
+def _renombrar_duplicados_sql() -> None:
+    """
+    Igual que `_renombrar_duplicados` en un solo UPDATE, para `alembic upgrade --sql`
+    (sin conexión no se puede consultar). No evita choques con un nombre ' (<id>)'
+    ya existente: si lo hay, la creación del índice único falla y se ve en el script.
+    """
+    primeros = sa.select(sa.func.min(productos.c.id)).group_by(productos.c.nombre)
+    op.execute(
+        productos.update()
+        .where(productos.c.id.not_in(primeros))
+        .values(nombre=productos.c.nombre + ' (' + sa.cast(productos.c.id, sa.String) + ')')
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Una base anterior pudo guardar nombres repetidos: sin esto el índice único no se crea
+    if context.is_offline_mode():
+        _renombrar_duplicados_sql()
+    else:
+        _renombrar_duplicados()
+    # Índice único para la búsqueda por nombre de check_unicidad_producto
+    op.create_index(op.f('ix_productos_nombre'), 'productos', ['nombre'], unique=True)
+    # Índice parcial con los productos bajo stock mínimo (SQLite y Postgres)
+    op.create_index(
+        'ix_productos_stock_bajo',
+        'productos',
+        ['id'],
+        unique=False,
+        sqlite_where=sa.text('stock < stock_minimo'),
+        postgresql_where=sa.text('stock < stock_minimo'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_productos_stock_bajo', table_name='productos')
+    op.drop_index(op.f('ix_productos_nombre'), table_name='productos')
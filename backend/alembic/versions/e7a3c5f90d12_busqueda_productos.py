@@ -0,0 +1,67 @@
+"""busqueda_productos
+
+Revision ID: e7a3c5f90d12
+Revises: 9d27a4b1e0c5
+Create Date: 2026-10-19 16:22:48.902375
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3c5f90d12'
+down_revision: Union[str, Sequence[str], None] = '9d27a4b1e0c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PRODUCTOS_FTS_SQLITE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS productos_fts USING fts5(
+        nombre, descripcion,
+        content='productos', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS productos_fts_ai AFTER INSERT ON productos BEGIN
+        INSERT INTO productos_fts(rowid, nombre, descripcion) VALUES (new.id, new.nombre, new.descripcion);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS productos_fts_ad AFTER DELETE ON productos BEGIN
+        INSERT INTO productos_fts(productos_fts, rowid, nombre, descripcion)
+        VALUES ('delete', old.id, old.nombre, old.descripcion);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS productos_fts_au AFTER UPDATE OF nombre, descripcion ON productos BEGIN
+        INSERT INTO productos_fts(productos_fts, rowid, nombre, descripcion)
+        VALUES ('delete', old.id, old.nombre, old.descripcion);
+        INSERT INTO productos_fts(rowid, nombre, descripcion) VALUES (new.id, new.nombre, new.descripcion);
+    END""",
+]
+PRODUCTOS_FTS_POSTGRES = [
+    """CREATE INDEX IF NOT EXISTS ix_productos_busqueda ON productos
+        USING GIN (to_tsvector('spanish', nombre || ' ' || coalesce(descripcion, '')))""",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for sql in PRODUCTOS_FTS_SQLITE:
+            op.execute(sql)
+        # Indexar las filas existentes desde la tabla de contenido
+        op.execute("INSERT INTO productos_fts(productos_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        for sql in PRODUCTOS_FTS_POSTGRES:
+            op.execute(sql)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS productos_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS productos_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS productos_fts_ai")
+        op.execute("DROP TABLE IF EXISTS productos_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_productos_busqueda")
@@ -1,13 +1,16 @@
 from app.db.session import SessionLocal
+from app.db.unit_of_work import UnidadDeTrabajo
 from app.utils.data_setup import crear_usuario_con_rol
 
 # Creamos conexión a la base
 db = SessionLocal()
 
-# Crear usuarios de prueba
-crear_usuario_con_rol(db, "admin", "admin123", "admin")
-crear_usuario_con_rol(db, "vcontreras", "admin123", "admin")
-crear_usuario_con_rol(db, "operador", "operador123", "operador")
-
-# Cerramos la conexión
-db.close()
+# Crear usuarios de prueba en una sola transacción: se crean todos o ninguno
+try:
+    with UnidadDeTrabajo(db):
+        crear_usuario_con_rol(db, "admin", "admin123", "admin")
+        crear_usuario_con_rol(db, "vcontreras", "admin123", "admin")
+        crear_usuario_con_rol(db, "operador", "operador123", "operador")
+finally:
+    # Cerramos la conexión
+    db.close()
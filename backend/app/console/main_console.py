@@ -1,5 +1,5 @@
 # backend/app/console/main_console.py
-from app.console.producto_console import main as producto_menu
+# Los submenús se importan al elegirlos: el menú aparece sin esperar a SQLAlchemy.
 
 
 def main_menu():
@@ -11,6 +11,8 @@ def main_menu():
         opcion = input("Ingrese una opción: ").strip()
 
         if opcion == "1":
+            from app.console.producto_console import main as producto_menu
+
             producto_menu()        
         elif opcion == "0":
             print("¡Hasta luego!")
@@ -16,42 +16,60 @@ def crear_producto(repo):
     except ValueError as e:
         print(f"Error: {e}")
 
-def listar_productos(repo):
-    productos = repo.get_all_productos()
-    if not productos:
+def _imprimir_producto(i, p):
+    print(f"{i}. [{p.id}] {p.nombre} - {p.sku} - {p.descripcion} - {p.stock} unidades")
+
+def listar_productos(repo, tam_lote=500):
+    # Se imprime a medida que llegan las páginas: no se carga el catálogo entero en memoria
+    i = 0
+    for pagina in repo.iterar_productos(tam_pagina=tam_lote):
+        if i == 0:
+            print("\nListado de productos:")
+        for p in pagina:
+            i += 1
+            _imprimir_producto(i, p)
+    if i == 0:
         print("No hay productos registrados.")
-        return
-
-    print("\nListado de productos:")
-    for i, p in enumerate(productos, start=1):
-        print(f"{i}. [{p.id}] {p.nombre} - {p.sku} - {p.descripcion} - {p.stock} unidades")
 
-def listar_productos_paginado(repo, por_pagina=5):
-    productos = repo.get_all_productos()
-    if not productos:
-        print("No hay productos registrados.")
+def listar_productos_paginado(repo, por_pagina=5, orden="id", desde=None, hasta=None):
+    # Las páginas se piden a la base de a una (keyset), así la primera sale al instante;
+    # la siguiente se pide antes del prompt para no ofrecer "ver más" después de la última
+    paginas = repo.iterar_productos(por_pagina, orden, desde, hasta)
+    bloque = next(paginas, None)
+    if bloque is None:
+        print("No hay productos en ese rango." if desde is not None or hasta is not None else "No hay productos registrados.")
         return
-
-    # total = len(productos)
-    pagina = 0
-
+    inicio = pagina = 0
     while True:
-        inicio = pagina * por_pagina
-        fin = inicio + por_pagina
-        bloque = productos[inicio:fin]
-
-        if not bloque:
-            print("Fin del listado.")
-            break
-
-        print(f"\nPágina {pagina + 1}:")
+        pagina += 1
+        print(f"\nPágina {pagina}:")
         for i, p in enumerate(bloque, start=inicio + 1):
-            print(f"{i}. [{p.id}] {p.nombre} - {p.sku} - {p.descripcion} - {p.stock} unidades")
+            _imprimir_producto(i, p)
+        inicio += len(bloque)
 
+        bloque = next(paginas, None)
+        if bloque is None:
+            print("Fin del listado.")
+            return
         opcion = input("\n[Enter] para ver más, [S] para salir: ").strip().lower()
         if opcion == "s":
-            break
-        pagina += 1
+            return
+
+def ir_a_rango(repo):
+    orden = input("Buscar por [I]D o [S]KU: ").strip().lower()
+    if orden not in ("i", "s"):
+        print("Opción inválida.")
+        return
+    desde = input("Desde (dejar vacío para el inicio): ").strip() or None
+    hasta = input("Hasta (dejar vacío para el final): ").strip() or None
+    if orden == "i":
+        try:
+            desde = int(desde) if desde else None
+            hasta = int(hasta) if hasta else None
+        except ValueError:
+            print("ID inválido.")
+            return
+    listar_productos_paginado(repo, orden="id" if orden == "i" else "sku", desde=desde, hasta=hasta)
 
 def actualizar_producto(repo):
     try:
@@ -98,6 +116,7 @@ def main():
         "4": lambda: actualizar_producto(repo),
         "5": lambda: eliminar_producto(repo),
         "6": lambda: seed_productos(repo),  # nueva opción
+        "7": lambda: ir_a_rango(repo),
     }
 
     while True:
@@ -108,6 +127,7 @@ def main():
         print("4. Actualizar producto")
         print("5. Eliminar producto")
         print("6. Insertar productos de prueba")
+        print("7. Ir a un rango de ID o SKU")
         print("0. Salir")
         opcion = input("Ingrese opción: ")
 
@@ -0,0 +1,103 @@
+# app/core/cache.py
+"""
+Caché en proceso para lecturas frecuentes.
+
+`LRUCache` es acotada (LRU) y con vencimiento (TTL). Cualquier objeto que
+cumpla `CacheBackend` puede reemplazarla, por ejemplo un backend compartido
+entre workers de uvicorn.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Protocol
+
+MISSING = object()
+
+
+class CacheBackend(Protocol):
+    def get(self, key: Hashable) -> Any:
+        """Devuelve el valor o `MISSING`."""
+
+    def set(self, key: Hashable, value: Any) -> None: ...
+
+    def delete(self, *keys: Hashable) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict[str, int]: ...
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 1024, ttl: float | None = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            expires_at, value = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                if self._data.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+_producto_cache: CacheBackend = LRUCache(maxsize=2048, ttl=30.0)
+
+
+def get_producto_cache() -> CacheBackend:
+    return _producto_cache
+
+
+def set_producto_cache(backend: CacheBackend) -> None:
+    """Reemplaza el backend de la caché de productos (p. ej. uno compartido entre workers)."""
+    global _producto_cache
+    _producto_cache = backend
@@ -0,0 +1,25 @@
+# app/core/http_cache.py
+"""Utilidades para requests condicionales (ETag / If-None-Match) y cuerpos ya serializados."""
+
+from __future__ import annotations
+
+from fastapi import Response
+
+from app.core.cache import LRUCache
+
+# Cuerpos JSON de listados, indexados por (URL de la base, ETag): una versión
+# nueva nunca reutiliza un cuerpo viejo, así que no hace falta invalidar ni TTL.
+# El ETag lleva la época de la base, que cambia si la base se recrea.
+respuestas_cache = LRUCache(maxsize=32, ttl=None)
+
+
+def etag_coincide(if_none_match: str | None, etag: str) -> bool:
+    """True si alguno de los ETag de If-None-Match (o `*`) coincide con `etag`."""
+    if not if_none_match:
+        return False
+    candidatos = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidatos or etag in candidatos
+
+
+def no_modificado(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
@@ -0,0 +1,222 @@
+# app/core/metrics.py
+"""
+Instrumentación de performance sin colector externo.
+
+- `MetricsMiddleware` (ASGI puro) mide latencia, tamaño de respuesta y
+  requests en curso por ruta (plantilla, p. ej. `/productos/{producto_id}`).
+- `instrumentar_engine` engancha eventos de SQLAlchemy para contar y cronometrar
+  las consultas de cada request.
+- `render_prometheus` expone todo en formato de texto de Prometheus.
+- Los requests más lentos que `SLOW_REQUEST_MS` se loguean con su SQL, útil
+  para detectar N+1.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.cache import get_producto_cache
+
+logger = logging.getLogger("app.performance")
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+MAX_SENTENCIAS_LOG = 50
+
+LATENCIA_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TAMANIO_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+CONSULTAS_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+
+
+class Histograma:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.conteos = [0] * (len(buckets) + 1)  # el último es +Inf
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float) -> None:
+        self.conteos[bisect_left(self.buckets, valor)] += 1
+        self.suma += valor
+        self.total += 1
+
+    def lineas(self, nombre: str, etiquetas: str) -> list[str]:
+        sep = "," if etiquetas else ""
+        lineas = []
+        acumulado = 0
+        for limite, conteo in zip(self.buckets, self.conteos):
+            acumulado += conteo
+            lineas.append(f'{nombre}_bucket{{{etiquetas}{sep}le="{limite}"}} {acumulado}')
+        lineas.append(f'{nombre}_bucket{{{etiquetas}{sep}le="+Inf"}} {self.total}')
+        lineas.append(f"{nombre}_sum{{{etiquetas}}} {self.suma}")
+        lineas.append(f"{nombre}_count{{{etiquetas}}} {self.total}")
+        return lineas
+
+
+@dataclass
+class ContextoRequest:
+    consultas: int = 0
+    tiempo_db: float = 0.0
+    sentencias: list[str] = field(default_factory=list)
+
+
+_contexto: ContextVar[ContextoRequest | None] = ContextVar("metricas_request", default=None)
+
+
+class RegistroMetricas:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.en_curso = 0
+        self.latencia: dict[tuple[str, str], Histograma] = {}
+        self.tamanio: dict[tuple[str, str], Histograma] = {}
+        self.consultas: dict[tuple[str, str], Histograma] = {}
+        self.tiempo_db: dict[tuple[str, str], float] = {}
+        self.respuestas: dict[tuple[str, str, int], int] = {}
+        self.consultas_total = 0
+        self.tiempo_db_total = 0.0
+
+    def registrar(self, metodo: str, ruta: str, status: int, duracion: float, tamanio: int, ctx: ContextoRequest):
+        clave = (metodo, ruta)
+        with self._lock:
+            self.latencia.setdefault(clave, Histograma(LATENCIA_BUCKETS)).observar(duracion)
+            self.tamanio.setdefault(clave, Histograma(TAMANIO_BUCKETS)).observar(tamanio)
+            self.consultas.setdefault(clave, Histograma(CONSULTAS_BUCKETS)).observar(ctx.consultas)
+            self.tiempo_db[clave] = self.tiempo_db.get(clave, 0.0) + ctx.tiempo_db
+            self.respuestas[(metodo, ruta, status)] = self.respuestas.get((metodo, ruta, status), 0) + 1
+
+    def registrar_consulta(self, duracion: float) -> None:
+        with self._lock:
+            self.consultas_total += 1
+            self.tiempo_db_total += duracion
+
+
+registro = RegistroMetricas()
+
+
+def _etiquetas(metodo: str, ruta: str) -> str:
+    return f'method="{metodo}",route="{ruta}"'
+
+
+def render_prometheus() -> str:
+    r = registro
+    with r._lock:
+        lineas = [
+            "# HELP http_requests_in_flight Requests en curso.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {r.en_curso}",
+            "# HELP http_requests_total Requests atendidos por ruta y status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (metodo, ruta, status), n in sorted(r.respuestas.items()):
+            lineas.append(f'http_requests_total{{{_etiquetas(metodo, ruta)},status="{status}"}} {n}')
+
+        for nombre, ayuda, datos in (
+            ("http_request_duration_seconds", "Latencia por ruta.", r.latencia),
+            ("http_response_size_bytes", "Tamaño del cuerpo de respuesta por ruta.", r.tamanio),
+            ("http_request_db_queries", "Consultas SQL por request.", r.consultas),
+        ):
+            lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} histogram"]
+            for (metodo, ruta), hist in sorted(datos.items()):
+                lineas += hist.lineas(nombre, _etiquetas(metodo, ruta))
+
+        lineas += [
+            "# HELP http_request_db_seconds_total Tiempo en la base por ruta.",
+            "# TYPE http_request_db_seconds_total counter",
+        ]
+        for (metodo, ruta), segundos in sorted(r.tiempo_db.items()):
+            lineas.append(f"http_request_db_seconds_total{{{_etiquetas(metodo, ruta)}}} {segundos}")
+        lineas += [
+            "# HELP db_queries_total Consultas SQL ejecutadas.",
+            "# TYPE db_queries_total counter",
+            f"db_queries_total {r.consultas_total}",
+            "# HELP db_query_seconds_total Tiempo total en consultas SQL.",
+            "# TYPE db_query_seconds_total counter",
+            f"db_query_seconds_total {r.tiempo_db_total}",
+        ]
+
+    stats = get_producto_cache().stats()
+    lineas += ["# HELP producto_cache Estadísticas de la caché de productos.", "# TYPE producto_cache gauge"]
+    for clave, valor in sorted(stats.items()):
+        lineas.append(f'producto_cache{{stat="{clave}"}} {valor}')
+    return "\n".join(lineas) + "\n"
+
+
+def instrumentar_engine(engine: Engine) -> None:
+    """Cuenta y cronometra cada consulta del engine, asignándola al request en curso."""
+    if getattr(engine, "_metricas_instrumentado", False):
+        return
+    engine._metricas_instrumentado = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metricas_inicio", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _despues(conn, cursor, statement, parameters, context, executemany):
+        inicios = conn.info.get("metricas_inicio")
+        if not inicios:
+            return
+        duracion = time.perf_counter() - inicios.pop()
+        registro.registrar_consulta(duracion)
+        ctx = _contexto.get()
+        if ctx is not None:
+            ctx.consultas += 1
+            ctx.tiempo_db += duracion
+            if len(ctx.sentencias) < MAX_SENTENCIAS_LOG:
+                ctx.sentencias.append(f"{duracion * 1000:.1f}ms {statement}")
+
+
+class MetricsMiddleware:
+    """Middleware ASGI: mide cada request HTTP y loguea los lentos con su SQL."""
+
+    def __init__(self, app, slow_request_ms: float | None = None):
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = ContextoRequest()
+        token = _contexto.set(ctx)
+        status = 500
+        tamanio = 0
+
+        async def send_wrapper(message):
+            nonlocal status, tamanio
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                tamanio += len(message.get("body", b""))
+            await send(message)
+
+        with registro._lock:
+            registro.en_curso += 1
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duracion = time.perf_counter() - inicio
+            with registro._lock:
+                registro.en_curso -= 1
+            _contexto.reset(token)
+            route = scope.get("route")
+            ruta = getattr(route, "path", None) or "unmatched"
+            metodo = scope["method"]
+            registro.registrar(metodo, ruta, status, duracion, tamanio, ctx)
+            umbral = SLOW_REQUEST_MS if self.slow_request_ms is None else self.slow_request_ms
+            if duracion * 1000 >= umbral:
+                logger.warning(
+                    "Request lento: %s %s -> %s en %.1fms (%d consultas, %.1fms en DB)\n%s",
+                    metodo, scope["path"], status, duracion * 1000, ctx.consultas,
+                    ctx.tiempo_db * 1000, "\n".join(ctx.sentencias),
+                )
@@ -0,0 +1,92 @@
+# app/core/openapi.py
+"""
+Esquema OpenAPI precompilado.
+
+Generar el esquema recorre todas las rutas y modelos pydantic; en vez de
+pagarlo en el primer `/openapi.json` de cada worker, el build lo escribe en
+`OPENAPI_PATH` (`python -m app.scripts.build_openapi`). El archivo guarda la
+versión de la app y la revisión del código (`APP_REVISION` o el commit de
+git) con que se generó: si no coinciden con las del proceso, se ignora y el
+esquema se genera en caliente como antes. Comprobarlo cuesta un par de
+lecturas chicas, no recorrer las fuentes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+
+APP_DIR = Path(__file__).resolve().parents[1]
+OPENAPI_PATH = APP_DIR / "openapi.json"
+
+
+def revision(repo: Path = APP_DIR.parents[1]) -> str:
+    """`APP_REVISION` si el deploy la define; si no, el commit de git leído de `.git` (sin correr git)."""
+    if os.getenv("APP_REVISION"):
+        return os.environ["APP_REVISION"]
+    git = repo / ".git"
+    try:
+        head = (git / "HEAD").read_text(encoding="utf-8").strip()
+        if not head.startswith("ref: "):
+            return head  # HEAD separado
+        ref = head.removeprefix("ref: ")
+        if (git / ref).exists():
+            return (git / ref).read_text(encoding="utf-8").strip()
+        for linea in (git / "packed-refs").read_text(encoding="utf-8").splitlines():
+            if linea.endswith(f" {ref}"):
+                return linea.split()[0]
+    except OSError:
+        pass
+    return ""
+
+
+def identidad(app: FastAPI) -> str:
+    return f"{app.version}@{revision()}"
+
+
+def construir_openapi(app: FastAPI) -> dict[str, Any]:
+    openapi_schema = get_openapi(
+        title=app.title,
+        version=app.version,
+        description=app.description,
+        routes=app.routes,
+        tags=app.openapi_tags,
+    )
+
+    openapi_schema["components"]["securitySchemes"] = {
+        "BearerAuth": {
+            "type": "http",
+            "scheme": "bearer",
+            "bearerFormat": "JWT",
+        }
+    }
+
+    for path in openapi_schema["paths"].values():
+        for method in path.values():
+            method.setdefault("security", [{"BearerAuth": []}])
+
+    return openapi_schema
+
+
+def guardar_openapi(app: FastAPI, path: Path | None = None) -> Path:
+    path = path or OPENAPI_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"fingerprint": identidad(app), "schema": construir_openapi(app)}
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def cargar_openapi(app: FastAPI, path: Path | None = None) -> dict[str, Any] | None:
+    """Esquema precompilado si existe y es de esta versión y revisión; si no, None."""
+    try:
+        data = json.loads((path or OPENAPI_PATH).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.get("fingerprint") != identidad(app):
+        return None
+    return data.get("schema")
@@ -0,0 +1,119 @@
+# app/core/profiling.py
+"""
+Profiler de muestreo sin dependencias externas.
+
+Un hilo de fondo toma `sys._current_frames()` cada `intervalo` segundos y
+acumula las pilas en formato "folded" (`raiz;llamada;...;hoja N`), que leen
+directamente flamegraph.pl, speedscope o inferno.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from types import FrameType
+from typing import Callable, Iterator
+
+
+def default_profiles_dir() -> Path:
+    # Este archivo está en backend/app/core/...  => subir dos niveles para llegar a backend/
+    backend_root = Path(__file__).resolve().parents[2]
+    return backend_root / "profiles"
+
+
+class SamplingProfiler:
+    def __init__(
+        self,
+        intervalo: float = 0.005,
+        hilo: int | None = None,
+        incluir: Callable[[int, FrameType], bool] | None = None,
+    ):
+        """
+        Args:
+            intervalo: segundos entre muestras.
+            hilo: ident del único hilo a muestrear; None muestrea todos los hilos
+                (la raíz de cada pila es el nombre del hilo).
+            incluir: filtro opcional `(ident, frame actual) -> bool` de los hilos a muestrear.
+        """
+        self.intervalo = intervalo
+        self.hilo = hilo
+        self.incluir = incluir
+        self.pilas: Counter[str] = Counter()
+        self.muestras = 0
+        self._detener = threading.Event()
+        self._sampler: threading.Thread | None = None
+
+    def start(self) -> "SamplingProfiler":
+        self._detener.clear()
+        self._sampler = threading.Thread(target=self._bucle, name="sampling-profiler", daemon=True)
+        self._sampler.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._detener.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        return self
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _bucle(self) -> None:
+        propio = threading.get_ident()
+        while not self._detener.wait(self.intervalo):
+            nombres = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == propio or (self.hilo is not None and ident != self.hilo):
+                    continue
+                if self.incluir is not None and not self.incluir(ident, frame):
+                    continue
+                pila = []
+                while frame is not None:
+                    code = frame.f_code
+                    pila.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                    frame = frame.f_back
+                if self.hilo is None:
+                    pila.append(nombres.get(ident, str(ident)))
+                self.pilas[";".join(reversed(pila))] += 1
+            self.muestras += 1
+
+    def folded(self) -> str:
+        return "".join(f"{pila} {n}\n" for pila, n in self.pilas.most_common())
+
+    def guardar(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.folded(), encoding="utf-8")
+        return path
+
+
+def nombre_perfil(etiqueta: str) -> str:
+    limpio = "".join(c if c.isalnum() else "_" for c in etiqueta).strip("_")
+    return f"{datetime.now():%Y%m%d-%H%M%S-%f}-{limpio}.folded"
+
+
+@contextmanager
+def perfilar_a_archivo(path: str | Path | None, intervalo: float = 0.005) -> Iterator[SamplingProfiler | None]:
+    """Perfila el hilo actual y guarda el resultado en `path`; sin `path` no hace nada."""
+    if not path:
+        yield None
+        return
+    profiler = SamplingProfiler(intervalo=intervalo, hilo=threading.get_ident())
+    inicio = time.perf_counter()
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        destino = profiler.guardar(Path(path))
+        print(
+            f"Profile saved to / Perfil guardado en: {destino} "
+            f"({profiler.muestras} samples / muestras, {time.perf_counter() - inicio:.2f}s)"
+        )
@@ -1,8 +1,10 @@
+import os
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-DATABASE_URL = "sqlite:///./BioFusion.db"
+# DATABASE_URL permite apuntar la app a otra base (p. ej. la del load test).
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./BioFusion.db")
 
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
@@ -5,5 +5,8 @@ from .base import EntityBase
 from .usuario import UsuarioORM, usuario_rol
 from .rol import RolORM
 from .producto import ProductoORM
+from .contador import ContadorORM
+from .movimiento import MovimientoStockORM
+from .job import JobORM
 
 # así SQLAlchemy los "ve" al momento de correr Alembic u otras operaciones
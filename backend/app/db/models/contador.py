@@ -0,0 +1,27 @@
+# app/db/models/contador.py
+import secrets
+
+from sqlalchemy import Column, Integer, String, event
+from app.db.models.base import EntityBase
+
+# Fila con un valor aleatorio fijado al crear la tabla: identifica esta base,
+# así una base recreada (contadores de nuevo en 0) no repite ETags viejos.
+EPOCA = "epoca"
+
+
+def nueva_epoca() -> int:
+    return secrets.randbelow(2**31 - 1) + 1
+
+
+class ContadorORM(EntityBase):
+    """Contador de cambios con nombre; se usa para versionar vistas (ETag)."""
+    __tablename__ = "contadores"
+    __table_args__ = {'extend_existing': True}
+
+    nombre = Column(String, unique=True, nullable=False)
+    valor = Column(Integer, nullable=False, default=0)
+
+
+@event.listens_for(ContadorORM.__table__, "after_create")
+def _sembrar_epoca(tabla, conexion, **kw):
+    conexion.execute(tabla.insert().values(nombre=EPOCA, valor=nueva_epoca()))
@@ -0,0 +1,27 @@
+# app/db/models/job.py
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, String
+from app.db.models.base import EntityBase
+
+class JobORM(EntityBase):
+    """Trabajo de analítica en segundo plano; su estado lo mantiene app/services/jobs.py."""
+    __tablename__ = "jobs"
+    __table_args__ = {'extend_existing': True}
+
+    tipo = Column(String, nullable=False)
+    estado = Column(String, nullable=False, default="pendiente", index=True)
+    parametros = Column(JSON, nullable=False, default=dict)
+    progreso = Column(Float, nullable=False, default=0.0)
+    mensaje = Column(String)
+    resultado = Column(JSON)
+    resultado_path = Column(String)
+    error = Column(String)
+    cancelacion_solicitada = Column(Boolean, nullable=False, default=False)
+    creado_por = Column(String)
+    # Gestor que corre el job y última señal de vida: sin latido reciente, nadie lo corre
+    propietario = Column(String)
+    latido = Column(DateTime)
+    creado = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    iniciado = Column(DateTime)
+    finalizado = Column(DateTime)
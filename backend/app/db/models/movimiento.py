@@ -0,0 +1,16 @@
+# app/db/models/movimiento.py
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from app.db.models.base import EntityBase
+
+class MovimientoStockORM(EntityBase):
+    """Libro de movimientos de stock: una fila por cada delta aplicado."""
+    __tablename__ = "movimientos_stock"
+    __table_args__ = {'extend_existing': True}
+
+    producto_id = Column(Integer, ForeignKey("productos.id", ondelete="CASCADE"), index=True, nullable=False)
+    cantidad = Column(Integer, nullable=False)
+    motivo = Column(String)
+    stock_resultante = Column(Integer, nullable=False)
+    fecha = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
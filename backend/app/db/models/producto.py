@@ -1,13 +1,66 @@
 # app/db/models/producto.py
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, DDL, Index, Integer, String, event, text
 from app.db.models.base import EntityBase
 
 class ProductoORM(EntityBase):
     __tablename__ = "productos"
     __table_args__ = {'extend_existing': True}
     
-    nombre = Column(String, nullable=False)
+    nombre = Column(String, unique=True, index=True, nullable=False)
     sku = Column(String, unique=True, nullable=False)
     descripcion = Column(String)
     stock = Column(Integer, default=0, nullable=False)
-    stock_minimo = Column(Integer, nullable=False, default=0) 
\ No newline at end of file
+    stock_minimo = Column(Integer, nullable=False, default=0)
+    # Base de los ETag por producto. Cada UPDATE la sube en SQL (`version = version + 1`),
+    # tanto el repositorio como los movimientos de stock; no se usa `version_id_col`
+    # porque su chequeo fallaría con StaleDataError ante un movimiento concurrente.
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
+
+
+# Índice parcial: solo contiene los productos con stock bajo, así las consultas
+# `stock < stock_minimo` recorren el índice en lugar de toda la tabla.
+# La base lo mantiene sola en cada INSERT/UPDATE/DELETE.
+Index(
+    "ix_productos_stock_bajo",
+    ProductoORM.id,
+    sqlite_where=ProductoORM.stock < ProductoORM.stock_minimo,
+    postgresql_where=ProductoORM.stock < ProductoORM.stock_minimo,
+)
+
+
+# Búsqueda de texto completo sobre nombre y descripción.
+# SQLite: tabla virtual FTS5 de contenido externo, sincronizada por triggers.
+# Postgres: índice GIN sobre la misma expresión tsvector que usa el repositorio.
+PRODUCTOS_FTS_SQLITE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS productos_fts USING fts5(
+        nombre, descripcion,
+        content='productos', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS productos_fts_ai AFTER INSERT ON productos BEGIN
+        INSERT INTO productos_fts(rowid, nombre, descripcion) VALUES (new.id, new.nombre, new.descripcion);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS productos_fts_ad AFTER DELETE ON productos BEGIN
+        INSERT INTO productos_fts(productos_fts, rowid, nombre, descripcion)
+        VALUES ('delete', old.id, old.nombre, old.descripcion);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS productos_fts_au AFTER UPDATE OF nombre, descripcion ON productos BEGIN
+        INSERT INTO productos_fts(productos_fts, rowid, nombre, descripcion)
+        VALUES ('delete', old.id, old.nombre, old.descripcion);
+        INSERT INTO productos_fts(rowid, nombre, descripcion) VALUES (new.id, new.nombre, new.descripcion);
+    END""",
+]
+PRODUCTOS_FTS_POSTGRES = [
+    """CREATE INDEX IF NOT EXISTS ix_productos_busqueda ON productos
+        USING GIN (to_tsvector('spanish', nombre || ' ' || coalesce(descripcion, '')))""",
+]
+
+for _sql in PRODUCTOS_FTS_SQLITE:
+    event.listen(ProductoORM.__table__, "after_create", DDL(_sql).execute_if(dialect="sqlite"))
+for _sql in PRODUCTOS_FTS_POSTGRES:
+    event.listen(ProductoORM.__table__, "after_create", DDL(_sql).execute_if(dialect="postgresql"))
+event.listen(
+    ProductoORM.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS productos_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,100 @@
+# app/db/unit_of_work.py
+"""
+Unidad de trabajo sobre una `Session`.
+
+Dentro de `with UnidadDeTrabajo(db):` los repositorios no hacen commit por
+operación: agregan sus objetos (con un flush cada `flush_cada` altas),
+acumulan los incrementos de contadores y registran lo que debe correr después
+del commit (p. ej. invalidar la caché). Al salir sin error se hace un único
+commit; con error, rollback y no se ejecuta nada de lo registrado.
+
+Fuera de una unidad, `agregar` y `confirmar` se comportan como `db.add` y
+`db.commit`, así que los repositorios funcionan igual en ambos casos.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+_CLAVE = "unidad_de_trabajo"
+
+
+class UnidadDeTrabajo:
+    def __init__(self, db: Session, flush_cada: int = 500):
+        self.db = db
+        self.flush_cada = flush_cada
+        self.pendientes = 0
+        self.contadores: Counter[str] = Counter()  # incrementos diferidos (ContadorRepository)
+        self._antes_commit: list[Callable[[], None]] = []
+        self._tras_commit: list[Callable[[], None]] = []
+        self._externa: UnidadDeTrabajo | None = None
+
+    def __enter__(self) -> "UnidadDeTrabajo":
+        # Una unidad anidada se suma a la externa: el commit lo hace la de más afuera
+        self._externa = unidad_activa(self.db)
+        if self._externa is not None:
+            return self._externa
+        self.db.info[_CLAVE] = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self._externa is not None:
+            return False
+        del self.db.info[_CLAVE]
+        if exc_type is not None:
+            self.db.rollback()
+            return False
+        try:
+            for fn in self._antes_commit:
+                fn()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        for fn in self._tras_commit:
+            fn()
+        return False
+
+    def agregar(self, obj) -> None:
+        self.db.add(obj)
+        self.pendientes += 1
+        if self.pendientes >= self.flush_cada:
+            self.flush()
+
+    def flush(self) -> None:
+        self.db.flush()
+        self.pendientes = 0
+
+    def antes_de_commit(self, fn: Callable[[], None]) -> None:
+        self._antes_commit.append(fn)
+
+    def tras_commit(self, fn: Callable[[], None]) -> None:
+        self._tras_commit.append(fn)
+
+
+def unidad_activa(db: Session) -> UnidadDeTrabajo | None:
+    return db.info.get(_CLAVE)
+
+
+def agregar(db: Session, obj) -> None:
+    """`db.add`, con flush por lotes si hay una unidad de trabajo activa."""
+    uow = unidad_activa(db)
+    if uow is None:
+        db.add(obj)
+    else:
+        uow.agregar(obj)
+
+
+def confirmar(db: Session, tras_commit: Callable[[], None] | None = None) -> None:
+    """Commit inmediato, o diferido al cierre de la unidad de trabajo activa."""
+    uow = unidad_activa(db)
+    if uow is not None:
+        if tras_commit is not None:
+            uow.tras_commit(tras_commit)
+        return
+    db.commit()
+    if tras_commit is not None:
+        tras_commit()
@@ -0,0 +1,137 @@
+# app/dependencies/profiling.py
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import threading
+from contextlib import contextmanager
+
+from fastapi import HTTPException
+from fastapi.routing import APIRoute
+from fastapi.security.utils import get_authorization_scheme_param
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from app.core.profiling import SamplingProfiler, default_profiles_dir, nombre_perfil
+from app.db.session import get_db
+from app.dependencies.security import get_current_user, usuario_actual_con_rol
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY = "profile"
+
+# Marca del request perfilado; viaja con el contexto a los hilos del threadpool
+_perfil_actual: contextvars.ContextVar[object | None] = contextvars.ContextVar("perfil_request", default=None)
+# Hilos del threadpool que están corriendo el endpoint de un request perfilado: ident -> marca
+_hilos_marcados: dict[int, object] = {}
+
+
+def _perfil_solicitado(request: Request) -> bool:
+    valor = request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY)
+    return bool(valor) and valor.lower() not in ("0", "false", "no")
+
+
+def _autorizar(app, token: str) -> None:
+    """401/403 (HTTPException) si el token no es de un admin. Abre sesión solo para esto."""
+    sesiones = app.dependency_overrides.get(get_db, get_db)()
+    db = next(sesiones)
+    try:
+        usuario_actual_con_rol("admin")(get_current_user(token=token, db=db))
+    finally:
+        sesiones.close()
+
+
+@contextmanager
+def _marcar_hilo():
+    """Anota el hilo actual como parte del request perfilado (si lo hay) mientras dura el bloque."""
+    marca = _perfil_actual.get()
+    if marca is None:
+        yield
+        return
+    ident = threading.get_ident()
+    _hilos_marcados[ident] = marca
+    try:
+        yield
+    finally:
+        _hilos_marcados.pop(ident, None)
+
+
+def _con_hilo_marcado(endpoint):
+    @functools.wraps(endpoint)  # FastAPI lee la firma del original a través de __wrapped__
+    def marcado(*args, **kwargs):
+        with _marcar_hilo():
+            return endpoint(*args, **kwargs)
+
+    return marcado
+
+
+class RutaPerfilable(APIRoute):
+    """Ruta cuyo endpoint síncrono marca el hilo del threadpool que lo corre, para `PerfiladoMiddleware`."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = _con_hilo_marcado(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _hilos_del_request(marca: object, hilo_loop: int, loop: asyncio.AbstractEventLoop, tarea: asyncio.Task):
+    """
+    Filtro del profiler: el hilo del event loop solo mientras corre la tarea de
+    este request, y los hilos del threadpool marcados con su endpoint.
+    """
+
+    def incluir(ident: int, frame) -> bool:
+        if ident == hilo_loop:
+            return asyncio.current_task(loop) is tarea
+        return _hilos_marcados.get(ident) is marca
+
+    return incluir
+
+
+class PerfiladoMiddleware:
+    """
+    Middleware ASGI: con `X-Profile: 1` o `?profile=1` el request se ejecuta
+    bajo el profiler de muestreo. Solo para administradores (401/403 si no).
+    El perfil (formato folded) se guarda en backend/profiles y su URL de
+    descarga va en el header `X-Profile-Path`, también en respuestas propias
+    del handler como los 304.
+
+    Entran en el perfil el event loop mientras corre la tarea del request y
+    el hilo del threadpool que ejecuta su endpoint (rutas `RutaPerfilable`).
+    Las dependencias síncronas (sesión, usuario actual) corren en otras
+    llamadas al threadpool y no se muestrean.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _perfil_solicitado(Request(scope)):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        _, token = get_authorization_scheme_param(request.headers.get("Authorization"))
+        try:
+            await run_in_threadpool(_autorizar, scope["app"], token)
+        except HTTPException as e:
+            await JSONResponse({"detail": e.detail}, status_code=e.status_code, headers=e.headers)(scope, receive, send)
+            return
+
+        nombre = nombre_perfil(f"{request.method}-{request.url.path}")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = [*message.get("headers", []), (b"x-profile-path", f"/admin/perfiles/{nombre}".encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        marca = object()
+        token_perfil = _perfil_actual.set(marca)
+        incluir = _hilos_del_request(marca, threading.get_ident(), asyncio.get_running_loop(), asyncio.current_task())
+        profiler = SamplingProfiler(intervalo=0.001, incluir=incluir).start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _perfil_actual.reset(token_perfil)
+            profiler.stop().guardar(default_profiles_dir() / nombre)
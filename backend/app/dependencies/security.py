@@ -1,7 +1,6 @@
 # app/dependencies/security.py
 
 from fastapi import Depends, HTTPException, status
-from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordBearer
 from app.db.session import get_db
@@ -12,6 +11,8 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> UsuarioORM:
+    from jose import JWTError, jwt  # diferido: python-jose no se carga al importar la app
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -0,0 +1,33 @@
+# mappers/job_mapper.py
+from app.domain.models.job import Job
+from app.db.models.job import JobORM
+
+def job_orm_to_domain(orm: JobORM) -> Job:
+    return Job(
+        id=orm.id,
+        tipo=orm.tipo,
+        estado=orm.estado,
+        parametros=orm.parametros or {},
+        progreso=orm.progreso,
+        mensaje=orm.mensaje,
+        resultado=orm.resultado,
+        resultado_path=orm.resultado_path,
+        error=orm.error,
+        cancelacion_solicitada=orm.cancelacion_solicitada,
+        creado_por=orm.creado_por,
+        creado=orm.creado,
+        iniciado=orm.iniciado,
+        finalizado=orm.finalizado,
+    )
+
+def job_domain_to_orm(domain: Job) -> JobORM:
+    orm = JobORM(
+        tipo=domain.tipo,
+        estado=domain.estado,
+        parametros=domain.parametros,
+        progreso=domain.progreso,
+        creado_por=domain.creado_por,
+    )
+    if domain.id is not None:
+        orm.id = domain.id
+    return orm
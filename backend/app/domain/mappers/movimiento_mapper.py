@@ -0,0 +1,26 @@
+# mappers/movimiento_mapper.py
+from app.domain.models.movimiento import MovimientoStock
+from app.db.models.movimiento import MovimientoStockORM
+
+def movimiento_orm_to_domain(orm: MovimientoStockORM) -> MovimientoStock:
+    return MovimientoStock(
+        id=orm.id,
+        producto_id=orm.producto_id,
+        cantidad=orm.cantidad,
+        stock_resultante=orm.stock_resultante,
+        motivo=orm.motivo,
+        fecha=orm.fecha,
+    )
+
+def movimiento_domain_to_orm(domain: MovimientoStock) -> MovimientoStockORM:
+    orm = MovimientoStockORM(
+        producto_id=domain.producto_id,
+        cantidad=domain.cantidad,
+        stock_resultante=domain.stock_resultante,
+        motivo=domain.motivo,
+    )
+    if domain.fecha is not None:
+        orm.fecha = domain.fecha
+    if domain.id is not None:
+        orm.id = domain.id
+    return orm
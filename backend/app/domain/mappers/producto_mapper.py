@@ -9,7 +9,8 @@ def producto_orm_to_domain(orm: ProductoORM) -> Producto:
         sku=orm.sku,
         descripcion=orm.descripcion,
         stock=orm.stock,
-        stock_minimo=orm.stock_minimo
+        stock_minimo=orm.stock_minimo,
+        version=orm.version
     )
 
 def producto_domain_to_orm(domain: Producto) -> ProductoORM:
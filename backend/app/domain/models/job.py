@@ -0,0 +1,41 @@
+# domain/models/job.py
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
+
+PENDIENTE = "pendiente"
+EN_CURSO = "en_curso"
+COMPLETADO = "completado"
+FALLIDO = "fallido"
+CANCELADO = "cancelado"
+
+ESTADOS = (PENDIENTE, EN_CURSO, COMPLETADO, FALLIDO, CANCELADO)
+ESTADOS_ACTIVOS = (PENDIENTE, EN_CURSO)
+
+
+@dataclass
+class Job:
+    id: Optional[int]
+    tipo: str
+    estado: str = PENDIENTE
+    parametros: dict[str, Any] = field(default_factory=dict)
+    progreso: float = 0.0
+    mensaje: Optional[str] = None
+    resultado: Optional[dict[str, Any]] = None
+    resultado_path: Optional[str] = None
+    error: Optional[str] = None
+    cancelacion_solicitada: bool = False
+    creado_por: Optional[str] = None
+    creado: Optional[datetime] = None
+    iniciado: Optional[datetime] = None
+    finalizado: Optional[datetime] = None
+
+    def __post_init__(self):
+        if self.estado not in ESTADOS:
+            raise ValueError(f"Estado de job inválido: {self.estado}")
+        if not 0.0 <= self.progreso <= 1.0:
+            raise ValueError("El progreso debe estar entre 0 y 1.")
+
+    @property
+    def activo(self) -> bool:
+        return self.estado in ESTADOS_ACTIVOS
@@ -0,0 +1,23 @@
+# domain/models/movimiento.py
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+@dataclass
+class MovimientoStock:
+    id: Optional[int]
+    producto_id: int
+    cantidad: int
+    stock_resultante: int
+    motivo: Optional[str] = None
+    fecha: Optional[datetime] = None
+    def __post_init__(self):
+        if self.cantidad == 0:
+            raise ValueError("La cantidad del movimiento no puede ser cero.")
+
+
+@dataclass
+class ResultadoMovimiento:
+    """Resultado de aplicar un movimiento: el movimiento registrado o el motivo del rechazo."""
+    movimiento: Optional[MovimientoStock] = None
+    error: Optional[str] = None
@@ -9,7 +9,8 @@ class Producto:
     sku: str
     descripcion: Optional[str] = None
     stock: int = 0
-    stock_minimo: int = 0 
+    stock_minimo: int = 0
+    version: int = 1
     def __post_init__(self):
         if not self.nombre:
             raise ValueError("El nombre del producto no puede estar vacío.")
@@ -1,7 +1,6 @@
 # file: backend/app/main.py
 # from fastapi import FastAPI
 from fastapi import FastAPI
-from fastapi.openapi.utils import get_openapi
 from fastapi.openapi.models import OAuthFlows as OAuthFlowsModel
 from fastapi.security import OAuth2
 from typing import Optional, Dict
@@ -10,7 +9,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 
-from app.routers import auth, usuarios, admin, productos
+from app.core.openapi import cargar_openapi, construir_openapi
+from app.core.metrics import MetricsMiddleware, instrumentar_engine
+from app.db.engine import engine
+from app.dependencies.profiling import PerfiladoMiddleware
+from app.routers import auth, usuarios, admin, productos, metricas
 
 
 class OAuth2PasswordBearerWithCookie(OAuth2):
@@ -35,7 +38,7 @@ app = FastAPI(
         {"name": "Usuarios", "description": "Administración de usuarios del sistema"},
         {"name": "Productos", "description": "Catálogo y stock de productos"},        
         {"name": "Administración", "description": "Funciones avanzadas para admins"},
-    ]
+    ],
 )
 
 app.add_middleware(
@@ -45,6 +48,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(PerfiladoMiddleware)  # perfilado opt-in (X-Profile), solo admins
+app.add_middleware(MetricsMiddleware)
+instrumentar_engine(engine)
 
 BASE_DIR = Path(__file__).resolve().parent
 STATIC_DIR = BASE_DIR / "static"
@@ -56,34 +62,16 @@ app.include_router(auth.router, prefix="/auth", tags=["Autenticación"])
 app.include_router(usuarios.router, prefix="/usuarios", tags=["Usuarios"])
 app.include_router(productos.router, prefix="/productos", tags=["Productos"])
 app.include_router(admin.router, prefix="/admin", tags=["Administración"])
+app.include_router(metricas.router)
 
 
 def custom_openapi():
     if app.openapi_schema:
         return app.openapi_schema
 
-    openapi_schema = get_openapi(
-        title=app.title,
-        version=app.version,
-        description=app.description,
-        routes=app.routes,
-        tags=app.openapi_tags,
-    )
-
-    openapi_schema["components"]["securitySchemes"] = {
-        "BearerAuth": {
-            "type": "http",
-            "scheme": "bearer",
-            "bearerFormat": "JWT",
-        }
-    }
-
-    for path in openapi_schema["paths"].values():
-        for method in path.values():
-            method.setdefault("security", [{"BearerAuth": []}])
-
-    app.openapi_schema = openapi_schema
+    # Precompilado en el build (app/scripts/build_openapi.py); si falta o está desactualizado se genera aquí.
+    app.openapi_schema = cargar_openapi(app) or construir_openapi(app)
     return app.openapi_schema
 
 
-app.openapi = custom_openapi
\ No newline at end of file
+app.openapi = custom_openapi
@@ -0,0 +1,5 @@
+# app/pipeline/__init__.py
+from app.pipeline.dag import Etapa, EtapaFallida, Pipeline, ResultadoEtapa, Salida
+from app.pipeline.flujo import construir_flujo
+
+__all__ = ["Etapa", "EtapaFallida", "Pipeline", "ResultadoEtapa", "Salida", "construir_flujo"]
@@ -0,0 +1,95 @@
+# app/pipeline/__main__.py
+"""
+Corre el flujo de analítica como DAG con caché:
+
+    python -m app.pipeline                      # todo el flujo
+    python -m app.pipeline --stage metrics      # una etapa y las que necesita
+    python -m app.pipeline --generate 5000      # regenerar el dataset antes
+    python -m app.pipeline --list               # estado de la caché, sin ejecutar
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from app.core.profiling import perfilar_a_archivo
+from app.pipeline.dag import EtapaFallida, ResultadoEtapa
+from app.pipeline.flujo import ETAPAS, construir_flujo
+
+
+def _imprimir(resultado: ResultadoEtapa) -> None:
+    if resultado.estado == "en_cache":
+        print(f"  {resultado.nombre:<12} cached / en caché")
+    else:
+        print(f"  {resultado.nombre:<12} ran / ejecutada en {resultado.duracion:.2f}s  (log: {resultado.log})")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Cached DAG runner for the analytics flow")
+    parser.add_argument("--path", type=str, default=None, help="Ruta del CSV (default: backend/datasets/product_dataset.csv)")
+    parser.add_argument("--reports-dir", type=str, default=None, help="Carpeta de los reportes (default: backend/reports)")
+    parser.add_argument("--cache-dir", type=str, default=None, help="Manifiesto, artefactos intermedios y logs (default: backend/pipeline_cache)")
+    parser.add_argument("--generate", type=int, default=None, metavar="N", help="Generar un dataset de N filas antes del análisis (opcional)")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla del dataset generado (default: 42)")
+    parser.add_argument("--stage", action="append", choices=ETAPAS, default=None, help="Etapa a correr junto con las que necesita; repetible (default: todas)")
+    parser.add_argument("--force", action="store_true", help="Ignorar la caché y ejecutar todo lo seleccionado")
+    parser.add_argument("--workers", type=int, default=1, help="Etapas en paralelo en un pool de procesos; 1 = en este proceso (default: 1)")
+    parser.add_argument("--duplicates", choices=("exact", "bloom", "off"), default="exact", help="Verificación de Id/Code únicos (default: exact)")
+    parser.add_argument("--epsilon", type=float, default=0.005, help="Error de rango de percentiles/histogramas (default: 0.005)")
+    parser.add_argument("--bins", type=int, default=10, help="Intervalos de los histogramas (default: 10)")
+    parser.add_argument("--list", action="store_true", help="Mostrar qué etapas están al día en la caché, sin ejecutar")
+    parser.add_argument("--profile", type=str, default=None, help="Guardar un perfil de muestreo (formato folded/flamegraph) en este archivo (opcional)")
+    args = parser.parse_args(argv)
+
+    with perfilar_a_archivo(args.profile):
+        return _run(args)
+
+
+def _run(args: argparse.Namespace) -> int:
+    if args.workers < 1:
+        print("ERROR: --workers must be >= 1 / debe ser >= 1")
+        return 1
+    try:
+        pipeline = construir_flujo(
+            csv_path=Path(args.path) if args.path else None,
+            reports_dir=Path(args.reports_dir) if args.reports_dir else None,
+            cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+            generar_filas=args.generate,
+            seed=args.seed,
+            duplicados=args.duplicates,
+            epsilon=args.epsilon,
+            bins=args.bins,
+        )
+        objetivos = [e for e in args.stage or [] if e in pipeline.etapas]
+        if args.stage and not objetivos:
+            print(f"ERROR: stage not in this flow / etapa fuera de este flujo: {', '.join(args.stage)}")
+            return 1
+
+        if args.list:
+            for nombre, al_dia in pipeline.estado(objetivos).items():
+                print(f"  {nombre:<12} {'cached / en caché' if al_dia else 'pending / pendiente'}")
+            return 0
+
+        print(f"Pipeline cache / Caché: {pipeline.cache_dir}")
+        resultados = pipeline.ejecutar(objetivos, forzar=args.force, max_workers=args.workers, al_terminar=_imprimir)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+    except EtapaFallida as e:
+        print(f"ERROR: {e}")
+        print(f"Log: {pipeline.cache_dir / f'{e.etapa}.log'}")
+        return 1
+
+    ejecutadas = sum(r.estado == "ejecutada" for r in resultados.values())
+    print(f"\nDone / Listo: {ejecutadas} ran / ejecutadas, {len(resultados) - ejecutadas} cached / en caché")
+    for nombre in ("integrity", "metrics", "exploratory", "report"):
+        if nombre in resultados:
+            for path in resultados[nombre].salidas.values():
+                print(f"  {nombre} -> {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
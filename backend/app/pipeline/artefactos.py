@@ -0,0 +1,68 @@
+# app/pipeline/artefactos.py
+"""
+Lectura y escritura de los artefactos tipados que circulan entre etapas.
+
+- "frame": DataFrame. Se guarda en Arrow/Feather si pyarrow está instalado y
+  si no con pickle; en ambos casos sin pasar por CSV.
+- "json": dict serializable.
+- "csv": DataFrame que se escribe como CSV (p. ej. el dataset); quien lo
+  consume recibe el `Path` y decide cómo leerlo.
+- "text": str (reportes en markdown).
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+from pathlib import Path
+from typing import Any
+
+TIPOS = ("frame", "json", "csv", "text")
+
+
+def _hay_arrow() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def extension(tipo: str) -> str:
+    if tipo == "frame":
+        return ".feather" if _hay_arrow() else ".pkl"
+    return {"json": ".json", "csv": ".csv", "text": ".md"}[tipo]
+
+
+def validar(tipo: str, valor: Any) -> None:
+    import pandas as pd
+
+    esperado = {"frame": pd.DataFrame, "csv": pd.DataFrame, "json": dict, "text": str}[tipo]
+    if not isinstance(valor, esperado):
+        raise TypeError(f"Se esperaba {esperado.__name__} para una salida '{tipo}', llegó {type(valor).__name__}")
+
+
+def escribir(tipo: str, valor: Any, path: Path) -> None:
+    validar(tipo, valor)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporal = path.with_name(path.name + ".tmp")  # nunca dejar un artefacto a medio escribir
+    if tipo == "frame":
+        if path.suffix == ".feather":
+            valor.reset_index(drop=True).to_feather(temporal)
+        else:
+            valor.to_pickle(temporal)
+    elif tipo == "csv":
+        valor.to_csv(temporal, index=False)
+    elif tipo == "json":
+        temporal.write_text(json.dumps(valor, indent=2), encoding="utf-8")
+    else:
+        temporal.write_text(valor, encoding="utf-8")
+    temporal.replace(path)
+
+
+def leer(tipo: str, path: Path) -> Any:
+    if tipo == "frame":
+        import pandas as pd
+
+        return pd.read_feather(path) if path.suffix == ".feather" else pd.read_pickle(path)
+    if tipo == "json":
+        return json.loads(path.read_text(encoding="utf-8"))
+    if tipo == "text":
+        return path.read_text(encoding="utf-8")
+    return path
@@ -0,0 +1,341 @@
+# app/pipeline/dag.py
+"""
+Motor de pipelines: etapas declaradas como DAG, con caché por huella y
+ejecución concurrente.
+
+Cada etapa declara sus entradas (nombre de parámetro -> artefacto) y sus
+salidas tipadas. La clave de una etapa es un hash de su nombre, parámetros,
+código (`modulos`) y las huellas de sus entradas; si coincide con la del
+manifiesto y los archivos de salida existen, la etapa se saltea. Las etapas
+independientes corren a la vez en un pool de procesos; con un solo worker
+corren en el proceso actual y los artefactos "frame", si los hay, pasan de
+una etapa a otra en memoria.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import importlib.util
+import json
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from graphlib import CycleError, TopologicalSorter
+from pathlib import Path
+from typing import Any, Callable
+
+from app.pipeline import artefactos
+
+MANIFIESTO = "manifest.json"
+
+
+def default_cache_dir() -> Path:
+    # Este archivo está en backend/app/pipeline/...  => subir dos niveles para llegar a backend/
+    return Path(__file__).resolve().parents[2] / "pipeline_cache"
+
+
+@dataclass(frozen=True)
+class Salida:
+    nombre: str
+    tipo: str
+    destino: Path | None = None  # archivo final; sin destino queda en la caché
+
+    def __post_init__(self):
+        if self.tipo not in artefactos.TIPOS:
+            raise ValueError(f"Tipo de salida desconocido: {self.tipo}")
+
+
+@dataclass(frozen=True)
+class Etapa:
+    nombre: str
+    funcion: Callable[..., dict[str, Any]]  # de nivel de módulo, para poder enviarla a otro proceso
+    salidas: tuple[Salida, ...]
+    entradas: dict[str, str] = field(default_factory=dict)  # parámetro -> artefacto
+    parametros: dict[str, Any] = field(default_factory=dict)
+    modulos: tuple[str, ...] = ()  # módulos cuyo código invalida la caché al cambiar
+
+
+@dataclass
+class ResultadoEtapa:
+    nombre: str
+    estado: str  # "ejecutada" | "en_cache"
+    duracion: float
+    salidas: dict[str, Path]
+    log: Path | None = None
+
+
+class EtapaFallida(Exception):
+    def __init__(self, etapa: str, causa: BaseException):
+        super().__init__(f"La etapa '{etapa}' falló: {causa}")
+        self.etapa = etapa
+
+
+def _sha(*partes: Any) -> str:
+    return hashlib.sha256(json.dumps(partes, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def huella_archivo(path: Path) -> str:
+    """Huella barata de un archivo externo: ruta, tamaño y fecha de modificación."""
+    stat = path.stat()
+    return _sha(str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+
+
+def _huella_modulo(nombre: str) -> str:
+    spec = importlib.util.find_spec(nombre)
+    if spec is None or spec.origin is None:
+        raise ValueError(f"Módulo no encontrado: {nombre}")
+    return hashlib.sha256(Path(spec.origin).read_bytes()).hexdigest()
+
+
+def _correr_etapa(
+    etapa: Etapa,
+    entradas: dict[str, tuple[str, Path]],
+    destinos: dict[str, tuple[str, Path]],
+    log: Path,
+    memoria: dict[str, Any] | None = None,
+) -> None:
+    """
+    Carga las entradas, corre la etapa y escribe sus salidas. Corre en un
+    proceso del pool o en el actual; `memoria` (solo en el actual) evita
+    releer de disco los artefactos ya cargados y recibe los DataFrames
+    producidos. Desde el pool no se devuelve nada: las salidas viajan por disco.
+    """
+    en_memoria = memoria if memoria is not None else {}
+    kwargs = {
+        param: en_memoria[str(path)] if str(path) in en_memoria else artefactos.leer(tipo, path)
+        for param, (tipo, path) in entradas.items()
+    }
+    log.parent.mkdir(parents=True, exist_ok=True)
+    with log.open("w", encoding="utf-8") as salida, contextlib.redirect_stdout(salida):
+        valores = etapa.funcion(**kwargs, **etapa.parametros)
+    if not isinstance(valores, dict) or set(valores) != set(destinos):
+        raise TypeError(f"La etapa debe devolver exactamente las salidas {sorted(destinos)}")
+    for nombre, (tipo, path) in destinos.items():
+        artefactos.escribir(tipo, valores[nombre], path)
+        if memoria is not None and tipo == "frame":
+            memoria[str(path)] = valores[nombre]
+
+
+class Pipeline:
+    def __init__(
+        self,
+        etapas: list[Etapa],
+        fuentes: dict[str, Path] | None = None,
+        cache_dir: Path | None = None,
+    ):
+        """
+        Args:
+            etapas: etapas del DAG; los nombres de etapas y de salidas deben ser únicos.
+            fuentes: artefactos externos (archivos "csv") que ninguna etapa produce.
+            cache_dir: manifiesto, artefactos intermedios y logs (default: backend/pipeline_cache).
+        """
+        self.etapas = {e.nombre: e for e in etapas}
+        if len(self.etapas) != len(etapas):
+            raise ValueError("Hay etapas con el mismo nombre.")
+        self.fuentes = dict(fuentes or {})
+        self.cache_dir = cache_dir or default_cache_dir()
+
+        self.productor: dict[str, str] = {}
+        for etapa in etapas:
+            for salida in etapa.salidas:
+                if salida.nombre in self.productor or salida.nombre in self.fuentes:
+                    raise ValueError(f"El artefacto '{salida.nombre}' tiene más de un origen.")
+                self.productor[salida.nombre] = etapa.nombre
+
+        self.grafo: dict[str, set[str]] = {}
+        for etapa in etapas:
+            previas = set()
+            for artefacto in etapa.entradas.values():
+                if artefacto in self.productor:
+                    previas.add(self.productor[artefacto])
+                elif artefacto not in self.fuentes:
+                    raise ValueError(f"La etapa '{etapa.nombre}' usa el artefacto desconocido '{artefacto}'.")
+            self.grafo[etapa.nombre] = previas
+        try:
+            self.orden = list(TopologicalSorter(self.grafo).static_order())
+        except CycleError as e:
+            raise ValueError(f"El pipeline tiene un ciclo: {e.args[1]}") from e
+
+    # --- Rutas y huellas ---------------------------------------------------
+
+    def _salida(self, etapa: str, nombre: str) -> Salida:
+        return next(s for s in self.etapas[etapa].salidas if s.nombre == nombre)
+
+    def ruta(self, artefacto: str) -> Path:
+        if artefacto in self.fuentes:
+            return self.fuentes[artefacto]
+        etapa = self.productor[artefacto]
+        salida = self._salida(etapa, artefacto)
+        return salida.destino or self.cache_dir / f"{etapa}.{artefacto}{artefactos.extension(salida.tipo)}"
+
+    def _tipo(self, artefacto: str) -> str:
+        return "csv" if artefacto in self.fuentes else self._salida(self.productor[artefacto], artefacto).tipo
+
+    def seleccion(self, objetivos: list[str] | None = None) -> list[str]:
+        """Las etapas `objetivos` y todas las que necesitan, en orden topológico."""
+        if not objetivos:
+            return list(self.orden)
+        pendientes, elegidas = list(objetivos), set()
+        while pendientes:
+            nombre = pendientes.pop()
+            if nombre not in self.etapas:
+                raise ValueError(f"Etapa desconocida: {nombre}")
+            if nombre not in elegidas:
+                elegidas.add(nombre)
+                pendientes.extend(self.grafo[nombre])
+        return [n for n in self.orden if n in elegidas]
+
+    def _clave(self, nombre: str, claves: dict[str, str]) -> str:
+        """
+        Hash de la etapa. Los archivos "csv" (fuentes o generados) entran por
+        su huella en disco, así da igual quién los produjo; el resto, por la
+        clave de la etapa que los produce.
+        """
+        etapa = self.etapas[nombre]
+        huellas = {}
+        for param, artefacto in sorted(etapa.entradas.items()):
+            path = self.ruta(artefacto)
+            if self._tipo(artefacto) == "csv" and path.exists():
+                huellas[param] = huella_archivo(path)
+            elif artefacto in self.fuentes:
+                raise ValueError(f"No existe la fuente '{artefacto}': {path}")
+            else:
+                huellas[param] = _sha(claves[self.productor[artefacto]], artefacto)
+        codigo = {m: _huella_modulo(m) for m in etapa.modulos}
+        salidas = [(s.nombre, s.tipo, str(self.ruta(s.nombre))) for s in etapa.salidas]
+        return _sha(nombre, etapa.parametros, huellas, codigo, salidas)
+
+    def claves(self, etapas: list[str]) -> dict[str, str]:
+        claves: dict[str, str] = {}
+        for nombre in etapas:  # en orden topológico: las previas ya tienen clave
+            claves[nombre] = self._clave(nombre, claves)
+        return claves
+
+    # --- Manifiesto ----------------------------------------------------------
+
+    def _leer_manifiesto(self) -> dict[str, dict]:
+        path = self.cache_dir / MANIFIESTO
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return {}
+
+    def _guardar_manifiesto(self, manifiesto: dict[str, dict]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temporal = self.cache_dir / (MANIFIESTO + ".tmp")
+        temporal.write_text(json.dumps(manifiesto, indent=2, sort_keys=True), encoding="utf-8")
+        temporal.replace(self.cache_dir / MANIFIESTO)
+
+    def en_cache(self, nombre: str, clave: str, manifiesto: dict[str, dict]) -> bool:
+        registro = manifiesto.get(nombre)
+        return (
+            registro is not None
+            and registro.get("clave") == clave
+            and all(self.ruta(s.nombre).exists() for s in self.etapas[nombre].salidas)
+        )
+
+    def estado(self, objetivos: list[str] | None = None) -> dict[str, bool]:
+        """Etapa -> si está al día en la caché (sin ejecutar nada)."""
+        etapas = self.seleccion(objetivos)
+        claves = self.claves(etapas)
+        manifiesto = self._leer_manifiesto()
+        return {n: self.en_cache(n, claves[n], manifiesto) for n in etapas}
+
+    # --- Ejecución -------------------------------------------------------------
+
+    def ejecutar(
+        self,
+        objetivos: list[str] | None = None,
+        forzar: bool = False,
+        max_workers: int = 1,
+        al_terminar: Callable[[ResultadoEtapa], None] | None = None,
+    ) -> dict[str, ResultadoEtapa]:
+        """
+        Corre las etapas `objetivos` (todas por defecto) y las que necesitan.
+
+        Una etapa se saltea si su clave está en el manifiesto y sus salidas
+        existen, salvo con `forzar` o si alguna etapa previa se volvió a
+        ejecutar en esta corrida.
+        """
+        etapas = self.seleccion(objetivos)
+        claves = self.claves(etapas)
+        manifiesto = self._leer_manifiesto()
+        resultados: dict[str, ResultadoEtapa] = {}
+        ejecutadas: set[str] = set()
+        memoria: dict[str, Any] = {}
+
+        orden = TopologicalSorter({n: self.grafo[n] & set(etapas) for n in etapas})
+        orden.prepare()
+
+        def preparar(nombre: str):
+            etapa = self.etapas[nombre]
+            entradas = {p: (self._tipo(a), self.ruta(a)) for p, a in etapa.entradas.items()}
+            destinos = {s.nombre: (s.tipo, self.ruta(s.nombre)) for s in etapa.salidas}
+            return etapa, entradas, destinos, self.cache_dir / f"{nombre}.log"
+
+        def registrar(nombre: str, inicio: float) -> None:
+            ejecutadas.add(nombre)
+            manifiesto[nombre] = {"clave": claves[nombre], "terminada": time.time()}
+            self._guardar_manifiesto(manifiesto)
+            resultado = ResultadoEtapa(
+                nombre, "ejecutada", time.perf_counter() - inicio,
+                {s.nombre: self.ruta(s.nombre) for s in self.etapas[nombre].salidas},
+                self.cache_dir / f"{nombre}.log",
+            )
+            resultados[nombre] = resultado
+            if al_terminar:
+                al_terminar(resultado)
+
+        contexto = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=contexto) if max_workers > 1 else None
+        en_curso: dict[Future, tuple[str, float]] = {}
+        try:
+            while orden.is_active():
+                avanzo = False
+                for nombre in orden.get_ready():
+                    # Recién ahora sus entradas son definitivas (un "csv" pudo regenerarse)
+                    claves[nombre] = self._clave(nombre, claves)
+                    previas_ejecutadas = self.grafo[nombre] & ejecutadas
+                    if not forzar and not previas_ejecutadas and self.en_cache(nombre, claves[nombre], manifiesto):
+                        resultados[nombre] = ResultadoEtapa(
+                            nombre, "en_cache", 0.0,
+                            {s.nombre: self.ruta(s.nombre) for s in self.etapas[nombre].salidas},
+                        )
+                        if al_terminar:
+                            al_terminar(resultados[nombre])
+                        orden.done(nombre)
+                        avanzo = True
+                        continue
+                    inicio = time.perf_counter()
+                    etapa, entradas, destinos, log = preparar(nombre)
+                    if pool is None:
+                        try:
+                            _correr_etapa(etapa, entradas, destinos, log, memoria)
+                        except Exception as e:
+                            raise EtapaFallida(nombre, e) from e
+                        registrar(nombre, inicio)
+                        orden.done(nombre)
+                        avanzo = True
+                    else:
+                        en_curso[pool.submit(_correr_etapa, etapa, entradas, destinos, log)] = (nombre, inicio)
+                if avanzo:
+                    continue
+                if not en_curso:
+                    raise RuntimeError("Pipeline sin etapas listas ni en curso")  # no debería ocurrir
+                terminados, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                for futuro in terminados:
+                    nombre, inicio = en_curso.pop(futuro)
+                    try:
+                        futuro.result()
+                    except Exception as e:
+                        raise EtapaFallida(nombre, e) from e
+                    registrar(nombre, inicio)
+                    orden.done(nombre)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+        return resultados
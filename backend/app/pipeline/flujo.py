@@ -0,0 +1,175 @@
+# app/pipeline/flujo.py
+"""
+El flujo de analítica del notebook como DAG:
+
+    generate ─► dataset ─┬─► integrity ──┐
+                         ├─► metrics ────┼─► report
+                         └─► exploratory ┘
+
+`generate` solo existe si hay que crear el dataset; si no, el CSV es una
+fuente externa. integrity, metrics y exploratory son independientes y
+corren a la vez; cada una recorre el CSV por bloques con
+`analytics_pipeline.ejecutar` (la misma lectura que la pasada única), así
+ninguna necesita el archivo entero en memoria ni hay un DataFrame
+intermedio que serializar entre procesos. Las funciones importan pandas y
+los scripts recién al ejecutarse, en el proceso que les toque.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from app.pipeline.dag import Etapa, Pipeline, Salida
+
+# Filas por bloque al alimentar los acumuladores de los scripts
+BLOQUE = 100_000
+ETAPAS = ("generate", "integrity", "metrics", "exploratory", "report")
+
+
+def default_dataset_path() -> Path:
+    # Este archivo está en backend/app/pipeline/...  => subir dos niveles para llegar a backend/
+    return Path(__file__).resolve().parents[2] / "datasets" / "product_dataset.csv"
+
+
+def default_reports_dir() -> Path:
+    return Path(__file__).resolve().parents[2] / "reports"
+
+
+def _recorrer(dataset: Path, reporte: str, **opciones) -> dict:
+    """Resultado del consumidor `reporte` de analytics_pipeline tras leer `dataset` por bloques."""
+    from app.scripts.analytics_pipeline import crear_consumidores, ejecutar
+
+    consumidores = crear_consumidores(dataset, [reporte], **opciones)
+    return ejecutar(dataset, consumidores, chunksize=BLOQUE)[reporte]
+
+
+def generar(num_samples: int, seed: int | None) -> dict[str, Any]:
+    from app.scripts.create_product_dataset import generate_dataset
+
+    print(f"Generando {num_samples} filas (seed={seed})")
+    return {"dataset": generate_dataset(num_samples, seed)}
+
+
+def integridad(dataset: Path, duplicados: str, particiones: int) -> dict[str, Any]:
+    return {"integrity": _recorrer(dataset, "integrity", duplicados=duplicados, particiones=particiones)}
+
+
+def metricas(dataset: Path) -> dict[str, Any]:
+    from app.scripts.calculate_product_metrics import print_metrics
+
+    resultado = _recorrer(dataset, "metrics")
+    print_metrics(resultado)
+    return {"metrics": resultado}
+
+
+def exploratorio(dataset: Path, epsilon: float, bins: int) -> dict[str, Any]:
+    from app.scripts.exploratory_analysis import print_summary
+
+    resultado = _recorrer(dataset, "exploratory", epsilon=epsilon, bins=bins)
+    print_summary(resultado)
+    return {"exploratory": resultado}
+
+
+def _num(valor: float | None) -> str:
+    return "N/A" if valor is None else f"{valor:,.2f}"
+
+
+def reporte(integrity: dict, metrics: dict, exploratory: dict) -> dict[str, Any]:
+    lineas = [
+        "# Product dataset report / Reporte del dataset de productos",
+        "",
+        f"- Rows / Filas: {metrics['rows']}",
+        f"- Integrity issues / Problemas de integridad: {integrity['total_issues']}",
+        f"- Average BaseYield / Rendimiento promedio: {_num(metrics['average_base_yield'])}",
+        f"- Total Cost / Costo acumulado: {_num(metrics['total_cost'])}",
+        f"- Average Environmental Impact / Impacto ambiental promedio: {_num(metrics['average_environmental_impact'])}",
+        "",
+        "## Integrity / Integridad",
+        "",
+        *(f"- {clave}: {valor}" for clave, valor in integrity["issues"].items()),
+        "",
+        "## By category / Por categoría",
+        "",
+        "| Category | Count | AvgYield | TotalCost | AvgEnvImpact |",
+        "|---|---:|---:|---:|---:|",
+        *(
+            f"| {cat} | {v['count']} | {_num(v['AvgYield'])} | {_num(v['TotalCost'])} | {_num(v['AvgEnvImpact'])} |"
+            for cat, v in metrics["by_category"].items()
+        ),
+        "",
+        "## Distributions / Distribuciones",
+        "",
+        "| Column | Mean | Std | p5 | p50 | p95 |",
+        "|---|---:|---:|---:|---:|---:|",
+        *(
+            f"| {col} | {_num(st['mean'])} | {_num(st['std'])} | {_num(st['percentiles'].get('p5'))} "
+            f"| {_num(st['percentiles'].get('p50'))} | {_num(st['percentiles'].get('p95'))} |"
+            for col, st in exploratory["stats"].items()
+        ),
+        "",
+    ]
+    return {"report": "\n".join(lineas)}
+
+
+def construir_flujo(
+    csv_path: Path | None = None,
+    reports_dir: Path | None = None,
+    cache_dir: Path | None = None,
+    generar_filas: int | None = None,
+    seed: int | None = 42,
+    duplicados: str = "exact",
+    particiones: int = 64,
+    epsilon: float = 0.005,
+    bins: int = 10,
+) -> Pipeline:
+    """
+    Arma el DAG del notebook. El dataset se genera si `generar_filas` está
+    definido o si el CSV no existe (200 filas, como hacía el notebook).
+    """
+    csv_path = csv_path or default_dataset_path()
+    reports_dir = reports_dir or default_reports_dir()
+    if duplicados not in ("exact", "bloom", "off"):
+        raise ValueError(f"Modo de duplicados no disponible en el pipeline: {duplicados}")
+
+    etapas: list[Etapa] = []
+    fuentes: dict[str, Path] = {}
+    if generar_filas is not None or not csv_path.exists():
+        etapas.append(Etapa(
+            "generate", generar,
+            salidas=(Salida("dataset", "csv", csv_path),),
+            parametros={"num_samples": generar_filas or 200, "seed": seed},
+            modulos=("app.scripts.create_product_dataset",),
+        ))
+    else:
+        fuentes["dataset"] = csv_path
+
+    etapas += [
+        Etapa(
+            "integrity", integridad,
+            entradas={"dataset": "dataset"},
+            salidas=(Salida("integrity", "json", reports_dir / "integrity.json"),),
+            parametros={"duplicados": duplicados, "particiones": particiones},
+            modulos=("app.pipeline.flujo", "app.scripts.analytics_pipeline", "app.scripts.check_dataset_integrity", "app.scripts.duplicates"),
+        ),
+        Etapa(
+            "metrics", metricas,
+            entradas={"dataset": "dataset"},
+            salidas=(Salida("metrics", "json", reports_dir / "metrics.json"),),
+            modulos=("app.pipeline.flujo", "app.scripts.analytics_pipeline", "app.scripts.calculate_product_metrics", "app.scripts.streaming_stats"),
+        ),
+        Etapa(
+            "exploratory", exploratorio,
+            entradas={"dataset": "dataset"},
+            salidas=(Salida("exploratory", "json", reports_dir / "exploratory_summary.json"),),
+            parametros={"epsilon": epsilon, "bins": bins},
+            modulos=("app.pipeline.flujo", "app.scripts.analytics_pipeline", "app.scripts.exploratory_analysis", "app.scripts.streaming_stats"),
+        ),
+        Etapa(
+            "report", reporte,
+            entradas={"integrity": "integrity", "metrics": "metrics", "exploratory": "exploratory"},
+            salidas=(Salida("report", "text", reports_dir / "summary.md"),),
+            modulos=("app.pipeline.flujo",),
+        ),
+    ]
+    return Pipeline(etapas, fuentes=fuentes, cache_dir=cache_dir)
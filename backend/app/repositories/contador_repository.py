@@ -0,0 +1,71 @@
+# app/repositories/contador_repository.py
+
+from collections import Counter
+
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.db.models.contador import EPOCA, ContadorORM
+from app.db.unit_of_work import unidad_activa
+
+# Versión del conjunto de productos con stock < stock_minimo
+STOCK_BAJO = "productos_stock_bajo"
+# Versión de la tabla de productos completa (cualquier alta, baja o cambio)
+PRODUCTOS = "productos"
+
+# Dialectos con INSERT ... ON CONFLICT DO UPDATE
+_INSERT_DIALECTO = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class ContadorRepository:
+    """Contadores de cambios persistidos en la base.
+
+    `incrementar` no hace commit: el incremento viaja en la misma transacción
+    que el cambio que lo provoca, así ningún lector ve una versión adelantada
+    o atrasada respecto de los datos. Dentro de una unidad de trabajo los
+    incrementos se acumulan y se aplican con un upsert por contador antes del commit.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def obtener(self, nombre: str) -> int:
+        valor = self.db.query(ContadorORM.valor).filter(ContadorORM.nombre == nombre).scalar()
+        return valor or 0
+
+    def epoca(self) -> int:
+        """Identidad de esta base (0 si la tabla es anterior a la migración que la siembra)."""
+        valor = self.db.query(ContadorORM.valor).filter(ContadorORM.nombre == EPOCA).scalar()
+        return valor or 0
+
+    def incrementar(self, nombre: str, n: int = 1) -> None:
+        uow = unidad_activa(self.db)
+        if uow is None:
+            self._sumar(nombre, n)
+            return
+        if not uow.contadores:
+            uow.antes_de_commit(lambda: self._sumar_todos(uow.contadores))
+        uow.contadores[nombre] += n
+
+    def _sumar_todos(self, incrementos: Counter) -> None:
+        for nombre, n in incrementos.items():
+            self._sumar(nombre, n)
+
+    def _sumar(self, nombre: str, n: int) -> None:
+        dialecto = self.db.get_bind().dialect.name
+        if dialecto in _INSERT_DIALECTO:
+            # Un solo upsert atómico: dos primeros escritores concurrentes no chocan con el índice único
+            insert = _INSERT_DIALECTO[dialecto]
+            self.db.execute(
+                insert(ContadorORM)
+                .values(nombre=nombre, valor=n)
+                .on_conflict_do_update(index_elements=[ContadorORM.nombre], set_={"valor": ContadorORM.valor + n})
+            )
+            return
+        result = self.db.execute(
+            update(ContadorORM)
+            .where(ContadorORM.nombre == nombre)
+            .values(valor=ContadorORM.valor + n)
+        )
+        if result.rowcount == 0:
+            self.db.add(ContadorORM(nombre=nombre, valor=n))
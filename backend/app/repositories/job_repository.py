@@ -0,0 +1,109 @@
+# app/repositories/job_repository.py
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+from app.db.models.job import JobORM
+from app.domain.mappers.job_mapper import job_domain_to_orm, job_orm_to_domain
+from app.domain.models.job import CANCELADO, ESTADOS_ACTIVOS, EN_CURSO, FALLIDO, Job
+
+
+def _ahora() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_job(self, tipo: str, parametros: dict, creado_por: str | None = None, propietario: str | None = None) -> Job:
+        orm_obj = job_domain_to_orm(Job(id=None, tipo=tipo, parametros=parametros, creado_por=creado_por))
+        orm_obj.propietario = propietario
+        orm_obj.latido = _ahora()
+        self.db.add(orm_obj)
+        self.db.commit()
+        self.db.refresh(orm_obj)
+        return job_orm_to_domain(orm_obj)
+
+    def get_job(self, id_: int) -> Job | None:
+        job = self.db.query(JobORM).filter_by(id=id_).first()
+        return job_orm_to_domain(job) if job else None
+
+    def get_jobs(self, limit: int = 50) -> list[Job]:
+        jobs = self.db.query(JobORM).order_by(JobORM.id.desc()).limit(limit).all()
+        return [job_orm_to_domain(j) for j in jobs]
+
+    def contar_activos(self) -> int:
+        return self.db.query(JobORM).filter(JobORM.estado.in_(ESTADOS_ACTIVOS)).count()
+
+    def _huerfanos(self, vencimiento: timedelta):
+        """Jobs activos cuyo gestor dejó de dar señales (reinicio o caída del proceso)."""
+        limite = _ahora() - vencimiento
+        return self.db.query(JobORM).filter(
+            JobORM.estado.in_(ESTADOS_ACTIVOS), (JobORM.latido.is_(None)) | (JobORM.latido < limite)
+        )
+
+    def cerrar_huerfanos(self, vencimiento: timedelta) -> int:
+        """Marca como fallidos los jobs activos sin latido en `vencimiento`; devuelve cuántos."""
+        cerrados = self._huerfanos(vencimiento).update(
+            {
+                JobORM.estado: FALLIDO,
+                JobORM.finalizado: _ahora(),
+                JobORM.error: "El proceso que corría el job terminó antes de cerrarlo",
+            },
+            synchronize_session=False,
+        )
+        self.db.commit()
+        return cerrados
+
+    def cancelar_huerfano(self, id_: int, vencimiento: timedelta) -> bool:
+        """Cierra como cancelado un job activo que ningún gestor vivo corre."""
+        cerrados = self._huerfanos(vencimiento).filter(JobORM.id == id_).update(
+            {JobORM.estado: CANCELADO, JobORM.finalizado: _ahora(), JobORM.mensaje: "Cancelado (sin proceso dueño)"},
+            synchronize_session=False,
+        )
+        self.db.commit()
+        return bool(cerrados)
+
+    def latir(self, ids, propietario: str) -> None:
+        """Renueva el latido de los jobs activos de `propietario`."""
+        self.db.query(JobORM).filter(
+            JobORM.id.in_(list(ids)), JobORM.propietario == propietario, JobORM.estado.in_(ESTADOS_ACTIVOS)
+        ).update({JobORM.latido: _ahora()}, synchronize_session=False)
+        self.db.commit()
+
+    def ids_con_cancelacion(self, ids) -> set[int]:
+        """De los `ids` dados, los que tienen una cancelación pedida (desde cualquier proceso)."""
+        filas = self.db.query(JobORM.id).filter(JobORM.id.in_(list(ids)), JobORM.cancelacion_solicitada.is_(True))
+        return {id_ for (id_,) in filas}
+
+    def solicitar_cancelacion(self, id_: int) -> Job | None:
+        job = self.db.query(JobORM).filter_by(id=id_).first()
+        if not job:
+            return None
+        if job.estado in ESTADOS_ACTIVOS:
+            job.cancelacion_solicitada = True
+            self.db.commit()
+        return job_orm_to_domain(job)
+
+    def marcar_en_curso(self, id_: int, progreso: float, mensaje: str | None) -> None:
+        job = self.db.query(JobORM).filter_by(id=id_).first()
+        if not job or job.estado not in ESTADOS_ACTIVOS:
+            return
+        if job.estado != EN_CURSO:
+            job.estado = EN_CURSO
+            job.iniciado = _ahora()
+        job.progreso = progreso
+        job.mensaje = mensaje
+        self.db.commit()
+
+    def finalizar(self, id_: int, estado: str, **campos) -> None:
+        """Cierra el job con `estado` y los campos dados (resultado, resultado_path, error, ...)."""
+        job = self.db.query(JobORM).filter_by(id=id_).first()
+        if not job:
+            return
+        job.estado = estado
+        job.finalizado = _ahora()
+        for nombre, valor in campos.items():
+            setattr(job, nombre, valor)
+        self.db.commit()
@@ -0,0 +1,91 @@
+# app/repositories/movimiento_repository.py
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.db.models.movimiento import MovimientoStockORM
+from app.db.models.producto import ProductoORM
+from app.domain.models.movimiento import MovimientoStock, ResultadoMovimiento
+from app.domain.mappers.movimiento_mapper import movimiento_domain_to_orm, movimiento_orm_to_domain
+from app.repositories.contador_repository import ContadorRepository, PRODUCTOS, STOCK_BAJO
+from app.repositories.producto_repository import invalidar_cache_producto
+from app.schemas.movimiento import MovimientoLoteItem
+
+PRODUCTO_NO_ENCONTRADO = "Producto no encontrado."
+STOCK_INSUFICIENTE = "Stock insuficiente para el movimiento."
+
+
+class MovimientoRepository:
+    def __init__(self, db: Session):
+        self.db = db
+        self.contadores = ContadorRepository(db)
+
+    def aplicar_movimientos(
+        self, movimientos: list[MovimientoLoteItem], todo_o_nada: bool = False
+    ) -> list[ResultadoMovimiento]:
+        """
+        Aplica los deltas de stock en una sola transacción.
+
+        Cada delta es un `UPDATE ... SET stock = stock + :delta` condicionado a que
+        el stock no quede negativo, así dos egresos concurrentes no pueden pisarse.
+        Los movimientos rechazados no modifican nada; con `todo_o_nada=True` un
+        rechazo deshace el lote completo y lanza ValueError.
+        """
+        resultados: list[ResultadoMovimiento] = []
+        registrados: list[tuple[ResultadoMovimiento, MovimientoStockORM]] = []
+        modificados: dict[int, str] = {}
+        afecta_stock_bajo = False
+
+        for mov in movimientos:
+            fila = self.db.execute(
+                update(ProductoORM)
+                .where(ProductoORM.id == mov.producto_id, ProductoORM.stock + mov.cantidad >= 0)
+                .values(stock=ProductoORM.stock + mov.cantidad, version=ProductoORM.version + 1)
+                .returning(ProductoORM.stock, ProductoORM.stock_minimo, ProductoORM.sku),
+                execution_options={"synchronize_session": False},
+            ).first()
+
+            if fila is None:
+                existe = self.db.query(ProductoORM.id).filter(ProductoORM.id == mov.producto_id).first()
+                error = STOCK_INSUFICIENTE if existe else PRODUCTO_NO_ENCONTRADO
+                if todo_o_nada:
+                    self.db.rollback()
+                    raise ValueError(f"Producto {mov.producto_id}: {error}")
+                resultados.append(ResultadoMovimiento(error=error))
+                continue
+
+            stock, stock_minimo, sku = fila
+            modificados[mov.producto_id] = sku
+            if stock - mov.cantidad < stock_minimo or stock < stock_minimo:
+                afecta_stock_bajo = True
+
+            orm = movimiento_domain_to_orm(MovimientoStock(
+                id=None, producto_id=mov.producto_id, cantidad=mov.cantidad,
+                stock_resultante=stock, motivo=mov.motivo,
+            ))
+            self.db.add(orm)
+            resultado = ResultadoMovimiento()
+            registrados.append((resultado, orm))
+            resultados.append(resultado)
+
+        if afecta_stock_bajo:
+            self.contadores.incrementar(STOCK_BAJO)
+        if modificados:
+            self.contadores.incrementar(PRODUCTOS)
+        self.db.flush()
+        # Mapear antes del commit evita un refresh por fila al expirar los objetos
+        for resultado, orm in registrados:
+            resultado.movimiento = movimiento_orm_to_domain(orm)
+        self.db.commit()
+        for producto_id, sku in modificados.items():
+            invalidar_cache_producto(producto_id, sku)
+        return resultados
+
+    def get_movimientos_by_producto(self, producto_id: int, limit: int = 100) -> list[MovimientoStock]:
+        movimientos = (
+            self.db.query(MovimientoStockORM)
+            .filter(MovimientoStockORM.producto_id == producto_id)
+            .order_by(MovimientoStockORM.id.desc())
+            .limit(limit)
+            .all()
+        )
+        return [movimiento_orm_to_domain(m) for m in movimientos]
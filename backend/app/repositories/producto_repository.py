@@ -1,70 +1,275 @@
 # app/repositories/producto_repository.py
 
+import re
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Iterator
+
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from app.core.cache import MISSING, get_producto_cache
+from app.db.unit_of_work import UnidadDeTrabajo, agregar, confirmar, unidad_activa
 from app.db.models.producto import ProductoORM
 from app.domain.models.producto import Producto
 from app.schemas.producto import ProductoCreate, ProductoUpdate
 from app.domain.mappers.producto_mapper import producto_domain_to_orm, producto_orm_to_domain
-from app.utils.validations import check_unicidad_producto
+from app.repositories.contador_repository import ContadorRepository, PRODUCTOS, STOCK_BAJO
+from app.utils.validations import error_de_unicidad_producto
+
+
+def _stock_bajo(producto) -> bool:
+    return producto.stock < producto.stock_minimo
+
+
+def _consulta_fts5(q: str) -> str | None:
+    """Convierte texto libre en una consulta FTS5 segura: cada palabra entre comillas y como prefijo."""
+    tokens = re.findall(r"\w+", q)
+    return " ".join(f'"{t}"*' for t in tokens) or None
+
+
+_BUSQUEDA_SQLITE = text(
+    "SELECT productos.* FROM productos_fts "
+    "JOIN productos ON productos.id = productos_fts.rowid "
+    "WHERE productos_fts MATCH :q "
+    "ORDER BY bm25(productos_fts, 10.0, 1.0), productos.id "  # id desempata: páginas estables con LIMIT/OFFSET
+    "LIMIT :limit OFFSET :offset"
+)
+
+# Columnas válidas para recorrer el catálogo con keyset (ambas únicas e indexadas)
+_COLUMNAS_ORDEN = {"id": ProductoORM.id, "sku": ProductoORM.sku}
+
+
+def invalidar_cache_producto(id_: int, *skus: str) -> None:
+    """Quita de la caché de lecturas las entradas del producto (por id y por cada SKU dado)."""
+    get_producto_cache().delete(("id", id_), *(("sku", sku) for sku in skus))
+
 
 class ProductoRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.contadores = ContadorRepository(db)
+
+    @contextmanager
+    def _unicidad(self):
+        """Convierte la violación de nombre/SKU únicos en el ValueError de dominio."""
+        try:
+            yield
+        except IntegrityError as exc:
+            error = error_de_unicidad_producto(exc)
+            # Dentro de una unidad de trabajo el rollback lo hace la unidad al propagarse el error
+            if unidad_activa(self.db) is None:
+                self.db.rollback()
+            if error is None:
+                raise
+            raise error from exc
+
+    def _leer_con_cache(self, key: tuple, query, version: int | None = None) -> Producto | None:
+        # Se guardan y devuelven copias: el dominio es mutable y no debe filtrarse entre requests
+        cache = get_producto_cache()
+        cached = cache.get(key)
+        # Con `version` la entrada solo sirve si coincide con la de la base: la caché es
+        # por proceso y otro proceso pudo cambiar el producto antes de que venza el TTL
+        if cached is not MISSING and (version is None or cached.version == version):
+            return replace(cached)
+        producto = query.first()
+        if not producto:
+            return None
+        dominio = producto_orm_to_domain(producto)
+        cache.set(("id", dominio.id), replace(dominio))
+        cache.set(("sku", dominio.sku), replace(dominio))
+        return dominio
             
     # producto_repository.py
     def create_producto(self, producto_in: ProductoCreate) -> Producto:
-        check_unicidad_producto(self.db, producto_in.nombre, producto_in.sku)        
-        
+        """
+        Crea el producto; nombre o SKU repetidos lanzan ValueError (lo detecta el
+        índice único, sin consultas previas). Dentro de una unidad de trabajo el
+        INSERT se agrupa con los demás, el producto devuelto aún no tiene id y un
+        duplicado puede aparecer recién en el flush del lote o en el commit final.
+        """
         domain_model = Producto(id=None, nombre=producto_in.nombre, sku=producto_in.sku, descripcion=producto_in.descripcion,
                                 stock=producto_in.stock or 0,
                                 stock_minimo=producto_in.stock_minimo or 0 )
         
         orm_obj = producto_domain_to_orm(domain_model)
-        self.db.add(orm_obj)
-        self.db.commit()
-        self.db.refresh(orm_obj)
-        return producto_orm_to_domain(orm_obj)
+        if _stock_bajo(domain_model):
+            self.contadores.incrementar(STOCK_BAJO)
+        self.contadores.incrementar(PRODUCTOS)
+        with self._unicidad():
+            agregar(self.db, orm_obj)  # dentro de una unidad puede disparar el flush del lote
+            if unidad_activa(self.db) is None:
+                # El flush asigna el id y el ORM fija la versión: no hace falta refresh tras el commit
+                self.db.flush()
+                domain_model = producto_orm_to_domain(orm_obj)
+        creado = domain_model
+        confirmar(self.db, lambda: invalidar_cache_producto(creado.id, creado.sku))
+        return creado
 
     def get_all_productos(self) -> list[Producto]:
         productos = self.db.query(ProductoORM).all()
         return [producto_orm_to_domain(p) for p in productos]
 
-    def get_producto_by_id(self, id_: int) -> Producto | None:
-        producto = self.db.query(ProductoORM).filter_by(id=id_).first()
-        return producto_orm_to_domain(producto) if producto else None
+    def get_productos_page(
+        self,
+        after: int | str | None = None,
+        limit: int = 50,
+        orden: str = "id",
+        desde: int | str | None = None,
+        hasta: int | str | None = None,
+    ) -> list[Producto]:
+        """
+        Página de productos ordenada por `orden` ("id" o "sku") con keyset: `after`
+        es el último valor de la página anterior, así cada página cuesta lo mismo
+        sin importar cuán adentro del catálogo esté. `desde`/`hasta` acotan el
+        rango (inclusive).
+        """
+        columna = _COLUMNAS_ORDEN[orden]
+        query = self.db.query(ProductoORM)
+        if after is not None:
+            query = query.filter(columna > after)
+        if desde is not None:
+            query = query.filter(columna >= desde)
+        if hasta is not None:
+            query = query.filter(columna <= hasta)
+        productos = query.order_by(columna).limit(limit).all()
+        return [producto_orm_to_domain(p) for p in productos]
+
+    def iterar_productos(
+        self,
+        tam_pagina: int = 100,
+        orden: str = "id",
+        desde: int | str | None = None,
+        hasta: int | str | None = None,
+    ) -> Iterator[list[Producto]]:
+        """Recorre el catálogo de a páginas, pidiendo cada una a la base recién cuando se consume."""
+        after = None
+        while True:
+            pagina = self.get_productos_page(after, tam_pagina, orden, desde, hasta)
+            if not pagina:
+                return
+            yield pagina
+            if len(pagina) < tam_pagina:
+                return
+            after = getattr(pagina[-1], orden)
+
+    def get_producto_by_id(self, id_: int, version: int | None = None) -> Producto | None:
+        """Producto por id; con `version` una entrada cacheada de otra versión se recarga."""
+        return self._leer_con_cache(("id", id_), self.db.query(ProductoORM).filter_by(id=id_), version)
+
+    def get_producto_by_sku(self, sku: str) -> Producto | None:
+        return self._leer_con_cache(("sku", sku), self.db.query(ProductoORM).filter_by(sku=sku))
+
+    def get_producto_version(self, id_: int) -> int | None:
+        """Versión del producto sin cargar la entidad; None si no existe."""
+        return self.db.execute(select(ProductoORM.version).where(ProductoORM.id == id_)).scalar()
+
+    def get_productos_version(self) -> int:
+        """Versión de la tabla de productos; cambia con cada alta, baja o modificación."""
+        return self.contadores.obtener(PRODUCTOS)
+
+    def get_epoca(self) -> int:
+        """Identidad de la base; va en los ETags para que una base recreada no repita uno viejo."""
+        return self.contadores.epoca()
 
     def update_producto(self, id_: int, producto_upd: ProductoUpdate) -> Producto | None:
         producto = self.db.query(ProductoORM).filter_by(id=id_).first()
         if not producto:
             return None
+        estaba_bajo = _stock_bajo(producto)
+        sku_anterior = producto.sku
 
-        if producto_upd.nombre and producto_upd.nombre != producto.nombre:
-            check_unicidad_producto(self.db, producto_upd.nombre, None)
+        if producto_upd.nombre:
             producto.nombre = producto_upd.nombre
-        if producto_upd.sku and producto_upd.sku != producto.sku:
-            check_unicidad_producto(self.db, None, producto_upd.sku)
+        if producto_upd.sku:
             producto.sku = producto_upd.sku
         if producto_upd.descripcion is not None:
             producto.descripcion = producto_upd.descripcion
         if producto_upd.stock is not None:
             producto.stock = producto_upd.stock
 
-        self.db.commit()
-        self.db.refresh(producto)
-        return producto_orm_to_domain(producto)
+        if not self.db.is_modified(producto):
+            # Nada cambió: ni versión nueva ni ETags invalidados
+            return producto_orm_to_domain(producto)
+        # En SQL y no `version + 1` en Python: un movimiento de stock pudo subirla desde que se leyó
+        producto.version = ProductoORM.version + 1
+        with self._unicidad():
+            self.db.flush()  # se mapea antes del commit; solo se relee la versión
+        if estaba_bajo or _stock_bajo(producto):
+            self.contadores.incrementar(STOCK_BAJO)
+        self.contadores.incrementar(PRODUCTOS)
+        actualizado = producto_orm_to_domain(producto)
+        confirmar(self.db, lambda: invalidar_cache_producto(id_, sku_anterior, actualizado.sku))
+        return actualizado
 
     def delete_producto(self, id_: int) -> bool:
         producto = self.db.query(ProductoORM).filter_by(id=id_).first()
         if not producto:
             return False
+        if _stock_bajo(producto):
+            self.contadores.incrementar(STOCK_BAJO)
+        self.contadores.incrementar(PRODUCTOS)
+        sku = producto.sku
         self.db.delete(producto)
-        self.db.commit()
+        confirmar(self.db, lambda: invalidar_cache_producto(id_, sku))
         return True
 
     def get_low_stock_products(self) -> list[Producto]:
         productos = self.db.query(ProductoORM).filter(ProductoORM.stock < ProductoORM.stock_minimo).all()
         return [producto_orm_to_domain(p) for p in productos]
 
+    def get_low_stock_page(self, after_id: int | None = None, limit: int = 50) -> list[Producto]:
+        """Página de productos con stock bajo ordenada por id (keyset sobre ix_productos_stock_bajo)."""
+        query = self.db.query(ProductoORM).filter(ProductoORM.stock < ProductoORM.stock_minimo)
+        if after_id is not None:
+            query = query.filter(ProductoORM.id > after_id)
+        productos = query.order_by(ProductoORM.id).limit(limit).all()
+        return [producto_orm_to_domain(p) for p in productos]
+
+    def get_low_stock_version(self) -> int:
+        """Versión del conjunto de stock bajo; cambia con cada alta, baja o cambio que lo afecte."""
+        return self.contadores.obtener(STOCK_BAJO)
+
+    def search_productos(self, q: str, limit: int = 20, offset: int = 0) -> list[Producto]:
+        """
+        Búsqueda de texto completo en nombre y descripción, ordenada por relevancia.
+        Coincidencias en el nombre pesan más que en la descripción.
+        """
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            consulta = _consulta_fts5(q)
+            if consulta is None:
+                return []
+            productos = self.db.execute(
+                select(ProductoORM).from_statement(_BUSQUEDA_SQLITE),
+                {"q": consulta, "limit": limit, "offset": offset},
+            ).scalars().all()
+        elif dialect == "postgresql":
+            # Misma expresión que el índice GIN ix_productos_busqueda
+            vector = func.to_tsvector(
+                "spanish", ProductoORM.nombre + " " + func.coalesce(ProductoORM.descripcion, "")
+            )
+            consulta = func.websearch_to_tsquery("spanish", q)
+            productos = (
+                self.db.query(ProductoORM)
+                .filter(vector.op("@@")(consulta))
+                .order_by(func.ts_rank(vector, consulta).desc(), ProductoORM.id)
+                .limit(limit)
+                .offset(offset)
+                .all()
+            )
+        else:
+            patron = f"%{q}%"
+            productos = (
+                self.db.query(ProductoORM)
+                .filter(ProductoORM.nombre.ilike(patron) | ProductoORM.descripcion.ilike(patron))
+                .order_by(ProductoORM.id)
+                .limit(limit)
+                .offset(offset)
+                .all()
+            )
+        return [producto_orm_to_domain(p) for p in productos]
+
     def seed_productos(self):
         if self.db.query(ProductoORM).count() > 0:
             print("La base de datos ya contiene productos. Seed cancelado.")
@@ -83,7 +288,9 @@ class ProductoRepository:
             ProductoCreate(nombre="Bebida Fermentada de Kombucha", sku="BIO010", descripcion="Té fermentado con probióticos naturales, sabor a frutas"),
         ]
 
-        for p in productos_demo:
-            self.create_producto(p)
+        # Un solo commit para todo el lote en lugar de uno por producto
+        with UnidadDeTrabajo(self.db):
+            for p in productos_demo:
+                self.create_producto(p)
 
         print("Productos de prueba insertados correctamente.")
@@ -1,15 +1,127 @@
 # app/routers/admin.py
 
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+from app.core.cache import get_producto_cache
+from app.core.profiling import default_profiles_dir
+from app.db.session import get_db
+from app.dependencies.profiling import RutaPerfilable
 from app.dependencies.security import usuario_actual_con_rol
+from app.repositories.job_repository import JobRepository
+from app.schemas.job import JobParametros, JobRead, TipoJob
+from app.services.jobs import LimiteDeJobsAlcanzado, gestor_jobs_para
 
-router = APIRouter(tags=["Administración"])
+router = APIRouter(tags=["Administración"], route_class=RutaPerfilable)
 
 @router.get("/zona-segura")
 def solo_admin(user = Depends(usuario_actual_con_rol("admin"))):
     return {"msg": f"Bienvenido, {user.username}. Zona exclusiva para administradores."}
 
 
+@router.get("/cache/productos", summary="Estadísticas de la caché de productos")
+def estadisticas_cache_productos(user = Depends(usuario_actual_con_rol("admin"))):
+    """Aciertos, fallos, desalojos e invalidaciones de la caché de lecturas de productos."""
+    return get_producto_cache().stats()
+
+
+@router.get(
+    "/perfiles/{nombre}",
+    response_class=PlainTextResponse,
+    summary="Descargar un perfil de request",
+    description="Devuelve un perfil generado con el header X-Profile, en formato folded (flamegraph).",
+)
+def descargar_perfil(nombre: str, user = Depends(usuario_actual_con_rol("admin"))):
+    path = default_profiles_dir() / nombre
+    if "/" in nombre or "\\" in nombre or not nombre.endswith(".folded") or not path.is_file():
+        raise HTTPException(status_code=404, detail="Perfil no encontrado")
+    return PlainTextResponse(path.read_text(encoding="utf-8"))
+
+
+
+@router.post(
+    "/jobs/{tipo}",
+    response_model=JobRead,
+    status_code=202,
+    summary="Encolar un job de analítica",
+    description=(
+        "Encola la generación del dataset (generate), el chequeo de integridad (integrity) o el cálculo "
+        "de métricas (metrics) en un pool de procesos. Devuelve el job de inmediato; su avance se "
+        "consulta en GET /admin/jobs/{job_id}. Requiere rol admin."
+    ),
+    responses={
+        202: {"description": "Job encolado"},
+        400: {"description": "Parámetros inválidos o dataset inexistente"},
+        401: {"description": "No autenticado"},
+        403: {"description": "Acceso denegado"},
+        429: {"description": "Límite de jobs concurrentes alcanzado"},
+    },
+)
+def encolar_job(
+    tipo: TipoJob,
+    parametros: Optional[JobParametros] = Body(default=None),
+    db: Session = Depends(get_db),
+    user = Depends(usuario_actual_con_rol("admin")),
+):
+    """
+    Encola un job.
+
+    - **generate**: `num_samples`, `seed` opcional. Escribe `product_dataset.csv` en la carpeta del job.
+    - **metrics** / **integrity**: `path` opcional (relativo a backend/datasets o a la carpeta de jobs).
+    """
+    gestor = gestor_jobs_para(db.get_bind())
+    try:
+        return gestor.encolar(tipo.value, (parametros or JobParametros()).model_dump(), user.username)
+    except LimiteDeJobsAlcanzado as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/jobs", response_model=List[JobRead], summary="Listar jobs recientes")
+def listar_jobs(
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    user = Depends(usuario_actual_con_rol("admin")),
+):
+    """Jobs más recientes primero."""
+    return JobRepository(db).get_jobs(limit)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobRead,
+    summary="Estado de un job",
+    description="Estado, progreso (0 a 1), resumen del resultado y ruta del archivo generado. Requiere rol admin.",
+    responses={404: {"description": "Job no encontrado"}},
+)
+def obtener_job(job_id: int, db: Session = Depends(get_db), user = Depends(usuario_actual_con_rol("admin"))):
+    gestor = gestor_jobs_para(db.get_bind())
+    gestor.sincronizar()  # vuelca el avance más reciente de los jobs de este proceso
+    job = JobRepository(db).get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job no encontrado")
+    return job
+
+
+@router.post(
+    "/jobs/{job_id}/cancel",
+    response_model=JobRead,
+    summary="Cancelar un job",
+    description=(
+        "Un job pendiente se cancela de inmediato; uno en curso se detiene en su próximo punto de "
+        "control. Cancelar un job terminado no tiene efecto. Requiere rol admin."
+    ),
+    responses={404: {"description": "Job no encontrado"}},
+)
+def cancelar_job(job_id: int, db: Session = Depends(get_db), user = Depends(usuario_actual_con_rol("admin"))):
+    job = gestor_jobs_para(db.get_bind()).cancelar(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job no encontrado")
+    return job
+
 # from fastapi import APIRouter, Depends, HTTPException, status
 # from sqlalchemy.orm import Session
 # from app.db.session import get_db
@@ -4,10 +4,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app.db.session import get_db
+from app.dependencies.profiling import RutaPerfilable
 from app.security.auth import authenticate_user, create_access_token
 from app.schemas.token import Token
 
-router = APIRouter()
+router = APIRouter(route_class=RutaPerfilable)
 
 @router.post(
     "/login",
@@ -0,0 +1,18 @@
+# app/routers/metricas.py
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import render_prometheus
+from app.dependencies.profiling import RutaPerfilable
+
+router = APIRouter(route_class=RutaPerfilable)
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Métricas en formato Prometheus",
+    description="Latencia, tamaño de respuesta, requests en curso y consultas SQL por ruta.",
+    include_in_schema=False,
+)
+def metricas():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
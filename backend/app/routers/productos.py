@@ -1,13 +1,22 @@
 #file: backend/app/routers/productos.py
-from fastapi import APIRouter, Depends, HTTPException
-from app.schemas.producto import ProductoCreate, ProductoRead
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from pydantic import TypeAdapter
+from app.core.cache import MISSING
+from app.core.http_cache import etag_coincide, no_modificado, respuestas_cache
+from app.schemas.producto import ProductoCreate, ProductoRead, ProductoPagina
 from app.db.session import get_db
 from sqlalchemy.orm import Session
 from app.repositories.producto_repository import ProductoRepository
+from app.repositories.movimiento_repository import MovimientoRepository, PRODUCTO_NO_ENCONTRADO
+from app.schemas.movimiento import MovimientoCreate, MovimientoLoteItem, MovimientoRead
+from app.services.movimientos_coalescer import coalescedor_para
+from app.dependencies.profiling import RutaPerfilable
 from app.dependencies.security import get_current_user  # Asegúrate de tener esta función
-from typing import List
+from typing import List, Optional
 
-router = APIRouter()
+router = APIRouter(route_class=RutaPerfilable)
+
+_lista_productos = TypeAdapter(List[ProductoRead])
 
 @router.post(
     "/",
@@ -36,7 +45,80 @@ def crear_producto_endpoint(
     - **stock_minimo**: Stock mínimo permitido.
     """
     repo = ProductoRepository(db)
-    return repo.create_producto(producto)
+    try:
+        return repo.create_producto(producto)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get(
+    "/low-stock",
+    response_model=ProductoPagina,
+    summary="Productos con stock bajo",
+    description="Lista paginada (cursor por ID) de productos con stock menor al mínimo. Soporta If-None-Match. Requiere autenticación.",
+    responses={
+        200: {"description": "Página de productos con stock bajo"},
+        304: {"description": "Sin cambios desde el ETag enviado"},
+        401: {"description": "No autenticado"},
+    },
+    tags=["Productos"],
+)
+def obtener_productos_stock_bajo(
+    response: Response,
+    cursor: Optional[int] = Query(default=None, description="ID del último producto de la página anterior"),
+    limit: int = Query(default=50, ge=1, le=500),
+    if_none_match: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),  # Protege el endpoint
+):
+    """
+    Recupera productos con stock bajo usando paginación por cursor.
+
+    - **cursor**: `next_cursor` devuelto por la página anterior.
+    - **limit**: Cantidad máxima de productos por página.
+
+    El ETag depende solo de la base y de la versión del conjunto de stock bajo, así un
+    sondeo sin cambios responde 304 sin cargar productos.
+    """
+    repo = ProductoRepository(db)
+    etag = f'"stock-bajo-{repo.get_epoca()}-{repo.get_low_stock_version()}"'
+    if etag_coincide(if_none_match, etag):
+        return no_modificado(etag)
+
+    productos = repo.get_low_stock_page(after_id=cursor, limit=limit)
+    response.headers["ETag"] = etag
+    next_cursor = productos[-1].id if len(productos) == limit else None
+    return {"items": productos, "next_cursor": next_cursor}
+
+@router.get(
+    "/search",
+    response_model=ProductoPagina,
+    summary="Buscar productos",
+    description="Búsqueda de texto completo en nombre y descripción, ordenada por relevancia. Requiere autenticación.",
+    responses={
+        200: {"description": "Página de resultados"},
+        401: {"description": "No autenticado"},
+    },
+    tags=["Productos"],
+)
+def buscar_productos(
+    q: str = Query(..., min_length=1, description="Texto a buscar"),
+    cursor: Optional[int] = Query(default=None, ge=0, description="Posición de inicio (next_cursor de la página anterior)"),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),  # Protege el endpoint
+):
+    """
+    Busca productos por nombre o descripción.
+
+    - **q**: Palabras a buscar; cada una se busca también como prefijo.
+    - **cursor**: `next_cursor` devuelto por la página anterior.
+    - **limit**: Cantidad máxima de resultados por página.
+    """
+    repo = ProductoRepository(db)
+    offset = cursor or 0
+    productos = repo.search_productos(q, limit=limit, offset=offset)
+    next_cursor = offset + limit if len(productos) == limit else None
+    return {"items": productos, "next_cursor": next_cursor}
 
 @router.get(
     "/{producto_id}",
@@ -45,6 +127,7 @@ def crear_producto_endpoint(
     description="Devuelve la información de un producto específico dado su ID. Requiere autenticación.",
     responses={
         200: {"description": "Producto encontrado"},
+        304: {"description": "Sin cambios desde el ETag enviado"},
         404: {"description": "Producto no encontrado"},
         401: {"description": "No autenticado"},
     },
@@ -52,6 +135,8 @@ def crear_producto_endpoint(
 )
 def obtener_producto(
     producto_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),  # Protege el endpoint
 ):
@@ -59,11 +144,22 @@ def obtener_producto(
     Recupera un producto por su ID.
 
     - **producto_id**: ID del producto a buscar.
+
+    Responde con un ETag basado en la versión del producto; si el cliente
+    envía ese ETag en If-None-Match recibe 304 sin que se cargue el producto.
+    La copia cacheada solo se sirve si su versión es la de la base.
     """
     repo = ProductoRepository(db)
-    producto = repo.get_producto_by_id(producto_id)
+    version = repo.get_producto_version(producto_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Producto no encontrado")
+    if etag_coincide(if_none_match, f'"producto-{producto_id}-{version}"'):
+        return no_modificado(f'"producto-{producto_id}-{version}"')
+
+    producto = repo.get_producto_by_id(producto_id, version=version)
     if not producto:
         raise HTTPException(status_code=404, detail="Producto no encontrado")
+    response.headers["ETag"] = f'"producto-{producto.id}-{producto.version}"'
     return producto
 
 @router.get(
@@ -73,17 +169,111 @@ def obtener_producto(
     description="Devuelve la información de un producto específico dado su ID. Requiere autenticación.",
     responses={
         200: {"description": "Producto encontrado"},
+        304: {"description": "Sin cambios desde el ETag enviado"},
         404: {"description": "Producto no encontrado"},
         401: {"description": "No autenticado"},
     },
     tags=["Productos"],
 )
 def obtener_todos_productos(    
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
     # token: str = Header(None)  # recibe token directamente
     current_user: dict = Depends(get_current_user),  # Protege el endpoint
 ):
     # current_user = get_current_user(token, db)
     repo = ProductoRepository(db)
-    return repo.get_all_productos()
-    
\ No newline at end of file
+    etag = f'"productos-{repo.get_epoca()}-{repo.get_productos_version()}"'
+    if etag_coincide(if_none_match, etag):
+        return no_modificado(etag)
+
+    # El cuerpo serializado se reutiliza mientras la tabla no cambie
+    # (la caché es del proceso: la clave incluye la base por si hay más de un engine)
+    clave = (str(db.get_bind().url), etag)
+    cuerpo = respuestas_cache.get(clave)
+    if cuerpo is MISSING:
+        productos = repo.get_all_productos()
+        cuerpo = _lista_productos.dump_json(_lista_productos.validate_python([vars(p) for p in productos]))
+        respuestas_cache.set(clave, cuerpo)
+    # Se devuelve un Response propio: copiar los headers que hayan puesto las dependencias
+    return Response(content=cuerpo, media_type="application/json", headers={**response.headers, "ETag": etag})
+    
+
+@router.post(
+    "/movimientos",
+    response_model=List[MovimientoRead],
+    status_code=201,
+    summary="Registrar un lote de movimientos de stock",
+    description="Aplica varios deltas de stock de forma atómica en una sola transacción. Requiere autenticación.",
+    responses={
+        201: {"description": "Movimientos registrados"},
+        401: {"description": "No autenticado"},
+        409: {"description": "Algún movimiento dejaría stock negativo o el producto no existe"},
+    },
+    tags=["Productos"],
+)
+def registrar_movimientos_lote(
+    movimientos: List[MovimientoLoteItem],
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),  # Protege el endpoint
+):
+    """
+    Registra un lote de movimientos: se aplican todos o ninguno.
+
+    - **producto_id**: ID del producto.
+    - **cantidad**: Delta de stock (positivo ingresa, negativo egresa).
+    - **motivo**: Texto libre opcional.
+    """
+    repo = MovimientoRepository(db)
+    try:
+        resultados = repo.aplicar_movimientos(movimientos, todo_o_nada=True)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return [r.movimiento for r in resultados]
+
+@router.post(
+    "/{producto_id}/movimientos",
+    response_model=MovimientoRead,
+    status_code=201,
+    summary="Registrar un movimiento de stock",
+    description="Aplica un delta atómico al stock del producto y lo registra en el libro de movimientos. Requiere autenticación.",
+    responses={
+        201: {"description": "Movimiento registrado"},
+        401: {"description": "No autenticado"},
+        404: {"description": "Producto no encontrado"},
+        409: {"description": "Stock insuficiente"},
+        503: {"description": "El lote no se confirmó a tiempo; el movimiento puede aplicarse igual"},
+    },
+    tags=["Productos"],
+)
+def registrar_movimiento(
+    producto_id: int,
+    movimiento: MovimientoCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),  # Protege el endpoint
+):
+    """
+    Registra un movimiento de stock para un producto.
+
+    Los movimientos de requests concurrentes se agrupan en una misma
+    transacción; la respuesta llega cuando su lote quedó confirmado. Si el
+    lote no se confirma a tiempo responde 503: el movimiento ya está en cola
+    y puede aplicarse igual, así que conviene consultar el stock antes de reintentar.
+
+    - **cantidad**: Delta de stock (positivo ingresa, negativo egresa).
+    - **motivo**: Texto libre opcional.
+    """
+    item = MovimientoLoteItem(producto_id=producto_id, **movimiento.model_dump())
+    try:
+        resultado = coalescedor_para(db.get_bind()).aplicar(item)
+    except TimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail="El movimiento no se confirmó a tiempo y puede aplicarse igual; consultá el stock antes de reintentar",
+        )
+    if resultado.error == PRODUCTO_NO_ENCONTRADO:
+        raise HTTPException(status_code=404, detail="Producto no encontrado")
+    if resultado.error:
+        raise HTTPException(status_code=409, detail=resultado.error)
+    return resultado.movimiento
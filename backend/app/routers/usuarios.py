@@ -4,9 +4,10 @@ from sqlalchemy.orm import Session
 from app.schemas.usuario import UsuarioCreate, UsuarioRead
 from app.db.session import get_db
 from app.repositories.usuario_repository import UsuarioRepository
+from app.dependencies.profiling import RutaPerfilable
 from app.dependencies.security import get_current_user
 
-router = APIRouter()
+router = APIRouter(route_class=RutaPerfilable)
 
 @router.get(
     "/me",
@@ -0,0 +1,43 @@
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Optional
+
+
+class TipoJob(str, Enum):
+    metrics = "metrics"
+    integrity = "integrity"
+    generate = "generate"
+
+
+class JobParametros(BaseModel):
+    num_samples: Optional[int] = Field(default=None, ge=1, le=10_000_000, description="Solo generate: filas a generar")
+    seed: Optional[int] = Field(default=None, description="Solo generate: semilla para reproducibilidad")
+    path: Optional[str] = Field(
+        default=None,
+        description="metrics/integrity: CSV a analizar, relativo a backend/datasets o a la carpeta de jobs",
+    )
+
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "num_samples": 100000,
+            "seed": 42
+        }
+    })
+
+
+class JobRead(BaseModel):
+    id: int
+    tipo: str
+    estado: str
+    parametros: dict[str, Any]
+    progreso: float
+    mensaje: Optional[str] = None
+    resultado: Optional[dict[str, Any]] = None
+    resultado_path: Optional[str] = None
+    error: Optional[str] = None
+    cancelacion_solicitada: bool
+    creado_por: Optional[str] = None
+    creado: datetime
+    iniciado: Optional[datetime] = None
+    finalizado: Optional[datetime] = None
@@ -0,0 +1,35 @@
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Optional
+
+
+class MovimientoCreate(BaseModel):
+    cantidad: int = Field(..., description="Delta de stock: positivo para ingresos, negativo para egresos")
+    motivo: Optional[str] = None
+
+    @field_validator("cantidad")
+    @classmethod
+    def cantidad_distinta_de_cero(cls, v: int) -> int:
+        if v == 0:
+            raise ValueError("La cantidad del movimiento no puede ser cero.")
+        return v
+
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "cantidad": -3,
+            "motivo": "Venta mostrador"
+        }
+    })
+
+
+class MovimientoLoteItem(MovimientoCreate):
+    producto_id: int
+
+
+class MovimientoRead(BaseModel):
+    id: int
+    producto_id: int
+    cantidad: int
+    motivo: Optional[str] = None
+    stock_resultante: int
+    fecha: datetime
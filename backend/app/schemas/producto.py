@@ -39,3 +39,8 @@ class ProductoRead(BaseModel):
 class ProductoOut(ProductoBase):
     id: int
     model_config = ConfigDict(from_attributes=True)
+
+
+class ProductoPagina(BaseModel):
+    items: list[ProductoRead]
+    next_cursor: Optional[int] = None
@@ -0,0 +1,200 @@
+"""
+analytics_pipeline.py
+
+Integridad, métricas y análisis exploratorio con una sola lectura del CSV.
+
+Antes, el flujo del notebook corría check_dataset_integrity,
+calculate_product_metrics y exploratory_analysis por separado y cada uno
+volvía a leer y parsear el archivo. Acá el CSV se lee una vez, por bloques,
+y cada bloque se entrega a todos los consumidores; al final se escriben los
+tres reportes.
+
+Un consumidor es cualquier objeto con:
+- `columnas`: columnas que necesita (se lee la unión de todas),
+- `consumir(chunk)`: procesa un bloque sin modificarlo (es compartido),
+- `resultado()`: devuelve el reporte como dict serializable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Protocol
+
+import pandas as pd
+
+from app.core.profiling import perfilar_a_archivo
+from app.scripts.calculate_product_metrics import AcumuladorMetricas, print_metrics
+from app.scripts.check_dataset_integrity import AcumuladorIntegridad, report_duplicates
+from app.scripts.duplicates import COLUMNAS_CLAVE, DetectorBloom, DetectorExacto, estimar_filas
+from app.scripts.exploratory_analysis import AcumuladorExploratorio, print_summary
+
+REPORTES = ("integrity", "metrics", "exploratory")
+ARCHIVOS = {
+    "integrity": "integrity.json",
+    "metrics": "metrics.json",
+    "exploratory": "exploratory_summary.json",
+}
+MODOS_DUPLICADOS = ("exact", "bloom", "off")  # bloom+exact necesita dos pasadas
+
+
+class Consumidor(Protocol):
+    columnas: list[str]
+
+    def consumir(self, chunk: pd.DataFrame) -> None: ...
+
+    def resultado(self) -> dict: ...
+
+
+def default_dataset_path() -> Path:
+    # Este archivo está en backend/app/scripts/...  => subir dos niveles para llegar a backend/
+    backend_root = Path(__file__).resolve().parents[2]
+    return backend_root / "datasets" / "product_dataset.csv"
+
+
+def default_reports_dir() -> Path:
+    return Path(__file__).resolve().parents[2] / "reports"
+
+
+class ConsumidorIntegridad:
+    """Verificaciones de integridad más la búsqueda de Id/Code duplicados en la misma lectura."""
+
+    columnas = AcumuladorIntegridad.columnas
+
+    def __init__(self, detector: DetectorExacto | DetectorBloom | None = None):
+        self.acumulador = AcumuladorIntegridad()
+        self.detector = detector
+
+    def consumir(self, chunk: pd.DataFrame) -> None:
+        self.acumulador.consumir(chunk)
+        if self.detector is not None:
+            self.detector.consumir(chunk)
+
+    def resultado(self) -> dict:
+        issues = self.acumulador.reportar()
+        duplicados = self.detector.resultado() if self.detector is not None else {}
+        issues.update(report_duplicates(duplicados))
+        return {
+            "rows": self.acumulador.filas,
+            "issues": issues,
+            "total_issues": sum(issues.values()),
+            "duplicates": duplicados,
+        }
+
+
+def crear_consumidores(
+    csv_path: Path,
+    reportes: list[str] = list(REPORTES),
+    duplicados: str = "exact",
+    particiones: int = 64,
+    tasa_error: float = 0.001,
+    epsilon: float = 0.005,
+    bins: int = 10,
+) -> dict[str, Consumidor]:
+    desconocidos = set(reportes) - set(REPORTES)
+    if desconocidos:
+        raise ValueError(f"Reportes desconocidos: {', '.join(sorted(desconocidos))}")
+    if duplicados not in MODOS_DUPLICADOS:
+        raise ValueError(f"Modo de duplicados no disponible en una sola lectura: {duplicados}")
+
+    consumidores: dict[str, Consumidor] = {}
+    if "integrity" in reportes:
+        detector = None
+        if duplicados == "exact":
+            detector = DetectorExacto(COLUMNAS_CLAVE, particiones)
+        elif duplicados == "bloom":
+            detector = DetectorBloom(2 * estimar_filas(csv_path), COLUMNAS_CLAVE, tasa_error)
+        consumidores["integrity"] = ConsumidorIntegridad(detector)
+    if "metrics" in reportes:
+        consumidores["metrics"] = AcumuladorMetricas()
+    if "exploratory" in reportes:
+        consumidores["exploratory"] = AcumuladorExploratorio(epsilon=epsilon, bins=bins)
+    return consumidores
+
+
+def ejecutar(csv_path: Path, consumidores: dict[str, Consumidor], chunksize: int = 100_000) -> dict[str, dict]:
+    """Lee `csv_path` una vez y entrega cada bloque a todos los consumidores."""
+    encabezado = pd.read_csv(csv_path, nrows=0)
+    necesarias = set().union(*(c.columnas for c in consumidores.values()))
+    usecols = [c for c in encabezado.columns if c in necesarias]
+    # Claves como texto: un bloque con nulos no debe convertir "1" en "1.0"
+    dtype = {c: str for c in COLUMNAS_CLAVE if c in usecols}
+
+    leidos = 0
+    for chunk in pd.read_csv(csv_path, usecols=usecols, dtype=dtype, chunksize=chunksize, low_memory=False):
+        leidos += 1
+        for consumidor in consumidores.values():
+            consumidor.consumir(chunk)
+    if not leidos:  # solo encabezado: que cada consumidor vea las columnas presentes
+        for consumidor in consumidores.values():
+            consumidor.consumir(encabezado[usecols])
+
+    return {nombre: consumidor.resultado() for nombre, consumidor in consumidores.items()}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Integrity, metrics and exploratory reports in a single scan of the CSV")
+    parser.add_argument("--path", type=str, default=None, help="Ruta del CSV (default: backend/datasets/product_dataset.csv)")
+    parser.add_argument("--out-dir", type=str, default=None, help="Carpeta de los reportes JSON (default: backend/reports)")
+    parser.add_argument("--only", type=str, default=",".join(REPORTES), help=f"Reportes a generar, separados por coma (default: {','.join(REPORTES)})")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Filas por bloque de lectura (default: 100000)")
+    parser.add_argument("--duplicates", choices=MODOS_DUPLICADOS, default="exact", help="Verificación de Id/Code únicos (default: exact)")
+    parser.add_argument("--partitions", type=int, default=64, help="Buckets en disco del modo exacto (default: 64)")
+    parser.add_argument("--bloom-error", type=float, default=0.001, help="Tasa de falsos positivos del filtro de Bloom (default: 0.001)")
+    parser.add_argument("--epsilon", type=float, default=0.005, help="Error de rango de percentiles/histogramas (default: 0.005)")
+    parser.add_argument("--bins", type=int, default=10, help="Intervalos de los histogramas (default: 10)")
+    parser.add_argument("--strict", action="store_true", help="Salir con código 1 si la integridad detecta issues")
+    parser.add_argument("--profile", type=str, default=None, help="Guardar un perfil de muestreo (formato folded/flamegraph) en este archivo (opcional)")
+    args = parser.parse_args(argv)
+
+    with perfilar_a_archivo(args.profile):
+        return _run(args)
+
+
+def _run(args: argparse.Namespace) -> int:
+    csv_path = Path(args.path) if args.path else default_dataset_path()
+    if not csv_path.exists():
+        print(f"ERROR: CSV not found / no encontrado: {csv_path}")
+        return 1
+    out_dir = Path(args.out_dir) if args.out_dir else default_reports_dir()
+
+    try:
+        consumidores = crear_consumidores(
+            csv_path,
+            [r.strip() for r in args.only.split(",") if r.strip()],
+            duplicados=args.duplicates,
+            particiones=args.partitions,
+            tasa_error=args.bloom_error,
+            epsilon=args.epsilon,
+            bins=args.bins,
+        )
+        print(f"Scanning / Leyendo {csv_path} once for / una vez para: {', '.join(consumidores)}\n")
+        reportes = ejecutar(csv_path, consumidores, chunksize=args.chunksize)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    if "metrics" in reportes:
+        print("\n=== Metrics / Métricas ===")
+        print_metrics(reportes["metrics"])
+    if "exploratory" in reportes:
+        print("\n=== Exploratory / Exploratorio ===")
+        print_summary(reportes["exploratory"])
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    print()
+    for nombre, reporte in reportes.items():
+        destino = out_dir / ARCHIVOS[nombre]
+        with destino.open("w", encoding="utf-8") as f:
+            json.dump(reporte, f, indent=2)
+        print(f"{nombre} report saved to / reporte guardado en: {destino}")
+
+    if args.strict and reportes.get("integrity", {}).get("total_issues", 0) > 0:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""
+build_openapi.py
+
+Precompila el esquema OpenAPI de la API para que los workers no lo generen
+en el primer request a /openapi.json o /docs. Correr en el build/deploy:
+
+    python -m app.scripts.build_openapi [--out app/openapi.json]
+
+El esquema queda asociado a la versión de la app y a la revisión del código
+(`APP_REVISION` si está definida, si no el commit de git): el deploy que lo
+sirva debe tener la misma, o se vuelve a generar en caliente.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from app.core.openapi import OPENAPI_PATH, guardar_openapi
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Precompila el esquema OpenAPI")
+    parser.add_argument("--out", type=str, default=None, help=f"Archivo de salida (default: {OPENAPI_PATH})")
+    args = parser.parse_args(argv)
+
+    from app.main import app
+
+    destino = guardar_openapi(app, Path(args.out) if args.out else None)
+    print(f"OpenAPI schema written to / Esquema OpenAPI escrito en: {destino}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
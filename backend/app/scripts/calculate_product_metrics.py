@@ -6,6 +6,10 @@ Mejoras:
 - CLI (--path, --json-out) y ruta por defecto robusta
 - Lectura selectiva de columnas para menor uso de memoria
 - Conversión numérica segura y agregaciones en una sola pasada
+- Lectura por bloques (--chunksize): sumas y conteos se acumulan entre
+  bloques, así el CSV no necesita entrar en memoria
+- --path acepta también un dataset particionado (ver partitioned_dataset) y
+  --where Category=Food descarta las demás particiones antes de leer
 """
 
 from __future__ import annotations
@@ -16,6 +20,12 @@ from pathlib import Path
 
 import pandas as pd
 
+from app.core.profiling import perfilar_a_archivo
+from app.scripts.partitioned_dataset import Filtros, cargar_dataset, leer_dataset, parse_filtros, resumen_poda
+from app.scripts.streaming_stats import SumasPorCategoria
+
+METRIC_COLUMNS = ["BaseYield", "Cost", "EnvironmentalImpact"]
+
 
 def default_dataset_path() -> Path:
     # Este archivo está en backend/app/scripts/...  => subir dos niveles para llegar a backend/
@@ -23,10 +33,10 @@ def default_dataset_path() -> Path:
     return backend_root / "datasets" / "product_dataset.csv"
 
 
-def load_dataset(csv_path: Path) -> pd.DataFrame:
-    # Leer solo columnas necesarias
+def load_dataset(csv_path: Path, filtros: Filtros | None = None) -> pd.DataFrame:
+    # Leer solo columnas necesarias (y, si está particionado, solo las particiones de `filtros`)
     usecols = ["Category", "BaseYield", "Cost", "EnvironmentalImpact"]
-    df = pd.read_csv(csv_path, usecols=usecols, low_memory=False)
+    df = cargar_dataset(csv_path, usecols, filtros)
 
     # Convertir a numérico de forma segura
     for col in ["BaseYield", "Cost", "EnvironmentalImpact"]:
@@ -71,23 +81,69 @@ def compute_metrics(df: pd.DataFrame) -> dict:
     }
 
 
-def main(argv: list[str] | None = None) -> int:
-    parser = argparse.ArgumentParser(description="Calculate product metrics from CSV")
-    parser.add_argument("--path", type=str, default=None, help="Ruta del CSV (default: backend/datasets/product_dataset.csv)")
-    parser.add_argument("--json-out", type=str, default=None, help="Archivo JSON para guardar las métricas (opcional)")
-    args = parser.parse_args(argv)
+def _float_o_none(valor) -> float | None:
+    return float(valor) if pd.notna(valor) else None
+
+
+class AcumuladorMetricas:
+    """Las métricas de `compute_metrics` alimentadas bloque a bloque."""
+
+    columnas = ["Category", *METRIC_COLUMNS]
+
+    def __init__(self):
+        self.filas = 0
+        self.presentes: list[str] | None = None
+        self.sumas = dict.fromkeys(METRIC_COLUMNS, 0.0)
+        self.conteos = dict.fromkeys(METRIC_COLUMNS, 0)
+        self.por_categoria = SumasPorCategoria(METRIC_COLUMNS)
+
+    def consumir(self, chunk: pd.DataFrame) -> None:
+        if self.presentes is None:
+            self.presentes = [c for c in METRIC_COLUMNS if c in chunk.columns]
+        self.filas += len(chunk)
+        for col in self.presentes:
+            valores = pd.to_numeric(chunk[col], errors="coerce")
+            self.sumas[col] += float(valores.sum())
+            self.conteos[col] += int(valores.count())
+        self.por_categoria.actualizar(chunk)
+
+    def _promedio(self, col: str) -> float | None:
+        presente = col in (self.presentes or [])
+        return self.sumas[col] / self.conteos[col] if presente and self.conteos[col] else None
+
+    def resultado(self) -> dict:
+        by_cat = {}
+        parcial = self.por_categoria.parcial
+        if parcial is not None:
+            promedios = {col: self.por_categoria.promedio(col) for col in METRIC_COLUMNS if f"{col}_sum" in parcial}
+            for cat in parcial.index:
+                by_cat[str(cat)] = {
+                    "count": int(parcial.loc[cat, "count"]),
+                    "AvgYield": _float_o_none(promedios["BaseYield"][cat]) if "BaseYield" in promedios else None,
+                    "TotalCost": _float_o_none(parcial.loc[cat, "Cost_sum"]) if "Cost" in promedios else None,
+                    "AvgEnvImpact": (
+                        _float_o_none(promedios["EnvironmentalImpact"][cat]) if "EnvironmentalImpact" in promedios else None
+                    ),
+                }
+
+        return {
+            "rows": self.filas,
+            "average_base_yield": self._promedio("BaseYield"),
+            "total_cost": self.sumas["Cost"] if "Cost" in (self.presentes or []) else None,
+            "average_environmental_impact": self._promedio("EnvironmentalImpact"),
+            "by_category": by_cat,
+        }
 
-    csv_path = Path(args.path) if args.path else default_dataset_path()
-    if not csv_path.exists():
-        print(f"ERROR: CSV not found / no encontrado: {csv_path}")
-        return 1
 
-    df = load_dataset(csv_path)
-    print(f"Dataset loaded: {len(df)} rows / filas")
+def compute_streaming_metrics(csv_path: Path, chunksize: int = 100_000, filtros: Filtros | None = None) -> dict:
+    """`compute_metrics(load_dataset(...))` leyendo el CSV por bloques de `chunksize` filas."""
+    acumulador = AcumuladorMetricas()
+    for chunk in leer_dataset(csv_path, AcumuladorMetricas.columnas, filtros, chunksize=chunksize):
+        acumulador.consumir(chunk)
+    return acumulador.resultado()
 
-    metrics = compute_metrics(df)
 
-    # Salida por consola
+def print_metrics(metrics: dict) -> None:
     print(f"Average BaseYield / Rendimiento promedio: {metrics['average_base_yield']:.2f}" if metrics["average_base_yield"] is not None else "Average BaseYield: N/A")
     print(f"Total Cost / Costo acumulado: {metrics['total_cost']:.2f}" if metrics["total_cost"] is not None else "Total Cost: N/A")
     print(
@@ -103,6 +159,40 @@ def main(argv: list[str] | None = None) -> int:
                 f"- {cat}: count={vals['count']}, AvgYield={vals['AvgYield']}, TotalCost={vals['TotalCost']}, AvgEnvImpact={vals['AvgEnvImpact']}"
             )
 
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Calculate product metrics from CSV")
+    parser.add_argument("--path", type=str, default=None, help="Ruta del CSV o del dataset particionado (default: backend/datasets/product_dataset.csv)")
+    parser.add_argument("--where", action="append", default=None, help="Filtro Col=v1,v2 ('null' = nulos); en un dataset particionado descarta particiones antes de leer; repetible")
+    parser.add_argument("--json-out", type=str, default=None, help="Archivo JSON para guardar las métricas (opcional)")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Filas por bloque de lectura (default: 100000)")
+    parser.add_argument("--profile", type=str, default=None, help="Guardar un perfil de muestreo (formato folded/flamegraph) en este archivo (opcional)")
+    args = parser.parse_args(argv)
+
+    with perfilar_a_archivo(args.profile):
+        return _run(args)
+
+
+def _run(args: argparse.Namespace) -> int:
+    csv_path = Path(args.path) if args.path else default_dataset_path()
+    if not csv_path.exists():
+        print(f"ERROR: CSV not found / no encontrado: {csv_path}")
+        return 1
+
+    try:
+        filtros = parse_filtros(args.where)
+        poda = resumen_poda(csv_path, filtros)
+        metrics = compute_streaming_metrics(csv_path, chunksize=args.chunksize, filtros=filtros)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+    if poda is not None:
+        print(f"Partitions read / Particiones leídas: {poda[0]} of / de {poda[1]}")
+    print(f"Dataset scanned: {metrics['rows']} rows / filas")
+
+    # Salida por consola
+    print_metrics(metrics)
+
     # Opcional: guardar a JSON
     if args.json_out:
         out_path = Path(args.json_out)
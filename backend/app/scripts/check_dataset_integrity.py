@@ -6,6 +6,11 @@ Mejoras:
 - Ruta por defecto robusta (backend/datasets/product_dataset.csv)
 - CLI (--path, --strict) y manejo de errores amigable
 - Validaciones vectorizadas y seguras ante columnas ausentes
+- Lectura por bloques (--chunksize): el CSV no necesita entrar en memoria
+- Unicidad de Id y Code sin cargar las claves en memoria (buckets en disco
+  y/o filtro de Bloom, ver duplicates.py)
+- Reglas declarativas adicionales (--rules, ver quality_rules.py) evaluadas
+  en la misma lectura
 """
 
 from __future__ import annotations
@@ -14,9 +19,15 @@ import argparse
 from pathlib import Path
 from datetime import timedelta
 import sys
+from typing import Iterator
 
+import numpy as np
 import pandas as pd
 
+from app.core.profiling import perfilar_a_archivo
+from app.scripts.duplicates import COLUMNAS_CLAVE, MODOS, check_duplicates
+from app.scripts.quality_rules import ErrorDeConfiguracion, EvaluadorReglas, cargar_reglas, compilar, print_results
+
 
 def default_dataset_path() -> Path:
     # Este archivo está en backend/app/scripts/...  => subir dos niveles para llegar a backend/
@@ -24,66 +35,139 @@ def default_dataset_path() -> Path:
     return backend_root / "datasets" / "product_dataset.csv"
 
 
+REQUIRED_COLUMNS = [
+    "Id",
+    "Name",
+    "Code",
+    "Category",
+    "IsActive",
+    "BaseYield",
+    "NutritionalValue",
+    "Cost",
+    "EnvironmentalImpact",
+    "ShelfLife",
+]
+NON_NULLABLE_COLUMNS = ["Id", "Name", "Code", "Category", "IsActive"]
+NUMERIC_COLUMNS = ["BaseYield", "NutritionalValue", "Cost", "EnvironmentalImpact"]
+
+
+class AcumuladorIntegridad:
+    """Verificaciones de `check_integrity` alimentadas bloque a bloque; `reportar` imprime y resume."""
+
+    columnas = REQUIRED_COLUMNS
+
+    def __init__(self):
+        self.presentes: list[str] | None = None
+        self.filas = 0
+        self.nulos: dict[str, int] = {}
+        self.negativos: dict[str, int] = {}
+        self.minimos: dict[str, float] = {}
+        self.maximos: dict[str, float] = {}
+        self.shelf_invalidos = 0
+        self.shelf_no_positivos = 0
+
+    def consumir(self, chunk: pd.DataFrame) -> None:
+        if self.presentes is None:
+            self.presentes = list(chunk.columns)
+        self.filas += len(chunk)
+
+        for col, cnt in chunk[[c for c in NON_NULLABLE_COLUMNS if c in chunk.columns]].isnull().sum().items():
+            self.nulos[col] = self.nulos.get(col, 0) + int(cnt)
+
+        for col in (c for c in NUMERIC_COLUMNS if c in chunk.columns):
+            series = pd.to_numeric(chunk[col], errors="coerce")
+            self.negativos[col] = self.negativos.get(col, 0) + int((series < 0).sum())
+            # fmin/fmax ignoran NaN: un bloque sin valores no pisa el acumulado
+            self.minimos[col] = float(np.fmin(self.minimos.get(col, np.nan), series.min(skipna=True)))
+            self.maximos[col] = float(np.fmax(self.maximos.get(col, np.nan), series.max(skipna=True)))
+
+        if "ShelfLife" in chunk.columns:
+            # Pocos valores distintos ("189 days", ...): se parsea cada uno una sola vez
+            codigos, unicos = pd.factorize(chunk["ShelfLife"], use_na_sentinel=False)
+            shelf = pd.Series(pd.to_timedelta(pd.Index(unicos, dtype=object), errors="coerce").take(codigos))
+            self.shelf_invalidos += int(shelf.isna().sum())
+            self.shelf_no_positivos += int((shelf <= timedelta(0)).sum())
+
+    def reportar(self) -> dict:
+        """Imprime el detalle de las verificaciones y devuelve un resumen de issues."""
+        presentes = self.presentes or []
+        issues: dict[str, int] = {
+            "missing_columns": 0,
+            "nulls": 0,
+            "negatives": 0,
+            "invalid_shelf_life": 0,
+        }
+
+        print("=== Checking required columns / Verificando columnas obligatorias ===")
+        missing = [c for c in REQUIRED_COLUMNS if c not in presentes]
+        for col in missing:
+            print(f"Missing column: {col} / Falta columna: {col}")
+        issues["missing_columns"] = len(missing)
+
+        print("\n=== Checking non-null values / Verificando valores nulos ===")
+        if self.nulos:
+            for col, cnt in self.nulos.items():
+                print(f"{col}: {cnt} null values / valores nulos")
+            issues["nulls"] = sum(self.nulos.values())
+        else:
+            print("No non-nullable columns found present / No se hallaron columnas no nulas presentes")
+
+        print("\n=== Checking numeric ranges / Verificando rangos numéricos ===")
+        for col, neg_count in self.negativos.items():
+            if neg_count > 0:
+                print(f"Warning: {col} has {neg_count} negative values / valores negativos")
+            print(f"{col} - min: {self.minimos[col]}, max: {self.maximos[col]}")
+            issues["negatives"] += neg_count
+
+        print("\n=== Checking ShelfLife positive / Verificando ShelfLife positiva ===")
+        if "ShelfLife" in presentes:
+            print(f"ShelfLife invalid (NaT): {self.shelf_invalidos}")
+            print(f"ShelfLife <= 0 days: {self.shelf_no_positivos} products / productos")
+            issues["invalid_shelf_life"] = self.shelf_invalidos + self.shelf_no_positivos
+        else:
+            print("Column 'ShelfLife' not present / Columna 'ShelfLife' no presente")
+            issues["missing_columns"] += 1
+
+        return issues
+
+
 def check_integrity(df: pd.DataFrame) -> dict:
     """Ejecuta verificaciones de integridad y devuelve un resumen de issues."""
-    issues: dict[str, int] = {
-        "missing_columns": 0,
-        "nulls": 0,
-        "negatives": 0,
-        "invalid_shelf_life": 0,
-    }
-
-    print("=== Checking required columns / Verificando columnas obligatorias ===")
-    required_columns = [
-        "Id",
-        "Name",
-        "Code",
-        "Category",
-        "IsActive",
-        "BaseYield",
-        "NutritionalValue",
-        "Cost",
-        "EnvironmentalImpact",
-        "ShelfLife",
-    ]
-    missing = [c for c in required_columns if c not in df.columns]
-    for col in missing:
-        print(f"Missing column: {col} / Falta columna: {col}")
-    issues["missing_columns"] = len(missing)
-
-    print("\n=== Checking non-null values / Verificando valores nulos ===")
-    non_nullable = [c for c in ["Id", "Name", "Code", "Category", "IsActive"] if c in df.columns]
-    if non_nullable:
-        null_counts = df[non_nullable].isnull().sum()
-        for col, cnt in null_counts.items():
-            print(f"{col}: {cnt} null values / valores nulos")
-        issues["nulls"] = int(null_counts.sum())
-    else:
-        print("No non-nullable columns found present / No se hallaron columnas no nulas presentes")
-
-    print("\n=== Checking numeric ranges / Verificando rangos numéricos ===")
-    numeric_columns = [c for c in ["BaseYield", "NutritionalValue", "Cost", "EnvironmentalImpact"] if c in df.columns]
-    for col in numeric_columns:
-        series = pd.to_numeric(df[col], errors="coerce")
-        neg_count = int((series < 0).sum())
-        col_min, col_max = series.min(skipna=True), series.max(skipna=True)
-        if neg_count > 0:
-            print(f"Warning: {col} has {neg_count} negative values / valores negativos")
-        print(f"{col} - min: {col_min}, max: {col_max}")
-        issues["negatives"] += neg_count
-
-    print("\n=== Checking ShelfLife positive / Verificando ShelfLife positiva ===")
-    if "ShelfLife" in df.columns:
-        shelf = pd.to_timedelta(df["ShelfLife"], errors="coerce")
-        invalid = shelf.isna().sum()
-        non_positive = (shelf <= timedelta(0)).sum()
-        print(f"ShelfLife invalid (NaT): {int(invalid)}")
-        print(f"ShelfLife <= 0 days: {int(non_positive)} products / productos")
-        issues["invalid_shelf_life"] = int(invalid + non_positive)
-    else:
-        print("Column 'ShelfLife' not present / Columna 'ShelfLife' no presente")
-        issues["missing_columns"] += 1
+    acumulador = AcumuladorIntegridad()
+    acumulador.consumir(df)
+    return acumulador.reportar()
+
+
+def leer_bloques(csv_path: Path, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+    """
+    Encabezado (DataFrame sin filas, así las columnas se ven aunque el CSV esté
+    vacío) y luego el CSV por bloques. Los errores de lectura salen del `next`.
+    """
+    encabezado = pd.read_csv(csv_path, nrows=0)
+    yield encabezado
+    # Claves como texto, igual que check_rules y check_duplicates: "1" y "1.0" no son la misma
+    dtype = {c: str for c in COLUMNAS_CLAVE if c in encabezado.columns}
+    yield from pd.read_csv(csv_path, dtype=dtype, chunksize=chunksize, low_memory=False)
+
 
+def report_duplicates(resultados: dict[str, dict]) -> dict[str, int]:
+    """Imprime el resultado de `check_duplicates` y lo resume como issues."""
+    print("\n=== Checking unique keys / Verificando claves únicas ===")
+    issues: dict[str, int] = {}
+    for col, res in resultados.items():
+        if res["exact"]:
+            filas = res["duplicate_rows"]
+            print(f"{col}: {res['duplicate_values']} duplicated values / valores duplicados, {filas} extra rows / filas extra")
+        else:
+            filas = res["possible_duplicate_rows"]
+            print(
+                f"{col}: {filas} possible duplicate rows / posibles filas duplicadas "
+                f"(probabilistic, false positive rate / tasa de falsos positivos ~{res['false_positive_rate']:.2g})"
+            )
+        for ejemplo in res["examples"]:
+            filas_ejemplo = ejemplo.get("rows", [ejemplo.get("row")])
+            print(f"  - {ejemplo['value']!r} rows / filas {filas_ejemplo}")
+        issues[f"duplicate_{col.lower()}s"] = filas
     return issues
 
 
@@ -100,21 +184,72 @@ def main(argv: list[str] | None = None) -> int:
         action="store_true",
         help="Salir con código 1 si hay issues detectados",
     )
+    parser.add_argument(
+        "--duplicates",
+        choices=MODOS,
+        default="exact",
+        help="Verificación de Id/Code únicos: exact (buckets en disco), bloom (rápido, probabilístico), "
+        "bloom+exact (el filtro evita el volcado si no hay candidatos) u off (default: exact)",
+    )
+    parser.add_argument("--partitions", type=int, default=64, help="Buckets en disco del modo exacto (default: 64)")
+    parser.add_argument("--bloom-error", type=float, default=0.001, help="Tasa de falsos positivos del filtro de Bloom (default: 0.001)")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Filas por bloque de lectura (default: 100000)")
+    parser.add_argument("--rules", type=str, default=None, help="Archivo de reglas YAML/JSON a evaluar además de las verificaciones fijas (p. ej. backend/rules/product_dataset.yaml)")
+    parser.add_argument("--profile", type=str, default=None, help="Guardar un perfil de muestreo (formato folded/flamegraph) en este archivo (opcional)")
     args = parser.parse_args(argv)
 
+    with perfilar_a_archivo(args.profile):
+        return _run(args)
+
+
+def _run(args: argparse.Namespace) -> int:
     csv_path = Path(args.path) if args.path else default_dataset_path()
     if not csv_path.exists():
         print(f"ERROR: CSV not found / no encontrado: {csv_path}")
         return 1
 
+    acumulador = AcumuladorIntegridad()
+    reglas = None
+    if args.rules:
+        try:
+            reglas = EvaluadorReglas(compilar(cargar_reglas(Path(args.rules))), args.partitions)
+        except (OSError, ValueError) as e:
+            print(f"ERROR loading rules / cargando reglas: {e}")
+            return 1
+    consumidores = [acumulador, reglas] if reglas is not None else [acumulador]
+    # Solo los errores de lectura se informan como tales; los de una verificación o regla no se disfrazan
+    bloques = leer_bloques(csv_path, args.chunksize)
+    while True:
+        try:
+            chunk = next(bloques, None)
+        except (OSError, ValueError) as e:  # ParserError, EmptyDataError y UnicodeDecodeError son ValueError
+            print(f"ERROR loading CSV: {e}")
+            return 1
+        if chunk is None:
+            break
+        try:
+            for consumidor in consumidores:
+                consumidor.consumir(chunk)
+        except ErrorDeConfiguracion as e:
+            print(f"ERROR in rules / en las reglas: {e}")
+            return 1
+
+    print(f"Dataset scanned: {acumulador.filas} rows / filas\n")
+    issues = acumulador.reportar()
     try:
-        df = pd.read_csv(csv_path, low_memory=False)
-    except Exception as e:
-        print(f"ERROR loading CSV: {e}")
+        duplicados = check_duplicates(
+            csv_path, args.duplicates, chunksize=args.chunksize,
+            particiones=args.partitions, tasa_error=args.bloom_error,
+        )
+    except ValueError as e:
+        print(f"ERROR: {e}")
         return 1
-
-    print(f"Dataset loaded: {len(df)} rows / filas\n")
-    issues = check_integrity(df)
+    issues.update(report_duplicates(duplicados))
+    if reglas is not None:
+        print()
+        resultado_reglas = reglas.resultado()
+        print_results(resultado_reglas)
+        issues["rule_violations"] = resultado_reglas["total_violations"]
 
     total_issues = sum(issues.values())
     print("\n=== Summary / Resumen ===")
@@ -0,0 +1,361 @@
+"""
+clean_dataset.py
+
+Limpieza del dataset por bloques, sin operaciones fila por fila:
+
+- Números guardados como texto ("$1,234.50", "1.234,50 €", "(12.00)") se
+  convierten con operaciones vectorizadas de `str` según la configuración
+  regional de separadores (--locale en/es/fr).
+- Política de nulos por columna (--nulls): keep, drop, fill:<valor>, mean,
+  median o mode. mean/median/mode necesitan una pasada previa que solo lee
+  esas columnas (la mediana sale de un sketch KLL: es aproximada, con error
+  de rango ~0.1%).
+- Duplicados: hash de 64 bits de la fila ya limpia (o de las columnas de
+  --dedupe-on); los hashes vistos se guardan ordenados en un array de NumPy,
+  así la memoria es 8 bytes por fila única y no se compara texto. La
+  probabilidad de colisión es despreciable (~n²/2^65).
+
+El CSV limpio se escribe bloque a bloque, con lo que el archivo puede ser
+más grande que la memoria; al final se informan filas/seg.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.core.profiling import perfilar_a_archivo
+from app.scripts.check_dataset_integrity import NUMERIC_COLUMNS
+from app.scripts.streaming_stats import EstadisticasColumna
+
+# (separador de miles, separador decimal)
+LOCALES = {"en": (",", "."), "es": (".", ","), "fr": (" ", ",")}
+POLITICAS = ("keep", "drop", "fill", "mean", "median", "mode")
+POLITICAS_PREVIAS = ("mean", "median", "mode")  # necesitan recorrer el archivo antes
+# Símbolo ("$", "US$", "€") o código ISO ("USD") antes o después del número; el signo puede ir delante
+_SIMBOLOS = "$€£¥₹¢"
+_MONEDA_PREFIJO = rf"^([+-]?)\s*(?:[A-Z]{{3}}|[A-Z]{{0,2}}[{_SIMBOLOS}])\s*"
+_MONEDA_SUFIJO = rf"\s*(?:[A-Z]{{3}}|[{_SIMBOLOS}])$"
+
+
+def default_dataset_path() -> Path:
+    # Este archivo está en backend/app/scripts/...  => subir dos niveles para llegar a backend/
+    backend_root = Path(__file__).resolve().parents[2]
+    return backend_root / "datasets" / "product_dataset.csv"
+
+
+def default_output_path(csv_path: Path) -> Path:
+    return csv_path.with_name(f"{csv_path.stem}_clean{csv_path.suffix}")
+
+
+def parsear_numeros(serie: pd.Series, locale: str = "en") -> pd.Series:
+    """
+    Texto con símbolos de moneda, separadores de miles y negativos contables
+    entre paréntesis a float. Lo que no se puede convertir queda NaN.
+    """
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        return serie.astype("float64")
+    miles, decimal = LOCALES[locale]
+    texto = serie.astype("string").str.strip()
+    contable = texto.str.startswith("(") & texto.str.endswith(")")
+    texto = texto.mask(contable.fillna(False), texto.str[1:-1])
+    # Solo se quitan la moneda (al principio o al final) y los espacios, también los duros;
+    # cualquier otra cosa ("12abc34", "v2.1") la rechaza to_numeric y queda NaN
+    texto = texto.str.replace(_MONEDA_PREFIJO, r"\1", regex=True).str.replace(_MONEDA_SUFIJO, "", regex=True)
+    texto = texto.str.replace(r"\s", "", regex=True)
+    if miles in ".,":
+        texto = texto.str.replace(miles, "", regex=False)
+    if decimal != ".":
+        texto = texto.str.replace(decimal, ".", regex=False)
+    numeros = pd.to_numeric(texto, errors="coerce").astype("float64")
+    return numeros.mask(contable.fillna(False).to_numpy(dtype=bool), -numeros.abs())
+
+
+def parse_politicas(texto: str | None) -> dict[str, tuple[str, str | None]]:
+    """'Cost=median,Name=drop,Supplier=fill:Desconocido' -> {col: (política, valor)}."""
+    politicas = {}
+    for par in filter(None, (p.strip() for p in (texto or "").split(","))):
+        col, sep, politica = par.partition("=")
+        nombre, _, valor = politica.strip().partition(":")
+        if not sep or not col.strip() or nombre not in POLITICAS:
+            raise ValueError(f"Política de nulos inválida: {par} (opciones: {', '.join(POLITICAS)})")
+        if nombre == "fill" and not valor:
+            raise ValueError(f"fill necesita un valor, p. ej. {col.strip()}=fill:0")
+        politicas[col.strip()] = (nombre, valor if nombre == "fill" else None)
+    return politicas
+
+
+class HashesVistos:
+    """Conjunto de hashes de 64 bits en un array ordenado."""
+
+    def __init__(self):
+        self.vistos = np.empty(0, dtype=np.uint64)
+
+    def marcar(self, hashes: np.ndarray) -> np.ndarray:
+        """Máscara de los hashes ya vistos (antes o más arriba en el mismo bloque); agrega los nuevos."""
+        repetidos = pd.Series(hashes).duplicated().to_numpy()
+        if len(self.vistos):
+            pos = np.minimum(np.searchsorted(self.vistos, hashes), len(self.vistos) - 1)
+            repetidos |= self.vistos[pos] == hashes
+        nuevos = np.sort(hashes[~repetidos])
+        if len(nuevos):
+            # Mezcla de dos arrays ordenados: más barato que volver a ordenar todo
+            destino = np.searchsorted(self.vistos, nuevos) + np.arange(len(nuevos))
+            vistos = np.empty(len(self.vistos) + len(nuevos), dtype=np.uint64)
+            libres = np.ones(len(vistos), dtype=bool)
+            libres[destino] = False
+            vistos[destino] = nuevos
+            vistos[libres] = self.vistos
+            self.vistos = vistos
+        return repetidos
+
+
+def calcular_rellenos(
+    csv_path: Path,
+    politicas: dict[str, tuple[str, str | None]],
+    numericas: list[str],
+    locale: str = "en",
+    chunksize: int = 100_000,
+) -> dict[str, object]:
+    """Valor de relleno de cada columna con política fill/mean/median/mode."""
+    rellenos: dict[str, object] = {}
+    previas = {}
+    for col, (politica, valor) in politicas.items():
+        if politica == "fill":
+            rellenos[col] = float(parsear_numeros(pd.Series([valor]), locale)[0]) if col in numericas else valor
+            if col in numericas and np.isnan(rellenos[col]):
+                raise ValueError(f"El relleno de {col} no es numérico: {valor}")
+        elif politica in POLITICAS_PREVIAS:
+            if politica != "mode" and col not in numericas:
+                raise ValueError(f"{politica} solo aplica a columnas numéricas (--numeric): {col}")
+            previas[col] = politica
+    if not previas:
+        return rellenos
+
+    estadisticas = {c: EstadisticasColumna(epsilon=0.001, seed=0) for c, p in previas.items() if p != "mode"}
+    conteos: dict[str, pd.Series] = {c: pd.Series(dtype="int64") for c, p in previas.items() if p == "mode"}
+    for chunk in pd.read_csv(csv_path, usecols=list(previas), dtype=str, chunksize=chunksize):
+        for col in previas:
+            valores = parsear_numeros(chunk[col], locale) if col in numericas else chunk[col]
+            if col in estadisticas:
+                estadisticas[col].actualizar(valores)
+            else:
+                conteos[col] = conteos[col].add(valores.value_counts(), fill_value=0)
+
+    for col, politica in previas.items():
+        if politica == "mean":
+            rellenos[col] = estadisticas[col].momentos.resumen()["mean"]
+        elif politica == "median":
+            rellenos[col] = estadisticas[col].sketch.cuantiles([0.5])[0]
+        else:
+            rellenos[col] = conteos[col].idxmax() if len(conteos[col]) else None
+    return rellenos
+
+
+class Limpiador:
+    """Aplica el parseo numérico, los nulos y los duplicados a cada bloque que recibe."""
+
+    def __init__(
+        self,
+        numericas: list[str],
+        politicas: dict[str, tuple[str, str | None]],
+        rellenos: dict[str, object],
+        locale: str = "en",
+        dedupe: bool = True,
+        dedupe_on: list[str] | None = None,
+    ):
+        if locale not in LOCALES:
+            raise ValueError(f"Locale desconocido: {locale} (opciones: {', '.join(LOCALES)})")
+        self.numericas = numericas
+        self.politicas = politicas
+        self.rellenos = rellenos
+        self.locale = locale
+        self.dedupe = dedupe
+        self.dedupe_on = dedupe_on
+        self.vistos = HashesVistos()
+        self.filas_entrada = 0
+        self.filas_salida = 0
+        self.descartadas_nulos = 0
+        self.duplicados = 0
+        self.fallos_parseo = dict.fromkeys(numericas, 0)
+        self.rellenados: dict[str, int] = {}
+
+    def consumir(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        self.filas_entrada += len(chunk)
+        faltantes = [c for c in [*self.numericas, *self.politicas, *(self.dedupe_on or [])] if c not in chunk.columns]
+        if faltantes:
+            raise ValueError(f"Columnas inexistentes: {', '.join(dict.fromkeys(faltantes))}")
+        chunk = chunk.copy()
+
+        for col in self.numericas:
+            original = chunk[col]
+            chunk[col] = parsear_numeros(original, self.locale)
+            if not pd.api.types.is_numeric_dtype(original):  # read_csv ya dejó NaN los vacíos
+                self.fallos_parseo[col] += int((original.notna() & chunk[col].isna()).sum())
+
+        a_descartar = [c for c, (p, _) in self.politicas.items() if p == "drop"]
+        if a_descartar:
+            nulas = chunk[a_descartar].isna().any(axis=1)
+            self.descartadas_nulos += int(nulas.sum())
+            chunk = chunk[~nulas]
+        for col, valor in self.rellenos.items():
+            if valor is None:
+                continue
+            nulos = chunk[col].isna()
+            if nulos.any():
+                self.rellenados[col] = self.rellenados.get(col, 0) + int(nulos.sum())
+                chunk[col] = chunk[col].where(~nulos, valor)
+
+        if self.dedupe and len(chunk):
+            columnas = self.dedupe_on or list(chunk.columns)
+            # El hash depende del dtype: lo no numérico se hashea como texto, igual en todos los bloques
+            clave = chunk[columnas].astype({c: "string" for c in columnas if c not in self.numericas})
+            repetidos = self.vistos.marcar(pd.util.hash_pandas_object(clave, index=False).to_numpy())
+            self.duplicados += int(repetidos.sum())
+            chunk = chunk[~repetidos]
+
+        self.filas_salida += len(chunk)
+        return chunk
+
+    def reporte(self) -> dict:
+        return {
+            "rows_in": self.filas_entrada,
+            "rows_out": self.filas_salida,
+            "dropped_nulls": self.descartadas_nulos,
+            "duplicates_removed": self.duplicados,
+            "parse_failures": self.fallos_parseo,
+            "filled": self.rellenados,
+            "fill_values": {c: v for c, v in self.rellenos.items()},
+        }
+
+
+def clean_dataset(
+    csv_path: Path,
+    out_path: Path,
+    numericas: list[str] | None = None,
+    politicas: dict[str, tuple[str, str | None]] | None = None,
+    locale: str = "en",
+    dedupe: bool = True,
+    dedupe_on: list[str] | None = None,
+    chunksize: int = 100_000,
+) -> dict:
+    """
+    Limpia `csv_path` por bloques y escribe `out_path`. Sin `numericas` se
+    parsean las columnas numéricas del dataset de productos que existan.
+    """
+    inicio = time.perf_counter()
+    columnas = list(pd.read_csv(csv_path, nrows=0).columns)
+    numericas = [c for c in NUMERIC_COLUMNS if c in columnas] if numericas is None else numericas
+    politicas = politicas or {}
+    if locale not in LOCALES:
+        raise ValueError(f"Locale desconocido: {locale} (opciones: {', '.join(LOCALES)})")
+    faltantes = [c for c in [*numericas, *politicas, *(dedupe_on or [])] if c not in columnas]
+    if faltantes:
+        raise ValueError(f"Columnas inexistentes: {', '.join(dict.fromkeys(faltantes))}")
+
+    rellenos = calcular_rellenos(csv_path, politicas, numericas, locale, chunksize)
+    limpiador = Limpiador(numericas, politicas, rellenos, locale, dedupe, dedupe_on)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    temporal = out_path.with_name(out_path.name + ".tmp")
+    try:
+        primero = True
+        # Todo como texto: el dtype inferido cambia de un bloque a otro ("1" en uno, "1.0" si
+        # otro trae un NaN) y con él el hash de duplicados; las numéricas se parsean después
+        for chunk in pd.read_csv(csv_path, dtype=str, chunksize=chunksize):
+            limpio = limpiador.consumir(chunk)
+            limpio.to_csv(temporal, mode="w" if primero else "a", header=primero, index=False)
+            primero = False
+        if primero:  # solo encabezado
+            pd.DataFrame(columns=columnas).to_csv(temporal, index=False)
+        temporal.replace(out_path)
+    except BaseException:
+        temporal.unlink(missing_ok=True)
+        raise
+
+    segundos = time.perf_counter() - inicio
+    reporte = limpiador.reporte()
+    reporte["seconds"] = segundos
+    reporte["rows_per_sec"] = reporte["rows_in"] / segundos if segundos > 0 else None
+    return reporte
+
+
+def print_report(reporte: dict) -> None:
+    print(f"Rows in / Filas leídas: {reporte['rows_in']}")
+    print(f"Rows out / Filas escritas: {reporte['rows_out']}")
+    print(f"Dropped for nulls / Descartadas por nulos: {reporte['dropped_nulls']}")
+    print(f"Duplicates removed / Duplicados eliminados: {reporte['duplicates_removed']}")
+    for col, n in reporte["parse_failures"].items():
+        if n:
+            print(f"- {col}: {n} values not parseable / valores no convertibles")
+    for col, n in reporte["filled"].items():
+        print(f"- {col}: {n} nulls filled with / nulos rellenados con {reporte['fill_values'][col]!r}")
+    print(f"Throughput / Rendimiento: {reporte['rows_per_sec']:,.0f} rows/s / filas/s ({reporte['seconds']:.2f}s)")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Clean a CSV by chunks: numeric strings, nulls and duplicates")
+    parser.add_argument("--path", type=str, default=None, help="Ruta del CSV (default: backend/datasets/product_dataset.csv)")
+    parser.add_argument("--out", type=str, default=None, help="CSV limpio (default: <nombre>_clean.csv junto al original)")
+    parser.add_argument("--numeric", type=str, default=None, help="Columnas a convertir a número, separadas por coma (default: las numéricas del dataset de productos)")
+    parser.add_argument("--locale", choices=list(LOCALES), default="en", help="Separadores: en=1,234.5  es=1.234,5  fr=1 234,5 (default: en)")
+    parser.add_argument("--nulls", type=str, default=None, help="Políticas por columna, p. ej. 'Cost=median,Name=drop,Supplier=fill:N/A' (default: keep)")
+    parser.add_argument("--dedupe-on", type=str, default=None, help="Columnas que definen un duplicado, separadas por coma (default: la fila completa)")
+    parser.add_argument("--no-dedupe", action="store_true", help="No eliminar duplicados")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Filas por bloque de lectura (default: 100000)")
+    parser.add_argument("--json-out", type=str, default=None, help="Archivo JSON para guardar el reporte (opcional)")
+    parser.add_argument("--profile", type=str, default=None, help="Guardar un perfil de muestreo (formato folded/flamegraph) en este archivo (opcional)")
+    args = parser.parse_args(argv)
+
+    with perfilar_a_archivo(args.profile):
+        return _run(args)
+
+
+def _lista(texto: str | None) -> list[str] | None:
+    return None if texto is None else [c.strip() for c in texto.split(",") if c.strip()]
+
+
+def _run(args: argparse.Namespace) -> int:
+    csv_path = Path(args.path) if args.path else default_dataset_path()
+    if not csv_path.exists():
+        print(f"ERROR: CSV not found / no encontrado: {csv_path}")
+        return 1
+    out_path = Path(args.out) if args.out else default_output_path(csv_path)
+    if out_path.resolve() == csv_path.resolve():
+        print("ERROR: --out must differ from the input / debe ser distinto del CSV de entrada")
+        return 1
+
+    try:
+        reporte = clean_dataset(
+            csv_path,
+            out_path,
+            numericas=_lista(args.numeric),
+            politicas=parse_politicas(args.nulls),
+            locale=args.locale,
+            dedupe=not args.no_dedupe,
+            dedupe_on=_lista(args.dedupe_on),
+            chunksize=args.chunksize,
+        )
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    print_report(reporte)
+    print(f"Clean dataset saved to / Dataset limpio guardado en: {out_path}")
+    if args.json_out:
+        out_json = Path(args.json_out)
+        out_json.parent.mkdir(parents=True, exist_ok=True)
+        with out_json.open("w", encoding="utf-8") as f:
+            json.dump(reporte, f, indent=2, default=str)
+        print(f"Report saved to / Reporte guardado en: {out_json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
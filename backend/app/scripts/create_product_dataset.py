@@ -7,6 +7,8 @@ Mejoras:
 - Ruta de salida robusta relativa al repo (backend/datasets)
 - Crea el directorio de salida si no existe
 - Reproducibilidad opcional vía semilla
+- --partition-by Category[,Supplier]: escribe un dataset particionado al
+  estilo Hive (Category=Food/part-*.parquet) en lugar del CSV
 """
 
 from __future__ import annotations
@@ -19,13 +21,17 @@ import uuid
 import numpy as np
 import pandas as pd
 
+from app.core.profiling import perfilar_a_archivo
+from app.scripts.partitioned_dataset import FORMATOS, default_partitioned_path, guardar_particionado, print_resumen
 
-def generate_dataset(num_samples: int, seed: int | None = None) -> pd.DataFrame:
+
+def generate_dataset(num_samples: int, seed: int | None = None, inicio: int = 0) -> pd.DataFrame:
     """Genera un DataFrame con datos de productos.
 
     Args:
         num_samples: cantidad de filas a generar.
         seed: semilla opcional para reproducibilidad.
+        inicio: desplazamiento de la numeración (Name/Code/...), para generar por bloques.
 
     Returns:
         DataFrame con el dataset de productos.
@@ -37,9 +43,9 @@ def generate_dataset(num_samples: int, seed: int | None = None) -> pd.DataFrame:
 
     data = {
         "Id": [str(uuid.uuid4()) for _ in range(num_samples)],
-        "Name": [f"Product_{i+1}" for i in range(num_samples)],
-        "Code": [f"P{i+1000}" for i in range(num_samples)],
-        "Description": [f"Description of product {i+1}" for i in range(num_samples)],
+        "Name": [f"Product_{i+1}" for i in range(inicio, inicio + num_samples)],
+        "Code": [f"P{i+1000}" for i in range(inicio, inicio + num_samples)],
+        "Description": [f"Description of product {i+1}" for i in range(inicio, inicio + num_samples)],
         "Category": np.random.choice(categories, num_samples),
         "IsActive": np.random.choice([True, False], num_samples, p=[0.9, 0.1]),
         "DiscontinuedAt": [
@@ -52,8 +58,8 @@ def generate_dataset(num_samples: int, seed: int | None = None) -> pd.DataFrame:
         "NutritionalValue": np.random.uniform(1, 10, num_samples),
         "Cost": np.random.uniform(10, 100, num_samples),
         "EnvironmentalImpact": np.random.uniform(0.1, 5.0, num_samples),
-        "Notes": [f"Note {i+1}" for i in range(num_samples)],
-        "Supplier": [f"Supplier {i % 5 + 1}" for i in range(num_samples)],
+        "Notes": [f"Note {i+1}" for i in range(inicio, inicio + num_samples)],
+        "Supplier": [f"Supplier {i % 5 + 1}" for i in range(inicio, inicio + num_samples)],
         "ShelfLife": [timedelta(days=np.random.randint(30, 365)) for _ in range(num_samples)],
     }
 
@@ -70,7 +76,7 @@ def default_output_path() -> Path:
     return backend_root / "datasets" / "product_dataset.csv"
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(description="Generate a synthetic product dataset and save as CSV")
     parser.add_argument("--num-samples", type=int, default=50, help="Number of products to generate (default: 50)")
     parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducibility (optional)")
@@ -78,12 +84,30 @@ def main() -> None:
         "--out",
         type=str,
         default=None,
-        help="Output CSV path (default: backend/datasets/product_dataset.csv)",
+        help="Output CSV path, or folder with --partition-by (default: backend/datasets/product_dataset.csv or backend/datasets/product_dataset)",
     )
-    args = parser.parse_args()
+    parser.add_argument("--partition-by", type=str, default=None, help="Partition columns, comma separated, e.g. Category,Supplier (optional)")
+    parser.add_argument("--format", choices=FORMATOS, default=None, help="Partition file format with --partition-by (default: parquet if pyarrow is installed, else csv)")
+    parser.add_argument("--profile", type=str, default=None, help="Save a sampling profile (folded/flamegraph format) to this file (optional)")
+    args = parser.parse_args(argv)
+
+    with perfilar_a_archivo(args.profile):
+        _run(args)
 
+
+def _run(args: argparse.Namespace) -> None:
     df = generate_dataset(num_samples=args.num_samples, seed=args.seed)
 
+    if args.partition_by:
+        out_path = Path(args.out) if args.out else default_partitioned_path()
+        particion_por = [c.strip() for c in args.partition_by.split(",") if c.strip()]
+        try:
+            print_resumen(guardar_particionado(df, out_path, particion_por, formato=args.format))
+        except ValueError as e:
+            raise SystemExit(f"ERROR: {e}")
+        print(f"Partitioned dataset saved to / Dataset particionado guardado en: {out_path}")
+        return
+
     out_path = Path(args.out) if args.out else default_output_path()
     out_path.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(out_path, index=False)
@@ -0,0 +1,296 @@
+"""
+duplicates.py
+
+Detección de claves duplicadas (Id, Code) en CSV que no entran en memoria.
+
+- Exacta: cada valor se hashea y se vuelca (valor, fila) al bucket
+  `hash % particiones` en disco; después se revisa un bucket por vez, así la
+  memoria es ~1/particiones de la columna. Dos valores iguales siempre caen
+  en el mismo bucket, por eso el resultado es exacto.
+- Bloom: una sola pasada con un filtro de Bloom. Sin falsos negativos: si no
+  marca nada la columna es única; lo que marca es una cota superior (puede
+  incluir falsos positivos con la tasa informada).
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+COLUMNAS_CLAVE = ("Id", "Code")
+MODOS = ("exact", "bloom", "bloom+exact", "off")
+
+
+def _hashes(valores: pd.Series) -> np.ndarray:
+    return pd.util.hash_pandas_object(valores, index=False).to_numpy()
+
+
+def _normalizar(chunk: pd.DataFrame, col: str) -> pd.Series:
+    """Valores no nulos como texto, indexados por número de fila de datos."""
+    return chunk[col].dropna().astype(str)
+
+
+class FiltroBloom:
+    def __init__(self, capacidad: int, tasa_error: float = 0.001):
+        if not 0 < tasa_error < 1:
+            raise ValueError("La tasa de error debe estar entre 0 y 1.")
+        capacidad = max(1, capacidad)
+        self.m = max(64, math.ceil(-capacidad * math.log(tasa_error) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacidad * math.log(2)))
+        self.bits = np.zeros((self.m + 7) // 8, dtype=np.uint8)
+
+    def _posiciones(self, hashes: np.ndarray) -> np.ndarray:
+        # Doble hashing (Kirsch–Mitzenmacher): h1 + i*h2 a partir de un hash de 64 bits
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        i = np.arange(self.k, dtype=np.uint64)
+        return (h1[:, None] + i[None, :] * h2[:, None]) % np.uint64(self.m)
+
+    def contiene(self, hashes: np.ndarray) -> np.ndarray:
+        pos = self._posiciones(hashes)
+        return np.all(self.bits[pos >> np.uint64(3)] & (1 << (pos & np.uint64(7))).astype(np.uint8), axis=1)
+
+    def agregar(self, hashes: np.ndarray) -> None:
+        pos = self._posiciones(hashes).ravel()
+        np.bitwise_or.at(self.bits, pos >> np.uint64(3), (1 << (pos & np.uint64(7))).astype(np.uint8))
+
+    @property
+    def tasa_falsos_positivos(self) -> float:
+        """Tasa estimada según la fracción de bits encendidos."""
+        llenado = int(np.unpackbits(self.bits)[: self.m].sum()) / self.m
+        return llenado**self.k
+
+
+class DetectorBloom:
+    """Pasada probabilística: alimentar con `consumir` y pedir el `resultado` al final."""
+
+    def __init__(
+        self,
+        capacidad: int,
+        columnas: Iterable[str] = COLUMNAS_CLAVE,
+        tasa_error: float = 0.001,
+        max_ejemplos: int = 5,
+    ):
+        self.columnas = list(columnas)
+        self.max_ejemplos = max_ejemplos
+        self.filtros = {col: FiltroBloom(capacidad, tasa_error) for col in self.columnas}
+        self.marcadas = dict.fromkeys(self.columnas, 0)
+        self.ejemplos: dict[str, list[dict]] = {col: [] for col in self.columnas}
+
+    def consumir(self, chunk: pd.DataFrame) -> None:
+        for col in self.columnas:
+            if col not in chunk.columns:
+                continue
+            valores = _normalizar(chunk, col)
+            if valores.empty:
+                continue
+            hashes = _hashes(valores)
+            posibles = self.filtros[col].contiene(hashes) | pd.Series(hashes).duplicated().to_numpy()
+            self.filtros[col].agregar(hashes)
+            self.marcadas[col] += int(posibles.sum())
+            faltan = self.max_ejemplos - len(self.ejemplos[col])
+            if faltan > 0:
+                self.ejemplos[col] += [{"value": v, "row": int(f)} for f, v in valores[posibles].head(faltan).items()]
+
+    def resultado(self) -> dict[str, dict]:
+        return {
+            col: {
+                "exact": False,
+                "possible_duplicate_rows": self.marcadas[col],
+                "false_positive_rate": self.filtros[col].tasa_falsos_positivos,
+                "examples": self.ejemplos[col],
+            }
+            for col in self.columnas
+        }
+
+
+class DetectorExacto:
+    """
+    Cuenta, por columna, los valores repetidos ("duplicate_values") y las filas
+    que repiten un valor ya visto ("duplicate_rows"), con hasta `max_ejemplos`
+    valores de ejemplo y las filas (0-based, sin encabezado) donde aparecen.
+
+    `consumir` vuelca (fila, valor) al bucket de su hash; `resultado` revisa
+    un bucket por vez y borra los archivos.
+    """
+
+    def __init__(
+        self,
+        columnas: Iterable[str] = COLUMNAS_CLAVE,
+        particiones: int = 64,
+        directorio: Path | None = None,
+        max_ejemplos: int = 5,
+    ):
+        if particiones <= 0:
+            raise ValueError("La cantidad de particiones debe ser mayor a 0.")
+        self.columnas = list(columnas)
+        self.particiones = particiones
+        self.max_ejemplos = max_ejemplos
+        self._tmp = tempfile.TemporaryDirectory(prefix="duplicados-", dir=directorio)
+        self.buckets = {
+            col: [Path(self._tmp.name) / f"{i}-{p}.pkl" for p in range(particiones)]
+            for i, col in enumerate(self.columnas)
+        }
+
+    def consumir(self, chunk: pd.DataFrame) -> None:
+        for col in self.columnas:
+            if col not in chunk.columns:
+                continue
+            valores = _normalizar(chunk, col)
+            if valores.empty:
+                continue
+            particion = _hashes(valores) % np.uint64(self.particiones)
+            filas, textos = valores.index.to_numpy(), valores.to_numpy()
+            orden = np.argsort(particion, kind="stable")
+            cortes = np.flatnonzero(np.diff(particion[orden])) + 1
+            # Los buckets son temporales y privados: pickle es mucho más rápido que to_csv
+            for indices in np.split(orden, cortes):
+                with self.buckets[col][int(particion[indices[0]])].open("ab") as f:
+                    pickle.dump((filas[indices], textos[indices]), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def resultado(self) -> dict[str, dict]:
+        try:
+            return {col: self._revisar(col) for col in self.columnas}
+        finally:
+            self.cerrar()
+
+    def cerrar(self) -> None:
+        self._tmp.cleanup()
+
+    def _revisar(self, col: str) -> dict:
+        valores_dup = filas_dup = 0
+        # Max-heap por primera fila (negada) con los `max_ejemplos` ejemplos que aparecen antes;
+        # cada fila tiene un solo valor, así que no hay empates
+        ejemplos: list[tuple[int, dict]] = []
+        for bucket in self.buckets[col]:
+            if not bucket.exists():
+                continue
+            datos = pd.DataFrame(_leer_bucket(bucket), columns=["row", "value"])
+            conteos = datos["value"].value_counts()
+            repetidos = conteos[conteos > 1]
+            valores_dup += len(repetidos)
+            filas_dup += int((repetidos - 1).sum())
+            if not len(repetidos) or not self.max_ejemplos:
+                continue
+            dup = datos[datos["value"].isin(repetidos.index)]
+            for valor, primera in dup.groupby("value")["row"].min().nsmallest(self.max_ejemplos).items():
+                if len(ejemplos) == self.max_ejemplos and primera > -ejemplos[0][0]:
+                    break  # vienen ordenadas: las siguientes tampoco entran
+                filas = np.sort(dup["row"].to_numpy()[(dup["value"] == valor).to_numpy()])
+                ejemplo = {"value": valor, "count": len(filas), "rows": filas[:10].tolist()}
+                if len(ejemplos) < self.max_ejemplos:
+                    heapq.heappush(ejemplos, (-int(primera), ejemplo))
+                else:
+                    heapq.heapreplace(ejemplos, (-int(primera), ejemplo))
+        return {
+            "exact": True,
+            "duplicate_values": valores_dup,
+            "duplicate_rows": filas_dup,
+            "examples": [e for _, e in sorted(ejemplos, key=lambda par: -par[0])],
+        }
+
+
+def _leer_bucket(path: Path) -> dict[str, np.ndarray]:
+    filas, textos = [], []
+    with path.open("rb") as f:
+        while True:
+            try:
+                parte_filas, parte_textos = pickle.load(f)
+            except EOFError:
+                break
+            filas.append(parte_filas)
+            textos.append(parte_textos)
+    return {"row": np.concatenate(filas), "value": np.concatenate(textos)}
+
+
+def duplicados_bloom(
+    chunks: Iterable[pd.DataFrame],
+    capacidad: int,
+    columnas: Iterable[str] = COLUMNAS_CLAVE,
+    tasa_error: float = 0.001,
+    max_ejemplos: int = 5,
+) -> dict[str, dict]:
+    detector = DetectorBloom(capacidad, columnas, tasa_error, max_ejemplos)
+    for chunk in chunks:
+        detector.consumir(chunk)
+    return detector.resultado()
+
+
+def duplicados_exactos(
+    chunks: Iterable[pd.DataFrame],
+    columnas: Iterable[str] = COLUMNAS_CLAVE,
+    particiones: int = 64,
+    directorio: Path | None = None,
+    max_ejemplos: int = 5,
+) -> dict[str, dict]:
+    detector = DetectorExacto(columnas, particiones, directorio, max_ejemplos)
+    try:
+        for chunk in chunks:
+            detector.consumir(chunk)
+    except BaseException:
+        detector.cerrar()
+        raise
+    return detector.resultado()
+
+
+def estimar_filas(csv_path: Path, muestra: int = 1_000) -> int:
+    """Filas aproximadas del CSV según el largo medio de las primeras líneas."""
+    tamanio = csv_path.stat().st_size
+    with csv_path.open("rb") as f:
+        encabezado = len(f.readline())
+        largos = [len(linea) for _, linea in zip(range(muestra), f)]
+    if not largos:
+        return 0
+    return math.ceil((tamanio - encabezado) / (sum(largos) / len(largos)))
+
+
+def check_duplicates(
+    csv_path: Path,
+    modo: str = "exact",
+    columnas: Iterable[str] = COLUMNAS_CLAVE,
+    chunksize: int = 100_000,
+    particiones: int = 64,
+    tasa_error: float = 0.001,
+    max_ejemplos: int = 5,
+    directorio: Path | None = None,
+) -> dict[str, dict]:
+    """
+    Busca claves duplicadas leyendo `csv_path` por bloques.
+
+    Modos: "exact" (buckets en disco), "bloom" (solo filtro de Bloom,
+    probabilístico), "bloom+exact" (el filtro descarta sin volcar a disco las
+    columnas que son únicas y el resto se resuelve exacto) y "off".
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo de duplicados desconocido: {modo}")
+    presentes = set(pd.read_csv(csv_path, nrows=0).columns)
+    columnas = [c for c in columnas if c in presentes]
+    if modo != "bloom" and particiones <= 0:
+        raise ValueError("La cantidad de particiones debe ser mayor a 0.")
+    if modo == "off" or not columnas:
+        return {}
+
+    def leer():
+        return pd.read_csv(csv_path, usecols=columnas, dtype=str, chunksize=chunksize)
+
+    resultado: dict[str, dict] = {}
+    if modo in ("bloom", "bloom+exact"):
+        # Margen x2 sobre la estimación: si se queda corto, la tasa informada lo refleja
+        resultado = duplicados_bloom(leer(), 2 * estimar_filas(csv_path), columnas, tasa_error, max_ejemplos)
+        if modo == "bloom":
+            return resultado
+        columnas = [c for c in columnas if resultado[c]["possible_duplicate_rows"] > 0]
+        for col in resultado:
+            if col not in columnas:
+                resultado[col] = {"exact": True, "duplicate_values": 0, "duplicate_rows": 0, "examples": []}
+        if not columnas:
+            return resultado
+    resultado.update(duplicados_exactos(leer(), columnas, particiones, directorio, max_ejemplos))
+    return resultado
@@ -0,0 +1,345 @@
+"""
+excel_ingest.py
+
+Ingesta de planillas XLSX grandes a un formato rápido, una sola vez.
+
+`pd.read_excel(..., engine="openpyxl")` arma el DOM completo del libro y
+tarda minutos con las planillas de proveedores de ~500k filas. Acá el libro
+se lee con openpyxl en modo read-only (streaming) por lotes de filas; cada
+lote se convierte a DataFrame y sus tipos se coercionan de forma vectorizada
+con un esquema fijo (inferido del primer lote o indicado con --types). El
+resultado se escribe en una caché Parquet (si pyarrow está instalado) o CSV,
+con el hash del libro en el nombre: mientras el archivo no cambie, los
+análisis siguientes leen la caché y no vuelven a tocar el XLSX.
+
+Tipos de columna: "str", "float", "bool", "datetime". Id y Code siempre se
+tratan como texto, igual que en el resto de los scripts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib.util
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+from app.core.profiling import perfilar_a_archivo
+from app.scripts.duplicates import COLUMNAS_CLAVE
+
+TIPOS = ("str", "float", "bool", "datetime")
+FORMATOS = ("parquet", "csv")
+# infer_dtype de pandas -> tipo del esquema; lo demás queda como texto
+_INFERIDOS = {
+    "boolean": "bool",
+    "integer": "float",
+    "floating": "float",
+    "mixed-integer-float": "float",
+    "decimal": "float",
+    "datetime": "datetime",
+    "datetime64": "datetime",
+    "date": "datetime",
+}
+
+
+def default_cache_dir() -> Path:
+    # Este archivo está en backend/app/scripts/...  => subir dos niveles para llegar a backend/
+    backend_root = Path(__file__).resolve().parents[2]
+    return backend_root / "datasets" / "excel_cache"
+
+
+def formato_por_defecto() -> str:
+    return "parquet" if importlib.util.find_spec("pyarrow") is not None else "csv"
+
+
+def hash_libro(path: Path, bloque: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        while parte := f.read(bloque):
+            h.update(parte)
+    return h.hexdigest()
+
+
+# --- Lectura en streaming ------------------------------------------------------
+
+
+def filas_xlsx(xlsx_path: Path, hoja: str | None = None) -> Iterator[tuple]:
+    """Filas del libro como tuplas de valores, sin cargar el DOM (openpyxl read-only)."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ValueError("Falta openpyxl para leer XLSX: pip install openpyxl") from e
+
+    try:
+        libro = load_workbook(xlsx_path, read_only=True, data_only=True)
+    except Exception as e:  # zip inválido, formato no soportado, etc.
+        raise ValueError(f"No se pudo abrir el XLSX {xlsx_path}: {e}") from e
+    try:
+        if hoja is not None and hoja not in libro.sheetnames:
+            raise ValueError(f"Hoja no encontrada: {hoja} (hojas: {', '.join(libro.sheetnames)})")
+        yield from (libro[hoja] if hoja is not None else libro.active).iter_rows(values_only=True)
+    finally:
+        libro.close()  # en read-only el archivo queda abierto hasta cerrarlo
+
+
+def _encabezado(fila: tuple) -> list[str]:
+    columnas = [str(v).strip() if v is not None else "" for v in fila]
+    while columnas and not columnas[-1]:  # celdas vacías al final del encabezado
+        columnas.pop()
+    return [c or f"col_{i}" for i, c in enumerate(columnas)]
+
+
+def lotes(filas: Iterable[tuple], filas_por_lote: int = 50_000) -> Iterator[pd.DataFrame]:
+    """
+    Agrupa las filas (la primera es el encabezado) en DataFrames de hasta
+    `filas_por_lote` filas, sin coercionar. Descarta las filas vacías que
+    openpyxl suele devolver al final de la hoja.
+    """
+    filas = iter(filas)
+    encabezado = _encabezado(next(filas, ()))
+    if not encabezado:
+        raise ValueError("La hoja está vacía o no tiene encabezado.")
+    ancho = len(encabezado)
+    vacio = True
+    while lote := list(itertools.islice(filas, filas_por_lote)):
+        # Normalizar el ancho: filas más cortas o con celdas sobrantes a la derecha
+        df = pd.DataFrame(
+            [fila if len(fila) == ancho else fila[:ancho] + (None,) * (ancho - len(fila)) for fila in lote],
+            columns=encabezado,
+            dtype=object,
+        )
+        df = df.dropna(how="all")
+        if len(df):
+            vacio = False
+            yield df
+    if vacio:
+        yield pd.DataFrame(columns=encabezado, dtype=object)
+
+
+# --- Tipos -----------------------------------------------------------------
+
+
+def inferir_esquema(df: pd.DataFrame, tipos: dict[str, str] | None = None) -> dict[str, str]:
+    """Tipo de cada columna según sus valores no nulos; `tipos` tiene prioridad."""
+    tipos = tipos or {}
+    desconocidos = set(tipos.values()) - set(TIPOS)
+    if desconocidos:
+        raise ValueError(f"Tipos desconocidos: {', '.join(sorted(desconocidos))}")
+    esquema = {}
+    for col in df.columns:
+        if col in tipos:
+            esquema[col] = tipos[col]
+        elif col in COLUMNAS_CLAVE:
+            esquema[col] = "str"
+        else:
+            esquema[col] = _INFERIDOS.get(pd.api.types.infer_dtype(df[col], skipna=True), "str")
+    return esquema
+
+
+def coercionar(df: pd.DataFrame, esquema: dict[str, str]) -> pd.DataFrame:
+    """Aplica el esquema columna por columna; lo que no convierte queda nulo."""
+    salida = {}
+    for col, tipo in esquema.items():
+        serie = df[col] if col in df.columns else pd.Series(None, index=df.index, dtype=object)
+        if tipo == "float":
+            salida[col] = pd.to_numeric(serie, errors="coerce").astype("float64")
+        elif tipo == "datetime":
+            salida[col] = pd.to_datetime(serie, errors="coerce")
+        elif tipo == "bool":
+            texto = serie.astype("string").str.strip().str.lower()
+            salida[col] = texto.map({"true": True, "1": True, "false": False, "0": False}).astype("boolean")
+        else:
+            salida[col] = serie.astype("string").str.strip()
+    return pd.DataFrame(salida, index=df.index).reset_index(drop=True)
+
+
+# --- Caché -----------------------------------------------------------------
+
+
+def ruta_cache(xlsx_path: Path, hoja: str | None, esquema_pedido: dict[str, str], formato: str, cache_dir: Path) -> Path:
+    """La clave incluye el contenido del libro, la hoja y los tipos pedidos."""
+    huella = hashlib.sha256(
+        json.dumps([hash_libro(xlsx_path), hoja, sorted(esquema_pedido.items())]).encode()
+    ).hexdigest()[:16]
+    return cache_dir / f"{xlsx_path.stem}-{huella}.{formato}"
+
+
+def _ruta_esquema(cache_path: Path) -> Path:
+    return cache_path.with_name(cache_path.name + ".schema.json")
+
+
+class _EscritorParquet:
+    def __init__(self, path: Path, esquema: dict[str, str]):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        tipos = {"str": pa.string(), "float": pa.float64(), "bool": pa.bool_(), "datetime": pa.timestamp("ns")}
+        self.pa = pa
+        self.schema = pa.schema([(col, tipos[tipo]) for col, tipo in esquema.items()])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def escribir(self, df: pd.DataFrame) -> None:
+        self.writer.write_table(self.pa.Table.from_pandas(df, schema=self.schema, preserve_index=False))
+
+    def cerrar(self) -> None:
+        self.writer.close()
+
+
+class _EscritorCSV:
+    def __init__(self, path: Path, esquema: dict[str, str]):
+        self.path = path
+        self.primero = True
+
+    def escribir(self, df: pd.DataFrame) -> None:
+        df.to_csv(self.path, mode="w" if self.primero else "a", header=self.primero, index=False)
+        self.primero = False
+
+    def cerrar(self) -> None:
+        pass
+
+
+def escribir_cache(
+    filas: Iterable[tuple],
+    destino: Path,
+    tipos: dict[str, str] | None = None,
+    filas_por_lote: int = 50_000,
+) -> int:
+    """
+    Coerciona y escribe las filas lote por lote en `destino` (.parquet o
+    .csv) junto a su esquema; devuelve la cantidad de filas. Se escribe en un
+    temporal, así una ingesta interrumpida no deja una caché a medias.
+    """
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporal = destino.with_name(destino.name + ".tmp")
+    escritor = None
+    total = 0
+    try:
+        for lote in lotes(filas, filas_por_lote):
+            if escritor is None:
+                esquema = inferir_esquema(lote, tipos)
+                escritor = (_EscritorParquet if destino.suffix == ".parquet" else _EscritorCSV)(temporal, esquema)
+            datos = coercionar(lote, esquema)
+            escritor.escribir(datos)
+            total += len(datos)
+    except BaseException:
+        if escritor is not None:
+            escritor.cerrar()
+        temporal.unlink(missing_ok=True)
+        raise
+    escritor.cerrar()
+    _ruta_esquema(destino).write_text(json.dumps({"rows": total, "columns": esquema}, indent=2), encoding="utf-8")
+    temporal.replace(destino)
+    return total
+
+
+def leer_cache(cache_path: Path) -> pd.DataFrame:
+    """Carga la caché con los mismos tipos con los que se escribió."""
+    if cache_path.suffix == ".parquet":
+        return pd.read_parquet(cache_path)
+    esquema = json.loads(_ruta_esquema(cache_path).read_text(encoding="utf-8"))["columns"]
+    dtype = {c: {"str": "string", "float": "float64", "bool": "boolean"}[t] for c, t in esquema.items() if t != "datetime"}
+    fechas = [c for c, t in esquema.items() if t == "datetime"]
+    return pd.read_csv(cache_path, dtype=dtype, parse_dates=fechas, keep_default_na=False, na_values=[""])
+
+
+def ingestar(
+    xlsx_path: Path,
+    hoja: str | None = None,
+    cache_dir: Path | None = None,
+    tipos: dict[str, str] | None = None,
+    formato: str | None = None,
+    filas_por_lote: int = 50_000,
+    forzar: bool = False,
+) -> tuple[Path, bool]:
+    """
+    Devuelve (ruta de la caché, si ya existía). Solo lee el XLSX si no hay
+    caché para este contenido, hoja y tipos, o con `forzar`.
+    """
+    formato = formato or formato_por_defecto()
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato}")
+    if formato == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise ValueError("Falta pyarrow para escribir Parquet: pip install pyarrow (o usar --format csv)")
+    desconocidos = set((tipos or {}).values()) - set(TIPOS)
+    if desconocidos:
+        raise ValueError(f"Tipos desconocidos: {', '.join(sorted(desconocidos))}")
+    destino = ruta_cache(xlsx_path, hoja, tipos or {}, formato, cache_dir or default_cache_dir())
+    if destino.exists() and _ruta_esquema(destino).exists() and not forzar:
+        return destino, True
+    escribir_cache(filas_xlsx(xlsx_path, hoja), destino, tipos, filas_por_lote)
+    return destino, False
+
+
+def leer_excel(xlsx_path: Path, hoja: str | None = None, **kwargs) -> pd.DataFrame:
+    """Reemplazo de `pd.read_excel` para análisis: pasa por la caché."""
+    cache_path, _ = ingestar(xlsx_path, hoja, **kwargs)
+    return leer_cache(cache_path)
+
+
+def _parse_tipos(texto: str | None) -> dict[str, str]:
+    tipos = {}
+    for par in filter(None, (p.strip() for p in (texto or "").split(","))):
+        col, sep, tipo = par.partition("=")
+        if not sep or not col.strip():
+            raise ValueError(f"Tipo mal formado (se espera Columna=tipo): {par}")
+        tipos[col.strip()] = tipo.strip()
+    return tipos
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream an XLSX workbook into a Parquet/CSV cache")
+    parser.add_argument("path", type=str, help="Ruta del XLSX")
+    parser.add_argument("--sheet", type=str, default=None, help="Hoja a leer (default: la activa)")
+    parser.add_argument("--cache-dir", type=str, default=None, help="Carpeta de la caché (default: backend/datasets/excel_cache)")
+    parser.add_argument("--format", choices=FORMATOS, default=None, help="Formato de la caché (default: parquet si hay pyarrow, si no csv)")
+    parser.add_argument("--types", type=str, default=None, help="Tipos forzados, p. ej. 'Cost=float,IsActive=bool' (tipos: str, float, bool, datetime)")
+    parser.add_argument("--batch-rows", type=int, default=50_000, help="Filas por lote (default: 50000)")
+    parser.add_argument("--force", action="store_true", help="Volver a leer el XLSX aunque haya caché")
+    parser.add_argument("--profile", type=str, default=None, help="Guardar un perfil de muestreo (formato folded/flamegraph) en este archivo (opcional)")
+    args = parser.parse_args(argv)
+
+    with perfilar_a_archivo(args.profile):
+        return _run(args)
+
+
+def _run(args: argparse.Namespace) -> int:
+    xlsx_path = Path(args.path)
+    if not xlsx_path.exists():
+        print(f"ERROR: XLSX not found / no encontrado: {xlsx_path}")
+        return 1
+    if args.batch_rows <= 0:
+        print("ERROR: --batch-rows must be > 0 / debe ser > 0")
+        return 1
+
+    inicio = time.perf_counter()
+    try:
+        cache_path, existia = ingestar(
+            xlsx_path,
+            hoja=args.sheet,
+            cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+            tipos=_parse_tipos(args.types),
+            formato=args.format,
+            filas_por_lote=args.batch_rows,
+            forzar=args.force,
+        )
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    esquema = json.loads(_ruta_esquema(cache_path).read_text(encoding="utf-8"))
+    estado = "cache hit / ya estaba en caché" if existia else f"ingested / ingerido en {time.perf_counter() - inicio:.2f}s"
+    print(f"{xlsx_path.name}: {esquema['rows']} rows / filas, {estado}")
+    for col, tipo in esquema["columns"].items():
+        print(f"  {col}: {tipo}")
+    print(f"Cache / Caché: {cache_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,14 @@ Mejoras:
 - Ruta por defecto consistente
 - Lectura rápida de head (nrows) y carga selectiva de columnas para el resto
 - Conversión numérica segura
+- Lectura por bloques (--chunksize) con estadísticas de una sola pasada
+  (desvío, mín./máx., nulos, percentiles e histogramas) que no necesitan
+  cargar el CSV completo en memoria
+- Modo muestra (--sample N): vista previa y métricas sobre una muestra
+  aleatoria (reservorio o bloques por offset de bytes) con intervalos de
+  confianza, para respuestas en segundos sobre archivos enormes
+- --path acepta también un dataset particionado (ver partitioned_dataset) y
+  --where Category=Food descarta las demás particiones antes de leer
 """
 
 from __future__ import annotations
@@ -15,8 +23,27 @@ import argparse
 import json
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from app.core.profiling import perfilar_a_archivo
+from app.scripts.partitioned_dataset import (
+    Filtros,
+    cabeza,
+    cargar_dataset,
+    es_particionado,
+    leer_dataset,
+    parse_filtros,
+    resumen_poda,
+)
+from app.scripts.sampling import Muestra, intervalo_media, muestra_por_bloques, muestra_reservorio
+from app.scripts.streaming_stats import EstadisticasStreaming, SumasPorCategoria
+
+METRIC_COLUMNS = ["BaseYield", "Cost", "EnvironmentalImpact"]
+STATS_COLUMNS = ["BaseYield", "NutritionalValue", "Cost", "EnvironmentalImpact"]
+CATEGORY_AVERAGES = {"BaseYield": "AvgYield", "Cost": "AvgCost", "EnvironmentalImpact": "AvgEnvImpact"}
+SAMPLE_METHODS = ("reservoir", "blocks")
+
 
 def default_dataset_path() -> Path:
     # Este archivo está en backend/app/scripts/...  => subir dos niveles para llegar a backend/
@@ -24,14 +51,14 @@ def default_dataset_path() -> Path:
     return backend_root / "datasets" / "product_dataset.csv"
 
 
-def load_head(csv_path: Path, n: int = 5) -> pd.DataFrame:
-    return pd.read_csv(csv_path, nrows=max(1, n), low_memory=False)
+def load_head(csv_path: Path, n: int = 5, filtros: Filtros | None = None) -> pd.DataFrame:
+    return cabeza(csv_path, n, filtros)
 
 
-def load_for_metrics(csv_path: Path) -> pd.DataFrame:
-    usecols = ["Category", "BaseYield", "Cost", "EnvironmentalImpact"]
-    df = pd.read_csv(csv_path, usecols=usecols, low_memory=False)
-    for col in ["BaseYield", "Cost", "EnvironmentalImpact"]:
+def load_for_metrics(csv_path: Path, filtros: Filtros | None = None) -> pd.DataFrame:
+    usecols = ["Category", *METRIC_COLUMNS]
+    df = cargar_dataset(csv_path, usecols, filtros)
+    for col in METRIC_COLUMNS:
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors="coerce")
     return df
@@ -63,27 +90,137 @@ def compute_metrics(df: pd.DataFrame) -> dict:
     return {"averages": avg_metrics, "by_category": by_category}
 
 
-def main(argv: list[str] | None = None) -> int:
-    parser = argparse.ArgumentParser(description="Exploratory analysis of the product dataset")
-    parser.add_argument("--path", type=str, default=None, help="Ruta del CSV (default: backend/datasets/product_dataset.csv)")
-    parser.add_argument("--head-rows", type=int, default=5, help="Filas a mostrar en el head (default: 5)")
-    parser.add_argument("--json-out", type=str, default=None, help="Guardar resumen en JSON (opcional)")
-    args = parser.parse_args(argv)
+class AcumuladorExploratorio:
+    """Resumen exploratorio alimentado bloque a bloque (ver `compute_streaming_metrics`)."""
 
-    csv_path = Path(args.path) if args.path else default_dataset_path()
-    if not csv_path.exists():
-        print(f"ERROR: CSV not found / no encontrado: {csv_path}")
-        return 1
+    columnas = ["Category", *STATS_COLUMNS]
+
+    def __init__(self, epsilon: float = 0.005, bins: int = 10, seed: int | None = 0):
+        self.epsilon = epsilon
+        self.bins = bins
+        self.seed = seed
+        self.filas = 0
+        self.stats: EstadisticasStreaming | None = None
+        self.por_categoria = SumasPorCategoria(METRIC_COLUMNS)
+
+    def consumir(self, chunk: pd.DataFrame) -> None:
+        if self.stats is None:
+            presentes = [c for c in STATS_COLUMNS if c in chunk.columns]
+            self.stats = EstadisticasStreaming(presentes, epsilon=self.epsilon, seed=self.seed)
+        self.filas += len(chunk)
+        self.stats.actualizar(chunk)
+        self.por_categoria.actualizar(chunk)
+
+    def resultado(self) -> dict:
+        resumen = self.stats.resumen(bins=self.bins) if self.stats is not None else {}
+        averages = {col: (resumen[col]["mean"] if col in resumen else None) for col in METRIC_COLUMNS}
 
-    # Head
-    head_df = load_head(csv_path, n=args.head_rows)
-    print(f"Dataset head ({len(head_df)} rows):\n{head_df}\n")
+        by_category = []
+        parcial = self.por_categoria.parcial
+        if parcial is not None:
+            tabla = pd.DataFrame({"count": parcial["count"].astype(int)})
+            for col, nombre in CATEGORY_AVERAGES.items():
+                if f"{col}_sum" in parcial:
+                    tabla[nombre] = self.por_categoria.promedio(col)
+            tabla.index.name = "Category"
+            by_category = tabla.reset_index().to_dict(orient="records")
 
-    # Métricas
-    df = load_for_metrics(csv_path)
-    print(f"Dataset loaded for metrics: {len(df)} rows / filas\n")
+        return {"rows": self.filas, "averages": averages, "by_category": by_category, "stats": resumen}
+
+
+def compute_streaming_metrics(
+    csv_path: Path,
+    chunksize: int = 100_000,
+    epsilon: float = 0.005,
+    bins: int = 10,
+    seed: int | None = 0,
+    filtros: Filtros | None = None,
+) -> dict:
+    """
+    Igual que `compute_metrics(load_for_metrics(...))` más la sección "stats",
+    pero leyendo el CSV por bloques de `chunksize` filas: la memoria depende
+    del bloque y del sketch, no del tamaño del archivo.
+
+    Los percentiles e histogramas son aproximados con error de rango `epsilon`.
+    """
+    acumulador = AcumuladorExploratorio(epsilon=epsilon, bins=bins, seed=seed)
+    for chunk in leer_dataset(csv_path, AcumuladorExploratorio.columnas, filtros, chunksize=chunksize):
+        acumulador.consumir(chunk)
+    return acumulador.resultado()
+
+
+def load_sample(
+    csv_path: Path,
+    n: int,
+    method: str = "reservoir",
+    seed: int | None = None,
+    chunksize: int = 100_000,
+    block_rows: int = 1_000,
+) -> Muestra:
+    if method == "reservoir":
+        return muestra_reservorio(csv_path, n, seed=seed, chunksize=chunksize)
+    if method == "blocks":
+        return muestra_por_bloques(csv_path, n, seed=seed, filas_por_bloque=block_rows)
+    raise ValueError(f"Método de muestreo desconocido: {method}")
+
+
+def compute_sample_metrics(muestra: Muestra, confidence: float = 0.95, epsilon: float = 0.005, bins: int = 10) -> dict:
+    """
+    Las métricas de `compute_metrics` sobre la muestra, más "stats" e
+    "intervals": intervalo de confianza de cada promedio, de la proporción de
+    cada categoría y de sus promedios.
+    """
+    df = muestra.datos.copy()
+    for col in STATS_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
 
     summary = compute_metrics(df)
+    stats = EstadisticasStreaming([c for c in STATS_COLUMNS if c in df.columns], epsilon=epsilon, seed=0)
+    stats.actualizar(df)
+    summary["stats"] = stats.resumen(bins=bins)
+
+    grupos = muestra.grupos
+    poblacion = muestra.poblacion if muestra.poblacion_exacta else None
+    intervals = {
+        "averages": {
+            col: intervalo_media(df[col], confidence, grupos, poblacion) for col in METRIC_COLUMNS if col in df.columns
+        },
+        "by_category": [],
+    }
+    for row in summary["by_category"]:
+        categoria = row["Category"]
+        mascara = (df["Category"].isna() if pd.isna(categoria) else df["Category"] == categoria).to_numpy()
+        share = intervalo_media(mascara.astype(float), confidence, grupos, poblacion)
+        fila = {"Category": categoria, "share": share}
+        if muestra.poblacion:
+            fila["count_estimate"] = share["estimate"] * muestra.poblacion
+        for col, nombre in CATEGORY_AVERAGES.items():
+            if col in df.columns:
+                fila[nombre] = intervalo_media(
+                    df.loc[mascara, col], confidence, grupos[mascara] if grupos is not None else None
+                )
+        intervals["by_category"].append(fila)
+
+    summary["intervals"] = intervals
+    summary["sample"] = {
+        "method": muestra.metodo,
+        "size": len(df),
+        "population_rows": muestra.poblacion,
+        "population_exact": muestra.poblacion_exacta,
+        "blocks": int(len(np.unique(grupos))) if grupos is not None else None,
+        "confidence": confidence,
+    }
+    return summary
+
+
+def _fmt_intervalo(ic: dict) -> str:
+    if ic["low"] is None:
+        return f"{ic['estimate']} (no interval / sin intervalo)"
+    return f"{ic['estimate']:.6g} [{ic['low']:.6g}, {ic['high']:.6g}]"
+
+
+def print_summary(summary: dict) -> None:
     print("Average metrics / Promedio de métricas:")
     print(pd.Series(summary["averages"]))
 
@@ -95,6 +232,88 @@ def main(argv: list[str] | None = None) -> int:
                 f"AvgYield={row['AvgYield']}, AvgCost={row['AvgCost']}, AvgEnvImpact={row['AvgEnvImpact']}"
             )
 
+    if "intervals" in summary:
+        print(f"\n{summary['sample']['confidence']:.0%} confidence intervals / Intervalos de confianza:")
+        for col, ic in summary["intervals"]["averages"].items():
+            print(f"- {col}: {_fmt_intervalo(ic)}")
+        for fila in summary["intervals"]["by_category"]:
+            print(f"- {fila['Category']}: share / proporción {_fmt_intervalo(fila['share'])}")
+
+    epsilon = next((st["rank_error"] for st in summary["stats"].values()), None)
+    print(f"\nColumn statistics / Estadísticas por columna (rank error / error de rango ±{epsilon}):")
+    for col, st in summary["stats"].items():
+        pct = ", ".join(f"{k}={v:.4g}" for k, v in st["percentiles"].items() if v is not None)
+        print(
+            f"- {col}: count={st['count']}, nulls={st['nulls']}, mean={st['mean']}, std={st['std']}, "
+            f"min={st['min']}, max={st['max']}\n    {pct}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Exploratory analysis of the product dataset")
+    parser.add_argument("--path", type=str, default=None, help="Ruta del CSV o del dataset particionado (default: backend/datasets/product_dataset.csv)")
+    parser.add_argument("--where", action="append", default=None, help="Filtro Col=v1,v2 ('null' = nulos); en un dataset particionado descarta particiones antes de leer; repetible")
+    parser.add_argument("--head-rows", type=int, default=5, help="Filas a mostrar en el head (default: 5)")
+    parser.add_argument("--json-out", type=str, default=None, help="Guardar resumen en JSON (opcional)")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Filas por bloque de lectura (default: 100000)")
+    parser.add_argument("--epsilon", type=float, default=0.005, help="Error de rango de percentiles/histogramas (default: 0.005)")
+    parser.add_argument("--bins", type=int, default=10, help="Intervalos de los histogramas (default: 10)")
+    parser.add_argument("--sample", type=int, default=None, help="Analizar una muestra aleatoria de N filas en lugar del archivo completo")
+    parser.add_argument("--sample-method", choices=SAMPLE_METHODS, default="reservoir", help="reservoir: uniforme en una pasada; blocks: tramos en offsets al azar, sin recorrer el archivo; con N cerca del total de filas, las que siguen a un tramo ya tomado salen algo menos (default: reservoir)")
+    parser.add_argument("--block-rows", type=int, default=1_000, help="Filas consecutivas por tramo con --sample-method blocks (default: 1000)")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Nivel de confianza de los intervalos en modo muestra (default: 0.95)")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla del muestreo (opcional)")
+    parser.add_argument("--profile", type=str, default=None, help="Guardar un perfil de muestreo (formato folded/flamegraph) en este archivo (opcional)")
+    args = parser.parse_args(argv)
+    if args.sample is not None and args.sample <= 0:
+        parser.error("--sample debe ser mayor a 0 / must be greater than 0")
+
+    with perfilar_a_archivo(args.profile):
+        return _run(args)
+
+
+def _run(args: argparse.Namespace) -> int:
+    csv_path = Path(args.path) if args.path else default_dataset_path()
+    if not csv_path.exists():
+        print(f"ERROR: CSV not found / no encontrado: {csv_path}")
+        return 1
+
+    try:
+        filtros = parse_filtros(args.where)
+        if args.sample is not None:
+            if filtros or es_particionado(csv_path):
+                raise ValueError("--sample necesita un CSV sin --where / requires a plain CSV without --where")
+            if not 0 < args.confidence < 1:
+                raise ValueError("--confidence debe estar entre 0 y 1.")
+            muestra = load_sample(
+                csv_path, args.sample, method=args.sample_method, seed=args.seed,
+                chunksize=args.chunksize, block_rows=args.block_rows,
+            )
+            head_df = muestra.datos.head(max(1, args.head_rows))
+            print(f"Random sample preview ({len(head_df)} rows) / Vista previa de la muestra:\n{head_df}\n")
+            summary = compute_sample_metrics(muestra, confidence=args.confidence, epsilon=args.epsilon, bins=args.bins)
+            poblacion = f"{muestra.poblacion}" if muestra.poblacion_exacta else f"~{muestra.poblacion}"
+            print(
+                f"Sample ({muestra.metodo}): {len(muestra.datos)} of / de {poblacion} rows / filas; "
+                f"metrics below are estimates / las métricas son estimaciones\n"
+            )
+        else:
+            poda = resumen_poda(csv_path, filtros)
+            if poda is not None:
+                print(f"Partitions read / Particiones leídas: {poda[0]} of / de {poda[1]}")
+            head_df = load_head(csv_path, n=args.head_rows, filtros=filtros)
+            print(f"Dataset head ({len(head_df)} rows):\n{head_df}\n")
+            # Métricas (una sola pasada por bloques)
+            summary = compute_streaming_metrics(
+                csv_path, chunksize=args.chunksize, epsilon=args.epsilon, bins=args.bins, filtros=filtros
+            )
+            print(f"Dataset scanned for metrics: {summary['rows']} rows / filas\n")
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    print_summary(summary)
+
     if args.json_out:
         out_path = Path(args.json_out)
         out_path.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,384 @@
+"""
+partitioned_dataset.py
+
+Dataset de productos particionado al estilo Hive:
+
+    product_dataset/
+        _dataset.json
+        Category=Food/part-00000.parquet
+        Category=Food/part-00001.parquet
+        Category=Beverage/part-00000.parquet
+        ...
+
+Con --partition-by Category,Supplier queda Category=Food/Supplier=Supplier 1/.
+Las columnas de partición no se guardan dentro de los archivos: salen del
+nombre de la carpeta y al leer vuelven como texto. Un valor nulo va a
+`__HIVE_DEFAULT_PARTITION__`, como en Hive/Spark.
+
+Los archivos son Parquet si pyarrow está instalado y CSV si no (--format
+para elegir). `_dataset.json` guarda columnas, particiones, formato y filas.
+
+Al leer con filtros ({columna: valores}) las particiones que no coinciden
+se descartan antes de abrir un solo archivo; los filtros sobre columnas que
+no son de partición se aplican fila a fila. `leer_dataset` acepta también un
+CSV común, así los scripts tratan igual las dos formas.
+
+El repartido lee el CSV por bloques: cada bloque agrega un part-NNNNN a cada
+partición que toca. Todo se escribe en una carpeta temporal que reemplaza a
+la anterior al final.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import shutil
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+
+from app.core.profiling import perfilar_a_archivo
+from app.scripts.duplicates import COLUMNAS_CLAVE
+
+FORMATOS = ("parquet", "csv")
+METADATOS = "_dataset.json"
+PARTICION_NULA = "__HIVE_DEFAULT_PARTITION__"
+
+Filtros = dict[str, list[str | None]]
+
+
+def default_dataset_path() -> Path:
+    # Este archivo está en backend/app/scripts/...  => subir dos niveles para llegar a backend/
+    backend_root = Path(__file__).resolve().parents[2]
+    return backend_root / "datasets" / "product_dataset.csv"
+
+
+def default_partitioned_path() -> Path:
+    return Path(__file__).resolve().parents[2] / "datasets" / "product_dataset"
+
+
+def formato_por_defecto() -> str:
+    return "parquet" if importlib.util.find_spec("pyarrow") is not None else "csv"
+
+
+def parse_filtros(textos: list[str] | None) -> Filtros:
+    """['Category=Food,Beverage', 'IsActive=True'] -> {columna: valores}; 'null' elige los nulos."""
+    filtros: Filtros = {}
+    for texto in textos or []:
+        col, sep, valores = texto.partition("=")
+        if not sep or not col.strip():
+            raise ValueError(f"Filtro inválido (se espera Col=v1,v2): {texto!r}")
+        lista = [None if v.strip() == "null" else v.strip() for v in valores.split(",")]
+        filtros.setdefault(col.strip(), []).extend(lista)
+    return filtros
+
+
+def filtrar_filas(df: pd.DataFrame, filtros: Filtros) -> pd.DataFrame:
+    """Filas cuyo valor, como texto, está en los valores del filtro (None = nulos)."""
+    if not filtros:
+        return df
+    mascara = np.ones(len(df), dtype=bool)
+    for col, valores in filtros.items():
+        coincide = df[col].astype("string").isin([v for v in valores if v is not None]).fillna(False).to_numpy(dtype=bool)
+        if None in valores:
+            coincide |= df[col].isna().to_numpy()
+        mascara &= coincide
+    return df[mascara]
+
+
+def _validar(disponibles: list[str], filtros: Filtros) -> None:
+    faltantes = [c for c in filtros if c not in disponibles]
+    if faltantes:
+        raise ValueError(f"Columnas inexistentes: {', '.join(faltantes)}")
+
+
+def _escapar(valor) -> str:
+    if valor is None or pd.isna(valor):
+        return PARTICION_NULA
+    # Como Hive: '/', '=', '%' y demás caracteres especiales van como %XX
+    return quote(str(valor), safe=" ")
+
+
+def _desescapar(texto: str) -> str | None:
+    return None if texto == PARTICION_NULA else unquote(texto)
+
+
+# --- Lectura con poda ------------------------------------------------------------
+
+
+@dataclass
+class Particion:
+    valores: dict[str, str | None]
+    archivos: tuple[Path, ...]
+
+    def coincide(self, filtros: Filtros) -> bool:
+        return all(self.valores[col] in valores for col, valores in filtros.items() if col in self.valores)
+
+
+class DatasetParticionado:
+    """Carpeta escrita por `guardar_particionado`/`repartir`; descubre sus particiones por nombre."""
+
+    def __init__(self, raiz: Path):
+        archivo = raiz / METADATOS
+        if not archivo.exists():
+            raise ValueError(f"No es un dataset particionado (falta {METADATOS}): {raiz}")
+        self.raiz = raiz
+        self.meta = json.loads(archivo.read_text(encoding="utf-8"))
+        self.columnas: list[str] = self.meta["columns"]
+        self.particion_por: list[str] = self.meta["partition_by"]
+        self.formato: str = self.meta["format"]
+        self.particiones = self._descubrir()
+
+    def _descubrir(self) -> list[Particion]:
+        particiones = []
+        for carpeta in sorted(self.raiz.glob("/".join("*" for _ in self.particion_por))):
+            partes = carpeta.relative_to(self.raiz).parts
+            valores = {}
+            for parte, col in zip(partes, self.particion_por):
+                nombre, sep, texto = parte.partition("=")
+                if nombre != col or not sep:
+                    break
+                valores[col] = _desescapar(texto)
+            else:
+                archivos = tuple(sorted(carpeta.glob(f"part-*.{self.formato}")))
+                if carpeta.is_dir() and archivos:
+                    particiones.append(Particion(valores, archivos))
+        return particiones
+
+    def podar(self, filtros: Filtros | None = None) -> list[Particion]:
+        """Particiones que pueden tener filas para `filtros`, sin abrir ningún archivo."""
+        _validar(self.columnas, filtros or {})
+        return [p for p in self.particiones if p.coincide(filtros or {})]
+
+    def leer(
+        self,
+        columnas: list[str] | None = None,
+        filtros: Filtros | None = None,
+        chunksize: int | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        filtros = filtros or {}
+        particiones = self.podar(filtros)
+        pedidas = [c for c in self.columnas if columnas is None or c in columnas]
+        por_fila = {c: v for c, v in filtros.items() if c not in self.particion_por}
+        en_archivo = [c for c in self.columnas if c not in self.particion_por]
+        a_leer = [c for c in en_archivo if c in pedidas or c in por_fila] or en_archivo[:1]
+        for particion in particiones:
+            for archivo in particion.archivos:
+                for bloque in self._leer_archivo(archivo, a_leer, chunksize):
+                    for col, valor in particion.valores.items():
+                        bloque[col] = valor
+                    yield filtrar_filas(bloque, por_fila)[pedidas]
+
+    def _leer_archivo(self, archivo: Path, columnas: list[str], chunksize: int | None) -> Iterator[pd.DataFrame]:
+        if self.formato == "parquet":
+            df = pd.read_parquet(archivo, columns=columnas)
+            paso = chunksize or max(len(df), 1)
+            for inicio in range(0, max(len(df), 1), paso):
+                yield df.iloc[inicio : inicio + paso].copy()
+            return
+        dtype = {c: str for c in COLUMNAS_CLAVE if c in columnas}
+        lectura = pd.read_csv(archivo, usecols=columnas, dtype=dtype, chunksize=chunksize, low_memory=False)
+        yield from ([lectura] if chunksize is None else lectura)
+
+
+def es_particionado(path: Path) -> bool:
+    return path.is_dir()
+
+
+def leer_dataset(
+    path: Path,
+    columnas: list[str] | None = None,
+    filtros: Filtros | None = None,
+    chunksize: int | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Bloques de `columnas` (las que existan) de un CSV o de una carpeta
+    particionada, restringidos a `filtros`. Sin `chunksize`, un bloque por
+    archivo leído.
+    """
+    if es_particionado(path):
+        yield from DatasetParticionado(path).leer(columnas, filtros, chunksize)
+        return
+    filtros = filtros or {}
+    disponibles = list(pd.read_csv(path, nrows=0).columns)
+    _validar(disponibles, filtros)
+    pedidas = [c for c in disponibles if columnas is None or c in columnas]
+    usecols = [c for c in disponibles if c in pedidas or c in filtros]
+    dtype = {c: str for c in COLUMNAS_CLAVE if c in usecols}
+    lectura = pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize, low_memory=False)
+    for bloque in [lectura] if chunksize is None else lectura:
+        yield filtrar_filas(bloque, filtros)[pedidas] if filtros else bloque
+
+
+def _vacio(path: Path, columnas: list[str] | None) -> pd.DataFrame:
+    disponibles = DatasetParticionado(path).columnas if es_particionado(path) else list(pd.read_csv(path, nrows=0).columns)
+    return pd.DataFrame(columns=[c for c in disponibles if columnas is None or c in columnas])
+
+
+def cargar_dataset(path: Path, columnas: list[str] | None = None, filtros: Filtros | None = None) -> pd.DataFrame:
+    """`leer_dataset` completo en un solo DataFrame."""
+    bloques = list(leer_dataset(path, columnas, filtros))
+    if not bloques:
+        return _vacio(path, columnas)
+    return pd.concat(bloques, ignore_index=True) if len(bloques) > 1 else bloques[0]
+
+
+# Filas por bloque al buscar las primeras filas que pasan los filtros
+BLOQUE_CABEZA = 10_000
+
+
+def cabeza(path: Path, n: int = 5, filtros: Filtros | None = None) -> pd.DataFrame:
+    """Primeras `n` filas que pasan los filtros, leyendo solo lo necesario."""
+    n = max(1, n)
+    partes, filas = [], 0
+    # Bloques de tamaño normal: con filtros selectivos, bloques de `n` filas serían miles de lecturas
+    for bloque in leer_dataset(path, None, filtros, chunksize=max(n, BLOQUE_CABEZA)):
+        partes.append(bloque)
+        filas += len(bloque)
+        if filas >= n:
+            break
+    return pd.concat(partes, ignore_index=True).head(n) if partes else _vacio(path, None)
+
+
+def resumen_poda(path: Path, filtros: Filtros | None) -> tuple[int, int] | None:
+    """(particiones a leer, particiones totales), o None si `path` es un CSV común."""
+    if not es_particionado(path):
+        return None
+    dataset = DatasetParticionado(path)
+    return len(dataset.podar(filtros)), len(dataset.particiones)
+
+
+# --- Escritura -----------------------------------------------------------------------
+
+
+def _escribir(
+    bloques: Iterable[pd.DataFrame],
+    raiz: Path,
+    columnas: list[str],
+    particion_por: list[str],
+    formato: str | None,
+) -> dict:
+    formato = formato or formato_por_defecto()
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato} (opciones: {', '.join(FORMATOS)})")
+    if formato == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise ValueError("Falta pyarrow para escribir Parquet: pip install pyarrow (o usar --format csv)")
+    if not particion_por:
+        raise ValueError("Hace falta al menos una columna de partición")
+    _validar(columnas, dict.fromkeys(particion_por, []))
+    if raiz.exists() and any(raiz.iterdir()) and not (raiz / METADATOS).exists():
+        # Nunca borrar una carpeta que no escribimos nosotros
+        raise ValueError(f"La carpeta existe y no es un dataset particionado: {raiz}")
+
+    inicio = time.perf_counter()
+    temporal = raiz.with_name(raiz.name + ".tmp")
+    shutil.rmtree(temporal, ignore_errors=True)
+    temporal.mkdir(parents=True)
+    filas, archivos, carpetas = 0, 0, set()
+    try:
+        for numero, bloque in enumerate(bloques):
+            filas += len(bloque)
+            claves = [bloque[c].astype("string") for c in particion_por]
+            datos = bloque.drop(columns=particion_por)
+            for valores, posiciones in datos.groupby(claves, dropna=False, sort=False).indices.items():
+                valores = valores if isinstance(valores, tuple) else (valores,)
+                carpeta = temporal.joinpath(*(f"{c}={_escapar(v)}" for c, v in zip(particion_por, valores)))
+                carpeta.mkdir(parents=True, exist_ok=True)
+                parte = datos.iloc[posiciones]
+                destino = carpeta / f"part-{numero:05d}.{formato}"
+                if formato == "parquet":
+                    parte.to_parquet(destino, index=False)
+                else:
+                    parte.to_csv(destino, index=False)
+                archivos += 1
+                carpetas.add(carpeta)
+        meta = {
+            "columns": columnas,
+            "partition_by": list(particion_por),
+            "format": formato,
+            "rows": filas,
+            "partitions": len(carpetas),
+            "files": archivos,
+        }
+        (temporal / METADATOS).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        if raiz.exists():
+            shutil.rmtree(raiz)
+        temporal.rename(raiz)
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+    return {**meta, "seconds": time.perf_counter() - inicio}
+
+
+def guardar_particionado(
+    df: pd.DataFrame,
+    raiz: Path,
+    particion_por: list[str] | tuple[str, ...] = ("Category",),
+    formato: str | None = None,
+) -> dict:
+    """Escribe `df` en `raiz` particionado por `particion_por`; reemplaza lo que hubiera."""
+    return _escribir([df], raiz, list(df.columns), list(particion_por), formato)
+
+
+def repartir(
+    csv_path: Path,
+    raiz: Path,
+    particion_por: list[str] | tuple[str, ...] = ("Category",),
+    formato: str | None = None,
+    chunksize: int = 100_000,
+) -> dict:
+    """Reparte un CSV en `raiz` leyéndolo por bloques de `chunksize` filas."""
+    columnas = list(pd.read_csv(csv_path, nrows=0).columns)
+    # Claves y columnas de partición como texto, para que el valor de la carpeta sea el del CSV
+    dtype = {c: str for c in [*COLUMNAS_CLAVE, *particion_por] if c in columnas}
+    bloques = pd.read_csv(csv_path, dtype=dtype, chunksize=chunksize, low_memory=False)
+    return _escribir(bloques, raiz, columnas, list(particion_por), formato)
+
+
+def print_resumen(meta: dict) -> None:
+    print(f"Rows / Filas: {meta['rows']}")
+    print(f"Partitioned by / Particionado por: {', '.join(meta['partition_by'])} ({meta['format']})")
+    print(f"Partitions / Particiones: {meta['partitions']}, files / archivos: {meta['files']}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Repartition the product CSV into a Hive-style partitioned dataset")
+    parser.add_argument("--path", type=str, default=None, help="Ruta del CSV (default: backend/datasets/product_dataset.csv)")
+    parser.add_argument("--out", type=str, default=None, help="Carpeta del dataset particionado (default: backend/datasets/product_dataset)")
+    parser.add_argument("--partition-by", type=str, default="Category", help="Columnas de partición separadas por coma (default: Category)")
+    parser.add_argument("--format", choices=FORMATOS, default=None, help="Formato de los archivos (default: parquet si hay pyarrow, si no csv)")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Filas por bloque de lectura (default: 100000)")
+    parser.add_argument("--profile", type=str, default=None, help="Guardar un perfil de muestreo (formato folded/flamegraph) en este archivo (opcional)")
+    args = parser.parse_args(argv)
+
+    with perfilar_a_archivo(args.profile):
+        return _run(args)
+
+
+def _run(args: argparse.Namespace) -> int:
+    csv_path = Path(args.path) if args.path else default_dataset_path()
+    if not csv_path.is_file():
+        print(f"ERROR: CSV not found / no encontrado: {csv_path}")
+        return 1
+    out_path = Path(args.out) if args.out else default_partitioned_path()
+    particion_por = [c.strip() for c in args.partition_by.split(",") if c.strip()]
+
+    try:
+        meta = repartir(csv_path, out_path, particion_por, formato=args.format, chunksize=args.chunksize)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+    print_resumen(meta)
+    print(f"Partitioned dataset saved to / Dataset particionado guardado en: {out_path} ({meta['seconds']:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
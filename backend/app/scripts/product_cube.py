@@ -0,0 +1,403 @@
+"""
+product_cube.py
+
+Cubo de agregados del dataset de productos para cortes y drill-down sin
+volver a leer el CSV.
+
+- `build`: una sola pasada por bloques agrupa por todas las dimensiones
+  (Category, Supplier, IsActive y el tramo de ShelfLife) y, al final, arma
+  los 16 grouping sets (estilo `GROUPING SETS`/`CUBE` de SQL) a partir de ese
+  cuboide base. Cada fila guarda count y, por medida, suma, no nulos, mínimo
+  y máximo: con eso cualquier corte se re-agrega sin perder exactitud.
+- El cubo se guarda columnar en un `.npz` comprimido: las dimensiones como
+  códigos int32 más su diccionario de valores, las medidas como arrays
+  float64 y `grouping_id` como máscara de bits de las dimensiones presentes.
+- `query`: elige el grouping set que cubre las dimensiones pedidas y las de
+  los filtros, filtra por códigos y re-agrega si hace falta. Son unas
+  centenas de filas, así que responde en milisegundos.
+
+El cubo recuerda tamaño y fecha de modificación del CSV de origen y avisa
+si el CSV cambió desde que se construyó.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.core.profiling import perfilar_a_archivo
+from app.scripts.partitioned_dataset import parse_filtros
+
+DIMENSIONES = ["Category", "Supplier", "IsActive", "ShelfLifeBucket"]
+MEDIDAS = ["BaseYield", "NutritionalValue", "Cost", "EnvironmentalImpact"]
+AGREGADOS = ("sum", "n", "min", "max")
+
+# Tramos de ShelfLife en días: (0, 30], (30, 90], ...
+LIMITES_VIDA_UTIL = [0, 30, 90, 180, 365, np.inf]
+TRAMOS_VIDA_UTIL = ["0-30d", "31-90d", "91-180d", "181-365d", ">365d"]
+
+# Columnas del CSV que alimentan las dimensiones
+COLUMNAS_DIMENSION = ["Category", "Supplier", "IsActive", "ShelfLife"]
+
+
+def default_dataset_path() -> Path:
+    # Este archivo está en backend/app/scripts/...  => subir dos niveles para llegar a backend/
+    backend_root = Path(__file__).resolve().parents[2]
+    return backend_root / "datasets" / "product_dataset.csv"
+
+
+def default_cube_path() -> Path:
+    return Path(__file__).resolve().parents[2] / "datasets" / "product_cube.npz"
+
+
+def tramo_vida_util(serie: pd.Series) -> pd.Series:
+    """ShelfLife ("50 days", "1 days 02:00:00"...) al tramo en días; lo no convertible queda nulo."""
+    # Pocos valores distintos: se convierte cada uno una sola vez
+    codigos, unicos = pd.factorize(serie)
+    dias = pd.to_timedelta(pd.Series(unicos, dtype="string").astype(object), errors="coerce") / pd.Timedelta(days=1)
+    tramos = pd.cut(dias, LIMITES_VIDA_UTIL, labels=TRAMOS_VIDA_UTIL, include_lowest=True).astype(object)
+    tramos = np.append(tramos.where(tramos.notna(), None).to_numpy(dtype=object), None)
+    return pd.Series(tramos[codigos], index=serie.index, dtype=object)
+
+
+def _dimensiones(chunk: pd.DataFrame) -> pd.DataFrame:
+    datos = {}
+    for dim in ("Category", "Supplier", "IsActive"):
+        if dim in chunk.columns:
+            valores = chunk[dim].astype("string").str.strip()
+            valores = valores.mask(valores == "")
+            datos[dim] = valores.astype(object).where(valores.notna(), None)
+        else:
+            datos[dim] = pd.Series(None, index=chunk.index, dtype=object)
+    if "ShelfLife" in chunk.columns:
+        datos["ShelfLifeBucket"] = tramo_vida_util(chunk["ShelfLife"])
+    else:
+        datos["ShelfLifeBucket"] = pd.Series(None, index=chunk.index, dtype=object)
+    return pd.DataFrame(datos, index=chunk.index)
+
+
+def _agregar(grupos) -> pd.DataFrame:
+    """Partes de un groupby de filas crudas: count y suma/no nulos/mín/máx por medida."""
+    partes = {"count": grupos.size()}
+    for medida in MEDIDAS:
+        columna = grupos[medida]
+        partes[f"{medida}__sum"] = columna.sum()
+        partes[f"{medida}__n"] = columna.count()
+        partes[f"{medida}__min"] = columna.min()
+        partes[f"{medida}__max"] = columna.max()
+    return pd.DataFrame(partes)
+
+
+def _reagregar(parcial: pd.DataFrame, por: list[str]) -> pd.DataFrame:
+    """Combina filas ya agregadas: sumas y conteos se suman, mín/máx se vuelven a tomar."""
+    reglas = {"count": "sum"}
+    for medida in MEDIDAS:
+        reglas.update({f"{medida}__sum": "sum", f"{medida}__n": "sum", f"{medida}__min": "min", f"{medida}__max": "max"})
+    if not por:
+        return parcial.agg(reglas).to_frame().T
+    return parcial.groupby(por, dropna=False, sort=False).agg(reglas)
+
+
+class ConstructorCubo:
+    """Cuboide base alimentado bloque a bloque; `resultado()` devuelve todos los grouping sets."""
+
+    columnas = [*COLUMNAS_DIMENSION, *MEDIDAS]
+
+    def __init__(self):
+        self.filas = 0
+        self.parciales: list[pd.DataFrame] = []
+
+    def consumir(self, chunk: pd.DataFrame) -> None:
+        self.filas += len(chunk)
+        filas = _dimensiones(chunk)
+        for medida in MEDIDAS:
+            filas[medida] = pd.to_numeric(chunk[medida], errors="coerce") if medida in chunk.columns else np.nan
+        self.parciales.append(_agregar(filas.groupby(DIMENSIONES, dropna=False, sort=False)))
+
+    def base(self) -> pd.DataFrame:
+        if not self.parciales:
+            return _agregar(pd.DataFrame(columns=[*DIMENSIONES, *MEDIDAS]).groupby(DIMENSIONES))
+        base = _reagregar(pd.concat(self.parciales), DIMENSIONES)
+        self.parciales = [base]
+        return base
+
+    def resultado(self) -> pd.DataFrame:
+        """Una fila por grupo de cada grouping set; las dimensiones agregadas quedan en None."""
+        base = self.base().reset_index()
+        conjuntos = []
+        for grouping_id in range(1 << len(DIMENSIONES)):
+            por = [d for i, d in enumerate(DIMENSIONES) if grouping_id >> i & 1]
+            if grouping_id == (1 << len(DIMENSIONES)) - 1:
+                conjunto = base.copy()
+            else:
+                conjunto = _reagregar(base, por).reset_index(drop=not por)
+            for dim in DIMENSIONES:
+                if dim not in por:
+                    conjunto[dim] = None
+            conjunto["grouping_id"] = grouping_id
+            conjuntos.append(conjunto)
+        cubo = pd.concat(conjuntos, ignore_index=True)
+        return cubo[[*DIMENSIONES, "grouping_id", "count", *(f"{m}__{a}" for m in MEDIDAS for a in AGREGADOS)]]
+
+
+def _huella(csv_path: Path) -> dict:
+    stat = csv_path.stat()
+    return {"source": str(csv_path.resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class Cubo:
+    """Cubo cargado en memoria: arrays por columna, listo para `consultar`."""
+
+    def __init__(self, dimensiones: dict[str, tuple[np.ndarray, np.ndarray]], columnas: dict[str, np.ndarray], meta: dict):
+        # dimensiones: nombre -> (códigos int32 con -1 = nulo/agregado, valores)
+        self.dimensiones = dimensiones
+        self.columnas = columnas
+        self.meta = meta
+
+    @classmethod
+    def desde_tabla(cls, tabla: pd.DataFrame, meta: dict) -> Cubo:
+        dimensiones = {}
+        for dim in DIMENSIONES:
+            valores = tabla[dim]
+            distintos = sorted(str(v) for v in valores.dropna().unique())
+            codigos = pd.Categorical(valores.where(valores.isna(), valores.astype(str)), categories=distintos).codes
+            dimensiones[dim] = (codigos.astype(np.int32), np.array(distintos, dtype=str))
+        columnas = {"grouping_id": tabla["grouping_id"].to_numpy(dtype=np.int32), "count": tabla["count"].to_numpy(dtype=np.int64)}
+        for medida in MEDIDAS:
+            for agregado in AGREGADOS:
+                tipo = np.int64 if agregado == "n" else np.float64
+                columnas[f"{medida}__{agregado}"] = tabla[f"{medida}__{agregado}"].to_numpy(dtype=tipo)
+        return cls(dimensiones, columnas, meta)
+
+    def guardar(self, path: Path) -> Path:
+        arrays = {"__meta__": np.array(json.dumps(self.meta))}
+        for dim, (codigos, valores) in self.dimensiones.items():
+            arrays[f"{dim}__codes"] = codigos
+            arrays[f"{dim}__values"] = valores
+        arrays.update(self.columnas)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporal = path.with_name(path.name + ".tmp")
+        try:
+            # Con un objeto archivo np.savez no agrega la extensión .npz al temporal
+            with temporal.open("wb") as f:
+                np.savez_compressed(f, **arrays)
+            temporal.replace(path)
+        except BaseException:
+            temporal.unlink(missing_ok=True)
+            raise
+        return path
+
+    @classmethod
+    def cargar(cls, path: Path) -> Cubo:
+        with np.load(path, allow_pickle=False) as datos:
+            meta = json.loads(str(datos["__meta__"]))
+            dimensiones = {dim: (datos[f"{dim}__codes"], datos[f"{dim}__values"]) for dim in DIMENSIONES}
+            columnas = {k: datos[k] for k in datos.files if k != "__meta__" and "__codes" not in k and "__values" not in k}
+        return cls(dimensiones, columnas, meta)
+
+    def desactualizado(self) -> bool:
+        """True si el CSV de origen cambió (o ya no está) desde que se construyó el cubo."""
+        origen = Path(self.meta["source"])
+        if not origen.exists():
+            return True
+        return _huella(origen) != {k: self.meta[k] for k in ("source", "size", "mtime_ns")}
+
+    def consultar(
+        self,
+        por: list[str] | None = None,
+        filtros: dict[str, list[str | None]] | None = None,
+        medidas: list[str] | None = None,
+    ) -> list[dict]:
+        """
+        Agregados agrupados por `por` y restringidos a `filtros` ({dim: valores};
+        None en los valores elige los nulos). Por fila: las dimensiones, count
+        y, por medida, `<medida>_avg/_sum/_min/_max`.
+        """
+        por = list(por or [])
+        filtros = filtros or {}
+        medidas = MEDIDAS if medidas is None else list(medidas)
+        desconocidas = [d for d in [*por, *filtros] if d not in DIMENSIONES]
+        if desconocidas:
+            raise ValueError(f"Dimensiones desconocidas: {', '.join(desconocidas)} (opciones: {', '.join(DIMENSIONES)})")
+        desconocidas = [m for m in medidas if m not in MEDIDAS]
+        if desconocidas:
+            raise ValueError(f"Medidas desconocidas: {', '.join(desconocidas)} (opciones: {', '.join(MEDIDAS)})")
+        if len(set(por)) != len(por):
+            raise ValueError("Dimensión repetida en el agrupamiento")
+
+        # El grouping set más chico que tiene todas las dimensiones necesarias
+        necesarias = set(por) | set(filtros)
+        grouping_id = sum(1 << i for i, d in enumerate(DIMENSIONES) if d in necesarias)
+        filas = self.columnas["grouping_id"] == grouping_id
+        for dim, valores in filtros.items():
+            codigos, diccionario = self.dimensiones[dim]
+            buscados = [-1 if v is None else int(np.searchsorted(diccionario, v)) for v in valores]
+            buscados = [c for c, v in zip(buscados, valores) if v is None or (c < len(diccionario) and diccionario[c] == v)]
+            filas &= np.isin(codigos, buscados)
+
+        columnas = ["count", *(f"{m}__{a}" for m in medidas for a in AGREGADOS)]
+        tabla = pd.DataFrame({c: self.columnas[c][filas] for c in columnas})
+        for dim in por:
+            tabla[dim] = self.dimensiones[dim][0][filas]
+        if set(filtros) - set(por) or not por:
+            # Filtros fuera del agrupamiento: se suman las filas que quedan
+            if por:
+                tabla = tabla.groupby(por, sort=False).agg(_reglas(columnas)).reset_index()
+            else:
+                tabla = tabla[columnas].agg(_reglas(columnas)).to_frame().T
+        if por:
+            tabla = tabla.sort_values(por, kind="stable", key=lambda codigos: self._orden(codigos.name, codigos))
+        return [self._fila(fila, por, medidas) for fila in tabla.to_dict("records")]
+
+    def _orden(self, dim: str, codigos: pd.Series) -> pd.Series | np.ndarray:
+        """Clave de orden de los códigos: los tramos de ShelfLife por su límite inferior, el resto alfabético (nulos primero)."""
+        if dim != "ShelfLifeBucket":
+            return codigos  # los diccionarios ya están ordenados alfabéticamente
+        inferior = dict(zip(TRAMOS_VIDA_UTIL, LIMITES_VIDA_UTIL))
+        # El -inf agregado al final es el del código -1 (nulo)
+        limites = np.array([*(inferior.get(str(v), np.inf) for v in self.dimensiones[dim][1]), -np.inf])
+        return limites[codigos.to_numpy(dtype=np.int64)]
+
+    def _fila(self, fila: dict, por: list[str], medidas: list[str]) -> dict:
+        resultado: dict = {}
+        for dim in por:
+            codigo = int(fila[dim])
+            resultado[dim] = None if codigo < 0 else str(self.dimensiones[dim][1][codigo])
+        resultado["count"] = int(fila["count"])
+        for medida in medidas:
+            n = int(fila[f"{medida}__n"])
+            suma = float(fila[f"{medida}__sum"])
+            resultado[f"{medida}_avg"] = suma / n if n else None
+            resultado[f"{medida}_sum"] = suma
+            resultado[f"{medida}_min"] = _float_o_none(fila[f"{medida}__min"])
+            resultado[f"{medida}_max"] = _float_o_none(fila[f"{medida}__max"])
+        return resultado
+
+
+def _reglas(columnas: list[str]) -> dict[str, str]:
+    return {c: "min" if c.endswith("__min") else "max" if c.endswith("__max") else "sum" for c in columnas}
+
+
+def _float_o_none(valor) -> float | None:
+    return float(valor) if pd.notna(valor) else None
+
+
+def build_cube(csv_path: Path, chunksize: int = 100_000) -> Cubo:
+    """Construye el cubo en una pasada por bloques de `chunksize` filas."""
+    inicio = time.perf_counter()
+    columnas = set(pd.read_csv(csv_path, nrows=0).columns)
+    usecols = [c for c in ConstructorCubo.columnas if c in columnas]
+    constructor = ConstructorCubo()
+    dtype = {c: str for c in COLUMNAS_DIMENSION if c in columnas}
+    for chunk in pd.read_csv(csv_path, usecols=usecols, dtype=dtype, chunksize=chunksize, low_memory=False):
+        constructor.consumir(chunk)
+    tabla = constructor.resultado()
+    meta = {
+        **_huella(csv_path),
+        "rows": constructor.filas,
+        "groups": int(len(tabla)),
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "seconds": time.perf_counter() - inicio,
+    }
+    return Cubo.desde_tabla(tabla, meta)
+
+
+def print_rows(filas: list[dict]) -> None:
+    if not filas:
+        print("No groups match / Ningún grupo coincide")
+        return
+    columnas = list(filas[0])
+    textos = [[_celda(f[c]) for c in columnas] for f in filas]
+    anchos = [max(len(c), *(len(t[i]) for t in textos)) for i, c in enumerate(columnas)]
+    print("  ".join(c.ljust(a) for c, a in zip(columnas, anchos)))
+    for t in textos:
+        print("  ".join(v.ljust(a) for v, a in zip(t, anchos)))
+
+
+def _celda(valor) -> str:
+    if valor is None:
+        return "N/A"
+    if isinstance(valor, float):
+        return f"{valor:,.2f}"
+    return str(valor)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build and query the product rollup cube")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="Construir el cubo con una pasada por el CSV")
+    p_build.add_argument("--path", type=str, default=None, help="Ruta del CSV (default: backend/datasets/product_dataset.csv)")
+    p_build.add_argument("--out", type=str, default=None, help="Archivo del cubo (default: backend/datasets/product_cube.npz)")
+    p_build.add_argument("--chunksize", type=int, default=100_000, help="Filas por bloque de lectura (default: 100000)")
+
+    p_query = sub.add_parser("query", help="Consultar un corte o drill-down del cubo")
+    p_query.add_argument("--cube", type=str, default=None, help="Archivo del cubo (default: backend/datasets/product_cube.npz)")
+    p_query.add_argument("--by", type=str, default="", help=f"Dimensiones separadas por coma ({', '.join(DIMENSIONES)}); vacío = total")
+    p_query.add_argument("--where", action="append", default=None, help="Filtro Dim=v1,v2 ('null' = nulos); repetible")
+    p_query.add_argument("--measures", type=str, default=None, help=f"Medidas separadas por coma (default: {', '.join(MEDIDAS)})")
+    p_query.add_argument("--json-out", type=str, default=None, help="Archivo JSON para guardar el resultado (opcional)")
+
+    for p in (p_build, p_query):
+        p.add_argument("--profile", type=str, default=None, help="Guardar un perfil de muestreo (formato folded/flamegraph) en este archivo (opcional)")
+    args = parser.parse_args(argv)
+
+    with perfilar_a_archivo(args.profile):
+        return _build(args) if args.command == "build" else _query(args)
+
+
+def _lista(texto: str | None) -> list[str] | None:
+    return None if texto is None else [c.strip() for c in texto.split(",") if c.strip()]
+
+
+def _build(args: argparse.Namespace) -> int:
+    csv_path = Path(args.path) if args.path else default_dataset_path()
+    if not csv_path.exists():
+        print(f"ERROR: CSV not found / no encontrado: {csv_path}")
+        return 1
+    try:
+        cubo = build_cube(csv_path, chunksize=args.chunksize)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+    out_path = cubo.guardar(Path(args.out) if args.out else default_cube_path())
+    print(f"Dataset scanned: {cubo.meta['rows']} rows / filas in {cubo.meta['seconds']:.2f}s")
+    print(f"Cube saved to / Cubo guardado en: {out_path} ({cubo.meta['groups']} groups / grupos)")
+    return 0
+
+
+def _query(args: argparse.Namespace) -> int:
+    cube_path = Path(args.cube) if args.cube else default_cube_path()
+    if not cube_path.exists():
+        print(f"ERROR: cube not found / cubo no encontrado: {cube_path} (run / correr: build)")
+        return 1
+    try:
+        inicio = time.perf_counter()
+        cubo = Cubo.cargar(cube_path)
+        filas = cubo.consultar(_lista(args.by), parse_filtros(args.where), _lista(args.measures))
+        milisegundos = (time.perf_counter() - inicio) * 1000
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+    if cubo.desactualizado():
+        print(f"WARNING: source CSV changed since the cube was built / el CSV cambió desde que se construyó el cubo: {cubo.meta['source']}")
+
+    print_rows(filas)
+    print(f"\n{len(filas)} group(s) / grupos in {milisegundos:.1f}ms")
+    if args.json_out:
+        out_path = Path(args.json_out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(filas, indent=2), encoding="utf-8")
+        print(f"Result saved to / Resultado guardado en: {out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
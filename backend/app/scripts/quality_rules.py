@@ -0,0 +1,474 @@
+"""
+quality_rules.py
+
+Motor de reglas de calidad de datos declaradas en un archivo YAML o JSON
+(ver backend/rules/product_dataset.yaml).
+
+    columns:
+      Cost: {type: float, required: true, nullable: false, min: 0}
+      Code: {type: str, unique: true, regex: "^P\\d+$"}
+      Category: {allowed: [Food, Beverage]}
+    rules:
+      - name: discontinued_only_when_inactive
+        when: {column: IsActive, equals: true}
+        then: {column: DiscontinuedAt, is_null: true}
+
+Las reglas se compilan una sola vez a funciones que devuelven máscaras
+booleanas de NumPy (True = fila que viola la regla). Por cada bloque del CSV
+cada columna se convierte a su tipo declarado una única vez y todas las
+reglas se evalúan sobre esa misma vista: una sola pasada sobre los datos.
+La unicidad usa el detector exacto de duplicates.py (buckets en disco).
+
+Condiciones (en `when`/`then`):
+- {column: X, is_null: true|false}, {column: X, equals: v}, {column: X, in: [..]},
+  {column: X, min|max|gt|lt: v}, {column: X, regex: "..."},
+  {column: X, op: "<"|"<="|">"|">="|"=="|"!=", other: Y} (entre columnas);
+  varias claves en la misma condición se combinan con AND.
+- {all: [...]}, {any: [...]}, {not: {...}}.
+Los nulos nunca cumplen una comparación: `then: {column: X, min: 0}` falla
+si X es nulo (combinar con `is_null: true` dentro de `any` si se admite).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import operator
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from app.core.profiling import perfilar_a_archivo
+from app.scripts.duplicates import COLUMNAS_CLAVE, DetectorExacto
+
+TIPOS = ("str", "float", "int", "bool", "datetime", "duration")
+CLAVES_COLUMNA = {"type", "required", "nullable", "unique", "min", "max", "gt", "lt", "regex", "allowed"}
+PREDICADOS = ("is_null", "equals", "in", "min", "max", "gt", "lt", "regex", "op")
+OPERADORES = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "==": operator.eq, "!=": operator.ne}
+_COMPARACIONES = {"min": operator.ge, "max": operator.le, "gt": operator.gt, "lt": operator.lt}
+
+Mascara = Callable[["Vista"], np.ndarray]
+
+
+class ErrorDeConfiguracion(ValueError):
+    """Regla que no se puede evaluar sobre los datos, p. ej. un `op` entre columnas de tipos incompatibles."""
+
+
+def default_dataset_path() -> Path:
+    # Este archivo está en backend/app/scripts/...  => subir dos niveles para llegar a backend/
+    backend_root = Path(__file__).resolve().parents[2]
+    return backend_root / "datasets" / "product_dataset.csv"
+
+
+def default_rules_path() -> Path:
+    return Path(__file__).resolve().parents[2] / "rules" / "product_dataset.yaml"
+
+
+def cargar_reglas(path: Path) -> dict:
+    texto = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ValueError("Falta PyYAML para leer reglas YAML: pip install PyYAML (o usar JSON)") from e
+        spec = yaml.safe_load(texto)
+    else:
+        spec = json.loads(texto)
+    if not isinstance(spec, dict):
+        raise ValueError(f"El archivo de reglas debe ser un objeto con 'columns' y/o 'rules': {path}")
+    return spec
+
+
+# --- Tipos -----------------------------------------------------------------
+
+
+def _a_bool(serie: pd.Series) -> pd.Series:
+    if pd.api.types.is_bool_dtype(serie):
+        return serie.astype("boolean")
+    texto = serie.astype("string").str.strip().str.lower()
+    return texto.map({"true": True, "1": True, "false": False, "0": False}).astype("boolean")
+
+
+def _a_duracion(serie: pd.Series) -> pd.Series:
+    # Pocos valores distintos ("189 days", ...): se parsea cada uno una sola vez
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=False)
+    valores = pd.to_timedelta(pd.Index(unicos, dtype=object), errors="coerce").take(codigos)
+    return pd.Series(valores, index=serie.index)
+
+
+def convertir(serie: pd.Series, tipo: str) -> pd.Series:
+    """La columna en su tipo declarado; lo que no convierte queda nulo."""
+    if tipo in ("float", "int"):
+        numeros = pd.to_numeric(serie, errors="coerce").astype("float64")
+        return numeros.where(numeros % 1 == 0) if tipo == "int" else numeros
+    if tipo == "bool":
+        return _a_bool(serie)
+    if tipo == "datetime":
+        return pd.to_datetime(serie, errors="coerce", format="mixed")
+    if tipo == "duration":
+        return _a_duracion(serie)
+    return serie
+
+
+def _literal(valor: Any, tipo: str) -> Any:
+    """Convierte un valor del archivo de reglas al tipo de la columna, al compilar."""
+    try:
+        if tipo in ("float", "int"):
+            return float(valor)
+        if tipo == "datetime":
+            return pd.Timestamp(valor)
+        if tipo == "duration":
+            return pd.Timedelta(valor)
+        if tipo == "bool" and not isinstance(valor, bool):
+            return str(valor).strip().lower() in ("true", "1")
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Valor {valor!r} no compatible con el tipo {tipo}") from e
+    return valor
+
+
+def _mascara(resultado: pd.Series | np.ndarray) -> np.ndarray:
+    """Máscara booleana donde los nulos cuentan como False."""
+    if isinstance(resultado, np.ndarray):
+        return resultado.astype(bool)
+    return resultado.to_numpy(dtype=bool, na_value=False)
+
+
+class Vista:
+    """Un bloque con sus columnas convertidas a demanda, una vez cada una."""
+
+    def __init__(self, chunk: pd.DataFrame, tipos: dict[str, str]):
+        self.chunk = chunk
+        self.tipos = tipos
+        self._convertidas: dict[str, pd.Series] = {}
+        self._nulos: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.chunk)
+
+    def crudo(self, columna: str) -> pd.Series:
+        return self.chunk[columna]
+
+    def columna(self, columna: str) -> pd.Series:
+        if columna not in self._convertidas:
+            self._convertidas[columna] = convertir(self.chunk[columna], self.tipos.get(columna, "str"))
+        return self._convertidas[columna]
+
+    def nulos(self, columna: str) -> np.ndarray:
+        if columna not in self._nulos:
+            self._nulos[columna] = self.chunk[columna].isna().to_numpy()
+        return self._nulos[columna]
+
+
+# --- Compilación -------------------------------------------------------------
+
+
+@dataclass
+class Regla:
+    nombre: str
+    columnas: tuple[str, ...]
+    violaciones: Mascara  # True = la fila viola la regla
+    mensaje: str = ""
+
+
+def _predicado(columna: str, clave: str, valor: Any, tipos: dict[str, str]) -> Mascara:
+    tipo = tipos.get(columna, "str")
+    if clave == "is_null":
+        return (lambda v: v.nulos(columna)) if valor else (lambda v: ~v.nulos(columna))
+    if clave == "equals":
+        literal = _literal(valor, tipo)
+        return lambda v: _mascara(v.columna(columna) == literal)
+    if clave == "in":
+        if not isinstance(valor, list):
+            raise ValueError(f"'in' espera una lista ({columna})")
+        literales = [_literal(x, tipo) for x in valor]
+        return lambda v: _mascara(v.columna(columna).isin(literales))
+    if clave in _COMPARACIONES:
+        comparar, literal = _COMPARACIONES[clave], _literal(valor, tipo)
+        return lambda v: _mascara(comparar(v.columna(columna), literal))
+    if clave == "regex":
+        return lambda v: _mascara(v.crudo(columna).astype("string").str.fullmatch(valor))
+    raise ValueError(f"Condición desconocida: {clave}")
+
+
+def compilar_condicion(spec: dict, tipos: dict[str, str]) -> tuple[Mascara, set[str]]:
+    """Condición -> (función bloque -> máscara, columnas que usa)."""
+    if not isinstance(spec, dict) or not spec:
+        raise ValueError(f"Condición inválida: {spec!r}")
+    if "all" in spec or "any" in spec:
+        clave = "all" if "all" in spec else "any"
+        partes = [compilar_condicion(s, tipos) for s in spec[clave]]
+        if not partes:
+            raise ValueError(f"'{clave}' necesita al menos una condición")
+        reducir = np.logical_and.reduce if clave == "all" else np.logical_or.reduce
+        return (lambda v: reducir([f(v) for f, _ in partes])), set().union(*(c for _, c in partes))
+    if "not" in spec:
+        interna, columnas = compilar_condicion(spec["not"], tipos)
+        return (lambda v: ~interna(v)), columnas
+
+    columna = spec.get("column")
+    claves = [k for k in spec if k != "column"]
+    if not columna or not claves:
+        raise ValueError(f"Condición inválida (falta 'column' o un predicado): {spec!r}")
+    desconocidas = set(claves) - set(PREDICADOS) - {"other"}
+    if desconocidas:
+        raise ValueError(f"Predicados desconocidos en {columna}: {', '.join(sorted(desconocidas))}")
+
+    columnas = {columna}
+    predicados: list[Mascara] = []
+    for clave in claves:
+        if clave == "other":
+            continue
+        if clave == "op":
+            otra, simbolo = spec.get("other"), spec["op"]
+            if simbolo not in OPERADORES or not otra:
+                raise ValueError(f"'op' necesita uno de {', '.join(OPERADORES)} y 'other' ({columna})")
+            comparar = OPERADORES[simbolo]
+            columnas.add(otra)
+            predicados.append(lambda v, otra=otra, comparar=comparar: _mascara(comparar(v.columna(columna), v.columna(otra))))
+        else:
+            predicados.append(_predicado(columna, clave, spec[clave], tipos))
+    if len(predicados) == 1:
+        return predicados[0], columnas
+    return (lambda v: np.logical_and.reduce([p(v) for p in predicados])), columnas
+
+
+@dataclass
+class ReglasCompiladas:
+    tipos: dict[str, str]
+    requeridas: list[str]
+    unicas: list[str]
+    reglas: list[Regla]
+
+    @property
+    def columnas(self) -> list[str]:
+        usadas = {c for r in self.reglas for c in r.columnas}
+        return list(dict.fromkeys([*self.requeridas, *self.unicas, *sorted(usadas)]))
+
+
+def compilar(spec: dict) -> ReglasCompiladas:
+    """Valida el archivo de reglas y lo compila; los errores salen como ValueError."""
+    columnas_spec = spec.get("columns") or {}
+    tipos: dict[str, str] = {}
+    for col, opciones in columnas_spec.items():
+        desconocidas = set(opciones or {}) - CLAVES_COLUMNA
+        if desconocidas:
+            raise ValueError(f"Claves desconocidas en la columna {col}: {', '.join(sorted(desconocidas))}")
+        tipo = (opciones or {}).get("type", "str")
+        if tipo not in TIPOS:
+            raise ValueError(f"Tipo desconocido en {col}: {tipo} (opciones: {', '.join(TIPOS)})")
+        tipos[col] = tipo
+
+    reglas: list[Regla] = []
+    requeridas, unicas = [], []
+    for col, opciones in columnas_spec.items():
+        opciones = opciones or {}
+        tipo = tipos[col]
+        if opciones.get("required", False):
+            requeridas.append(col)
+        if opciones.get("unique", False):
+            unicas.append(col)
+        if tipo != "str":
+            reglas.append(Regla(
+                f"{col}.type", (col,),
+                lambda v, col=col: ~v.nulos(col) & _mascara(v.columna(col).isna()),
+                f"valor no convertible a {tipo}",
+            ))
+        if opciones.get("nullable", True) is False:
+            reglas.append(Regla(f"{col}.nullable", (col,), lambda v, col=col: v.nulos(col), "valor nulo"))
+        for clave in ("min", "max", "gt", "lt"):
+            if clave in opciones:
+                cumple = _predicado(col, clave, opciones[clave], tipos)
+                # Solo valores presentes y convertibles: nulos y tipos inválidos tienen su propia regla
+                reglas.append(Regla(
+                    f"{col}.{clave}", (col,),
+                    lambda v, col=col, cumple=cumple: _mascara(v.columna(col).notna()) & ~cumple(v),
+                    f"{clave} {opciones[clave]}",
+                ))
+        if "regex" in opciones:
+            cumple = _predicado(col, "regex", opciones["regex"], tipos)
+            reglas.append(Regla(f"{col}.regex", (col,), lambda v, col=col, cumple=cumple: ~v.nulos(col) & ~cumple(v), f"no coincide con {opciones['regex']}"))
+        if "allowed" in opciones:
+            cumple = _predicado(col, "in", opciones["allowed"], tipos)
+            reglas.append(Regla(f"{col}.allowed", (col,), lambda v, col=col, cumple=cumple: ~v.nulos(col) & ~cumple(v), "valor no permitido"))
+
+    nombres = {r.nombre for r in reglas}
+    for i, regla in enumerate(spec.get("rules") or []):
+        nombre = regla.get("name") or f"rule_{i + 1}"
+        if nombre in nombres:
+            raise ValueError(f"Regla repetida: {nombre}")
+        nombres.add(nombre)
+        if "then" not in regla:
+            raise ValueError(f"La regla {nombre} necesita 'then'")
+        entonces, columnas = compilar_condicion(regla["then"], tipos)
+        if "when" in regla:
+            cuando, columnas_cuando = compilar_condicion(regla["when"], tipos)
+            columnas |= columnas_cuando
+            violaciones = lambda v, cuando=cuando, entonces=entonces: cuando(v) & ~entonces(v)  # noqa: E731
+        else:
+            violaciones = lambda v, entonces=entonces: ~entonces(v)  # noqa: E731
+        reglas.append(Regla(nombre, tuple(sorted(columnas)), violaciones, regla.get("message", "")))
+
+    return ReglasCompiladas(tipos, requeridas, unicas, reglas)
+
+
+# --- Evaluación ----------------------------------------------------------------
+
+
+class EvaluadorReglas:
+    """
+    Evalúa todas las reglas en cada bloque recibido; `resultado` al final.
+    Los conteos y ejemplos son de esta pasada: las mismas `ReglasCompiladas`
+    pueden usarse en varios evaluadores.
+    """
+
+    def __init__(self, compiladas: ReglasCompiladas, particiones: int = 64, max_ejemplos: int = 5):
+        self.compiladas = compiladas
+        self.columnas = compiladas.columnas
+        self.max_ejemplos = max_ejemplos
+        self.presentes: set[str] | None = None
+        self.filas = 0
+        self.conteos = {r.nombre: 0 for r in compiladas.reglas}
+        self.ejemplos: dict[str, list[int]] = {r.nombre: [] for r in compiladas.reglas}
+        self.detector = DetectorExacto(compiladas.unicas, particiones, max_ejemplos=max_ejemplos) if compiladas.unicas else None
+
+    def consumir(self, chunk: pd.DataFrame) -> None:
+        if self.presentes is None:
+            self.presentes = set(chunk.columns)
+        self.filas += len(chunk)
+        if not len(chunk):
+            return
+        vista = Vista(chunk, self.compiladas.tipos)
+        for regla in self.compiladas.reglas:
+            if not self.presentes.issuperset(regla.columnas):
+                continue
+            try:
+                malas = regla.violaciones(vista)
+            except TypeError as e:
+                raise ErrorDeConfiguracion(
+                    f"La regla {regla.nombre} compara tipos incompatibles ({e}); "
+                    f"revisar el 'type' declarado de {', '.join(regla.columnas)}"
+                ) from e
+            cantidad = int(malas.sum())
+            if cantidad:
+                self.conteos[regla.nombre] += cantidad
+                ejemplos = self.ejemplos[regla.nombre]
+                faltan = self.max_ejemplos - len(ejemplos)
+                if faltan > 0:
+                    ejemplos += [int(i) for i in chunk.index[malas][:faltan]]
+        if self.detector is not None:
+            self.detector.consumir(chunk)
+
+    def resultado(self) -> dict:
+        presentes = self.presentes or set()
+        faltantes = [c for c in self.compiladas.requeridas if c not in presentes]
+        reglas = [
+            {
+                "rule": r.nombre,
+                "columns": list(r.columnas),
+                "message": r.mensaje,
+                "violations": self.conteos[r.nombre],
+                "examples": self.ejemplos[r.nombre],
+                "evaluated": presentes.issuperset(r.columnas),
+            }
+            for r in self.compiladas.reglas
+        ]
+        if self.detector is not None:
+            for col, res in self.detector.resultado().items():
+                reglas.append({
+                    "rule": f"{col}.unique",
+                    "columns": [col],
+                    "message": "valor repetido",
+                    "violations": res["duplicate_rows"] if col in presentes else 0,
+                    "examples": [e["rows"][1] for e in res["examples"]] if col in presentes else [],
+                    "evaluated": col in presentes,
+                })
+        return {
+            "rows": self.filas,
+            "missing_columns": faltantes,
+            "rules": reglas,
+            "total_violations": len(faltantes) + sum(r["violations"] for r in reglas),
+        }
+
+
+def evaluar(df: pd.DataFrame, spec: dict) -> dict:
+    """Atajo para un DataFrame en memoria."""
+    evaluador = EvaluadorReglas(compilar(spec))
+    evaluador.consumir(df)
+    return evaluador.resultado()
+
+
+def print_results(resultado: dict) -> None:
+    print("=== Data quality rules / Reglas de calidad ===")
+    for col in resultado["missing_columns"]:
+        print(f"Missing column: {col} / Falta columna: {col}")
+    for regla in resultado["rules"]:
+        if not regla["evaluated"]:
+            print(f"- {regla['rule']}: skipped, missing columns / omitida, faltan columnas")
+        elif regla["violations"]:
+            detalle = f" ({regla['message']})" if regla["message"] else ""
+            print(f"- {regla['rule']}: {regla['violations']} violations / violaciones{detalle}, rows / filas {regla['examples']}")
+    evaluadas = sum(r["evaluated"] for r in resultado["rules"])
+    print(f"Rules evaluated / Reglas evaluadas: {evaluadas}, total violations / violaciones: {resultado['total_violations']}")
+
+
+def check_rules(csv_path: Path, rules_path: Path, chunksize: int = 100_000, particiones: int = 64) -> dict:
+    evaluador = EvaluadorReglas(compilar(cargar_reglas(rules_path)), particiones)
+    encabezado = pd.read_csv(csv_path, nrows=0)
+    usecols = [c for c in encabezado.columns if c in set(evaluador.columnas)]
+    dtype = {c: str for c in COLUMNAS_CLAVE if c in usecols}
+    # Las columnas presentes se registran aunque el archivo no tenga filas
+    evaluador.consumir(encabezado[usecols])
+    for chunk in pd.read_csv(csv_path, usecols=usecols, dtype=dtype, chunksize=chunksize, low_memory=False):
+        evaluador.consumir(chunk)
+    return evaluador.resultado()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate declarative data-quality rules (YAML/JSON) over a CSV")
+    parser.add_argument("--path", type=str, default=None, help="Ruta del CSV (default: backend/datasets/product_dataset.csv)")
+    parser.add_argument("--rules", type=str, default=None, help="Archivo de reglas YAML/JSON (default: backend/rules/product_dataset.yaml)")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Filas por bloque de lectura (default: 100000)")
+    parser.add_argument("--partitions", type=int, default=64, help="Buckets en disco para las reglas de unicidad (default: 64)")
+    parser.add_argument("--json-out", type=str, default=None, help="Archivo JSON para guardar el resultado (opcional)")
+    parser.add_argument("--strict", action="store_true", help="Salir con código 1 si hay violaciones")
+    parser.add_argument("--profile", type=str, default=None, help="Guardar un perfil de muestreo (formato folded/flamegraph) en este archivo (opcional)")
+    args = parser.parse_args(argv)
+
+    with perfilar_a_archivo(args.profile):
+        return _run(args)
+
+
+def _run(args: argparse.Namespace) -> int:
+    csv_path = Path(args.path) if args.path else default_dataset_path()
+    rules_path = Path(args.rules) if args.rules else default_rules_path()
+    for etiqueta, path in (("CSV", csv_path), ("Rules / Reglas", rules_path)):
+        if not path.exists():
+            print(f"ERROR: {etiqueta} not found / no encontrado: {path}")
+            return 1
+
+    try:
+        resultado = check_rules(csv_path, rules_path, chunksize=args.chunksize, particiones=args.partitions)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+    print(f"Dataset scanned: {resultado['rows']} rows / filas\n")
+    print_results(resultado)
+
+    if args.json_out:
+        out_path = Path(args.json_out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with out_path.open("w", encoding="utf-8") as f:
+            json.dump(resultado, f, indent=2)
+        print(f"Results saved to / Resultado guardado en: {out_path}")
+
+    if args.strict and resultado["total_violations"] > 0:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+sampling.py
+
+Muestras aleatorias de CSV enormes para análisis interactivo.
+
+- `muestra_reservorio`: muestra uniforme de n filas en una sola pasada por
+  bloques. Cada fila recibe una clave aleatoria y se conservan las n claves
+  más chicas (equivalente al algoritmo R, pero vectorizado por bloque).
+- `muestra_por_bloques`: salta a offsets de bytes al azar y lee tramos de
+  filas consecutivas; no recorre el archivo, así que tarda segundos aunque
+  pese decenas de GB. La muestra es por conglomerados (las filas de un mismo
+  tramo se parecen si el archivo está ordenado) y `intervalo_media` lo tiene
+  en cuenta con errores estándar robustos por bloque.
+"""
+
+from __future__ import annotations
+
+import io
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class Muestra:
+    datos: pd.DataFrame
+    metodo: str
+    poblacion: int | None  # filas del archivo (estimadas si no es exacta)
+    poblacion_exacta: bool
+    grupos: np.ndarray | None = None  # tramo de origen de cada fila (muestreo por bloques)
+
+
+def muestra_reservorio(csv_path: Path, n: int, seed: int | None = None, chunksize: int = 100_000) -> Muestra:
+    if n <= 0:
+        raise ValueError("El tamaño de muestra debe ser mayor a 0.")
+    rng = np.random.default_rng(seed)
+    reservorio: pd.DataFrame | None = None
+    claves = np.empty(0)
+    total = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize, low_memory=False):
+        claves_chunk = rng.random(len(chunk))
+        chunk.index = pd.RangeIndex(total, total + len(chunk))  # posición en el archivo
+        total += len(chunk)
+        if len(claves) == n:
+            # Con el reservorio lleno solo pueden entrar filas con clave menor a la máxima
+            entran = claves_chunk < claves.max()
+            chunk, claves_chunk = chunk[entran], claves_chunk[entran]
+            if chunk.empty:
+                continue
+        candidatos = chunk if reservorio is None else pd.concat([reservorio, chunk])
+        claves = np.concatenate([claves, claves_chunk])
+        if len(claves) > n:
+            menores = np.argpartition(claves, n - 1)[:n]
+            candidatos, claves = candidatos.iloc[menores], claves[menores]
+        reservorio = candidatos
+
+    datos = reservorio.sort_index() if reservorio is not None else pd.read_csv(csv_path, nrows=0)
+    return Muestra(datos.reset_index(drop=True), "reservoir", total, True)
+
+
+def muestra_por_bloques(
+    csv_path: Path, n: int, seed: int | None = None, filas_por_bloque: int = 1_000
+) -> Muestra:
+    """
+    Exactamente `n` filas (o todo el archivo si tiene menos) en tramos de hasta
+    `filas_por_bloque` filas consecutivas. El comienzo de cada tramo es una
+    fila uniforme: se toma la que contiene un byte al azar y se acepta con
+    probabilidad 1/largo, lo que compensa que las filas largas tengan más
+    bytes (en promedio, un sorteo por byte de fila; cada uno es un seek y una
+    lectura corta). Al llegar al final del archivo el tramo sigue desde la
+    primera fila, así las del principio tienen los mismos comienzos posibles
+    que el resto. Un tramo se corta donde empieza otro ya tomado y se sortean
+    tramos hasta completar `n`.
+
+    Sesgo que queda: las filas que siguen a un tramo ya tomado tienen menos
+    comienzos posibles, algo que solo se nota con `n` cerca del total de
+    filas. Supone una fila por línea (sin saltos de línea dentro de campos
+    entre comillas).
+    """
+    if n <= 0 or filas_por_bloque <= 0:
+        raise ValueError("El tamaño de muestra y las filas por bloque deben ser mayores a 0.")
+    rng = np.random.default_rng(seed)
+    tamanio = csv_path.stat().st_size
+    tomadas: dict[int, tuple[bytes, int]] = {}  # inicio de la línea -> (línea, tramo)
+    cubiertos = 0  # bytes de las líneas tomadas (incluye las vacías, que no son filas)
+    filas = 0
+    tramo = 0
+    with csv_path.open("rb") as f:
+        encabezado = f.readline()
+        inicio = f.tell()
+        while filas < n and cubiertos < tamanio - inicio:
+            posicion = _inicio_de_linea(f, int(rng.integers(inicio, tamanio)), inicio)
+            if posicion in tomadas:
+                continue  # cayó en un tramo ya tomado: sortear otro comienzo
+            f.seek(posicion)
+            if rng.random() * len(f.readline()) >= 1:
+                continue  # rechazo por largo: cada fila sale como comienzo con la misma probabilidad
+            en_tramo = 0
+            while en_tramo < filas_por_bloque and filas < n and posicion not in tomadas:
+                f.seek(posicion)
+                linea = f.readline()
+                cubiertos += len(linea)
+                if linea.strip():
+                    tomadas[posicion] = (linea if linea.endswith(b"\n") else linea + b"\n", tramo)
+                    en_tramo += 1
+                    filas += 1
+                else:
+                    tomadas[posicion] = (b"", tramo)
+                posicion = f.tell() if f.tell() < tamanio else inicio  # al final, seguir desde la primera fila
+            tramo += 1
+
+    # En el orden del archivo, como muestra_reservorio
+    elegidas = [tomadas[p] for p in sorted(tomadas) if tomadas[p][0]]
+    lineas = [linea for linea, _ in elegidas]
+    datos = pd.read_csv(io.BytesIO(encabezado + b"".join(lineas)), low_memory=False)
+    bytes_por_fila = sum(map(len, lineas)) / len(lineas) if lineas else None
+    poblacion = round((tamanio - inicio) / bytes_por_fila) if bytes_por_fila else 0
+    return Muestra(datos, "blocks", poblacion, False, np.asarray([g for _, g in elegidas]))
+
+
+def _inicio_de_linea(f, offset: int, inicio: int, ventana: int = 4_096) -> int:
+    """Posición donde empieza la línea que contiene el byte `offset` (sin retroceder antes de `inicio`)."""
+    fin = offset
+    while fin > inicio:
+        desde = max(inicio, fin - ventana)
+        f.seek(desde)
+        salto = f.read(fin - desde).rfind(b"\n")
+        if salto >= 0:
+            return desde + salto + 1
+        fin = desde
+    return inicio
+
+
+def intervalo_media(
+    valores,
+    confianza: float = 0.95,
+    grupos: np.ndarray | None = None,
+    poblacion: int | None = None,
+) -> dict:
+    """
+    Estimación e intervalo normal de la media de `valores` (ignora NaN).
+
+    Con `grupos` usa el error estándar del estimador de razón por
+    conglomerados; con `poblacion` aplica la corrección por población finita.
+    Las proporciones se estiman pasando un indicador 0/1.
+    """
+    v = np.asarray(valores, dtype=float)
+    validos = ~np.isnan(v)
+    v = v[validos]
+    n = len(v)
+    if n == 0:
+        return {"estimate": None, "low": None, "high": None, "stderr": None}
+    media = float(v.mean())
+
+    if grupos is not None:
+        por_grupo = pd.Series(v).groupby(np.asarray(grupos)[validos]).agg(["sum", "count"])
+        b = len(por_grupo)
+        residuos = por_grupo["sum"] - media * por_grupo["count"]
+        error = math.sqrt((residuos**2).sum() / (b * (b - 1))) / por_grupo["count"].mean() if b > 1 else math.nan
+    else:
+        error = float(v.std(ddof=1)) / math.sqrt(n) if n > 1 else math.nan
+        if poblacion and poblacion > 1:
+            error *= math.sqrt(max(0.0, (poblacion - n) / (poblacion - 1)))
+
+    if math.isnan(error):
+        return {"estimate": media, "low": None, "high": None, "stderr": None}
+    z = NormalDist().inv_cdf(0.5 + confianza / 2)
+    return {"estimate": media, "low": media - z * error, "high": media + z * error, "stderr": error}
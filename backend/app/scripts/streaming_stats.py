@@ -0,0 +1,252 @@
+"""
+streaming_stats.py
+
+Estadísticas de una sola pasada para columnas numéricas, alimentadas bloque a
+bloque (p. ej. `pd.read_csv(..., chunksize=...)`), así el tamaño del archivo
+no está limitado por la RAM.
+
+- `Momentos`: conteo, nulos, media, desvío, mín. y máx. con el acumulador de
+  Welford en su forma por bloques (Chan et al.): cada bloque se resume con
+  numpy y se fusiona con el acumulado sin perder precisión.
+- `SketchKLL`: sketch de cuantiles estilo KLL. Memoria O(k log(n/k)) y error
+  de rango normalizado ≈ `epsilon` con alta probabilidad.
+- `SumasPorCategoria`: conteo, sumas y no nulos por categoría, para
+  promedios y totales agrupados.
+- Todos se fusionan con `combinar`, de modo que varios procesos pueden
+  procesar partes del archivo y juntar sus resultados al final.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+PERCENTILES_DEFAULT = (1, 5, 25, 50, 75, 95, 99)
+# Constante empírica del error de KLL: k = C / epsilon (ver test_streaming_stats)
+_CONSTANTE_KLL = 2.5
+
+
+class Momentos:
+    def __init__(self):
+        self.n = 0
+        self.nulos = 0
+        self.media = 0.0
+        self.m2 = 0.0  # suma de cuadrados de las desviaciones a la media
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def actualizar(self, valores: np.ndarray, nulos: int = 0) -> None:
+        self.nulos += nulos
+        if len(valores) == 0:
+            return
+        n_b = len(valores)
+        media_b = float(valores.mean())
+        m2_b = float(((valores - media_b) ** 2).sum())
+        self._fusionar(n_b, media_b, m2_b, float(valores.min()), float(valores.max()))
+
+    def combinar(self, otro: "Momentos") -> "Momentos":
+        self.nulos += otro.nulos
+        if otro.n:
+            self._fusionar(otro.n, otro.media, otro.m2, otro.minimo, otro.maximo)
+        return self
+
+    def _fusionar(self, n_b: int, media_b: float, m2_b: float, minimo: float, maximo: float) -> None:
+        n = self.n + n_b
+        delta = media_b - self.media
+        self.media += delta * n_b / n
+        self.m2 += m2_b + delta * delta * self.n * n_b / n
+        self.n = n
+        self.minimo = min(self.minimo, minimo)
+        self.maximo = max(self.maximo, maximo)
+
+    @property
+    def desvio(self) -> float | None:
+        """Desvío estándar muestral (ddof=1, como pandas)."""
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else None
+
+    def resumen(self) -> dict:
+        return {
+            "count": self.n,
+            "nulls": self.nulos,
+            "mean": self.media if self.n else None,
+            "std": self.desvio,
+            "min": self.minimo if self.n else None,
+            "max": self.maximo if self.n else None,
+        }
+
+
+class SketchKLL:
+    """
+    Sketch de cuantiles de Karnin–Lang–Liberty.
+
+    Cada nivel h guarda elementos con peso 2**h. Cuando un nivel excede su
+    capacidad se ordena y se promueve la mitad de los elementos (pares o
+    impares, al azar) al nivel siguiente. La capacidad decrece geométricamente
+    (factor 2/3) hacia los niveles bajos, lo que acota la memoria.
+    """
+
+    def __init__(self, epsilon: float = 0.005, seed: int | None = None):
+        if not 0 < epsilon < 1:
+            raise ValueError("epsilon debe estar entre 0 y 1.")
+        self.epsilon = epsilon
+        self.k = max(16, math.ceil(_CONSTANTE_KLL / epsilon))
+        self.n = 0
+        self.niveles: list[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacidad(self, nivel: int) -> int:
+        altura = len(self.niveles)
+        return max(2, math.ceil(self.k * (2 / 3) ** (altura - nivel - 1)))
+
+    def actualizar(self, valores: np.ndarray) -> None:
+        if len(valores) == 0:
+            return
+        self.n += len(valores)
+        self.niveles[0] = np.concatenate([self.niveles[0], np.asarray(valores, dtype=float)])
+        self._compactar()
+
+    def combinar(self, otro: "SketchKLL") -> "SketchKLL":
+        if otro.k != self.k:
+            raise ValueError("Solo se pueden combinar sketches con el mismo epsilon.")
+        while len(self.niveles) < len(otro.niveles):
+            self.niveles.append(np.empty(0))
+        for h, items in enumerate(otro.niveles):
+            self.niveles[h] = np.concatenate([self.niveles[h], items])
+        self.n += otro.n
+        self._compactar()
+        return self
+
+    def _compactar(self) -> None:
+        h = 0
+        while h < len(self.niveles):
+            items = self.niveles[h]
+            if len(items) >= self._capacidad(h):
+                if h + 1 == len(self.niveles):
+                    self.niveles.append(np.empty(0))
+                items = np.sort(items)
+                sobrante = items[-1:] if len(items) % 2 else items[:0]
+                pares = items[: len(items) - len(sobrante)]
+                promovidos = pares[int(self._rng.integers(2))::2]
+                self.niveles[h + 1] = np.concatenate([self.niveles[h + 1], promovidos])
+                self.niveles[h] = sobrante
+            h += 1
+
+    def _ordenados(self) -> tuple[np.ndarray, np.ndarray]:
+        valores = np.concatenate(self.niveles)
+        pesos = np.concatenate([np.full(len(items), 2.0 ** h) for h, items in enumerate(self.niveles)])
+        orden = np.argsort(valores, kind="stable")
+        return valores[orden], np.cumsum(pesos[orden])
+
+    def cuantiles(self, qs: Iterable[float]) -> list[float | None]:
+        if self.n == 0:
+            return [None for _ in qs]
+        valores, acumulado = self._ordenados()
+        total = acumulado[-1]
+        indices = np.searchsorted(acumulado, np.asarray(list(qs), dtype=float) * total, side="left")
+        return [float(valores[min(i, len(valores) - 1)]) for i in indices]
+
+    def cdf(self, puntos: Iterable[float]) -> np.ndarray:
+        """Fracción estimada de valores <= cada punto."""
+        valores, acumulado = self._ordenados()
+        indices = np.searchsorted(valores, np.asarray(list(puntos), dtype=float), side="right")
+        return np.where(indices > 0, acumulado[np.maximum(indices - 1, 0)], 0.0) / acumulado[-1]
+
+    @property
+    def tamanio(self) -> int:
+        return sum(len(items) for items in self.niveles)
+
+
+class EstadisticasColumna:
+    def __init__(self, epsilon: float = 0.005, seed: int | None = None):
+        self.momentos = Momentos()
+        self.sketch = SketchKLL(epsilon, seed)
+
+    def actualizar(self, serie: pd.Series) -> None:
+        numeros = pd.to_numeric(serie, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        validos = numeros[~np.isnan(numeros)]
+        self.momentos.actualizar(validos, nulos=len(numeros) - len(validos))
+        self.sketch.actualizar(validos)
+
+    def combinar(self, otra: "EstadisticasColumna") -> "EstadisticasColumna":
+        self.momentos.combinar(otra.momentos)
+        self.sketch.combinar(otra.sketch)
+        return self
+
+    def resumen(self, percentiles: Iterable[float] = PERCENTILES_DEFAULT, bins: int = 10) -> dict:
+        percentiles = list(percentiles)
+        resumen = self.momentos.resumen()
+        resumen["percentiles"] = dict(zip(
+            (f"p{p:g}" for p in percentiles), self.sketch.cuantiles(p / 100 for p in percentiles)
+        ))
+        resumen["histogram"] = self._histograma(bins)
+        resumen["rank_error"] = self.sketch.epsilon
+        return resumen
+
+    def _histograma(self, bins: int) -> dict | None:
+        """Histograma de `bins` intervalos iguales entre mín. y máx.; conteos estimados desde el sketch."""
+        m = self.momentos
+        if m.n == 0:
+            return None
+        bordes = np.linspace(m.minimo, m.maximo, bins + 1)
+        acumulada = self.sketch.cdf(bordes)
+        acumulada[0], acumulada[-1] = 0.0, 1.0
+        conteos = np.diff(np.round(acumulada * m.n)).astype(int)
+        return {"edges": bordes.tolist(), "counts": conteos.tolist()}
+
+
+class EstadisticasStreaming:
+    """Estadísticas por columna de un flujo de DataFrames; fusionable entre procesos."""
+
+    def __init__(self, columnas: Iterable[str], epsilon: float = 0.005, seed: int | None = None):
+        self.epsilon = epsilon
+        self.columnas = {col: EstadisticasColumna(epsilon, seed) for col in columnas}
+
+    def actualizar(self, chunk: pd.DataFrame) -> None:
+        for col, stats in self.columnas.items():
+            if col in chunk.columns:
+                stats.actualizar(chunk[col])
+
+    def combinar(self, otra: "EstadisticasStreaming") -> "EstadisticasStreaming":
+        for col, stats in otra.columnas.items():
+            if col in self.columnas:
+                self.columnas[col].combinar(stats)
+            else:
+                self.columnas[col] = stats
+        return self
+
+    def resumen(self, percentiles: Iterable[float] = PERCENTILES_DEFAULT, bins: int = 10) -> dict:
+        return {col: stats.resumen(percentiles, bins) for col, stats in self.columnas.items()}
+
+
+class SumasPorCategoria:
+    """Conteo de filas y, por columna, suma (`{col}_sum`) y no nulos (`{col}_n`) por categoría."""
+
+    def __init__(self, columnas: Iterable[str], clave: str = "Category"):
+        self.columnas = list(columnas)
+        self.clave = clave
+        self.parcial: pd.DataFrame | None = None
+
+    def actualizar(self, chunk: pd.DataFrame) -> None:
+        if self.clave not in chunk.columns:
+            return
+        columnas = [c for c in self.columnas if c in chunk.columns]
+        valores = chunk[columnas].apply(pd.to_numeric, errors="coerce")
+        grupos = valores.groupby(chunk[self.clave], dropna=False)
+        parcial = grupos.sum().add_suffix("_sum").join(grupos.count().add_suffix("_n"))
+        parcial["count"] = grupos.size()
+        self._sumar(parcial)
+
+    def combinar(self, otra: "SumasPorCategoria") -> "SumasPorCategoria":
+        if otra.parcial is not None:
+            self._sumar(otra.parcial)
+        return self
+
+    def _sumar(self, parcial: pd.DataFrame) -> None:
+        self.parcial = parcial if self.parcial is None else self.parcial.add(parcial, fill_value=0)
+
+    def promedio(self, columna: str) -> pd.Series:
+        """Promedio por categoría (NaN si no hay valores)."""
+        return self.parcial[f"{columna}_sum"] / self.parcial[f"{columna}_n"].where(self.parcial[f"{columna}_n"] > 0)
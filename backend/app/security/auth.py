@@ -1,12 +1,11 @@
 #path: backend/app/security/auth.py
 from datetime import datetime, timedelta, timezone
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from app.db.models.usuario import UsuarioORM
 from sqlalchemy.orm import Session
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from app.db.session import get_db
+from app.security.hashing import get_pwd_context
 
 
 # Clave secreta para firmar el token
@@ -15,13 +14,12 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verificar_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def obtener_password_hash(password):
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def __autenticar_usuario__(db: Session, username: str, password: str):
     usuario = db.query(UsuarioORM).filter(UsuarioORM.username == username).first()
@@ -43,6 +41,8 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
+    from jose import jwt  # import diferido: solo lo paga quien emite tokens
+
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 def obtener_usuario_actual(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> UsuarioORM:
@@ -51,6 +51,8 @@ def obtener_usuario_actual(token: str = Depends(oauth2_scheme), db: Session = De
         detail="No se pudo validar las credenciales",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
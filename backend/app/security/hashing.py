@@ -1,6 +1,12 @@
-from passlib.context import CryptContext
+from functools import lru_cache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    # passlib/bcrypt se importan en el primer hash, no al importar la app
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def hashear_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
@@ -0,0 +1,241 @@
+# app/services/jobs.py
+"""
+Gestor de jobs de analítica en segundo plano.
+
+`encolar` registra el job en la tabla `jobs` y lo manda a un pool de procesos
+(spawn), así generar o analizar millones de filas no bloquea a los workers de
+la API. Un hilo de fondo vuelca a la base el avance publicado por las tareas
+(ver app/services/tareas.py) y el resultado final. La cancelación se pide en
+la base, de modo que cualquier worker de la API puede cancelar un job aunque
+lo haya encolado otro: el dueño la ve en su próxima sincronización.
+
+Cada gestor renueva el latido de sus jobs activos. Un job activo sin latido
+en JOBS_LATIDO_VENCIDO segundos quedó de un proceso que ya no existe
+(reinicio, caída): se cierra como fallido antes de contar el límite de
+activos, y `cancelar` lo cierra directamente en lugar de esperar a un dueño.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.models.job import CANCELADO, COMPLETADO, FALLIDO, Job
+from app.repositories.job_repository import JobRepository
+from app.services import tareas
+
+logger = logging.getLogger("app.jobs")
+
+JOBS_MAX_WORKERS = int(os.getenv("JOBS_MAX_WORKERS", "2"))
+JOBS_MAX_ACTIVOS = int(os.getenv("JOBS_MAX_ACTIVOS", "8"))
+JOBS_LATIDO_VENCIDO = float(os.getenv("JOBS_LATIDO_VENCIDO", "30"))
+
+
+class LimiteDeJobsAlcanzado(Exception):
+    pass
+
+
+def default_jobs_dir() -> Path:
+    # Este archivo está en backend/app/services/...  => subir dos niveles para llegar a backend/
+    backend_root = Path(__file__).resolve().parents[2]
+    return backend_root / "jobs"
+
+
+def default_datasets_dir() -> Path:
+    return Path(__file__).resolve().parents[2] / "datasets"
+
+
+class GestorJobs:
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        max_workers: int = JOBS_MAX_WORKERS,
+        max_activos: int = JOBS_MAX_ACTIVOS,
+        directorio: Path | None = None,
+        intervalo: float = 0.5,
+        latido_vencido: float = JOBS_LATIDO_VENCIDO,
+    ):
+        self.session_factory = session_factory
+        self.max_workers = max_workers
+        self.max_activos = max_activos
+        self.directorio = directorio or default_jobs_dir()
+        self.intervalo = intervalo
+        self.vencimiento = timedelta(seconds=latido_vencido)
+        self.propietario = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._ultimo_latido = 0.0
+        self._futuros: dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._pool: ProcessPoolExecutor | None = None
+        self._manager = None
+        self._compartido = None
+        self._hilo: threading.Thread | None = None
+
+    def _iniciar(self) -> None:
+        if self._pool is not None:
+            return
+        contexto = multiprocessing.get_context("spawn")  # sin fork: la API tiene hilos y conexiones abiertas
+        self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=contexto)
+        if self._manager is not None:
+            return  # pool recreado tras romperse: el dict compartido y el monitor siguen
+        self._manager = contexto.Manager()
+        self._compartido = self._manager.dict()
+        self._hilo = threading.Thread(target=self._vigilar, name="jobs-monitor", daemon=True)
+        self._hilo.start()
+
+    def resolver_dataset(self, path: str | None) -> Path:
+        """CSV de entrada: por defecto el dataset del repo; solo se aceptan rutas dentro de datasets/ o jobs/."""
+        raices = [default_datasets_dir().resolve(), self.directorio.resolve()]
+        if not path:
+            candidato = raices[0] / "product_dataset.csv"
+        else:
+            candidatos = [(raiz / path).resolve() for raiz in raices]
+            candidato = next((c for c in candidatos if c.is_file()), candidatos[0])
+        if not any(candidato.is_relative_to(raiz) for raiz in raices):
+            raise ValueError("La ruta debe estar dentro de backend/datasets o de la carpeta de jobs.")
+        if not candidato.is_file():
+            raise ValueError(f"No existe el dataset: {path or candidato.name}")
+        return candidato
+
+    def encolar(self, tipo: str, parametros: dict, creado_por: str | None = None) -> Job:
+        if tipo not in tareas.TAREAS:
+            raise ValueError(f"Tipo de job desconocido: {tipo}")
+        parametros = {k: v for k, v in parametros.items() if v is not None}
+        if tipo != "generate":
+            parametros["path"] = str(self.resolver_dataset(parametros.get("path")))
+
+        with self._lock:
+            with self.session_factory() as db:
+                repo = JobRepository(db)
+                repo.cerrar_huerfanos(self.vencimiento)
+                if repo.contar_activos() >= self.max_activos:
+                    raise LimiteDeJobsAlcanzado(
+                        f"Hay {self.max_activos} jobs pendientes o en curso; reintente cuando termine alguno."
+                    )
+                job = repo.create_job(tipo, parametros, creado_por, self.propietario)
+            self._iniciar()
+            try:
+                self._futuros[job.id] = self._pool.submit(
+                    tareas.ejecutar, tipo, parametros, str(self.directorio / str(job.id)), self._compartido, job.id
+                )
+            except Exception as exc:  # p. ej. BrokenProcessPool: un worker murió de golpe
+                # El job nunca va a correr: se cierra ya y el próximo encolar arma un pool nuevo.
+                # Los futuros del pool roto terminan con el mismo error y el monitor los cierra.
+                self._pool.shutdown(wait=False)
+                self._pool = None
+                with self.session_factory() as db:
+                    repo = JobRepository(db)
+                    repo.finalizar(job.id, FALLIDO, error=f"{type(exc).__name__}: {exc}")
+                    job = repo.get_job(job.id)
+        return job
+
+    def cancelar(self, id_: int) -> Job | None:
+        with self.session_factory() as db:
+            repo = JobRepository(db)
+            job = repo.solicitar_cancelacion(id_)
+            if job is not None and job.activo and repo.cancelar_huerfano(id_, self.vencimiento):
+                return repo.get_job(id_)  # ningún gestor vivo lo corre: nadie más lo va a cerrar
+        if job is not None and job.activo:
+            self._propagar_cancelacion(id_)
+            self.sincronizar()
+            with self.session_factory() as db:
+                job = JobRepository(db).get_job(id_)
+        return job
+
+    def _propagar_cancelacion(self, id_: int) -> None:
+        with self._lock:
+            futuro = self._futuros.get(id_)
+        if futuro is None:
+            return
+        if not futuro.cancel() and self._compartido is not None:
+            self._compartido[("cancelar", id_)] = True  # ya corre: la tarea corta en su próximo punto de control
+
+    def _vigilar(self) -> None:
+        while not self._detener.wait(self.intervalo):
+            try:
+                self.sincronizar()
+            except Exception:  # el monitor no debe morir por un error transitorio de la base
+                logger.exception("Error sincronizando jobs de %s", self.propietario)
+
+    def sincronizar(self) -> None:
+        """Vuelca a la base el avance y el final de los jobs de este proceso."""
+        with self._lock:
+            activos = dict(self._futuros)
+        if not activos:
+            return
+        with self.session_factory() as db:
+            repo = JobRepository(db)
+            # Un latido por tercio del vencimiento alcanza y no escribe en la base en cada vuelta
+            if time.monotonic() - self._ultimo_latido >= self.vencimiento.total_seconds() / 3:
+                repo.latir(activos, self.propietario)
+                self._ultimo_latido = time.monotonic()
+            for id_ in repo.ids_con_cancelacion(activos):
+                self._propagar_cancelacion(id_)
+            for id_, futuro in activos.items():
+                if futuro.done():
+                    with self._lock:
+                        if self._futuros.pop(id_, None) is None:
+                            continue  # ya lo cerró otro hilo (monitor o request)
+                    self._finalizar(repo, id_, futuro)
+                elif self._compartido is not None and ("progreso", id_) in self._compartido:
+                    progreso, mensaje = self._compartido[("progreso", id_)]
+                    repo.marcar_en_curso(id_, progreso, mensaje)
+
+    def _finalizar(self, repo: JobRepository, id_: int, futuro: Future) -> None:
+        if futuro.cancelled():
+            repo.finalizar(id_, CANCELADO, mensaje="Cancelado antes de iniciar")
+        elif isinstance(futuro.exception(), tareas.TareaCancelada):
+            repo.finalizar(id_, CANCELADO, mensaje="Cancelado")
+        elif futuro.exception() is not None:
+            exc = futuro.exception()
+            repo.finalizar(id_, FALLIDO, error=f"{type(exc).__name__}: {exc}")
+        else:
+            resultado = futuro.result()
+            repo.finalizar(
+                id_, COMPLETADO, progreso=1.0, mensaje="Completado",
+                resultado=resultado["resumen"], resultado_path=resultado["resultado_path"],
+            )
+        if self._compartido is not None:
+            self._compartido.pop(("progreso", id_), None)
+            self._compartido.pop(("cancelar", id_), None)
+
+    def apagar(self) -> None:
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+        if self._pool is not None:
+            with self._lock:
+                pendientes = list(self._futuros)
+            for id_ in pendientes:
+                self._propagar_cancelacion(id_)
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self.sincronizar()
+            self._manager.shutdown()
+            self._pool = self._manager = self._compartido = None
+
+
+_gestores: dict[Engine, GestorJobs] = {}
+_gestores_lock = threading.Lock()
+
+
+def gestor_jobs_para(engine: Engine) -> GestorJobs:
+    """Devuelve el gestor de jobs del engine (uno por base), creándolo la primera vez."""
+    with _gestores_lock:
+        gestor = _gestores.get(engine)
+        if gestor is None:
+            factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            gestor = _gestores[engine] = GestorJobs(factory)
+            atexit.register(gestor.apagar)
+        return gestor
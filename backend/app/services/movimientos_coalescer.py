@@ -0,0 +1,93 @@
+# app/services/movimientos_coalescer.py
+"""
+Coalescedor write-behind de movimientos de stock.
+
+Los requests encolan su movimiento y esperan un Future. Un hilo de fondo junta
+todo lo que llega durante `ventana_ms` (o hasta `max_lote` movimientos) y lo
+aplica con `MovimientoRepository.aplicar_movimientos` en una sola transacción,
+así N requests concurrentes pagan un commit (y un fsync) en lugar de N.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.models.movimiento import ResultadoMovimiento
+from app.repositories.movimiento_repository import MovimientoRepository
+from app.schemas.movimiento import MovimientoLoteItem
+
+
+class CoalescedorMovimientos:
+    def __init__(self, session_factory: sessionmaker, ventana_ms: float = 5.0, max_lote: int = 500):
+        self.session_factory = session_factory
+        self.ventana = ventana_ms / 1000
+        self.max_lote = max_lote
+        self._cola: queue.Queue[tuple[MovimientoLoteItem, Future]] = queue.Queue()
+        self._hilo: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def enviar(self, movimiento: MovimientoLoteItem) -> Future:
+        """Encola el movimiento; el Future se resuelve con su ResultadoMovimiento tras el commit del lote."""
+        futuro: Future = Future()
+        self._cola.put((movimiento, futuro))
+        self._asegurar_hilo()
+        return futuro
+
+    def aplicar(self, movimiento: MovimientoLoteItem, timeout: float | None = 10.0) -> ResultadoMovimiento:
+        return self.enviar(movimiento).result(timeout=timeout)
+
+    def _asegurar_hilo(self) -> None:
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        with self._lock:
+            if self._hilo is None or not self._hilo.is_alive():
+                self._hilo = threading.Thread(target=self._bucle, name="coalescedor-movimientos", daemon=True)
+                self._hilo.start()
+
+    def _bucle(self) -> None:
+        while True:
+            lote = [self._cola.get()]
+            limite = time.monotonic() + self.ventana
+            while len(lote) < self.max_lote:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(self._cola.get(timeout=restante))
+                except queue.Empty:
+                    break
+            self._procesar(lote)
+
+    def _procesar(self, lote: list[tuple[MovimientoLoteItem, Future]]) -> None:
+        db = self.session_factory()
+        try:
+            resultados = MovimientoRepository(db).aplicar_movimientos([mov for mov, _ in lote])
+        except Exception as e:
+            db.rollback()
+            for _, futuro in lote:
+                futuro.set_exception(e)
+        else:
+            for (_, futuro), resultado in zip(lote, resultados):
+                futuro.set_result(resultado)
+        finally:
+            db.close()
+
+
+_coalescedores: dict[Engine, CoalescedorMovimientos] = {}
+_coalescedores_lock = threading.Lock()
+
+
+def coalescedor_para(engine: Engine) -> CoalescedorMovimientos:
+    """Devuelve el coalescedor del engine (uno por base), creándolo la primera vez."""
+    with _coalescedores_lock:
+        coalescedor = _coalescedores.get(engine)
+        if coalescedor is None:
+            factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            coalescedor = _coalescedores[engine] = CoalescedorMovimientos(factory)
+        return coalescedor
@@ -0,0 +1,104 @@
+# app/services/tareas.py
+"""
+Tareas de analítica que corren dentro de los procesos del pool de jobs.
+
+Se importan en el proceso hijo: pandas/numpy y los scripts se cargan recién
+ahí, nunca en el proceso de la API. El avance y la cancelación viajan por un
+dict compartido (`multiprocessing.Manager`): la tarea publica
+`("progreso", id)` y consulta `("cancelar", id)` en cada punto de control.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+from pathlib import Path
+from typing import Any, Callable, MutableMapping
+
+# Filas por bloque al generar: acota la memoria y da puntos de control frecuentes
+BLOQUE_GENERACION = 100_000
+# Filas por bloque al leer un CSV existente
+BLOQUE_LECTURA = 100_000
+
+
+class TareaCancelada(Exception):
+    pass
+
+
+class Progreso:
+    def __init__(self, compartido: MutableMapping, job_id: int):
+        self.compartido = compartido
+        self.job_id = job_id
+
+    def __call__(self, fraccion: float, mensaje: str) -> None:
+        """Publica el avance y corta la tarea si se pidió cancelarla."""
+        if self.compartido.get(("cancelar", self.job_id)):
+            raise TareaCancelada(f"Job {self.job_id} cancelado")
+        self.compartido[("progreso", self.job_id)] = (min(max(fraccion, 0.0), 1.0), mensaje)
+
+
+def _generar(parametros: dict, directorio: Path, progreso: Progreso) -> dict[str, Any]:
+    from app.scripts.create_product_dataset import generate_dataset
+
+    total = parametros.get("num_samples") or 50
+    destino = directorio / "product_dataset.csv"
+    hechas = 0
+    while hechas < total:
+        progreso(hechas / total, f"Generando filas {hechas}-{min(hechas + BLOQUE_GENERACION, total)} de {total}")
+        n = min(BLOQUE_GENERACION, total - hechas)
+        # La semilla solo se fija en el primer bloque; los siguientes continúan la misma secuencia
+        df = generate_dataset(n, seed=parametros.get("seed") if hechas == 0 else None, inicio=hechas)
+        df.to_csv(destino, mode="w" if hechas == 0 else "a", header=hechas == 0, index=False)
+        hechas += n
+    return {"resultado_path": str(destino), "resumen": {"rows": total}}
+
+
+def _metricas(parametros: dict, directorio: Path, progreso: Progreso) -> dict[str, Any]:
+    from app.scripts import calculate_product_metrics as script
+
+    progreso(0.05, "Cargando dataset")
+    df = script.load_dataset(Path(parametros["path"]))
+    progreso(0.6, f"Calculando métricas sobre {len(df)} filas")
+    metricas = script.compute_metrics(df)
+    destino = directorio / "metrics.json"
+    destino.write_text(json.dumps(metricas, indent=2), encoding="utf-8")
+    resumen = {k: v for k, v in metricas.items() if k != "by_category"}
+    return {"resultado_path": str(destino), "resumen": resumen}
+
+
+def _integridad(parametros: dict, directorio: Path, progreso: Progreso) -> dict[str, Any]:
+    from app.scripts.check_dataset_integrity import AcumuladorIntegridad, leer_bloques, report_duplicates
+    from app.scripts.duplicates import check_duplicates, estimar_filas
+
+    # Misma lectura por bloques que el CLI: la memoria no depende del tamaño del CSV
+    path = Path(parametros["path"])
+    total = max(estimar_filas(path), 1)
+    acumulador = AcumuladorIntegridad()
+    for chunk in leer_bloques(path, BLOQUE_LECTURA):
+        progreso(0.05 + 0.65 * min(acumulador.filas / total, 1.0), f"Verificando filas desde {acumulador.filas}")
+        acumulador.consumir(chunk)
+    issues = acumulador.reportar()
+    progreso(0.75, "Buscando Id/Code duplicados")
+    issues.update(report_duplicates(check_duplicates(path, chunksize=BLOQUE_LECTURA, directorio=directorio)))
+    destino = directorio / "integrity.json"
+    destino.write_text(json.dumps(issues, indent=2), encoding="utf-8")
+    return {"resultado_path": str(destino), "resumen": {**issues, "total_issues": sum(issues.values())}}
+
+
+TAREAS: dict[str, Callable[[dict, Path, Progreso], dict[str, Any]]] = {
+    "generate": _generar,
+    "metrics": _metricas,
+    "integrity": _integridad,
+}
+
+
+def ejecutar(tipo: str, parametros: dict, directorio: str, compartido: MutableMapping, job_id: int) -> dict[str, Any]:
+    """Punto de entrada en el proceso hijo. La salida de consola del script queda en job.log."""
+    carpeta = Path(directorio)
+    carpeta.mkdir(parents=True, exist_ok=True)
+    progreso = Progreso(compartido, job_id)
+    with (carpeta / "job.log").open("w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+        progreso(0.0, "Iniciado")
+        resultado = TAREAS[tipo](parametros, carpeta, progreso)
+    progreso(1.0, "Completado")
+    return resultado
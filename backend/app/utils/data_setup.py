@@ -1,5 +1,6 @@
 from app.db.models.usuario import UsuarioORM
 from app.db.models.rol import RolORM
+from app.db.unit_of_work import agregar, confirmar
 from app.security.hashing import hashear_password
 
 
@@ -11,9 +12,8 @@ def crear_usuario_con_rol(db, username: str, password: str, rol: str):
     if not rol_obj:
         print(f"➕ Rol '{rol}' no existe. Creando nuevo rol...")
         rol_obj = RolORM(nombre=rol)
-        db.add(rol_obj)
-        db.commit()
-        db.refresh(rol_obj)
+        agregar(db, rol_obj)
+        db.flush()  # sin autoflush: el próximo usuario con este rol tiene que encontrarlo
     else:
         print(f"✅ Rol '{rol}' ya existe.")
 
@@ -29,9 +29,8 @@ def crear_usuario_con_rol(db, username: str, password: str, rol: str):
     )
     user.roles.append(rol_obj)
 
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    
+    agregar(db, user)
+    confirmar(db)  # dentro de una UnidadDeTrabajo, el commit es el de la unidad
+
     print(f"✅ Usuario '{username}' creado exitosamente con rol '{rol}'.\n")
     return user
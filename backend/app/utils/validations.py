@@ -1,26 +1,26 @@
 # app/utils/validations.py
 
-from sqlalchemy.orm import Session
-from app.db.models.producto import ProductoORM
+from sqlalchemy.exc import IntegrityError
 
-def check_unicidad_producto(
-    db: Session, nombre: str | None, sku: str | None, exclude_id: int | None = None
-):
-    """
-    Valida que no exista otro producto con el mismo nombre o SKU.
-    Si se pasa `exclude_id`, se ignora ese ID en la búsqueda (para updates).
-    Lanza ValueError si encuentra conflicto.
+NOMBRE_DUPLICADO = "Ya existe otro producto con ese nombre."
+SKU_DUPLICADO = "Ya existe otro producto con ese SKU."
+
+
+def error_de_unicidad_producto(exc: IntegrityError) -> ValueError | None:
     """
-    if nombre:
-        query = db.query(ProductoORM).filter(ProductoORM.nombre == nombre)
-        if exclude_id is not None:
-            query = query.filter(ProductoORM.id != exclude_id)
-        if query.first():
-            raise ValueError("Ya existe otro producto con ese nombre.")
+    Traduce la violación de los índices únicos de `productos` (nombre, sku) al
+    ValueError de dominio. Devuelve None si el IntegrityError es por otra causa.
 
-    if sku:
-        query = db.query(ProductoORM).filter(ProductoORM.sku == sku)
-        if exclude_id is not None:
-            query = query.filter(ProductoORM.id != exclude_id)
-        if query.first():
-            raise ValueError("Ya existe otro producto con ese SKU.")
+    La unicidad la garantiza la base: consultar antes de escribir cuesta dos
+    round trips y no evita que dos altas concurrentes pasen el chequeo.
+    """
+    # SQLite: "UNIQUE constraint failed: productos.sku"
+    # Postgres: 'duplicate key value violates unique constraint ...  DETAIL: Key (sku)=(...)'
+    mensaje = str(exc.orig).lower()
+    if "unique" not in mensaje and "duplicate" not in mensaje:
+        return None
+    if "productos.nombre" in mensaje or "(nombre)" in mensaje or "ix_productos_nombre" in mensaje:
+        return ValueError(NOMBRE_DUPLICADO)
+    if "productos.sku" in mensaje or "(sku)" in mensaje or "productos_sku_key" in mensaje:
+        return ValueError(SKU_DUPLICADO)
+    return None
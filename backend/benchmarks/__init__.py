@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Los módulos bench_* registran sus benchmarks al importarse.
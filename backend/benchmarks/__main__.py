@@ -0,0 +1,65 @@
+# benchmarks/__main__.py
+"""
+CLI de benchmarks.
+
+    python -m benchmarks run [--filter api.] [--sizes 10k,1m] [--out benchmarks/results/actual.json]
+    python -m benchmarks compare base.json actual.json [--threshold 0.10]
+
+`compare` sale con código 1 si algún benchmark empeora más que el umbral.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks import bench_api, bench_mapping, bench_repositories, bench_scripts  # noqa: F401  (registran benchmarks)
+from benchmarks.harness import SIZES, compare, run, save
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks del backend")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Ejecutar benchmarks y guardar resultados JSON")
+    p_run.add_argument("--filter", type=str, default=None, help="Solo benchmarks cuyo nombre contenga este texto")
+    p_run.add_argument("--sizes", type=str, default="10k", help=f"Tamaños separados por coma ({', '.join(SIZES)})")
+    p_run.add_argument("--repeat", type=int, default=None, help="Repeticiones por benchmark (default: las de cada uno)")
+    p_run.add_argument("--out", type=str, default=None, help="Archivo JSON de salida (default: benchmarks/results/<fecha>.json)")
+
+    p_cmp = sub.add_parser("compare", help="Comparar dos corridas y marcar regresiones")
+    p_cmp.add_argument("base", type=str)
+    p_cmp.add_argument("new", type=str)
+    p_cmp.add_argument("--threshold", type=float, default=0.10, help="Empeoramiento tolerado (default: 0.10 = 10%%)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        sizes = tuple(s.strip().lower() for s in args.sizes.split(",") if s.strip())
+        unknown = [s for s in sizes if s not in SIZES]
+        if unknown:
+            print(f"ERROR: unknown sizes / tamaños desconocidos: {unknown}")
+            return 2
+        data = run(args.filter, sizes=sizes, repeat=args.repeat)
+        out = Path(args.out) if args.out else RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+        print(f"\nResults saved to / Resultados guardados en: {save(data, out)}")
+        return 0
+
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    new = json.loads(Path(args.new).read_text(encoding="utf-8"))
+    filas = compare(base, new, threshold=args.threshold)
+    for fila in filas:
+        marca = "REGRESSION" if fila["regression"] else "ok"
+        print(f"{fila['name']:<45} {fila['base'] * 1000:10.3f}ms -> {fila['new'] * 1000:10.3f}ms  x{fila['ratio']:.2f}  {marca}")
+    regresiones = [f for f in filas if f["regression"]]
+    print(f"\n{len(regresiones)} regression(s) / regresiones over {args.threshold:.0%}")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
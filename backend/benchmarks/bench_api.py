@@ -0,0 +1,128 @@
+# benchmarks/bench_api.py
+"""Throughput de la API con TestClient contra SQLite en memoria sembrada."""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.cache import get_producto_cache
+from app.core.http_cache import respuestas_cache
+from app.db.models.base import EntityBase
+from app.db.models.producto import ProductoORM
+from app.db.models.rol import RolORM
+from app.db.models.usuario import UsuarioORM
+from app.db.session import get_db
+from app.main import app
+from app.security.auth import ALGORITHM, SECRET_KEY, create_access_token, obtener_password_hash
+from benchmarks.harness import benchmark
+
+SEED_PRODUCTOS = 1_000
+REQUESTS = 200
+
+
+@dataclass
+class ApiContext:
+    client: TestClient
+    headers: dict[str, str]
+    ids: list[int]
+    contador: itertools.count
+
+
+def _api_setup() -> ApiContext:
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    EntityBase.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    with Session() as db:
+        rol = RolORM(nombre="admin")
+        db.add(UsuarioORM(
+            username="admin", email="admin@example.com",
+            hashed_password=obtener_password_hash("admin123"), is_active=True, roles=[rol],
+        ))
+        db.add_all(
+            ProductoORM(nombre=f"Producto {i}", sku=f"SKU{i:06d}", stock=100, stock_minimo=i % 20)
+            for i in range(SEED_PRODUCTOS)
+        )
+        db.commit()
+        ids = [i for (i,) in db.query(ProductoORM.id)]
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    get_producto_cache().clear()
+    respuestas_cache.clear()
+    client = TestClient(app)
+    token = client.post("/auth/login", data={"username": "admin", "password": "admin123"}).json()["access_token"]
+    return ApiContext(client, {"Authorization": f"Bearer {token}"}, ids, itertools.count())
+
+
+@benchmark("api.create_producto", setup=_api_setup, ops=lambda n: REQUESTS)
+def bench_create_producto(ctx: ApiContext) -> None:
+    for _ in range(REQUESTS):
+        i = next(ctx.contador)
+        resp = ctx.client.post("/productos/", json={"nombre": f"Nuevo {i}", "sku": f"NEW{i}"}, headers=ctx.headers)
+        assert resp.status_code == 201, resp.text
+
+
+@benchmark("api.get_producto", setup=_api_setup, ops=lambda n: REQUESTS)
+def bench_get_producto(ctx: ApiContext) -> None:
+    for i in range(REQUESTS):
+        resp = ctx.client.get(f"/productos/{ctx.ids[i % len(ctx.ids)]}", headers=ctx.headers)
+        assert resp.status_code == 200
+
+
+@benchmark("api.get_producto_not_modified", setup=_api_setup, ops=lambda n: REQUESTS)
+def bench_get_producto_304(ctx: ApiContext) -> None:
+    etag = ctx.client.get(f"/productos/{ctx.ids[0]}", headers=ctx.headers).headers["ETag"]
+    headers = {**ctx.headers, "If-None-Match": etag}
+    for _ in range(REQUESTS):
+        assert ctx.client.get(f"/productos/{ctx.ids[0]}", headers=headers).status_code == 304
+
+
+@benchmark("api.list_productos", setup=_api_setup, ops=lambda n: 20)
+def bench_list_productos(ctx: ApiContext) -> None:
+    for _ in range(20):
+        assert ctx.client.get("/productos/", headers=ctx.headers).status_code == 200
+
+
+@benchmark("api.movimiento_stock", setup=_api_setup, ops=lambda n: REQUESTS)
+def bench_movimiento(ctx: ApiContext) -> None:
+    for i in range(REQUESTS):
+        cantidad = 1 if i % 2 else -1
+        resp = ctx.client.post(
+            f"/productos/{ctx.ids[i % len(ctx.ids)]}/movimientos", json={"cantidad": cantidad}, headers=ctx.headers
+        )
+        assert resp.status_code == 201, resp.text
+
+
+@benchmark("api.search", setup=_api_setup, ops=lambda n: REQUESTS)
+def bench_search(ctx: ApiContext) -> None:
+    for i in range(REQUESTS):
+        ctx.client.get("/productos/search", params={"q": f"Producto {i}"}, headers=ctx.headers)
+
+
+@benchmark("auth.login", setup=_api_setup, repeat=3, ops=lambda n: 5)
+def bench_login(ctx: ApiContext) -> None:
+    for _ in range(5):
+        resp = ctx.client.post("/auth/login", data={"username": "admin", "password": "admin123"})
+        assert resp.status_code == 200
+
+
+@benchmark("auth.jwt_roundtrip", ops=lambda n: 1_000)
+def bench_jwt_roundtrip() -> None:
+    from jose import jwt
+
+    for i in range(1_000):
+        token = create_access_token({"sub": f"user{i}"})
+        jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -0,0 +1,28 @@
+# benchmarks/bench_mapping.py
+"""Costo de mapear filas ORM a objetos de dominio."""
+
+from __future__ import annotations
+
+from app.db.models.producto import ProductoORM
+from app.domain.mappers.producto_mapper import producto_domain_to_orm, producto_orm_to_domain
+from benchmarks.harness import benchmark
+
+
+def _orms(n: int) -> list[ProductoORM]:
+    return [
+        ProductoORM(id=i, nombre=f"Producto {i}", sku=f"SKU{i}", descripcion="x", stock=i % 50, stock_minimo=10, version=1)
+        for i in range(n)
+    ]
+
+
+@benchmark("mapping.orm_to_domain", setup=_orms, sizes=("10k", "100k", "1m"), ops=lambda n: n)
+def bench_orm_to_domain(orms: list[ProductoORM], n: int) -> None:
+    for orm in orms:
+        producto_orm_to_domain(orm)
+
+
+@benchmark("mapping.domain_to_orm", setup=lambda n: [producto_orm_to_domain(o) for o in _orms(n)],
+           sizes=("10k", "100k"), ops=lambda n: n)
+def bench_domain_to_orm(dominios, n: int) -> None:
+    for d in dominios:
+        producto_domain_to_orm(d)
@@ -0,0 +1,51 @@
+# benchmarks/bench_repositories.py
+"""Altas en lote con commit por operación vs. unidad de trabajo (SQLite en archivo, con fsync)."""
+
+from __future__ import annotations
+
+import itertools
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.models.base import EntityBase
+from app.db.unit_of_work import UnidadDeTrabajo
+from app.repositories.producto_repository import ProductoRepository
+from app.schemas.producto import ProductoCreate
+from benchmarks.harness import benchmark
+
+LOTE = 500
+
+
+@dataclass
+class RepoContext:
+    db: Session
+    contador: itertools.count
+
+    def lote(self) -> list[ProductoCreate]:
+        return [ProductoCreate(nombre=f"Producto {i}", sku=f"SKU{i}") for i in itertools.islice(self.contador, LOTE)]
+
+
+def _repo_setup() -> RepoContext:
+    path = Path(tempfile.mkdtemp(prefix="bench-repo-")) / "bench.db"
+    engine = create_engine(f"sqlite:///{path}")
+    EntityBase.metadata.create_all(bind=engine)
+    return RepoContext(sessionmaker(autocommit=False, autoflush=False, bind=engine)(), itertools.count())
+
+
+@benchmark("repo.create_commit_por_producto", setup=_repo_setup, repeat=3, ops=lambda n: LOTE)
+def bench_create_commit_por_producto(ctx: RepoContext) -> None:
+    repo = ProductoRepository(ctx.db)
+    for p in ctx.lote():
+        repo.create_producto(p)
+
+
+@benchmark("repo.create_unidad_de_trabajo", setup=_repo_setup, repeat=3, ops=lambda n: LOTE)
+def bench_create_unidad_de_trabajo(ctx: RepoContext) -> None:
+    repo = ProductoRepository(ctx.db)
+    with UnidadDeTrabajo(ctx.db):
+        for p in ctx.lote():
+            repo.create_producto(p)
@@ -0,0 +1,74 @@
+# benchmarks/bench_scripts.py
+"""Scripts de analítica sobre datasets generados de 10k / 1M / 10M filas."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import tempfile
+from pathlib import Path
+
+from app.scripts import analytics_pipeline, calculate_product_metrics, check_dataset_integrity, exploratory_analysis
+from app.scripts.partitioned_dataset import repartir
+from app.scripts.create_product_dataset import generate_dataset
+from benchmarks.harness import benchmark
+
+SIZES = ("10k", "1m", "10m")
+_CSV_CACHE: dict[int, Path] = {}
+_PARTICIONADO_CACHE: dict[int, Path] = {}
+
+
+def _dataset(n: int) -> Path:
+    """CSV de `n` filas, generado una vez por corrida y reutilizado por todos los benchmarks."""
+    if n not in _CSV_CACHE:
+        path = Path(tempfile.mkdtemp(prefix="bench-")) / f"products_{n}.csv"
+        generate_dataset(num_samples=n, seed=42).to_csv(path, index=False)
+        _CSV_CACHE[n] = path
+    return _CSV_CACHE[n]
+
+
+def _particionado(n: int) -> Path:
+    """El mismo dataset particionado por Category, escrito una vez por corrida."""
+    if n not in _PARTICIONADO_CACHE:
+        csv = _dataset(n)
+        _PARTICIONADO_CACHE[n] = csv.with_name(f"products_{n}")
+        repartir(csv, _PARTICIONADO_CACHE[n])
+    return _PARTICIONADO_CACHE[n]
+
+
+def _silencio():
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+@benchmark("scripts.generate_dataset", sizes=("10k", "1m"), repeat=3, ops=lambda n: n)
+def bench_generate(n: int) -> None:
+    generate_dataset(num_samples=n, seed=42)
+
+
+@benchmark("scripts.calculate_product_metrics", setup=_dataset, sizes=SIZES, repeat=3, ops=lambda n: n)
+def bench_metrics(csv: Path, n: int) -> None:
+    calculate_product_metrics.compute_metrics(calculate_product_metrics.load_dataset(csv))
+
+
+@benchmark("scripts.calculate_product_metrics.one_category", setup=_particionado, sizes=SIZES, repeat=3, ops=lambda n: n)
+def bench_metrics_particionado(raiz: Path, n: int) -> None:
+    """Un reporte de una sola categoría: la poda lee ~1/5 de los archivos; comparar contra el anterior."""
+    calculate_product_metrics.compute_metrics(calculate_product_metrics.load_dataset(raiz, {"Category": ["Food"]}))
+
+
+@benchmark("scripts.check_dataset_integrity", setup=_dataset, sizes=SIZES, repeat=3, ops=lambda n: n)
+def bench_integrity(csv: Path, n: int) -> None:
+    with _silencio():
+        check_dataset_integrity.main(["--path", str(csv)])
+
+
+@benchmark("scripts.exploratory_analysis", setup=_dataset, sizes=SIZES, repeat=3, ops=lambda n: n)
+def bench_exploratory(csv: Path, n: int) -> None:
+    exploratory_analysis.compute_metrics(exploratory_analysis.load_for_metrics(csv))
+
+
+@benchmark("scripts.analytics_pipeline", setup=_dataset, sizes=SIZES, repeat=3, ops=lambda n: n)
+def bench_pipeline(csv: Path, n: int) -> None:
+    """Los tres reportes con una sola lectura; comparar contra la suma de los tres anteriores."""
+    with _silencio(), tempfile.TemporaryDirectory() as out:
+        analytics_pipeline.main(["--path", str(csv), "--out-dir", out])
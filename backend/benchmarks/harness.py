@@ -0,0 +1,135 @@
+# benchmarks/harness.py
+"""
+Mini harness de benchmarks (estilo asv, sin dependencias externas).
+
+Cada benchmark es una función registrada con `@benchmark`. Si declara
+`sizes`, se ejecuta una vez por tamaño y recibe `n`. El `setup` opcional
+corre fuera del cronómetro y su resultado se pasa como primer argumento.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+DEFAULT_SIZES = ("10k",)
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable[..., Any]
+    setup: Callable[..., Any] | None = None
+    sizes: tuple[str, ...] | None = None
+    repeat: int = 5
+    ops: Callable[[int | None], int] | None = None  # operaciones por llamada (para ops/s)
+
+
+REGISTRY: dict[str, Benchmark] = {}
+
+
+def benchmark(
+    name: str,
+    *,
+    setup: Callable[..., Any] | None = None,
+    sizes: tuple[str, ...] | None = None,
+    repeat: int = 5,
+    ops: Callable[[int | None], int] | None = None,
+):
+    def decorator(func):
+        REGISTRY[name] = Benchmark(name, func, setup, sizes, repeat, ops)
+        return func
+    return decorator
+
+
+@dataclass
+class Resultado:
+    name: str
+    times: list[float] = field(default_factory=list)
+    ops: int = 1
+
+    def resumen(self) -> dict[str, float]:
+        median = statistics.median(self.times)
+        return {
+            "min": min(self.times),
+            "median": median,
+            "mean": statistics.fmean(self.times),
+            "stdev": statistics.stdev(self.times) if len(self.times) > 1 else 0.0,
+            "repeat": len(self.times),
+            "ops": self.ops,
+            "ops_per_sec": self.ops / median if median else 0.0,
+        }
+
+
+def _medir(bench: Benchmark, n: int | None, repeat: int | None) -> Resultado:
+    args = (n,) if n is not None else ()
+    estado = bench.setup(*args) if bench.setup else None
+    call_args = ((estado,) if bench.setup else ()) + args
+    resultado = Resultado(bench.name, ops=bench.ops(n) if bench.ops else 1)
+    bench.func(*call_args)  # calentamiento
+    for _ in range(repeat or bench.repeat):
+        gc.collect()
+        inicio = time.perf_counter()
+        bench.func(*call_args)
+        resultado.times.append(time.perf_counter() - inicio)
+    return resultado
+
+
+def run(
+    filtro: str | None = None,
+    sizes: tuple[str, ...] = DEFAULT_SIZES,
+    repeat: int | None = None,
+    verbose: bool = True,
+) -> dict[str, Any]:
+    resultados: dict[str, dict[str, float]] = {}
+    for bench in REGISTRY.values():
+        if filtro and filtro not in bench.name:
+            continue
+        for size in (bench.sizes and [s for s in sizes if s in bench.sizes]) or ([None] if not bench.sizes else []):
+            nombre = f"{bench.name}[{size}]" if size else bench.name
+            resumen = _medir(bench, SIZES[size] if size else None, repeat).resumen()
+            resultados[nombre] = resumen
+            if verbose:
+                print(f"{nombre:<45} median={resumen['median'] * 1000:10.3f}ms  ops/s={resumen['ops_per_sec']:12.1f}")
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "sizes": list(sizes),
+        },
+        "results": resultados,
+    }
+
+
+def save(data: dict[str, Any], path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return path
+
+
+def compare(base: dict[str, Any], nuevo: dict[str, Any], threshold: float = 0.10) -> list[dict[str, Any]]:
+    """Compara medianas benchmark a benchmark; `regression` marca los que empeoran más que `threshold`."""
+    filas = []
+    for nombre, actual in nuevo["results"].items():
+        previo = base["results"].get(nombre)
+        if previo is None or not previo["median"]:
+            continue
+        ratio = actual["median"] / previo["median"]
+        filas.append({
+            "name": nombre,
+            "base": previo["median"],
+            "new": actual["median"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return filas
@@ -0,0 +1,99 @@
+# benchmarks/importtime.py
+"""
+Presupuesto de tiempo de import de los entry points (`python -X importtime`).
+
+Cada entry point se importa en un intérprete limpio; se toma el mínimo de
+`--repeat` corridas y se verifica que no arrastre módulos pesados que no usa.
+
+    python -m benchmarks.importtime [--repeat 3] [--out importtime.json]
+
+Sale con código 1 si algún entry point excede su presupuesto.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+
+@dataclass(frozen=True)
+class Presupuesto:
+    max_ms: float
+    prohibidos: tuple[str, ...] = ()
+
+
+# Los ms son holgados (runners de CI lentos); lo que no debe romperse son los prohibidos.
+PRESUPUESTOS: dict[str, Presupuesto] = {
+    "app.main": Presupuesto(2500, ("pandas", "numpy", "passlib", "jose")),
+    "app.console.main_console": Presupuesto(150, ("sqlalchemy", "fastapi", "pandas", "passlib")),
+    "app.scripts.calculate_product_metrics": Presupuesto(1500, ("fastapi", "sqlalchemy", "passlib")),
+    "app.scripts.check_dataset_integrity": Presupuesto(1500, ("fastapi", "sqlalchemy", "passlib")),
+    "app.scripts.exploratory_analysis": Presupuesto(1500, ("fastapi", "sqlalchemy", "passlib")),
+    "app.scripts.analytics_pipeline": Presupuesto(1500, ("fastapi", "sqlalchemy", "passlib")),
+    "app.scripts.excel_ingest": Presupuesto(1500, ("fastapi", "sqlalchemy", "passlib")),
+    "app.scripts.clean_dataset": Presupuesto(1500, ("fastapi", "sqlalchemy", "passlib")),
+    "app.scripts.quality_rules": Presupuesto(1500, ("fastapi", "sqlalchemy", "passlib")),
+    "app.scripts.product_cube": Presupuesto(1500, ("fastapi", "sqlalchemy", "passlib")),
+    "app.scripts.partitioned_dataset": Presupuesto(1500, ("fastapi", "sqlalchemy", "passlib")),
+    "app.pipeline.__main__": Presupuesto(150, ("pandas", "numpy", "fastapi", "sqlalchemy", "passlib")),
+}
+
+
+def medir(modulo: str) -> tuple[float, set[str]]:
+    """(ms acumulados del import de `modulo`, módulos de primer nivel importados)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=BACKEND_ROOT, capture_output=True, text=True, check=True,
+    )
+    total_us = 0
+    importados: set[str] = set()
+    for linea in proc.stderr.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, nombre = (p.strip() for p in linea.split("|"))
+        if not acumulado.isdigit():
+            continue  # cabecera
+        importados.add(nombre.split(".")[0])
+        if nombre == modulo:
+            total_us = int(acumulado)
+    return total_us / 1000, importados
+
+
+def verificar(repeat: int = 3) -> dict[str, dict]:
+    reporte = {}
+    for modulo, presupuesto in PRESUPUESTOS.items():
+        mediciones = [medir(modulo) for _ in range(repeat)]
+        ms = min(m for m, _ in mediciones)
+        prohibidos = sorted(set(presupuesto.prohibidos) & mediciones[0][1])
+        reporte[modulo] = {
+            "ms": ms,
+            "max_ms": presupuesto.max_ms,
+            "forbidden_imported": prohibidos,
+            "ok": ms <= presupuesto.max_ms and not prohibidos,
+        }
+    return reporte
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.importtime", description="Presupuesto de import")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", type=str, default=None, help="Guardar el reporte JSON en este archivo")
+    args = parser.parse_args(argv)
+
+    reporte = verificar(args.repeat)
+    for modulo, r in reporte.items():
+        extra = f"  forbidden / prohibidos: {', '.join(r['forbidden_imported'])}" if r["forbidden_imported"] else ""
+        print(f"{modulo:<42} {r['ms']:8.1f}ms / {r['max_ms']:.0f}ms  {'ok' if r['ok'] else 'OVER BUDGET'}{extra}")
+    if args.out:
+        Path(args.out).write_text(json.dumps(reporte, indent=2), encoding="utf-8")
+    return 0 if all(r["ok"] for r in reporte.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
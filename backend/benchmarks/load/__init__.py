@@ -0,0 +1,2 @@
+# benchmarks/load/__init__.py
+# Generador de carga HTTP: `python -m benchmarks.load --help`.
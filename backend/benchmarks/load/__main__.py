@@ -0,0 +1,64 @@
+# benchmarks/load/__main__.py
+"""
+Load test local: siembra una base SQLite, levanta uvicorn y lo somete a carga.
+
+    python -m benchmarks.load --concurrency 32 --duration 20 --mix get=60,create=10,login=5
+    python -m benchmarks.load --url http://127.0.0.1:8000   # contra un servidor ya levantado
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.load.runner import DEFAULT_MIX, ejecutar, formatear, parse_mix
+from benchmarks.load.server import seed_database, servidor
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description="Load test HTTP de la API")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clientes asyncio concurrentes (default: 16)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Segundos de carga (default: 10)")
+    parser.add_argument("--mix", type=str, default=None,
+                        help="Pesos por operación, p. ej. 'get=50,create=10' "
+                             f"(default: {','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items())})")
+    parser.add_argument("--productos", type=int, default=5_000, help="Productos sembrados (default: 5000)")
+    parser.add_argument("--workers", type=int, default=1, help="Workers de uvicorn (default: 1)")
+    parser.add_argument("--url", type=str, default=None,
+                        help="Usar un servidor existente (debe tener admin/admin123 y productos 1..N)")
+    parser.add_argument("--out", type=str, default=None, help="Guardar el reporte JSON en este archivo")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as exc:
+        print(f"ERROR: {exc}")
+        return 2
+
+    def correr(base_url: str) -> dict:
+        print(f"Load test: {args.concurrency} clients / clientes, {args.duration:.0f}s -> {base_url}")
+        return asyncio.run(ejecutar(base_url, mix, args.concurrency, args.duration, args.productos))
+
+    if args.url:
+        reporte = correr(args.url)
+    else:
+        with tempfile.TemporaryDirectory(prefix="biofusion-load-") as tmp:
+            print(f"Seeding / Sembrando {args.productos} productos...")
+            url_db = seed_database(Path(tmp) / "load.db", args.productos)
+            with servidor(url_db, workers=args.workers) as base_url:
+                reporte = correr(base_url)
+
+    print(formatear(reporte))
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(reporte, indent=2), encoding="utf-8")
+        print(f"Report saved to / Reporte guardado en: {args.out}")
+    return 1 if reporte["total"]["error_rate"] > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+# benchmarks/load/runner.py
+"""
+Clientes asyncio que mezclan lecturas, escrituras y llamadas autenticadas.
+
+Cada operación del mix tiene un peso; cada cliente elige la siguiente al azar
+según esos pesos y registra latencia y status bajo el nombre del endpoint.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+from benchmarks.load.server import PASSWORD, USUARIO
+
+DEFAULT_MIX = {
+    "get": 45,
+    "list": 5,
+    "search": 10,
+    "low_stock": 5,
+    "revalidate": 10,
+    "create": 5,
+    "movimiento": 15,
+    "login": 5,
+}
+
+
+@dataclass
+class Contexto:
+    client: httpx.AsyncClient
+    headers: dict[str, str]
+    productos: int
+    rng: random.Random
+    secuencia: itertools.count
+    corrida: str  # prefijo de esta corrida: nombre y sku son únicos y la base sobrevive entre corridas
+    etags: dict[int, str] = field(default_factory=dict)
+
+    def producto_id(self) -> int:
+        return self.rng.randint(1, self.productos)
+
+
+Operacion = Callable[[Contexto], Awaitable[httpx.Response]]
+
+
+async def _get(ctx: Contexto) -> httpx.Response:
+    return await ctx.client.get(f"/productos/{ctx.producto_id()}", headers=ctx.headers)
+
+
+async def _list(ctx: Contexto) -> httpx.Response:
+    return await ctx.client.get("/productos/", headers=ctx.headers)
+
+
+async def _search(ctx: Contexto) -> httpx.Response:
+    return await ctx.client.get("/productos/search", params={"q": f"lote {ctx.rng.randint(0, 96)}"}, headers=ctx.headers)
+
+
+async def _low_stock(ctx: Contexto) -> httpx.Response:
+    return await ctx.client.get("/productos/low-stock", headers=ctx.headers)
+
+
+async def _revalidate(ctx: Contexto) -> httpx.Response:
+    """GET condicional: reusa el ETag visto para ese producto (304 si no cambió)."""
+    producto_id = ctx.rng.randint(1, min(ctx.productos, 50))
+    headers = dict(ctx.headers)
+    if producto_id in ctx.etags:
+        headers["If-None-Match"] = ctx.etags[producto_id]
+    resp = await ctx.client.get(f"/productos/{producto_id}", headers=headers)
+    if "ETag" in resp.headers:
+        ctx.etags[producto_id] = resp.headers["ETag"]
+    return resp
+
+
+async def _create(ctx: Contexto) -> httpx.Response:
+    n = next(ctx.secuencia)
+    return await ctx.client.post(
+        "/productos/", json={"nombre": f"Carga {ctx.corrida} {n}", "sku": f"LOAD-{ctx.corrida}-{n}"}, headers=ctx.headers
+    )
+
+
+async def _movimiento(ctx: Contexto) -> httpx.Response:
+    cantidad = ctx.rng.choice((-1, 1))
+    return await ctx.client.post(
+        f"/productos/{ctx.producto_id()}/movimientos", json={"cantidad": cantidad, "motivo": "load"}, headers=ctx.headers
+    )
+
+
+async def _login(ctx: Contexto) -> httpx.Response:
+    return await ctx.client.post("/auth/login", data={"username": USUARIO, "password": PASSWORD})
+
+
+OPERACIONES: dict[str, tuple[str, Operacion]] = {
+    "get": ("GET /productos/{id}", _get),
+    "list": ("GET /productos/", _list),
+    "search": ("GET /productos/search", _search),
+    "low_stock": ("GET /productos/low-stock", _low_stock),
+    "revalidate": ("GET /productos/{id} (If-None-Match)", _revalidate),
+    "create": ("POST /productos/", _create),
+    "movimiento": ("POST /productos/{id}/movimientos", _movimiento),
+    "login": ("POST /auth/login", _login),
+}
+
+# Respuestas esperadas que no cuentan como error.
+STATUS_OK = {200, 201, 304}
+
+
+def parse_mix(texto: str | None) -> dict[str, int]:
+    """'get=50,create=10' -> {'get': 50, 'create': 10}; sin texto devuelve DEFAULT_MIX."""
+    if not texto:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for parte in texto.split(","):
+        nombre, _, peso = parte.partition("=")
+        nombre = nombre.strip()
+        if nombre not in OPERACIONES:
+            raise ValueError(f"Operación desconocida '{nombre}'. Opciones: {', '.join(OPERACIONES)}")
+        mix[nombre] = int(peso or 1)
+    if not any(mix.values()):
+        raise ValueError("El mix debe tener al menos un peso mayor que cero")
+    return mix
+
+
+def percentil(ordenados: list[float], p: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not ordenados:
+        return 0.0
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+@dataclass
+class Estadistica:
+    latencias: list[float] = field(default_factory=list)
+    errores: int = 0
+    status: dict[str, int] = field(default_factory=dict)
+
+    def registrar(self, duracion: float, status: int | str) -> None:
+        self.latencias.append(duracion)
+        self.status[str(status)] = self.status.get(str(status), 0) + 1
+        if status not in STATUS_OK:
+            self.errores += 1
+
+    def resumen(self, duracion_total: float) -> dict[str, Any]:
+        ordenadas = sorted(self.latencias)
+        total = len(ordenadas)
+        return {
+            "requests": total,
+            "throughput_rps": total / duracion_total if duracion_total else 0.0,
+            "error_rate": self.errores / total if total else 0.0,
+            "p50_ms": percentil(ordenadas, 50) * 1000,
+            "p95_ms": percentil(ordenadas, 95) * 1000,
+            "p99_ms": percentil(ordenadas, 99) * 1000,
+            "max_ms": (ordenadas[-1] if ordenadas else 0.0) * 1000,
+            "status": dict(sorted(self.status.items())),
+        }
+
+
+async def _cliente(
+    base_url: str, token: str, mix: dict[str, int], productos: int, fin: float,
+    stats: dict[str, Estadistica], secuencia: itertools.count, corrida: str, seed: int,
+) -> None:
+    nombres = [n for n, peso in mix.items() if peso > 0]
+    pesos = [mix[n] for n in nombres]
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+        ctx = Contexto(client, {"Authorization": f"Bearer {token}"}, productos, random.Random(seed), secuencia, corrida)
+        while time.perf_counter() < fin:
+            nombre = ctx.rng.choices(nombres, weights=pesos)[0]
+            endpoint, operacion = OPERACIONES[nombre]
+            inicio = time.perf_counter()
+            try:
+                status: int | str = (await operacion(ctx)).status_code
+            except httpx.HTTPError as exc:
+                status = type(exc).__name__
+            stats.setdefault(endpoint, Estadistica()).registrar(time.perf_counter() - inicio, status)
+
+
+async def _login_token(base_url: str) -> str:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+        resp = await client.post("/auth/login", data={"username": USUARIO, "password": PASSWORD})
+        resp.raise_for_status()
+        return resp.json()["access_token"]
+
+
+async def ejecutar(
+    base_url: str, mix: dict[str, int], concurrencia: int, duracion: float, productos: int, seed: int = 42,
+) -> dict[str, Any]:
+    """Corre `concurrencia` clientes durante `duracion` segundos y resume por endpoint."""
+    token = await _login_token(base_url)
+    stats: dict[str, Estadistica] = {}
+    secuencia = itertools.count()
+    corrida = uuid.uuid4().hex[:8]
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        _cliente(base_url, token, mix, productos, inicio + duracion, stats, secuencia, corrida, seed + i)
+        for i in range(concurrencia)
+    ))
+    transcurrido = time.perf_counter() - inicio
+
+    total = Estadistica()
+    for est in stats.values():
+        total.latencias += est.latencias
+        total.errores += est.errores
+        for status, n in est.status.items():
+            total.status[status] = total.status.get(status, 0) + n
+    return {
+        "meta": {"concurrency": concurrencia, "duration_s": transcurrido, "mix": mix, "productos": productos},
+        "endpoints": {nombre: est.resumen(transcurrido) for nombre, est in sorted(stats.items())},
+        "total": total.resumen(transcurrido),
+    }
+
+
+def formatear(reporte: dict[str, Any]) -> str:
+    cabecera = f"{'endpoint':<42} {'reqs':>7} {'rps':>8} {'err%':>6} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8}"
+    lineas = [cabecera, "-" * len(cabecera)]
+    filas = list(reporte["endpoints"].items()) + [("TOTAL", reporte["total"])]
+    for nombre, r in filas:
+        lineas.append(
+            f"{nombre:<42} {r['requests']:>7} {r['throughput_rps']:>8.1f} {r['error_rate'] * 100:>6.2f} "
+            f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f}"
+        )
+    return "\n".join(lineas)
@@ -0,0 +1,87 @@
+# benchmarks/load/server.py
+"""Base SQLite sembrada + uvicorn en un subproceso local."""
+
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models.base import EntityBase
+from app.db.models.producto import ProductoORM
+from app.db.models.rol import RolORM
+from app.db.models.usuario import UsuarioORM
+from app.security.hashing import hashear_password
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+USUARIO = "admin"
+PASSWORD = "admin123"
+
+
+def seed_database(path: Path, productos: int) -> str:
+    """Crea una base nueva en `path` con un admin y `productos` productos; devuelve su URL."""
+    path.unlink(missing_ok=True)
+    url = f"sqlite:///{path}"
+    engine = create_engine(url)
+    EntityBase.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(UsuarioORM(
+            username=USUARIO, email=f"{USUARIO}@test.com",
+            hashed_password=hashear_password(PASSWORD), is_active=True, roles=[RolORM(nombre="admin")],
+        ))
+        db.add_all(
+            ProductoORM(nombre=f"Producto {i}", sku=f"SKU{i:07d}", descripcion=f"Reactivo lote {i % 97}",
+                        stock=100, stock_minimo=i % 120)
+            for i in range(1, productos + 1)
+        )
+        db.commit()
+    engine.dispose()
+    return url
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def servidor(database_url: str, workers: int = 1, port: int | None = None, timeout: float = 30.0) -> Iterator[str]:
+    """Levanta `uvicorn app.main:app` contra `database_url` y devuelve su URL base."""
+    port = port or _puerto_libre()
+    env = {**os.environ, "DATABASE_URL": database_url, "SLOW_REQUEST_MS": os.getenv("SLOW_REQUEST_MS", "1e9")}
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_ROOT, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        limite = time.monotonic() + timeout
+        while True:
+            if proceso.poll() is not None:
+                raise RuntimeError(f"uvicorn terminó con código {proceso.returncode}")
+            try:
+                if httpx.get(f"{base_url}/metrics", timeout=1.0).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > limite:
+                raise TimeoutError(f"uvicorn no respondió en {timeout}s")
+            time.sleep(0.1)
+        yield base_url
+    finally:
+        proceso.terminate()
+        try:
+            proceso.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proceso.kill()
@@ -0,0 +1,56 @@
+import time
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.routers import admin
+from app.services.jobs import GestorJobs
+from tests.api.test_producto_api import _auth_headers
+
+
+@pytest.fixture
+def gestor(monkeypatch, tmp_path, db_session):
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=db_session.get_bind())
+    gestor = GestorJobs(factory, max_workers=1, max_activos=1, directorio=tmp_path, intervalo=0.05)
+    monkeypatch.setattr(admin, "gestor_jobs_para", lambda engine: gestor)
+    yield gestor
+    gestor.apagar()
+
+
+def _esperar(client, headers, job_id, estados, timeout=120.0):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        job = client.get(f"/admin/jobs/{job_id}", headers=headers).json()
+        if job["estado"] in estados:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(job)
+
+
+def test_ciclo_de_vida_de_un_job(client, crear_usuario_admin, gestor):
+    headers = _auth_headers(client)
+
+    resp = client.post("/admin/jobs/generate", json={"num_samples": 20, "seed": 1}, headers=headers)
+    assert resp.status_code == 202, resp.text
+    job = _esperar(client, headers, resp.json()["id"], {"completado", "fallido"})
+
+    assert job["estado"] == "completado", job
+    assert job["resultado"] == {"rows": 20}
+    assert job["resultado_path"].endswith("product_dataset.csv")
+    assert job["creado_por"] == "admin"
+    assert [j["id"] for j in client.get("/admin/jobs", headers=headers).json()] == [job["id"]]
+
+
+def test_limite_cancelacion_y_errores(client, crear_usuario_admin, gestor):
+    headers = _auth_headers(client)
+    largo = client.post("/admin/jobs/generate", json={"num_samples": 3_000_000}, headers=headers).json()
+
+    assert client.post("/admin/jobs/integrity", headers=headers).status_code == 429
+    assert client.post(f"/admin/jobs/{largo['id']}/cancel", headers=headers).status_code == 200
+    assert _esperar(client, headers, largo["id"], {"cancelado"})["cancelacion_solicitada"]
+
+    assert client.post("/admin/jobs/borrar", headers=headers).status_code == 422
+    assert client.post("/admin/jobs/metrics", json={"path": "../secreto.csv"}, headers=headers).status_code == 400
+    assert client.get("/admin/jobs/999", headers=headers).status_code == 404
+    assert client.post("/admin/jobs/999/cancel", headers=headers).status_code == 404
+    assert client.post("/admin/jobs/generate").status_code == 401
@@ -34,4 +34,244 @@ def test_crear_producto(client, crear_usuario_admin):
     )
 
     assert resp.status_code == 201, resp.text
-    assert resp.json()["nombre"] == "Café"
\ No newline at end of file
+    assert resp.json()["nombre"] == "Café"
+
+def _auth_headers(client):
+    login_resp = client.post(
+        "/auth/login",
+        data={"username": "admin", "password": "admin123"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+    assert login_resp.status_code == 200, login_resp.text
+    return {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+
+
+def test_low_stock_paginado_por_cursor(client, crear_usuario_admin):
+    headers = _auth_headers(client)
+    for i in range(5):
+        stock = 1 if i % 2 == 0 else 50  # 0, 2 y 4 quedan bajo el mínimo
+        resp = client.post(
+            "/productos/",
+            json={"nombre": f"P{i}", "sku": f"SKU{i}", "stock": stock, "stock_minimo": 10},
+            headers=headers,
+        )
+        assert resp.status_code == 201, resp.text
+
+    page1 = client.get("/productos/low-stock", params={"limit": 2}, headers=headers)
+    assert page1.status_code == 200, page1.text
+    body1 = page1.json()
+    assert [p["nombre"] for p in body1["items"]] == ["P0", "P2"]
+    assert body1["next_cursor"] is not None
+
+    page2 = client.get(
+        "/productos/low-stock",
+        params={"limit": 2, "cursor": body1["next_cursor"]},
+        headers=headers,
+    )
+    body2 = page2.json()
+    assert [p["nombre"] for p in body2["items"]] == ["P4"]
+    assert body2["next_cursor"] is None
+
+
+def test_low_stock_if_none_match(client, crear_usuario_admin):
+    headers = _auth_headers(client)
+    client.post(
+        "/productos/",
+        json={"nombre": "Té", "sku": "TE1", "stock": 1, "stock_minimo": 10},
+        headers=headers,
+    )
+
+    first = client.get("/productos/low-stock", headers=headers)
+    etag = first.headers["ETag"]
+
+    unchanged = client.get("/productos/low-stock", headers={**headers, "If-None-Match": etag})
+    assert unchanged.status_code == 304
+
+    # Un producto con stock suficiente no altera el conjunto de stock bajo
+    client.post(
+        "/productos/",
+        json={"nombre": "Yerba", "sku": "YER1", "stock": 100, "stock_minimo": 10},
+        headers=headers,
+    )
+    still_unchanged = client.get("/productos/low-stock", headers={**headers, "If-None-Match": etag})
+    assert still_unchanged.status_code == 304
+
+    client.post(
+        "/productos/",
+        json={"nombre": "Mate", "sku": "MAT1", "stock": 0, "stock_minimo": 5},
+        headers=headers,
+    )
+    changed = client.get("/productos/low-stock", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert {p["nombre"] for p in changed.json()["items"]} == {"Té", "Mate"}
+
+
+def test_movimiento_de_stock(client, crear_usuario_admin):
+    headers = _auth_headers(client)
+    producto = client.post(
+        "/productos/",
+        json={"nombre": "Avena", "sku": "AVE1", "stock": 10, "stock_minimo": 2},
+        headers=headers,
+    ).json()
+    assert client.get(f"/productos/{producto['id']}", headers=headers).json()["stock"] == 10  # queda en caché
+
+    resp = client.post(f"/productos/{producto['id']}/movimientos", json={"cantidad": -4, "motivo": "Venta"}, headers=headers)
+    assert resp.status_code == 201, resp.text
+    assert resp.json()["stock_resultante"] == 6
+
+    insuficiente = client.post(f"/productos/{producto['id']}/movimientos", json={"cantidad": -7}, headers=headers)
+    assert insuficiente.status_code == 409
+
+    inexistente = client.post("/productos/9999/movimientos", json={"cantidad": 1}, headers=headers)
+    assert inexistente.status_code == 404
+
+    assert client.get(f"/productos/{producto['id']}", headers=headers).json()["stock"] == 6
+
+
+def test_movimiento_sin_confirmar_a_tiempo_devuelve_503(client, crear_usuario_admin, monkeypatch):
+    from app.services.movimientos_coalescer import CoalescedorMovimientos
+
+    def _sin_confirmar(self, movimiento, timeout=10.0):
+        raise TimeoutError
+
+    headers = _auth_headers(client)
+    producto = client.post("/productos/", json={"nombre": "Arroz", "sku": "ARR1", "stock": 3}, headers=headers).json()
+    monkeypatch.setattr(CoalescedorMovimientos, "aplicar", _sin_confirmar)
+
+    resp = client.post(f"/productos/{producto['id']}/movimientos", json={"cantidad": 1}, headers=headers)
+
+    assert resp.status_code == 503
+    assert "puede aplicarse igual" in resp.json()["detail"]
+
+
+def test_movimientos_en_lote_son_atomicos(client, crear_usuario_admin):
+    headers = _auth_headers(client)
+    a = client.post("/productos/", json={"nombre": "A", "sku": "A1", "stock": 5}, headers=headers).json()
+    b = client.post("/productos/", json={"nombre": "B", "sku": "B1", "stock": 1}, headers=headers).json()
+
+    rechazado = client.post(
+        "/productos/movimientos",
+        json=[{"producto_id": a["id"], "cantidad": -2}, {"producto_id": b["id"], "cantidad": -5}],
+        headers=headers,
+    )
+    assert rechazado.status_code == 409
+    assert client.get(f"/productos/{a['id']}", headers=headers).json()["stock"] == 5
+
+    ok = client.post(
+        "/productos/movimientos",
+        json=[{"producto_id": a["id"], "cantidad": -2}, {"producto_id": b["id"], "cantidad": 3}],
+        headers=headers,
+    )
+    assert ok.status_code == 201, ok.text
+    assert [m["stock_resultante"] for m in ok.json()] == [3, 4]
+
+
+def test_busqueda_texto_completo(client, crear_usuario_admin):
+    headers = _auth_headers(client)
+    for nombre, sku, descripcion in [
+        ("Café Orgánico", "CAF1", "Granos tostados"),
+        ("Leche de Almendra", "LEC1", "Ideal para el cafe con leche"),
+        ("Tofu", "TOF1", "Bloque de soja"),
+    ]:
+        client.post("/productos/", json={"nombre": nombre, "sku": sku, "descripcion": descripcion}, headers=headers)
+
+    resp = client.get("/productos/search", params={"q": "cafe"}, headers=headers)
+    assert resp.status_code == 200, resp.text
+    # Coincidir en el nombre rankea por encima de coincidir en la descripción
+    assert [p["nombre"] for p in resp.json()["items"]] == ["Café Orgánico", "Leche de Almendra"]
+
+    prefijo = client.get("/productos/search", params={"q": "alm"}, headers=headers)
+    assert [p["nombre"] for p in prefijo.json()["items"]] == ["Leche de Almendra"]
+
+    pagina = client.get("/productos/search", params={"q": "cafe", "limit": 1}, headers=headers).json()
+    assert pagina["next_cursor"] == 1
+    siguiente = client.get(
+        "/productos/search", params={"q": "cafe", "limit": 1, "cursor": pagina["next_cursor"]}, headers=headers
+    ).json()
+    assert [p["nombre"] for p in siguiente["items"]] == ["Leche de Almendra"]
+
+
+def test_get_producto_con_etag(client, crear_usuario_admin):
+    headers = _auth_headers(client)
+    producto = client.post("/productos/", json={"nombre": "Miel", "sku": "MIE1", "stock": 4}, headers=headers).json()
+
+    first = client.get(f"/productos/{producto['id']}", headers=headers)
+    etag = first.headers["ETag"]
+    assert client.get(f"/productos/{producto['id']}", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    client.post(f"/productos/{producto['id']}/movimientos", json={"cantidad": 1}, headers=headers)
+    changed = client.get(f"/productos/{producto['id']}", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["stock"] == 5
+
+
+def test_get_producto_recarga_si_otro_proceso_cambio_la_version(client, crear_usuario_admin, db_session):
+    from app.db.models.producto import ProductoORM
+
+    headers = _auth_headers(client)
+    producto = client.post("/productos/", json={"nombre": "Té", "sku": "TE1", "stock": 2}, headers=headers).json()
+    first = client.get(f"/productos/{producto['id']}", headers=headers)
+
+    # Otro proceso actualiza la fila: la caché de este proceso no se entera
+    with db_session.get_bind().begin() as conn:
+        conn.execute(
+            ProductoORM.__table__.update()
+            .where(ProductoORM.id == producto["id"])
+            .values(stock=9, version=ProductoORM.version + 1)
+        )
+
+    again = client.get(f"/productos/{producto['id']}", headers=headers)
+    assert again.headers["ETag"] != first.headers["ETag"]
+    assert again.json()["stock"] == 9
+
+
+def test_listado_con_etag_y_cuerpo_cacheado(client, crear_usuario_admin):
+    headers = _auth_headers(client)
+    client.post("/productos/", json={"nombre": "Sal", "sku": "SAL1"}, headers=headers)
+
+    first = client.get("/productos/", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert [p["nombre"] for p in first.json()] == ["Sal"]
+
+    again = client.get("/productos/", headers=headers)
+    assert again.content == first.content
+    assert client.get("/productos/", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    client.post("/productos/", json={"nombre": "Azúcar", "sku": "AZU1"}, headers=headers)
+    changed = client.get("/productos/", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert [p["nombre"] for p in changed.json()] == ["Sal", "Azúcar"]
+
+
+def test_listado_tras_recrear_la_base_no_reusa_etag(client, crear_usuario_admin, db_session):
+    from app.db.models.contador import ContadorORM
+    from app.db.models.producto import ProductoORM
+
+    headers = _auth_headers(client)
+    client.post("/productos/", json={"nombre": "Sal", "sku": "SAL1"}, headers=headers)
+    first = client.get("/productos/", headers=headers)
+
+    # Base recreada: los contadores vuelven a empezar y llegan al mismo valor
+    with db_session.get_bind().begin() as conn:
+        conn.execute(ProductoORM.__table__.delete())
+        ContadorORM.__table__.drop(conn)
+        ContadorORM.__table__.create(conn)
+    client.post("/productos/", json={"nombre": "Pimienta", "sku": "PIM1"}, headers=headers)
+
+    again = client.get("/productos/", headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 200
+    assert again.headers["ETag"] != first.headers["ETag"]
+    assert [p["nombre"] for p in again.json()] == ["Pimienta"]
+
+
+def test_crear_producto_duplicado_devuelve_400(client, crear_usuario_admin):
+    headers = _auth_headers(client)
+    assert client.post("/productos/", json={"nombre": "Único", "sku": "UNI-1"}, headers=headers).status_code == 201
+
+    resp = client.post("/productos/", json={"nombre": "Otro", "sku": "UNI-1"}, headers=headers)
+
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Ya existe otro producto con ese SKU."
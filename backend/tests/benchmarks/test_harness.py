@@ -0,0 +1,46 @@
+import json
+
+from benchmarks import harness
+from benchmarks.__main__ import main
+
+
+def _resultados(**medianas):
+    return {"meta": {}, "results": {n: {"median": m} for n, m in medianas.items()}}
+
+
+def test_compare_marca_regresiones_sobre_el_umbral():
+    filas = harness.compare(_resultados(a=1.0, b=1.0, c=1.0), _resultados(a=1.05, b=1.5, c=0.5, nuevo=1.0), threshold=0.10)
+    por_nombre = {f["name"]: f for f in filas}
+
+    assert set(por_nombre) == {"a", "b", "c"}  # los benchmarks sin base se ignoran
+    assert not por_nombre["a"]["regression"]
+    assert por_nombre["b"]["regression"] and por_nombre["b"]["ratio"] == 1.5
+    assert not por_nombre["c"]["regression"]
+
+
+def test_run_ejecuta_por_tamanio_y_save_escribe_json(monkeypatch, tmp_path):
+    llamadas = []
+    monkeypatch.setattr(harness, "REGISTRY", {})
+    harness.benchmark("demo.sized", setup=lambda n: list(range(n)), sizes=("10k", "1m"), repeat=2, ops=lambda n: n)(
+        lambda datos, n: llamadas.append(len(datos))
+    )
+    harness.benchmark("demo.plain", repeat=1)(lambda: None)
+
+    data = harness.run(sizes=("10k",), verbose=False)
+
+    assert set(data["results"]) == {"demo.sized[10k]", "demo.plain"}
+    assert llamadas == [10_000] * 3  # calentamiento + 2 repeticiones
+    assert data["results"]["demo.sized[10k]"]["repeat"] == 2
+    assert data["results"]["demo.sized[10k]"]["ops"] == 10_000
+
+    path = harness.save(data, tmp_path / "out.json")
+    assert json.loads(path.read_text())["results"].keys() == data["results"].keys()
+
+
+def test_cli_compare_sale_con_1_ante_regresion(tmp_path):
+    base, nuevo = tmp_path / "base.json", tmp_path / "new.json"
+    base.write_text(json.dumps(_resultados(x=1.0)))
+    nuevo.write_text(json.dumps(_resultados(x=2.0)))
+
+    assert main(["compare", str(base), str(nuevo)]) == 1
+    assert main(["compare", str(base), str(nuevo), "--threshold", "1.5"]) == 0
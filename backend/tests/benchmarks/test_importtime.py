@@ -0,0 +1,10 @@
+import pytest
+
+from benchmarks.importtime import PRESUPUESTOS, medir
+
+
+@pytest.mark.parametrize("modulo", sorted(PRESUPUESTOS))
+def test_entry_points_no_importan_dependencias_pesadas(modulo):
+    _, importados = medir(modulo)
+
+    assert not set(PRESUPUESTOS[modulo].prohibidos) & importados
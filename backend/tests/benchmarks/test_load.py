@@ -0,0 +1,59 @@
+import asyncio
+import itertools
+import json
+import random
+
+import httpx
+import pytest
+
+from benchmarks.load.runner import DEFAULT_MIX, Contexto, Estadistica, _create, parse_mix, percentil
+
+
+def test_parse_mix():
+    assert parse_mix(None) == DEFAULT_MIX
+    assert parse_mix("get=50, create=10,login") == {"get": 50, "create": 10, "login": 1}
+    with pytest.raises(ValueError):
+        parse_mix("borrar=1")
+    with pytest.raises(ValueError):
+        parse_mix("get=0")
+
+
+def test_percentil_rango_mas_cercano():
+    datos = [float(i) for i in range(1, 101)]
+    assert percentil(datos, 50) == 50.0
+    assert percentil(datos, 95) == 95.0
+    assert percentil(datos, 99) == 99.0
+    assert percentil([], 99) == 0.0
+
+
+def test_estadistica_cuenta_errores_y_status():
+    est = Estadistica()
+    for status in (200, 304, 201, 409, "ConnectError"):
+        est.registrar(0.010, status)
+
+    resumen = est.resumen(duracion_total=1.0)
+
+    assert resumen["requests"] == 5
+    assert resumen["throughput_rps"] == 5.0
+    assert resumen["error_rate"] == pytest.approx(0.4)
+    assert resumen["status"] == {"200": 1, "201": 1, "304": 1, "409": 1, "ConnectError": 1}
+    assert resumen["p50_ms"] == pytest.approx(10.0)
+
+
+def test_create_no_repite_sku_entre_corridas():
+    enviados = []
+
+    def responder(request: httpx.Request) -> httpx.Response:
+        enviados.append(json.loads(request.content))
+        return httpx.Response(201)
+
+    async def corrida(prefijo: str) -> None:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(responder), base_url="http://test") as client:
+            ctx = Contexto(client, {}, 10, random.Random(0), itertools.count(), prefijo)
+            await _create(ctx)
+            await _create(ctx)
+
+    asyncio.run(corrida("aaaa"))
+    asyncio.run(corrida("bbbb"))  # la secuencia vuelve a 0 en cada corrida
+
+    assert len({e["sku"] for e in enviados}) == len({e["nombre"] for e in enviados}) == 4
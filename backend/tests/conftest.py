@@ -3,6 +3,9 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.core.cache import get_producto_cache
+from app.core.http_cache import respuestas_cache
+from app.core.metrics import instrumentar_engine
 from app.db.models.base import EntityBase
 from app.db.models.rol import RolORM
 from app.db.models.usuario import UsuarioORM
@@ -20,12 +23,15 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+instrumentar_engine(engine)  # como en app.main con el engine real
 
 # Limpia y crea las tablas antes de cada test
 @pytest.fixture(autouse=True, scope="function")
 def setup_database():
     EntityBase.metadata.drop_all(bind=engine)
     EntityBase.metadata.create_all(bind=engine)
+    get_producto_cache().clear()  # los IDs y versiones se repiten entre tests
+    respuestas_cache.clear()
     yield
     # No es necesario drop_all aquí, ya que se limpia antes de cada test
 
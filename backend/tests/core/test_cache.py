@@ -0,0 +1,34 @@
+import time
+
+from app.core.cache import MISSING, LRUCache
+
+
+def test_lru_desaloja_el_menos_usado():
+    cache = LRUCache(maxsize=2, ttl=None)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" pasa a ser el menos usado
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+
+
+def test_ttl_vence_entradas():
+    cache = LRUCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is MISSING
+    assert cache.stats()["expirations"] == 1
+
+
+def test_delete_cuenta_invalidaciones():
+    cache = LRUCache()
+    cache.set("a", 1)
+    cache.delete("a", "inexistente")
+    assert cache.get("a") is MISSING
+    assert cache.stats()["invalidations"] == 1
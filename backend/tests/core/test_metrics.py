@@ -0,0 +1,47 @@
+import logging
+
+from app.core import metrics
+from app.core.metrics import Histograma
+
+
+def test_histograma_acumula_buckets():
+    hist = Histograma((0.1, 1.0))
+    for valor in (0.05, 0.5, 0.7, 3.0):
+        hist.observar(valor)
+    lineas = hist.lineas("latencia", 'route="/x"')
+    assert 'latencia_bucket{route="/x",le="0.1"} 1' in lineas
+    assert 'latencia_bucket{route="/x",le="1.0"} 3' in lineas
+    assert 'latencia_bucket{route="/x",le="+Inf"} 4' in lineas
+    assert 'latencia_count{route="/x"} 4' in lineas
+
+
+def test_metrics_expone_rutas_y_consultas(client, crear_usuario_admin):
+    login = client.post(
+        "/auth/login",
+        data={"username": "admin", "password": "admin123"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    client.get("/productos/999", headers=headers)
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    body = resp.text
+    assert 'http_requests_total{method="GET",route="/productos/{producto_id}",status="404"}' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/productos/{producto_id}"}' in body
+    assert 'http_request_db_queries_bucket{method="POST",route="/auth/login",le="0"} 0' in body
+    assert "http_requests_in_flight 1" in body  # el propio /metrics
+
+
+def test_request_lento_loguea_sql(client, crear_usuario_admin, caplog, monkeypatch):
+    monkeypatch.setattr(metrics, "SLOW_REQUEST_MS", 0)  # todos los requests son "lentos"
+    with caplog.at_level(logging.WARNING, logger="app.performance"):
+        client.post(
+            "/auth/login",
+            data={"username": "admin", "password": "admin123"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+    assert any(
+        "Request lento: POST /auth/login" in r.getMessage() and "SELECT" in r.getMessage()
+        for r in caplog.records
+    )
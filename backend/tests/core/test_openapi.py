@@ -0,0 +1,56 @@
+import json
+
+from app.core import openapi
+from app.main import app
+
+
+def test_guardar_y_cargar_openapi_precompilado(tmp_path):
+    destino = openapi.guardar_openapi(app, tmp_path / "openapi.json")
+
+    esquema = openapi.cargar_openapi(app, destino)
+
+    assert esquema == openapi.construir_openapi(app)
+    assert esquema["components"]["securitySchemes"]["BearerAuth"]["scheme"] == "bearer"
+
+
+def test_openapi_desactualizado_o_ausente_se_ignora(tmp_path):
+    destino = openapi.guardar_openapi(app, tmp_path / "openapi.json")
+    data = json.loads(destino.read_text())
+    data["fingerprint"] = "otra-version"
+    destino.write_text(json.dumps(data))
+
+    assert openapi.cargar_openapi(app, destino) is None
+    assert openapi.cargar_openapi(app, tmp_path / "no-existe.json") is None
+
+
+def test_endpoint_openapi_usa_el_precompilado(client, monkeypatch, tmp_path):
+    destino = openapi.guardar_openapi(app, tmp_path / "openapi.json")
+    data = json.loads(destino.read_text())
+    data["schema"]["info"]["title"] = "precompilado"
+    destino.write_text(json.dumps(data))
+    monkeypatch.setattr(openapi, "OPENAPI_PATH", destino)
+    monkeypatch.setattr(app, "openapi_schema", None)
+
+    assert client.get("/openapi.json").json()["info"]["title"] == "precompilado"
+
+
+def test_identidad_por_revision_sin_recorrer_las_fuentes(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_REVISION", "abc123")
+    destino = openapi.guardar_openapi(app, tmp_path / "openapi.json")
+    assert openapi.cargar_openapi(app, destino) is not None
+
+    monkeypatch.setenv("APP_REVISION", "def456")  # otro deploy
+    assert openapi.cargar_openapi(app, destino) is None
+
+
+def test_revision_desde_git(tmp_path, monkeypatch):
+    monkeypatch.delenv("APP_REVISION", raising=False)
+    git = tmp_path / ".git"
+    (git / "refs" / "heads").mkdir(parents=True)
+    (git / "HEAD").write_text("ref: refs/heads/main\n")
+    (git / "packed-refs").write_text("# pack-refs\n1111 refs/heads/main\n")
+    assert openapi.revision(tmp_path) == "1111"
+
+    (git / "refs" / "heads" / "main").write_text("2222\n")
+    assert openapi.revision(tmp_path) == "2222"
+    assert openapi.revision(tmp_path / "sin-repo") == ""
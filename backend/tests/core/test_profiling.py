@@ -0,0 +1,158 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+from app.core.profiling import SamplingProfiler
+from app.db.session import get_db
+from app.main import app
+from app.repositories.producto_repository import ProductoRepository
+from app.dependencies import profiling as profiling_dep
+from app.routers import admin
+from app.db.models.rol import RolORM
+from app.db.models.usuario import UsuarioORM
+from app.scripts.calculate_product_metrics import main as metrics_main
+from app.security.auth import obtener_password_hash
+
+
+def _ocupado(segundos: float) -> None:
+    fin = time.perf_counter() + segundos
+    while time.perf_counter() < fin:
+        pass
+
+
+def test_profiler_genera_pilas_folded():
+    with SamplingProfiler(intervalo=0.001) as profiler:
+        _ocupado(0.05)
+    folded = profiler.folded()
+    assert profiler.muestras > 0
+    assert "_ocupado (test_profiling.py" in folded
+    for linea in folded.splitlines():
+        pila, n = linea.rsplit(" ", 1)
+        assert int(n) > 0 and pila
+
+
+def _login(client, username, password):
+    resp = client.post(
+        "/auth/login",
+        data={"username": username, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def test_perfil_de_request_para_admin(client, crear_usuario_admin, tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling_dep, "default_profiles_dir", lambda: tmp_path)
+    monkeypatch.setattr(admin, "default_profiles_dir", lambda: tmp_path)
+    headers = _login(client, "admin", "admin123")
+
+    resp = client.get("/productos/", headers={**headers, "X-Profile": "1"})
+    assert resp.status_code == 200
+    path = resp.headers["X-Profile-Path"]
+
+    perfil = client.get(path, headers=headers)
+    assert perfil.status_code == 200
+    assert list(tmp_path.glob("*.folded"))
+
+    sin_perfil = client.get("/productos/", headers=headers)
+    assert "X-Profile-Path" not in sin_perfil.headers
+
+
+def test_perfil_solo_del_request_y_tambien_en_304(client, crear_usuario_admin, tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling_dep, "default_profiles_dir", lambda: tmp_path)
+    headers = _login(client, "admin", "admin123")
+    etag = client.get("/productos/", headers=headers).headers["ETag"]
+    version_original = ProductoRepository.get_productos_version
+
+    def _version_lenta(self):
+        fin = time.perf_counter() + 0.2
+        while time.perf_counter() < fin:
+            pass
+        return version_original(self)
+
+    monkeypatch.setattr(ProductoRepository, "get_productos_version", _version_lenta)
+
+    # Un hilo ajeno ocupado durante el request no aparece en el perfil
+    otro = threading.Thread(target=_ocupado, args=(0.5,), name="ajeno")
+    otro.start()
+    try:
+        resp = client.get("/productos/", headers={**headers, "X-Profile": "1", "If-None-Match": etag})
+    finally:
+        otro.join()
+
+    assert resp.status_code == 304
+    perfil = tmp_path / resp.headers["X-Profile-Path"].rsplit("/", 1)[1]
+    folded = perfil.read_text(encoding="utf-8")
+    assert "_ocupado" not in folded and "ajeno" not in folded
+    assert "_version_lenta" in folded
+
+
+def test_filtro_solo_hilos_marcados_y_tarea_del_request():
+    marca, ajena = object(), object()
+    listos, fin = threading.Barrier(3), threading.Event()
+
+    def _trabajar():
+        with profiling_dep._marcar_hilo():
+            listos.wait()
+            fin.wait()
+
+    def _hilo_con(valor):
+        token = profiling_dep._perfil_actual.set(valor)
+        contexto = contextvars.copy_context()
+        profiling_dep._perfil_actual.reset(token)
+        return threading.Thread(target=contexto.run, args=(_trabajar,))
+
+    async def _request():
+        loop, tarea = asyncio.get_running_loop(), asyncio.current_task()
+        incluir = profiling_dep._hilos_del_request(marca, threading.get_ident(), loop, tarea)
+        propio, otro = _hilo_con(marca), _hilo_con(ajena)
+        propio.start()
+        otro.start()
+        listos.wait()
+        try:
+            assert incluir(propio.ident, None) and not incluir(otro.ident, None)
+            # En el hilo del loop solo cuenta mientras corre la tarea del request
+            assert incluir(threading.get_ident(), None)
+            assert not await asyncio.create_task(asyncio.to_thread(incluir, threading.get_ident(), None))
+        finally:
+            fin.set()
+            propio.join()
+            otro.join()
+        assert not incluir(propio.ident, None)  # al terminar el endpoint la marca se quita
+
+    asyncio.run(_request())
+
+
+def test_sin_perfil_no_abre_sesion(client):
+    abiertas = []
+
+    def contar():
+        abiertas.append(1)
+        yield None
+
+    app.dependency_overrides[get_db] = contar
+    assert client.get("/metrics").status_code == 200
+    assert abiertas == []
+
+
+def test_perfil_de_request_rechazado_sin_rol_admin(client, db_session):
+    rol = RolORM(nombre="operador")
+    db_session.add(rol)
+    db_session.add(UsuarioORM(
+        username="operador", email="op@example.com",
+        hashed_password=obtener_password_hash("op_password"), is_active=True, roles=[rol],
+    ))
+    db_session.commit()
+    headers = _login(client, "operador", "op_password")
+
+    assert client.get("/productos/", params={"profile": "1"}, headers=headers).status_code == 403
+    assert client.get("/productos/", headers=headers).status_code == 200
+
+
+def test_script_con_profile(tmp_path):
+    csv = tmp_path / "sample.csv"
+    csv.write_text("Category,BaseYield,Cost,EnvironmentalImpact\nA,1,2,3\nB,4,5,6\n", encoding="utf-8")
+    perfil = tmp_path / "metrics.folded"
+
+    assert metrics_main(["--path", str(csv), "--profile", str(perfil)]) == 0
+    assert perfil.exists()
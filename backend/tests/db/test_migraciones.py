@@ -0,0 +1,47 @@
+# tests/db/test_migraciones.py
+
+import io
+import sqlite3
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def _config(url: str) -> Config:
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+def test_upgrade_offline_genera_un_script_aplicable(tmp_path):
+    config = _config(f"sqlite:///{tmp_path / 'offline.db'}")
+    config.output_buffer = io.StringIO()
+    command.upgrade(config, "head", sql=True)
+
+    conn = sqlite3.connect(tmp_path / "offline.db")
+    try:
+        conn.executescript(config.output_buffer.getvalue())
+        epocas = conn.execute("SELECT valor FROM contadores WHERE nombre = 'epoca'").fetchall()
+    finally:
+        conn.close()
+    assert len(epocas) == 1 and epocas[0][0] > 0
+
+
+def test_epoca_se_siembra_una_sola_vez(tmp_path):
+    url = f"sqlite:///{tmp_path / 'online.db'}"
+    config = _config(url)
+    command.upgrade(config, "head")
+    command.downgrade(config, "3e8b5d7a2c64")
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO contadores (nombre, valor) VALUES ('epoca', 7)"))
+    command.upgrade(config, "head")
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT valor FROM contadores WHERE nombre = 'epoca'")).scalars().all() == [7]
+    engine.dispose()
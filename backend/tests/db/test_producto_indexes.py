@@ -0,0 +1,123 @@
+# tests/db/test_producto_indexes.py
+
+import io
+import sqlite3
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+
+from app.db.models.producto import ProductoORM
+from app.repositories.producto_repository import ProductoRepository
+from app.schemas.producto import ProductoCreate
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def _plan(db_session, query) -> str:
+    sql = str(query.statement.compile(db_session.bind, compile_kwargs={"literal_binds": True}))
+    rows = db_session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+def test_busqueda_por_nombre_usa_indice(db_session):
+    query = db_session.query(ProductoORM).filter(ProductoORM.nombre == "Café")
+    plan = _plan(db_session, query)
+    assert "USING INDEX ix_productos_nombre" in plan
+
+
+def test_stock_bajo_usa_indice_parcial(db_session):
+    query = db_session.query(ProductoORM).filter(ProductoORM.stock < ProductoORM.stock_minimo)
+    plan = _plan(db_session, query)
+    assert "ix_productos_stock_bajo" in plan
+
+
+def test_indice_parcial_solo_contiene_stock_bajo(db_session):
+    db_session.add_all([
+        ProductoORM(nombre="A", sku="A1", stock=1, stock_minimo=5),
+        ProductoORM(nombre="B", sku="B1", stock=10, stock_minimo=5),
+    ])
+    db_session.commit()
+
+    query = db_session.query(ProductoORM).filter(ProductoORM.stock < ProductoORM.stock_minimo)
+    assert [p.nombre for p in query.all()] == ["A"]
+
+
+def test_unicidad_nombre_sigue_lanzando_value_error(db_session):
+    db_session.add(ProductoORM(nombre="Café", sku="CAFE1"))
+    db_session.commit()
+    try:
+        ProductoRepository(db_session).create_producto(ProductoCreate(nombre="Café", sku="CAFE2"))
+    except ValueError as e:
+        assert "nombre" in str(e)
+    else:
+        raise AssertionError("Se esperaba ValueError por nombre duplicado")
+
+
+def test_migracion_crea_y_elimina_indices(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migracion.db'}"
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+
+    command.upgrade(config, "c4e1d2a9f7b3")
+    engine = create_engine(url)
+    indices = {ix["name"]: ix for ix in inspect(engine).get_indexes("productos")}
+    assert indices["ix_productos_nombre"]["unique"]
+    assert "ix_productos_stock_bajo" in indices
+
+    command.downgrade(config, "ab1b6dbbe75f")
+    indices = {ix["name"] for ix in inspect(engine).get_indexes("productos")}
+    assert "ix_productos_nombre" not in indices
+    assert "ix_productos_stock_bajo" not in indices
+    engine.dispose()
+
+
+def test_migracion_renombra_nombres_repetidos(tmp_path):
+    url = f"sqlite:///{tmp_path / 'duplicados.db'}"
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+
+    command.upgrade(config, "ab1b6dbbe75f")
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        for id_, nombre in [(1, "Café"), (2, "Té"), (3, "Café"), (4, "Café (3)"), (5, "Café")]:
+            conn.execute(
+                text("INSERT INTO productos (id, nombre, sku, stock, stock_minimo) VALUES (:id, :nombre, :sku, 0, 0)"),
+                {"id": id_, "nombre": nombre, "sku": f"SKU{id_}"},
+            )
+
+    command.upgrade(config, "c4e1d2a9f7b3")
+    with engine.connect() as conn:
+        nombres = dict(conn.execute(text("SELECT id, nombre FROM productos")).all())
+    assert nombres == {1: "Café", 2: "Té", 3: "Café (3-2)", 4: "Café (3)", 5: "Café (5)"}
+    engine.dispose()
+
+
+def test_migracion_renombra_repetidos_en_modo_offline(tmp_path):
+    url = f"sqlite:///{tmp_path / 'offline.db'}"
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "ab1b6dbbe75f")
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        for id_, nombre in [(1, "Café"), (2, "Té"), (3, "Café")]:
+            conn.execute(
+                text("INSERT INTO productos (id, nombre, sku, stock, stock_minimo) VALUES (:id, :nombre, :sku, 0, 0)"),
+                {"id": id_, "nombre": nombre, "sku": f"SKU{id_}"},
+            )
+    engine.dispose()
+
+    # `alembic upgrade --sql`: solo genera el script, sin consultar la base
+    config.output_buffer = io.StringIO()
+    command.upgrade(config, "ab1b6dbbe75f:c4e1d2a9f7b3", sql=True)
+    conn = sqlite3.connect(tmp_path / "offline.db")
+    try:
+        conn.executescript(config.output_buffer.getvalue())
+        nombres = dict(conn.execute("SELECT id, nombre FROM productos").fetchall())
+    finally:
+        conn.close()
+    assert nombres == {1: "Café", 2: "Té", 3: "Café (3)"}
@@ -0,0 +1,131 @@
+import pytest
+from sqlalchemy import event
+
+from app.core.cache import get_producto_cache
+from app.db.models.producto import ProductoORM
+from app.db.unit_of_work import UnidadDeTrabajo, unidad_activa
+from app.repositories.producto_repository import ProductoRepository
+from app.schemas.producto import ProductoCreate
+
+
+@pytest.fixture
+def commits(db_session):
+    registro = []
+    event.listen(db_session, "after_commit", lambda s: registro.append(1))
+    return registro
+
+
+def _nuevo(i: int, **extra) -> ProductoCreate:
+    return ProductoCreate(nombre=f"Producto {i}", sku=f"SKU{i}", **extra)
+
+
+def test_un_solo_commit_para_el_lote(db_session, commits):
+    repo = ProductoRepository(db_session)
+
+    with UnidadDeTrabajo(db_session, flush_cada=3):
+        for i in range(10):
+            creado = repo.create_producto(_nuevo(i, stock=0, stock_minimo=1 if i < 4 else 0))
+            assert creado.id is None  # el id llega con el flush del lote
+        assert commits == []
+
+    assert len(commits) == 1
+    assert db_session.query(ProductoORM).count() == 10
+    assert repo.get_productos_version() == 10
+    assert repo.get_low_stock_version() == 4
+
+
+def test_error_hace_rollback_de_todo(db_session, commits):
+    repo = ProductoRepository(db_session)
+
+    with pytest.raises(RuntimeError):
+        with UnidadDeTrabajo(db_session, flush_cada=2):
+            for i in range(5):
+                repo.create_producto(_nuevo(i))
+            raise RuntimeError("falla a mitad del lote")
+
+    assert commits == []
+    assert unidad_activa(db_session) is None
+    assert db_session.query(ProductoORM).count() == 0
+    assert repo.get_productos_version() == 0
+
+
+def test_unidad_anidada_se_suma_a_la_externa(db_session, commits):
+    repo = ProductoRepository(db_session)
+
+    with UnidadDeTrabajo(db_session) as externa:
+        repo.create_producto(_nuevo(1))
+        with UnidadDeTrabajo(db_session) as interna:
+            assert interna is externa
+            repo.create_producto(_nuevo(2))
+        assert commits == []
+
+    assert len(commits) == 1
+    assert repo.get_productos_version() == 2
+
+
+def test_invalidacion_de_cache_recien_tras_el_commit(db_session):
+    repo = ProductoRepository(db_session)
+    creado = repo.create_producto(_nuevo(1))
+    repo.get_producto_by_id(creado.id)  # queda en caché
+    cache = get_producto_cache()
+    antes = cache.stats()["invalidations"]
+
+    with UnidadDeTrabajo(db_session):
+        repo.delete_producto(creado.id)
+        assert cache.stats()["invalidations"] == antes
+
+    assert cache.stats()["invalidations"] > antes
+    assert repo.get_producto_by_id(creado.id) is None
+
+
+def test_seed_productos_usa_un_commit(db_session, commits):
+    ProductoRepository(db_session).seed_productos()
+
+    assert len(commits) == 1
+    assert db_session.query(ProductoORM).count() == 10
+
+
+def test_contador_se_suma_con_un_solo_upsert(db_session):
+    from app.repositories.contador_repository import PRODUCTOS, ContadorRepository
+
+    sentencias = []
+
+    def registrar(conn, cursor, sql, *args):
+        sentencias.append(sql)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        repo = ContadorRepository(db_session)
+        repo.incrementar(PRODUCTOS, 2)
+        repo.incrementar(PRODUCTOS, 3)
+        db_session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+
+    assert repo.obtener(PRODUCTOS) == 5
+    upserts = [s for s in sentencias if s.lstrip().upper().startswith("INSERT INTO CONTADORES")]
+    assert len(upserts) == 2 and all("ON CONFLICT" in s.upper() for s in upserts)
+    assert not any(s.lstrip().upper().startswith("UPDATE CONTADORES") for s in sentencias)
+
+
+def test_usuarios_demo_en_una_sola_transaccion(db_session, commits):
+    from app.db.models.rol import RolORM
+    from app.db.models.usuario import UsuarioORM
+    from app.utils.data_setup import crear_usuario_con_rol
+
+    with UnidadDeTrabajo(db_session):
+        crear_usuario_con_rol(db_session, "uno", "clave123", "admin")
+        crear_usuario_con_rol(db_session, "dos", "clave123", "admin")
+        assert commits == []
+
+    assert len(commits) == 1
+    assert db_session.query(RolORM).filter_by(nombre="admin").count() == 1
+    assert db_session.query(UsuarioORM).count() == 2
+
+    with pytest.raises(RuntimeError):
+        with UnidadDeTrabajo(db_session):
+            crear_usuario_con_rol(db_session, "tres", "clave123", "operador")
+            raise RuntimeError("falla a mitad del lote")
+    assert db_session.query(UsuarioORM).count() == 2
+    assert db_session.query(RolORM).filter_by(nombre="operador").count() == 0
@@ -0,0 +1,179 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from app.pipeline import Etapa, EtapaFallida, Pipeline, Salida
+from app.pipeline import artefactos
+
+LLAMADAS: list[str] = []
+
+
+def leer(fuente: Path) -> dict:
+    LLAMADAS.append("leer")
+    return {"tabla": pd.read_csv(fuente)}
+
+
+def sumar(tabla: pd.DataFrame, columna: str) -> dict:
+    LLAMADAS.append("sumar")
+    print(f"sumando {columna}")
+    return {"suma": {"total": float(tabla[columna].sum())}}
+
+
+def contar(tabla: pd.DataFrame) -> dict:
+    LLAMADAS.append("contar")
+    return {"conteo": {"filas": len(tabla)}}
+
+
+def unir(suma: dict, conteo: dict) -> dict:
+    LLAMADAS.append("unir")
+    return {"texto": f"{suma['total']} / {conteo['filas']}"}
+
+
+def fallar(tabla: pd.DataFrame) -> dict:
+    raise RuntimeError("boom")
+
+
+def _pipeline(tmp_path: Path, columna: str = "x", destino: Path | None = None) -> Pipeline:
+    return Pipeline(
+        [
+            Etapa("leer", leer, salidas=(Salida("tabla", "frame"),), entradas={"fuente": "fuente"}),
+            Etapa("sumar", sumar, salidas=(Salida("suma", "json"),), entradas={"tabla": "tabla"}, parametros={"columna": columna}),
+            Etapa("contar", contar, salidas=(Salida("conteo", "json"),), entradas={"tabla": "tabla"}),
+            Etapa("unir", unir, salidas=(Salida("texto", "text", destino),), entradas={"suma": "suma", "conteo": "conteo"}),
+        ],
+        fuentes={"fuente": tmp_path / "datos.csv"},
+        cache_dir=tmp_path / "cache",
+    )
+
+
+@pytest.fixture(autouse=True)
+def datos(tmp_path: Path):
+    LLAMADAS.clear()
+    pd.DataFrame({"x": [1, 2, 3], "y": [10, 20, 30]}).to_csv(tmp_path / "datos.csv", index=False)
+
+
+def test_ejecuta_en_orden_y_escribe_salidas(tmp_path: Path):
+    destino = tmp_path / "out" / "resumen.md"
+    resultados = _pipeline(tmp_path, destino=destino).ejecutar()
+
+    assert LLAMADAS[0] == "leer" and LLAMADAS[-1] == "unir"
+    assert {r.estado for r in resultados.values()} == {"ejecutada"}
+    assert destino.read_text(encoding="utf-8") == "6.0 / 3"
+    assert "sumando x" in (tmp_path / "cache" / "sumar.log").read_text(encoding="utf-8")
+    manifiesto = json.loads((tmp_path / "cache" / "manifest.json").read_text(encoding="utf-8"))
+    assert set(manifiesto) == {"leer", "sumar", "contar", "unir"}
+
+
+def test_segunda_corrida_queda_en_cache(tmp_path: Path):
+    _pipeline(tmp_path).ejecutar()
+    LLAMADAS.clear()
+
+    resultados = _pipeline(tmp_path).ejecutar()
+
+    assert LLAMADAS == []
+    assert {r.estado for r in resultados.values()} == {"en_cache"}
+    assert all(_pipeline(tmp_path).estado().values())
+
+
+def test_cambio_de_parametro_invalida_la_etapa_y_las_siguientes(tmp_path: Path):
+    _pipeline(tmp_path).ejecutar()
+    LLAMADAS.clear()
+
+    resultados = _pipeline(tmp_path, columna="y").ejecutar()
+
+    assert sorted(LLAMADAS) == ["sumar", "unir"]
+    assert resultados["leer"].estado == "en_cache"
+    assert resultados["contar"].estado == "en_cache"
+    assert artefactos.leer("text", resultados["unir"].salidas["texto"]) == "60.0 / 3"
+
+
+def test_cambio_de_fuente_invalida_todo(tmp_path: Path):
+    _pipeline(tmp_path).ejecutar()
+    LLAMADAS.clear()
+    pd.DataFrame({"x": [5, 5], "y": [0, 0]}).to_csv(tmp_path / "datos.csv", index=False)
+
+    resultados = _pipeline(tmp_path).ejecutar()
+
+    assert sorted(LLAMADAS) == ["contar", "leer", "sumar", "unir"]
+    assert artefactos.leer("text", resultados["unir"].salidas["texto"]) == "10.0 / 2"
+
+
+def test_salida_borrada_vuelve_a_ejecutar(tmp_path: Path):
+    resultados = _pipeline(tmp_path).ejecutar()
+    resultados["contar"].salidas["conteo"].unlink()
+    LLAMADAS.clear()
+
+    _pipeline(tmp_path).ejecutar()
+
+    assert sorted(LLAMADAS) == ["contar", "unir"]
+
+
+def test_objetivo_corre_solo_sus_dependencias(tmp_path: Path):
+    resultados = _pipeline(tmp_path).ejecutar(["contar"])
+
+    assert list(resultados) == ["leer", "contar"]
+    assert LLAMADAS == ["leer", "contar"]
+
+
+def test_forzar_ignora_la_cache(tmp_path: Path):
+    _pipeline(tmp_path).ejecutar()
+    LLAMADAS.clear()
+
+    _pipeline(tmp_path).ejecutar(forzar=True)
+
+    assert sorted(LLAMADAS) == ["contar", "leer", "sumar", "unir"]
+
+
+def test_pool_de_procesos(tmp_path: Path):
+    destino = tmp_path / "resumen.md"
+    resultados = _pipeline(tmp_path, destino=destino).ejecutar(max_workers=2)
+
+    assert {r.estado for r in resultados.values()} == {"ejecutada"}
+    assert destino.read_text(encoding="utf-8") == "6.0 / 3"
+    assert _pipeline(tmp_path, destino=destino).estado() == dict.fromkeys(["leer", "sumar", "contar", "unir"], True)
+
+
+def test_etapa_fallida(tmp_path: Path):
+    pipeline = Pipeline(
+        [
+            Etapa("leer", leer, salidas=(Salida("tabla", "frame"),), entradas={"fuente": "fuente"}),
+            Etapa("fallar", fallar, salidas=(Salida("nada", "json"),), entradas={"tabla": "tabla"}),
+        ],
+        fuentes={"fuente": tmp_path / "datos.csv"},
+        cache_dir=tmp_path / "cache",
+    )
+    with pytest.raises(EtapaFallida, match="fallar"):
+        pipeline.ejecutar()
+    # Lo que terminó bien queda en caché
+    assert pipeline.estado() == {"leer": True, "fallar": False}
+
+
+def test_salidas_distintas_a_las_declaradas(tmp_path: Path):
+    pipeline = Pipeline(
+        [Etapa("leer", leer, salidas=(Salida("otra", "frame"),), entradas={"fuente": "fuente"})],
+        fuentes={"fuente": tmp_path / "datos.csv"},
+        cache_dir=tmp_path / "cache",
+    )
+    with pytest.raises(EtapaFallida, match="exactamente las salidas"):
+        pipeline.ejecutar()
+
+
+def test_validaciones_del_grafo(tmp_path: Path):
+    with pytest.raises(ValueError, match="desconocido"):
+        Pipeline([Etapa("contar", contar, salidas=(Salida("conteo", "json"),), entradas={"tabla": "tabla"})])
+    with pytest.raises(ValueError, match="ciclo"):
+        Pipeline([
+            Etapa("a", contar, salidas=(Salida("conteo", "json"),), entradas={"tabla": "tabla"}),
+            Etapa("b", leer, salidas=(Salida("tabla", "frame"),), entradas={"fuente": "conteo"}),
+        ])
+    with pytest.raises(ValueError, match="más de un origen"):
+        Pipeline([
+            Etapa("a", leer, salidas=(Salida("tabla", "frame"),), entradas={"fuente": "fuente"}),
+            Etapa("b", leer, salidas=(Salida("tabla", "frame"),), entradas={"fuente": "fuente"}),
+        ], fuentes={"fuente": tmp_path / "datos.csv"})
+    with pytest.raises(ValueError, match="Tipo de salida"):
+        Salida("x", "parquet")
+    with pytest.raises(ValueError, match="Etapa desconocida"):
+        _pipeline(tmp_path).ejecutar(["nada"])
@@ -0,0 +1,88 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.pipeline.__main__ import main
+from app.pipeline.flujo import construir_flujo
+from app.scripts.analytics_pipeline import crear_consumidores, ejecutar
+from app.scripts.create_product_dataset import generate_dataset
+
+
+def _rutas(tmp_path: Path) -> dict:
+    return {"csv_path": tmp_path / "productos.csv", "reports_dir": tmp_path / "reports", "cache_dir": tmp_path / "cache"}
+
+
+def test_genera_si_falta_el_csv(tmp_path: Path):
+    pipeline = construir_flujo(**_rutas(tmp_path))
+    assert "generate" in pipeline.etapas
+
+    resultados = pipeline.ejecutar()
+
+    assert (tmp_path / "productos.csv").exists()
+    assert json.loads((tmp_path / "reports" / "metrics.json").read_text(encoding="utf-8"))["rows"] == 200
+    assert "Reporte del dataset" in (tmp_path / "reports" / "summary.md").read_text(encoding="utf-8")
+    assert {r.estado for r in resultados.values()} == {"ejecutada"}
+
+
+def test_mismos_reportes_que_la_lectura_unica(tmp_path: Path):
+    rutas = _rutas(tmp_path)
+    generate_dataset(500, seed=1).to_csv(rutas["csv_path"], index=False)
+
+    construir_flujo(**rutas).ejecutar()
+    # Cada etapa lee el CSV por bloques: no queda un DataFrame intermedio en la caché
+    assert not [p for p in rutas["cache_dir"].rglob("*") if p.suffix in (".pkl", ".feather")]
+
+    esperado = ejecutar(rutas["csv_path"], crear_consumidores(rutas["csv_path"]))
+    for nombre, archivo in [("integrity", "integrity.json"), ("metrics", "metrics.json"), ("exploratory", "exploratory_summary.json")]:
+        obtenido = json.loads((rutas["reports_dir"] / archivo).read_text(encoding="utf-8"))
+        assert obtenido == json.loads(json.dumps(esperado[nombre]))
+
+
+def test_segunda_corrida_completa_en_cache(tmp_path: Path):
+    rutas = _rutas(tmp_path)
+    generate_dataset(300, seed=2).to_csv(rutas["csv_path"], index=False)
+    construir_flujo(**rutas).ejecutar()
+
+    resultados = construir_flujo(**rutas).ejecutar()
+    assert {r.estado for r in resultados.values()} == {"en_cache"}
+
+    # Cambiar un parámetro del exploratorio no recalcula métricas ni integridad
+    resultados = construir_flujo(**rutas, bins=5).ejecutar()
+    ejecutadas = {n for n, r in resultados.items() if r.estado == "ejecutada"}
+    assert ejecutadas == {"exploratory", "report"}
+
+
+def test_duplicados_en_el_reporte_de_integridad(tmp_path: Path):
+    rutas = _rutas(tmp_path)
+    df = generate_dataset(50, seed=3)
+    df.loc[10, "Id"] = df.loc[3, "Id"]
+    df.to_csv(rutas["csv_path"], index=False)
+
+    construir_flujo(**rutas).ejecutar(["integrity"])
+
+    integrity = json.loads((rutas["reports_dir"] / "integrity.json").read_text(encoding="utf-8"))
+    assert integrity["issues"]["duplicate_ids"] == 1
+    assert not (rutas["reports_dir"] / "metrics.json").exists()
+
+
+def test_modo_de_duplicados_invalido(tmp_path: Path):
+    with pytest.raises(ValueError, match="duplicados"):
+        construir_flujo(**_rutas(tmp_path), duplicados="bloom+exact")
+
+
+def test_cli(tmp_path: Path, capsys):
+    args = ["--path", str(tmp_path / "p.csv"), "--reports-dir", str(tmp_path / "r"), "--cache-dir", str(tmp_path / "c")]
+
+    assert main([*args, "--generate", "100", "--stage", "metrics"]) == 0
+    salida = capsys.readouterr().out
+    assert "metrics" in salida and "exploratory" not in salida.split("Done")[0]
+
+    assert main([*args, "--list"]) == 0
+    salida = capsys.readouterr().out
+    assert "metrics      cached" in salida
+    assert "report       pending" in salida
+
+    assert main([*args, "--stage", "generate"]) == 1
+    assert "fuera de este flujo" in capsys.readouterr().out
+    assert main([*args, "--workers", "0"]) == 1
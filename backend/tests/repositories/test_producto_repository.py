@@ -1,11 +1,13 @@
 import uuid
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, update
 from sqlalchemy.orm import sessionmaker
 
+from app.core.cache import get_producto_cache
 from app.db.models.base import EntityBase
 from app.db.models.producto import ProductoORM
 from app.repositories.producto_repository import ProductoRepository
+from app.schemas.producto import ProductoCreate, ProductoUpdate
 
 @pytest.fixture(scope="module")
 def engine():
@@ -29,7 +31,7 @@ def repo(db_session):
 @pytest.fixture
 def producto_ejemplo(db_session):
     sku = f"SKU-{uuid.uuid4().hex[:8]}"
-    producto = ProductoORM(nombre="Producto Test", sku=sku, stock=10, stock_minimo=2)
+    producto = ProductoORM(nombre=f"Producto Test {sku}", sku=sku, stock=10, stock_minimo=2)
     db_session.add(producto)
     db_session.commit()
     return producto
@@ -50,10 +52,10 @@ def test_get_producto_por_id(repo, producto_ejemplo):
     assert prod.nombre == producto_ejemplo.nombre
 
 def test_actualizar_producto(repo, db_session, producto_ejemplo):
-    producto_ejemplo.nombre = "Producto Actualizado"
+    producto_ejemplo.nombre = f"Producto Actualizado {producto_ejemplo.sku}"
     db_session.commit()
     prod = repo.get_producto_by_id(producto_ejemplo.id)
-    assert prod.nombre == "Producto Actualizado"
+    assert prod.nombre == f"Producto Actualizado {producto_ejemplo.sku}"
 
 def test_eliminar_producto(repo, db_session, producto_ejemplo):
     prod_id = producto_ejemplo.id
@@ -61,3 +63,187 @@ def test_eliminar_producto(repo, db_session, producto_ejemplo):
     db_session.commit()
     prod = repo.get_producto_by_id(prod_id)
     assert prod is None
+
+def test_update_producto_actualiza_version_stock_bajo(repo):
+    sku = f"SKU-{uuid.uuid4().hex[:8]}"
+    creado = repo.create_producto(ProductoCreate(nombre=f"Bajo {sku}", sku=sku, stock=20, stock_minimo=5))
+    version = repo.get_low_stock_version()
+
+    repo.update_producto(creado.id, ProductoUpdate(stock=1))
+    assert repo.get_low_stock_version() == version + 1
+    assert creado.id in [p.id for p in repo.get_low_stock_page(limit=500)]
+
+    repo.update_producto(creado.id, ProductoUpdate(stock=30))
+    assert repo.get_low_stock_version() == version + 2
+    assert creado.id not in [p.id for p in repo.get_low_stock_page(limit=500)]
+
+def test_update_producto_tras_movimiento_concurrente(repo, db_session, producto_ejemplo):
+    # El producto ya está cargado en la sesión cuando un movimiento sube stock y versión en SQL
+    version = producto_ejemplo.version
+    db_session.execute(
+        update(ProductoORM)
+        .where(ProductoORM.id == producto_ejemplo.id)
+        .values(stock=ProductoORM.stock + 5, version=ProductoORM.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+    actualizado = repo.update_producto(producto_ejemplo.id, ProductoUpdate(descripcion="Sin conflicto"))
+    assert actualizado.descripcion == "Sin conflicto"
+    assert actualizado.version == version + 2
+    assert repo.get_producto_version(producto_ejemplo.id) == version + 2
+
+def test_update_producto_sin_cambios_no_sube_versiones(repo):
+    sku = f"SKU-{uuid.uuid4().hex[:8]}"
+    creado = repo.create_producto(ProductoCreate(nombre=f"Igual {sku}", sku=sku, stock=1, stock_minimo=5))
+    versiones = (repo.get_productos_version(), repo.get_low_stock_version(), repo.get_producto_version(creado.id))
+
+    mismo = repo.update_producto(creado.id, ProductoUpdate(nombre=creado.nombre, stock=1))
+    assert mismo.version == creado.version
+    assert (repo.get_productos_version(), repo.get_low_stock_version(), repo.get_producto_version(creado.id)) == versiones
+
+def test_busqueda_sincronizada_por_triggers(repo):
+    sku = f"SKU-{uuid.uuid4().hex[:8]}"
+    creado = repo.create_producto(ProductoCreate(nombre=f"Kombucha {sku}", sku=sku, descripcion="Té fermentado"))
+    assert creado.id in [p.id for p in repo.search_productos("fermentado")]
+
+    repo.update_producto(creado.id, ProductoUpdate(descripcion="Bebida con jengibre", stock=1))
+    assert creado.id not in [p.id for p in repo.search_productos("fermentado")]
+    assert creado.id in [p.id for p in repo.search_productos("jengibre")]
+
+    repo.delete_producto(creado.id)
+    assert repo.search_productos("jengibre") == []
+
+def test_busqueda_paginada_estable_con_empates(repo):
+    sku = f"SKU-{uuid.uuid4().hex[:8]}"
+    # Mismo largo y mismos términos buscados: mismo bm25 para todos, el orden lo decide el id
+    ids = [
+        repo.create_producto(ProductoCreate(nombre=f"Empate {sku} {letra}", sku=f"{sku}-{letra}", descripcion="idéntico")).id
+        for letra in "abcdefg"
+    ]
+    paginas = [p.id for offset in range(0, 7, 3) for p in repo.search_productos(sku, limit=3, offset=offset)]
+    assert paginas == sorted(ids)
+
+def test_cache_de_lecturas_se_invalida_al_escribir(repo):
+    cache = get_producto_cache()
+    cache.clear()
+    sku = f"SKU-{uuid.uuid4().hex[:8]}"
+    creado = repo.create_producto(ProductoCreate(nombre=f"Cacheado {sku}", sku=sku, stock=3))
+
+    hits = cache.stats()["hits"]
+    assert repo.get_producto_by_id(creado.id).stock == 3
+    assert repo.get_producto_by_sku(sku).stock == 3  # poblado por la lectura anterior
+    assert cache.stats()["hits"] == hits + 1
+
+    repo.update_producto(creado.id, ProductoUpdate(stock=8))
+    assert repo.get_producto_by_id(creado.id).stock == 8
+    assert repo.get_producto_by_sku(sku).stock == 8
+
+    repo.delete_producto(creado.id)
+    assert repo.get_producto_by_id(creado.id) is None
+    assert repo.get_producto_by_sku(sku) is None
+
+
+def test_duplicados_lanzan_value_error_sin_consultas_previas(repo, db_session, producto_ejemplo):
+    from sqlalchemy import event
+
+    nombre, sku = producto_ejemplo.nombre, producto_ejemplo.sku
+    sentencias = []
+
+    def registrar(conn, cursor, statement, *args):
+        sentencias.append(statement)
+
+    event.listen(db_session.get_bind(), "before_cursor_execute", registrar)
+    try:
+        with pytest.raises(ValueError, match="SKU"):
+            repo.create_producto(ProductoCreate(nombre=f"Otro {uuid.uuid4().hex[:8]}", sku=sku))
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", registrar)
+
+    assert not any(s.lstrip().upper().startswith("SELECT") for s in sentencias)
+
+    with pytest.raises(ValueError, match="nombre"):
+        repo.create_producto(ProductoCreate(nombre=nombre, sku=f"SKU-{uuid.uuid4().hex[:8]}"))
+
+    # La sesión sigue usable tras el rollback
+    otro = repo.create_producto(ProductoCreate(nombre=f"Libre {uuid.uuid4().hex[:8]}", sku=f"SKU-{uuid.uuid4().hex[:8]}"))
+    with pytest.raises(ValueError, match="SKU"):
+        repo.update_producto(otro.id, ProductoUpdate(sku=sku, stock=1))
+    assert repo.get_producto_by_id(otro.id).sku == otro.sku
+
+
+def test_altas_concurrentes_con_el_mismo_sku(tmp_path):
+    """Varios escritores pasan juntos por create_producto: la base deja entrar exactamente uno."""
+    import threading
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'concurrente.db'}", connect_args={"timeout": 30})
+    EntityBase.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    escritores = 8
+    barrera = threading.Barrier(escritores)
+    resultados: list[object] = []
+
+    def escribir(i: int):
+        db = Session()
+        try:
+            barrera.wait()
+            resultados.append(ProductoRepository(db).create_producto(ProductoCreate(nombre=f"Concurrente {i}", sku="SKU-CARRERA")))
+        except ValueError as e:
+            resultados.append(e)
+        finally:
+            db.close()
+
+    hilos = [threading.Thread(target=escribir, args=(i,)) for i in range(escritores)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    creados = [r for r in resultados if not isinstance(r, Exception)]
+    errores = [r for r in resultados if isinstance(r, Exception)]
+    assert len(creados) == 1
+    assert len(errores) == escritores - 1
+    assert all("SKU" in str(e) for e in errores)
+    with Session() as db:
+        assert db.query(ProductoORM).filter_by(sku="SKU-CARRERA").count() == 1
+    engine.dispose()
+
+
+def test_iterar_productos_por_paginas_keyset(repo):
+    prefijo = f"PG-{uuid.uuid4().hex[:6]}-"
+    for i in range(7):
+        repo.create_producto(ProductoCreate(nombre=f"Paginado {prefijo}{i}", sku=f"{prefijo}{i}"))
+
+    paginas = list(repo.iterar_productos(tam_pagina=3, orden="sku", desde=prefijo, hasta=f"{prefijo}~"))
+
+    assert [len(p) for p in paginas] == [3, 3, 1]
+    assert [p.sku for pagina in paginas for p in pagina] == [f"{prefijo}{i}" for i in range(7)]
+
+    rango = [p.sku for pagina in repo.iterar_productos(tam_pagina=10, orden="sku", desde=f"{prefijo}2", hasta=f"{prefijo}4")
+             for p in pagina]
+    assert rango == [f"{prefijo}2", f"{prefijo}3", f"{prefijo}4"]
+
+    ids = [p.id for pagina in repo.iterar_productos(tam_pagina=2) for p in pagina]
+    assert ids == sorted(ids) and len(ids) == len(set(ids))
+
+
+def test_iterar_productos_pide_las_paginas_a_demanda(repo, db_session):
+    from sqlalchemy import event
+
+    for i in range(3):
+        sku = f"LZ-{uuid.uuid4().hex[:8]}"
+        repo.create_producto(ProductoCreate(nombre=f"Lazy {sku}", sku=sku))
+    consultas = []
+
+    def registrar(conn, cursor, statement, *args):
+        consultas.append(statement)
+
+    event.listen(db_session.get_bind(), "before_cursor_execute", registrar)
+    try:
+        iterador = repo.iterar_productos(tam_pagina=1)
+        assert consultas == []
+        assert len(next(iterador)) == 1
+        assert len(consultas) == 1
+        next(iterador)
+        assert len(consultas) == 2
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", registrar)
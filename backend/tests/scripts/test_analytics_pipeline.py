@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from app.scripts import analytics_pipeline
+from app.scripts.analytics_pipeline import crear_consumidores, ejecutar, main
+from app.scripts.calculate_product_metrics import compute_metrics, load_dataset
+from app.scripts.check_dataset_integrity import check_integrity
+
+
+def _make_csv(path: Path) -> pd.DataFrame:
+    df = pd.DataFrame(
+        {
+            "Id": ["a", "b", "c", "d", "e", "a"],
+            "Name": ["n1", "n2", None, "n4", "n5", "n6"],
+            "Code": ["P1", "P2", "P3", "P4", "P5", "P6"],
+            "Category": ["A", "A", "B", "B", "B", None],
+            "IsActive": [True] * 6,
+            "BaseYield": [100, 200, 300, None, 400, 50],
+            "NutritionalValue": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+            "Cost": [10.5, 20.0, -5.0, 2.5, 12.0, 1.0],
+            "EnvironmentalImpact": [1.0, 2.0, None, 4.0, 5.0, 6.0],
+            "ShelfLife": ["10 days", "0 days", "x", "5 days", "5 days", "1 days"],
+            "Supplier": ["s"] * 6,
+        }
+    )
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_una_sola_lectura_para_los_tres_reportes(tmp_path: Path, monkeypatch):
+    csv = tmp_path / "datos.csv"
+    df = _make_csv(csv)
+
+    lecturas = []
+    read_csv = pd.read_csv
+
+    def contar(*args, **kwargs):
+        if kwargs.get("chunksize"):
+            lecturas.append(kwargs.get("usecols"))
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(analytics_pipeline.pd, "read_csv", contar)
+    reportes = ejecutar(csv, crear_consumidores(csv, particiones=4), chunksize=2)
+
+    assert len(lecturas) == 1 and "Supplier" not in lecturas[0]
+
+    integridad = reportes["integrity"]
+    esperado = check_integrity(df.drop(columns="Supplier"))
+    assert integridad["issues"] == {**esperado, "duplicate_ids": 1, "duplicate_codes": 0}
+    assert integridad["rows"] == 6
+
+    metricas = reportes["metrics"]
+    en_memoria = compute_metrics(load_dataset(csv))
+    assert metricas["total_cost"] == pytest.approx(en_memoria["total_cost"])
+    assert metricas["average_base_yield"] == pytest.approx(en_memoria["average_base_yield"])
+    assert metricas["by_category"].keys() == en_memoria["by_category"].keys()
+    for cat, valores in en_memoria["by_category"].items():
+        assert metricas["by_category"][cat] == pytest.approx(valores)
+
+    assert reportes["exploratory"]["stats"]["NutritionalValue"]["count"] == 6
+
+
+def test_main_escribe_reportes(tmp_path: Path):
+    csv = tmp_path / "datos.csv"
+    _make_csv(csv)
+    out = tmp_path / "reports"
+
+    assert main(["--path", str(csv), "--out-dir", str(out), "--only", "integrity,metrics", "--strict"]) == 1
+    assert sorted(p.name for p in out.iterdir()) == ["integrity.json", "metrics.json"]
+    assert json.loads((out / "integrity.json").read_text(encoding="utf-8"))["issues"]["negatives"] == 1
+
+    assert main(["--path", str(csv), "--out-dir", str(out), "--only", "metrics,otra"]) == 1
+    assert main(["--path", str(csv), "--out-dir", str(out), "--duplicates", "bloom"]) == 0
+    assert (out / "exploratory_summary.json").exists()
+
+
+def test_csv_solo_encabezado(tmp_path: Path):
+    csv = tmp_path / "vacio.csv"
+    csv.write_text("Id,Code,Category,Cost\n", encoding="utf-8")
+    reportes = ejecutar(csv, crear_consumidores(csv))
+    assert reportes["integrity"]["issues"]["missing_columns"] == 7  # 6 ausentes + ShelfLife
+    assert reportes["metrics"]["rows"] == 0 and reportes["metrics"]["total_cost"] == 0.0
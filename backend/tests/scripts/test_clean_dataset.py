@@ -0,0 +1,145 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.scripts.clean_dataset import (
+    HashesVistos,
+    Limpiador,
+    clean_dataset,
+    main,
+    parse_politicas,
+    parsear_numeros,
+)
+
+
+def _make_csv(path: Path) -> pd.DataFrame:
+    df = pd.DataFrame(
+        {
+            "Id": ["1", "2", "3", "4", "5", "2", "7"],
+            "Name": ["a", "b", None, "d", "e", "b", "g"],
+            "Category": ["A", "B", "B", None, "B", "B", "A"],
+            "Cost": ["$1,000.50", "$20", "(5.00)", None, "abc", "$20", "USD 3"],
+            "Supplier": ["s1", None, "s3", "s4", "s5", None, "s7"],
+        }
+    )
+    df.to_csv(path, index=False)
+    return df
+
+
+@pytest.mark.parametrize(
+    "locale, valores, esperado",
+    [
+        ("en", ["$1,234.50", " 12 ", "(3.00)", "USD 7", "-5"], [1234.5, 12.0, -3.0, 7.0, -5.0]),
+        ("es", ["1.234,50 €", "$ 12", "(3,5)"], [1234.5, 12.0, -3.5]),
+        ("fr", ["1 234,5", "1 000,25"], [1234.5, 1000.25]),
+    ],
+)
+def test_parsear_numeros_por_locale(locale, valores, esperado):
+    assert parsear_numeros(pd.Series(valores), locale).tolist() == esperado
+
+
+def test_parsear_numeros_invalidos_y_numericos():
+    resultado = parsear_numeros(pd.Series(["abc", None, "", "12abc34", "v2.1", "1$2"]))
+    assert resultado.isna().all()
+    assert parsear_numeros(pd.Series(["1.5e3", "-$5", "(€ 4)", "5 USD"])).tolist() == [1500.0, -5.0, -4.0, 5.0]
+    assert parsear_numeros(pd.Series([1, 2])).dtype == "float64"
+
+
+def test_hashes_vistos_entre_bloques():
+    vistos = HashesVistos()
+    assert vistos.marcar(np.array([5, 3, 5, 9], dtype=np.uint64)).tolist() == [False, False, True, False]
+    assert vistos.marcar(np.array([4, 9, 10, 1, 4], dtype=np.uint64)).tolist() == [False, True, False, False, True]
+    assert vistos.vistos.tolist() == [1, 3, 4, 5, 9, 10]
+
+
+def test_parse_politicas():
+    assert parse_politicas("Cost=median, Name=drop,Supplier=fill:N/A") == {
+        "Cost": ("median", None),
+        "Name": ("drop", None),
+        "Supplier": ("fill", "N/A"),
+    }
+    for invalida in ["Cost", "Cost=borrar", "Cost=fill"]:
+        with pytest.raises(ValueError):
+            parse_politicas(invalida)
+
+
+def test_limpieza_por_bloques(tmp_path: Path):
+    csv, out = tmp_path / "precios.csv", tmp_path / "limpio.csv"
+    _make_csv(csv)
+
+    reporte = clean_dataset(
+        csv,
+        out,
+        numericas=["Cost"],
+        politicas=parse_politicas("Name=drop,Cost=median,Supplier=fill:desconocido,Category=mode"),
+        chunksize=2,
+    )
+
+    limpio = pd.read_csv(out, dtype={"Id": str})
+    # Fila 3 (Name nulo) descartada; la 6 repite a la 2 una vez limpia
+    assert limpio["Id"].tolist() == ["1", "2", "4", "5", "7"]
+    assert reporte["rows_in"] == 7 and reporte["rows_out"] == 5
+    assert reporte["dropped_nulls"] == 1
+    assert reporte["duplicates_removed"] == 1
+    assert reporte["parse_failures"] == {"Cost": 1}
+    # Mediana de 1000.5, 20, -5, 20, 3 (sobre el archivo completo, antes de descartar filas)
+    assert reporte["fill_values"]["Cost"] == pytest.approx(20.0)
+    assert limpio["Cost"].tolist() == [1000.5, 20.0, 20.0, 20.0, 3.0]
+    assert limpio["Supplier"].tolist() == ["s1", "desconocido", "s4", "s5", "s7"]
+    assert limpio.loc[limpio["Id"] == "4", "Category"].item() == "B"
+    assert reporte["rows_per_sec"] > 0
+
+
+def test_dedupe_por_columnas_y_desactivado(tmp_path: Path):
+    csv = tmp_path / "precios.csv"
+    _make_csv(csv)
+
+    por_categoria = clean_dataset(csv, tmp_path / "a.csv", numericas=[], dedupe_on=["Category"], chunksize=3)
+    assert por_categoria["rows_out"] == 3  # A, B y nulo
+
+    sin_dedupe = clean_dataset(csv, tmp_path / "b.csv", numericas=[], dedupe=False)
+    assert sin_dedupe["rows_out"] == 7
+
+
+def test_dedupe_no_depende_del_tamano_de_bloque(tmp_path: Path):
+    # Con bloques de 2 el primero infiere Qty float (por el NaN) y el segundo int
+    csv = tmp_path / "mixto.csv"
+    pd.DataFrame({"Name": ["a", "b", "a", "c"], "Qty": [1, None, 1, 2]}).astype({"Qty": "Int64"}).to_csv(csv, index=False)
+
+    for chunksize in (2, 10):
+        reporte = clean_dataset(csv, tmp_path / f"limpio_{chunksize}.csv", numericas=[], chunksize=chunksize)
+        assert reporte["duplicates_removed"] == 1
+        assert pd.read_csv(tmp_path / f"limpio_{chunksize}.csv", dtype=str)["Qty"].tolist() == ["1", np.nan, "2"]
+
+
+def test_errores_de_configuracion(tmp_path: Path):
+    csv = tmp_path / "precios.csv"
+    _make_csv(csv)
+    with pytest.raises(ValueError, match="inexistentes"):
+        clean_dataset(csv, tmp_path / "o.csv", numericas=["Precio"])
+    with pytest.raises(ValueError, match="numéricas"):
+        clean_dataset(csv, tmp_path / "o.csv", numericas=["Cost"], politicas={"Name": ("median", None)})
+    with pytest.raises(ValueError, match="no es numérico"):
+        clean_dataset(csv, tmp_path / "o.csv", numericas=["Cost"], politicas={"Cost": ("fill", "x")})
+    with pytest.raises(ValueError, match="Locale"):
+        Limpiador([], {}, {}, locale="xx")
+    assert not (tmp_path / "o.csv").exists()
+
+
+def test_cli(tmp_path: Path, capsys):
+    csv = tmp_path / "precios.csv"
+    _make_csv(csv)
+    reporte_json = tmp_path / "reporte.json"
+
+    code = main(["--path", str(csv), "--numeric", "Cost", "--nulls", "Name=drop", "--json-out", str(reporte_json)])
+
+    assert code == 0
+    assert (tmp_path / "precios_clean.csv").exists()
+    salida = capsys.readouterr().out
+    assert "filas/s" in salida and "Duplicados eliminados: 1" in salida
+    assert json.loads(reporte_json.read_text(encoding="utf-8"))["rows_out"] == 5
+    assert main(["--path", str(csv), "--out", str(csv)]) == 1
+    assert main(["--path", str(csv), "--nulls", "Cost=zzz"]) == 1
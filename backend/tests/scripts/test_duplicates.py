@@ -0,0 +1,91 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.scripts.check_dataset_integrity import main
+from app.scripts.duplicates import FiltroBloom, check_duplicates
+
+
+def _csv(path: Path, filas: int = 2_000) -> pd.DataFrame:
+    df = pd.DataFrame({"Id": [f"id-{i}" for i in range(filas)], "Code": [f"P{i}" for i in range(filas)]})
+    df.loc[1_500, "Code"] = "P3"  # duplicado entre bloques
+    df.loc[1_501, "Code"] = "P3"
+    df.loc[11, "Code"] = "P10"  # duplicado dentro del mismo bloque
+    df.loc[7, "Code"] = None  # los nulos no cuentan como duplicados
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_exacto_por_buckets(tmp_path: Path):
+    csv = tmp_path / "datos.csv"
+    _csv(csv)
+
+    resultado = check_duplicates(csv, "exact", chunksize=300, particiones=8)
+    assert resultado["Id"] == {"exact": True, "duplicate_values": 0, "duplicate_rows": 0, "examples": []}
+    code = resultado["Code"]
+    assert (code["duplicate_values"], code["duplicate_rows"]) == (2, 3)
+    assert code["examples"] == [
+        {"value": "P3", "count": 3, "rows": [3, 1_500, 1_501]},
+        {"value": "P10", "count": 2, "rows": [10, 11]},
+    ]
+
+
+def test_exacto_conserva_los_primeros_ejemplos(tmp_path: Path):
+    csv = tmp_path / "datos.csv"
+    # 500 valores repetidos repartidos en todos los buckets; los ejemplos son los que aparecen antes
+    pd.DataFrame({"Id": [f"id-{i % 500}" for i in range(1_000)][::-1], "Code": "P1"}).to_csv(csv, index=False)
+
+    resultado = check_duplicates(csv, "exact", chunksize=128, particiones=16)["Id"]
+    assert (resultado["duplicate_values"], resultado["duplicate_rows"]) == (500, 500)
+    assert [e["rows"] for e in resultado["examples"]] == [[i, i + 500] for i in range(5)]
+
+
+@pytest.mark.parametrize("modo", ["bloom", "bloom+exact"])
+def test_bloom_sin_falsos_negativos(tmp_path: Path, modo: str):
+    csv = tmp_path / "datos.csv"
+    _csv(csv)
+
+    resultado = check_duplicates(csv, modo, chunksize=300)
+    if modo == "bloom":
+        assert not resultado["Code"]["exact"]
+        assert resultado["Code"]["possible_duplicate_rows"] >= 3
+        assert resultado["Code"]["false_positive_rate"] < 0.01
+    else:
+        assert resultado["Code"]["duplicate_rows"] == 3
+        assert resultado["Id"]["duplicate_rows"] == 0
+
+
+def test_filtro_bloom_respeta_la_tasa():
+    filtro = FiltroBloom(10_000, tasa_error=0.01)
+    rng = np.random.default_rng(0)
+    vistos, nuevos = rng.integers(0, 2**63, size=(2, 10_000), dtype=np.uint64)
+    filtro.agregar(vistos)
+    assert filtro.contiene(vistos).all()
+    assert filtro.contiene(nuevos).mean() < 0.02
+
+
+def test_main_strict_falla_con_duplicados(tmp_path: Path, capsys):
+    csv = tmp_path / "datos.csv"
+    pd.DataFrame(
+        {
+            "Id": ["a", "b", "c"],
+            "Name": ["n1", "n2", "n3"],
+            "Code": ["P1", "P2", "P1"],
+            "Category": "Food",
+            "IsActive": True,
+            "BaseYield": 1.0,
+            "NutritionalValue": 1.0,
+            "Cost": 1.0,
+            "EnvironmentalImpact": 1.0,
+            "ShelfLife": "10 days",
+        }
+    ).to_csv(csv, index=False)
+
+    assert main(["--path", str(csv), "--strict", "--partitions", "4"]) == 1
+    salida = capsys.readouterr().out
+    assert "duplicate_codes: 1" in salida and "duplicate_ids: 0" in salida
+    assert "'P1' rows / filas [0, 2]" in salida
+    assert main(["--path", str(csv), "--strict", "--duplicates", "off"]) == 0
+    assert main(["--path", str(csv), "--partitions", "0"]) == 1
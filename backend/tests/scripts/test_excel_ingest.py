@@ -0,0 +1,132 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from app.scripts.excel_ingest import (
+    _parse_tipos,
+    coercionar,
+    escribir_cache,
+    hash_libro,
+    inferir_esquema,
+    ingestar,
+    leer_cache,
+    lotes,
+    main,
+    ruta_cache,
+)
+
+FILAS = [
+    ("Id", "Name", "Cost", "IsActive", "Updated", None),
+    (1, "a", 1.5, True, datetime(2024, 1, 1), None),
+    (2, None, 3, False, None),  # fila corta
+    (3, "c", "n/a", None, datetime(2024, 2, 1), None, "sobra"),  # celda fuera del encabezado
+    (None, None, None, None, None, None),  # fila vacía al final de la hoja
+]
+
+
+def test_lotes_normaliza_ancho_y_descarta_filas_vacias():
+    resultado = list(lotes(FILAS, filas_por_lote=2))
+
+    assert [len(df) for df in resultado] == [2, 1]
+    assert list(resultado[0].columns) == ["Id", "Name", "Cost", "IsActive", "Updated"]
+    assert resultado[0].iloc[1]["Updated"] is None
+
+
+def test_lotes_sin_datos_devuelve_solo_columnas():
+    (df,) = lotes([("A", "B")])
+    assert list(df.columns) == ["A", "B"] and df.empty
+    with pytest.raises(ValueError, match="encabezado"):
+        list(lotes([]))
+
+
+def test_inferir_y_coercionar():
+    primero = next(lotes(FILAS, filas_por_lote=2))
+    esquema = inferir_esquema(primero)
+    assert esquema == {"Id": "str", "Name": "str", "Cost": "float", "IsActive": "bool", "Updated": "datetime"}
+
+    ultimo = list(lotes(FILAS, filas_por_lote=2))[-1]
+    df = coercionar(ultimo, esquema)
+    assert df.loc[0, "Id"] == "3"
+    assert pd.isna(df.loc[0, "Cost"])  # "n/a" no es numérico
+    assert pd.isna(df.loc[0, "IsActive"])
+    assert df.loc[0, "Updated"] == pd.Timestamp("2024-02-01")
+
+
+def test_tipos_forzados():
+    primero = next(lotes(FILAS))
+    esquema = inferir_esquema(primero, {"Cost": "str"})
+    assert esquema["Cost"] == "str"
+    with pytest.raises(ValueError, match="Tipos desconocidos"):
+        inferir_esquema(primero, {"Cost": "decimal"})
+    assert _parse_tipos("Cost=float, IsActive=bool") == {"Cost": "float", "IsActive": "bool"}
+    with pytest.raises(ValueError):
+        _parse_tipos("Cost")
+
+
+def test_cache_csv_conserva_tipos(tmp_path: Path):
+    destino = tmp_path / "libro.csv"
+
+    assert escribir_cache(FILAS, destino, filas_por_lote=2) == 3
+
+    df = leer_cache(destino)
+    assert df["Id"].tolist() == ["1", "2", "3"]
+    assert str(df["IsActive"].dtype) == "boolean"
+    assert df["Updated"].dtype.kind == "M"
+    assert df["Cost"].tolist()[:2] == [1.5, 3.0]
+    esquema = json.loads((tmp_path / "libro.csv.schema.json").read_text(encoding="utf-8"))
+    assert esquema["rows"] == 3
+    assert not (tmp_path / "libro.csv.tmp").exists()
+
+
+def test_cache_interrumpida_no_queda_a_medias(tmp_path: Path):
+    def filas():
+        yield from FILAS[:3]
+        raise OSError("se cortó la lectura")
+
+    destino = tmp_path / "libro.csv"
+    with pytest.raises(OSError):
+        escribir_cache(filas(), destino, filas_por_lote=1)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_ruta_cache_depende_del_contenido_hoja_y_tipos(tmp_path: Path):
+    libro = tmp_path / "libro.xlsx"
+    libro.write_bytes(b"uno")
+    base = ruta_cache(libro, None, {}, "csv", tmp_path)
+
+    assert ruta_cache(libro, None, {}, "csv", tmp_path) == base
+    assert ruta_cache(libro, "Hoja2", {}, "csv", tmp_path) != base
+    assert ruta_cache(libro, None, {"Cost": "str"}, "csv", tmp_path) != base
+    anterior = hash_libro(libro)
+    libro.write_bytes(b"dos")
+    assert hash_libro(libro) != anterior
+    assert ruta_cache(libro, None, {}, "csv", tmp_path) != base
+
+
+def test_ingestar_xlsx_y_reusar_cache(tmp_path: Path):
+    openpyxl = pytest.importorskip("openpyxl")
+    libro = openpyxl.Workbook()
+    hoja = libro.active
+    for fila in FILAS[:4]:
+        hoja.append(list(fila[:5]))
+    xlsx = tmp_path / "proveedores.xlsx"
+    libro.save(xlsx)
+
+    cache_path, existia = ingestar(xlsx, cache_dir=tmp_path / "cache", formato="csv", filas_por_lote=2)
+    assert not existia
+    df = leer_cache(cache_path)
+    assert len(df) == 3 and df["Id"].tolist() == ["1", "2", "3"]
+
+    assert ingestar(xlsx, cache_dir=tmp_path / "cache", formato="csv") == (cache_path, True)
+
+
+def test_cli_errores(tmp_path: Path, capsys):
+    assert main([str(tmp_path / "no.xlsx")]) == 1
+    assert "no encontrado" in capsys.readouterr().out
+    libro = tmp_path / "libro.xlsx"
+    libro.write_bytes(b"x")
+    assert main([str(libro), "--batch-rows", "0"]) == 1
+    assert main([str(libro), "--types", "Cost=decimal", "--cache-dir", str(tmp_path / "c"), "--format", "csv"]) == 1
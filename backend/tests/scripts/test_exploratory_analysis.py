@@ -2,8 +2,17 @@ import json
 from pathlib import Path
 
 import pandas as pd
+import pytest
 
-from app.scripts.exploratory_analysis import load_head, load_for_metrics, compute_metrics, main
+from app.scripts.exploratory_analysis import (
+    compute_metrics,
+    compute_sample_metrics,
+    compute_streaming_metrics,
+    load_for_metrics,
+    load_head,
+    load_sample,
+    main,
+)
 
 
 def _make_sample_csv(path: Path) -> None:
@@ -55,4 +64,60 @@ def test_main_json_out(tmp_path: Path):
     assert exit_code == 0
     assert out_json.exists()
     data = json.loads(out_json.read_text(encoding="utf-8"))
-    assert "averages" in data and "by_category" in data
\ No newline at end of file
+    assert "averages" in data and "by_category" in data
+    assert data["stats"]["Cost"]["count"] == 5
+
+def test_streaming_metrics_equal_in_memory(tmp_path: Path):
+    csv = tmp_path / "sample.csv"
+    _make_sample_csv(csv)
+
+    esperado = compute_metrics(load_for_metrics(csv))
+    summary = compute_streaming_metrics(csv, chunksize=2)
+
+    assert summary["rows"] == 5
+    assert summary["averages"] == pytest.approx(esperado["averages"])
+    assert summary["by_category"] == esperado["by_category"]
+
+    stats = summary["stats"]
+    assert stats["BaseYield"]["nulls"] == 1
+    assert stats["BaseYield"]["min"] == 100 and stats["BaseYield"]["max"] == 400
+    assert stats["Cost"]["std"] == pytest.approx(pd.Series([10.5, 20.0, 5.0, 2.5, 12.0]).std())
+    assert "NutritionalValue" not in stats  # columna ausente en el CSV
+
+
+@pytest.mark.parametrize("method", ["reservoir", "blocks"])
+def test_main_sample_mode(tmp_path: Path, method: str):
+    csv = tmp_path / "sample.csv"
+    out_json = tmp_path / "summary.json"
+    _make_sample_csv(csv)
+
+    exit_code = main(
+        ["--path", str(csv), "--json-out", str(out_json), "--sample", "3", "--sample-method", method, "--seed", "1"]
+    )
+    assert exit_code == 0
+    data = json.loads(out_json.read_text(encoding="utf-8"))
+    assert data["sample"]["method"] == method and data["sample"]["size"] == 3
+    assert set(data["intervals"]["averages"]) == {"BaseYield", "Cost", "EnvironmentalImpact"}
+    assert sum(row["count"] for row in data["by_category"]) == 3
+
+
+@pytest.mark.parametrize("n", ["0", "-5"])
+def test_main_rechaza_sample_no_positivo(tmp_path: Path, n: str, capsys):
+    csv = tmp_path / "sample.csv"
+    _make_sample_csv(csv)
+
+    with pytest.raises(SystemExit) as exc:
+        main(["--path", str(csv), "--sample", n])
+    assert exc.value.code == 2
+    assert "--sample" in capsys.readouterr().err
+
+
+def test_sample_metrics_exact_when_sample_is_whole_file(tmp_path: Path):
+    csv = tmp_path / "sample.csv"
+    _make_sample_csv(csv)
+
+    summary = compute_sample_metrics(load_sample(csv, 100, seed=0))
+    cost = summary["intervals"]["averages"]["Cost"]
+    assert cost["estimate"] == cost["low"] == cost["high"] == 10.0
+    shares = {row["Category"]: row["share"]["estimate"] for row in summary["intervals"]["by_category"]}
+    assert shares == {"A": 0.4, "B": 0.6}
@@ -0,0 +1,157 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from app.scripts import calculate_product_metrics, create_product_dataset, exploratory_analysis, partitioned_dataset
+from app.scripts.create_product_dataset import generate_dataset
+from app.scripts.partitioned_dataset import (
+    METADATOS,
+    PARTICION_NULA,
+    DatasetParticionado,
+    cargar_dataset,
+    filtrar_filas,
+    guardar_particionado,
+    leer_dataset,
+    main,
+    parse_filtros,
+    repartir,
+)
+
+
+@pytest.fixture
+def csv(tmp_path: Path) -> Path:
+    path = tmp_path / "products.csv"
+    generate_dataset(500, seed=7).to_csv(path, index=False)
+    return path
+
+
+def _ordenado(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values("Code").reset_index(drop=True)
+
+
+def test_repartir_layout_hive(csv: Path, tmp_path: Path):
+    raiz = tmp_path / "ds"
+    meta = repartir(csv, raiz, ["Category", "Supplier"], formato="csv", chunksize=120)
+    assert meta["rows"] == 500 and meta["partitions"] == 25
+    assert (raiz / "Category=Food" / "Supplier=Supplier 1" / "part-00000.csv").exists()
+    assert json.loads((raiz / METADATOS).read_text(encoding="utf-8"))["partition_by"] == ["Category", "Supplier"]
+    # Las columnas de partición salen de la carpeta, no del archivo
+    parte = pd.read_csv(next((raiz / "Category=Food" / "Supplier=Supplier 1").glob("part-*.csv")))
+    assert "Category" not in parte.columns and "Supplier" not in parte.columns
+
+    original = pd.read_csv(csv, dtype={"Id": str, "Code": str})
+    leido = cargar_dataset(raiz)
+    assert list(leido.columns) == list(original.columns)
+    pd.testing.assert_frame_equal(_ordenado(leido), _ordenado(original), check_dtype=False)
+
+
+def test_poda_y_filtros_por_fila(csv: Path, tmp_path: Path):
+    raiz = tmp_path / "ds"
+    repartir(csv, raiz, ["Category"], formato="csv")
+    dataset = DatasetParticionado(raiz)
+    assert len(dataset.particiones) == 5
+    assert [p.valores for p in dataset.podar({"Category": ["Food", "Other"]})] == [{"Category": "Food"}, {"Category": "Other"}]
+
+    original = pd.read_csv(csv, dtype={"Id": str, "Code": str})
+    filtros = {"Category": ["Food"], "IsActive": ["False"]}
+    leido = cargar_dataset(raiz, ["Code", "Cost"], filtros)
+    esperado = original[(original["Category"] == "Food") & ~original["IsActive"]][["Code", "Cost"]]
+    assert list(leido.columns) == ["Code", "Cost"]
+    pd.testing.assert_frame_equal(_ordenado(leido), _ordenado(esperado))
+    # Un CSV común da lo mismo, filtrando fila a fila
+    pd.testing.assert_frame_equal(_ordenado(cargar_dataset(csv, ["Code", "Cost"], filtros)), _ordenado(esperado))
+
+    assert cargar_dataset(raiz, ["Cost"], {"Category": ["NoExiste"]}).empty
+    with pytest.raises(ValueError, match="Columnas inexistentes"):
+        list(leer_dataset(raiz, filtros={"Color": ["red"]}))
+
+
+def test_valores_nulos_y_escapados(tmp_path: Path):
+    df = pd.DataFrame({"Category": ["A/B", None, "A/B", "x=1"], "Cost": [1.0, 2.0, 3.0, 4.0]})
+    raiz = tmp_path / "ds"
+    guardar_particionado(df, raiz, ["Category"], formato="csv")
+    assert (raiz / f"Category={PARTICION_NULA}").is_dir()
+    assert (raiz / "Category=A%2FB").is_dir()
+    assert cargar_dataset(raiz, filtros={"Category": ["A/B"]})["Cost"].tolist() == [1.0, 3.0]
+    assert cargar_dataset(raiz, filtros={"Category": [None]})["Cost"].tolist() == [2.0]
+    assert cargar_dataset(raiz, filtros={"Category": ["x=1"]})["Category"].tolist() == ["x=1"]
+
+
+def test_no_pisa_carpetas_ajenas(csv: Path, tmp_path: Path):
+    ajena = tmp_path / "ajena"
+    ajena.mkdir()
+    (ajena / "importante.txt").write_text("no borrar", encoding="utf-8")
+    with pytest.raises(ValueError, match="no es un dataset particionado"):
+        repartir(csv, ajena, formato="csv")
+    assert (ajena / "importante.txt").exists()
+
+    raiz = tmp_path / "ds"
+    repartir(csv, raiz, formato="csv")
+    assert repartir(csv, raiz, ["Supplier"], formato="csv")["partitions"] == 5
+    assert not (raiz / "Category=Food").exists()
+
+
+def test_filtrar_filas_y_parse_filtros():
+    df = pd.DataFrame({"IsActive": [True, False, None], "n": [1, 2, 3]})
+    assert filtrar_filas(df, parse_filtros(["IsActive=True,null"]))["n"].tolist() == [1, 3]
+    with pytest.raises(ValueError):
+        parse_filtros(["IsActive"])
+
+
+def test_loaders_de_scripts_con_poda(csv: Path, tmp_path: Path, capsys):
+    raiz = tmp_path / "ds"
+    repartir(csv, raiz, formato="csv")
+    filtros = {"Category": ["Food"]}
+
+    esperado = calculate_product_metrics.compute_metrics(calculate_product_metrics.load_dataset(csv, filtros))
+    assert list(esperado["by_category"]) == ["Food"]
+    particionado = calculate_product_metrics.compute_streaming_metrics(raiz, chunksize=37, filtros=filtros)
+    assert particionado["rows"] == esperado["rows"]
+    assert particionado["total_cost"] == pytest.approx(esperado["total_cost"])
+
+    resumen = exploratory_analysis.compute_streaming_metrics(raiz, filtros=filtros)
+    assert resumen["rows"] == esperado["rows"]
+    assert resumen["averages"]["BaseYield"] == pytest.approx(esperado["average_base_yield"])
+    assert len(exploratory_analysis.load_head(raiz, n=3, filtros=filtros)) == 3
+
+    assert calculate_product_metrics.main(["--path", str(raiz), "--where", "Category=Food"]) == 0
+    assert "Partitions read / Particiones leídas: 1 of / de 5" in capsys.readouterr().out
+    assert exploratory_analysis.main(["--path", str(raiz), "--where", "Category=Food", "--sample", "10"]) == 1
+
+
+def test_cabeza_lee_bloques_normales_y_corta_al_llegar_a_n(csv: Path, monkeypatch):
+    pedidos = []
+    leer_original = partitioned_dataset.leer_dataset
+
+    def espiar(*args, chunksize=None, **kwargs):
+        pedidos.append(chunksize)
+        return leer_original(*args, chunksize=chunksize, **kwargs)
+
+    monkeypatch.setattr(partitioned_dataset, "leer_dataset", espiar)
+    filtros = {"Category": ["Food"]}
+    esperado = filtrar_filas(pd.read_csv(csv, dtype={"Id": str, "Code": str}), filtros).head(4).reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(partitioned_dataset.cabeza(csv, 4, filtros), esperado)
+    assert pedidos == [partitioned_dataset.BLOQUE_CABEZA]
+
+
+def test_cli_repartir_y_generar(csv: Path, tmp_path: Path, capsys):
+    assert main(["--path", str(csv), "--out", str(tmp_path / "ds"), "--format", "csv"]) == 0
+    assert "Partitions / Particiones: 5" in capsys.readouterr().out
+    assert main(["--path", str(tmp_path / "nada.csv"), "--out", str(tmp_path / "x")]) == 1
+
+    destino = tmp_path / "generado"
+    create_product_dataset.main(["--num-samples", "40", "--seed", "1", "--out", str(destino), "--partition-by", "Category,Supplier", "--format", "csv"])
+    assert DatasetParticionado(destino).meta["rows"] == 40
+
+
+def test_parquet(csv: Path, tmp_path: Path):
+    pytest.importorskip("pyarrow")
+    raiz = tmp_path / "ds"
+    repartir(csv, raiz, formato="parquet")
+    assert list((raiz / "Category=Food").glob("part-*.parquet"))
+    leido = cargar_dataset(raiz, ["Code", "Cost"], {"Category": ["Food"]})
+    original = pd.read_csv(csv, dtype={"Code": str})
+    assert sorted(leido["Code"]) == sorted(original.loc[original["Category"] == "Food", "Code"])
@@ -0,0 +1,134 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from app.scripts.calculate_product_metrics import compute_metrics, load_dataset
+from app.scripts.create_product_dataset import generate_dataset
+from app.scripts.product_cube import (
+    DIMENSIONES,
+    TRAMOS_VIDA_UTIL,
+    Cubo,
+    build_cube,
+    main,
+    parse_filtros,
+    tramo_vida_util,
+)
+
+
+@pytest.fixture
+def dataset(tmp_path: Path) -> Path:
+    path = tmp_path / "products.csv"
+    generate_dataset(600, seed=3).to_csv(path, index=False)
+    return path
+
+
+def _esperado(df: pd.DataFrame, por: list[str]) -> pd.DataFrame:
+    df = df.assign(IsActive=df["IsActive"].astype(str), ShelfLifeBucket=tramo_vida_util(df["ShelfLife"].astype(str)))
+    return df.groupby(por).agg(count=("Cost", "size"), Cost_sum=("Cost", "sum"), Cost_max=("Cost", "max")).reset_index()
+
+
+def test_tramo_vida_util():
+    serie = pd.Series(["30 days", "31 days", "200 days", "400 days", "basura", None])
+    assert tramo_vida_util(serie).tolist() == ["0-30d", "31-90d", "181-365d", ">365d", None, None]
+
+
+def test_corte_por_categoria_igual_a_compute_metrics(dataset: Path):
+    cubo = build_cube(dataset, chunksize=97)
+    esperado = compute_metrics(load_dataset(dataset))["by_category"]
+    filas = {f["Category"]: f for f in cubo.consultar(["Category"])}
+    assert set(filas) == set(esperado)
+    for cat, valores in esperado.items():
+        assert filas[cat]["count"] == valores["count"]
+        assert filas[cat]["BaseYield_avg"] == pytest.approx(valores["AvgYield"])
+        assert filas[cat]["Cost_sum"] == pytest.approx(valores["TotalCost"])
+        assert filas[cat]["EnvironmentalImpact_avg"] == pytest.approx(valores["AvgEnvImpact"])
+    total = cubo.consultar()
+    assert total[0]["count"] == 600 and cubo.meta["rows"] == 600
+
+
+def test_drill_down_y_filtros_contra_groupby(dataset: Path):
+    df = pd.read_csv(dataset)
+    cubo = build_cube(dataset)
+
+    filas = cubo.consultar(["Supplier", "IsActive"], {"Category": ["Food", "Beverage"]}, ["Cost"])
+    esperado = _esperado(df[df["Category"].isin(["Food", "Beverage"])], ["Supplier", "IsActive"])
+    assert [(f["Supplier"], f["IsActive"], f["count"]) for f in filas] == list(
+        esperado[["Supplier", "IsActive", "count"]].itertuples(index=False, name=None)
+    )
+    assert [f["Cost_sum"] for f in filas] == pytest.approx(esperado["Cost_sum"].tolist())
+    assert [f["Cost_max"] for f in filas] == pytest.approx(esperado["Cost_max"].tolist())
+    assert set(filas[0]) == {"Supplier", "IsActive", "count", "Cost_avg", "Cost_sum", "Cost_min", "Cost_max"}
+
+    filas = cubo.consultar(["Category", "ShelfLifeBucket"], {"Category": ["Food"]})
+    esperado = _esperado(df[df["Category"] == "Food"], ["Category", "ShelfLifeBucket"])
+    # Los tramos salen en el orden de sus límites, no alfabético ("181-365d" después de "31-90d")
+    esperado = esperado.sort_values("ShelfLifeBucket", key=lambda s: s.map(TRAMOS_VIDA_UTIL.index), kind="stable")
+    assert [f["ShelfLifeBucket"] for f in filas] == [t for t in TRAMOS_VIDA_UTIL if t in set(esperado["ShelfLifeBucket"])]
+    assert [(f["ShelfLifeBucket"], f["count"]) for f in filas] == list(esperado[["ShelfLifeBucket", "count"]].itertuples(index=False, name=None))
+
+    assert cubo.consultar(["Category"], {"Category": ["NoExiste"]}) == []
+
+
+def test_valores_nulos_y_errores(tmp_path: Path):
+    path = tmp_path / "nulos.csv"
+    pd.DataFrame({"Category": ["A", None, "A"], "Cost": [1, 2, "x"], "ShelfLife": ["10 days", "bad", None]}).to_csv(path, index=False)
+    cubo = build_cube(path)
+    filas = cubo.consultar(["Category"], medidas=["Cost"])
+    assert [(f["Category"], f["count"], f["Cost_avg"]) for f in filas] == [(None, 1, 2.0), ("A", 2, 1.0)]
+    assert cubo.consultar(medidas=["Cost"], filtros={"Category": [None]})[0]["count"] == 1
+    # Dimensiones y medidas ausentes del CSV quedan nulas
+    assert cubo.consultar(["Supplier"], medidas=["BaseYield"]) == [
+        {"Supplier": None, "count": 3, "BaseYield_avg": None, "BaseYield_sum": 0.0, "BaseYield_min": None, "BaseYield_max": None}
+    ]
+    with pytest.raises(ValueError, match="Dimensiones desconocidas"):
+        cubo.consultar(["Color"])
+    with pytest.raises(ValueError, match="Medidas desconocidas"):
+        cubo.consultar(medidas=["Price"])
+
+
+def test_bloques_no_cambian_el_cubo(dataset: Path):
+    grande, chico = build_cube(dataset), build_cube(dataset, chunksize=50)
+    por = DIMENSIONES[:3]
+    a, b = grande.consultar(por, medidas=["BaseYield"]), chico.consultar(por, medidas=["BaseYield"])
+    assert [(f["Category"], f["count"], f["BaseYield_min"]) for f in a] == [(f["Category"], f["count"], f["BaseYield_min"]) for f in b]
+    assert [f["BaseYield_sum"] for f in a] == pytest.approx([f["BaseYield_sum"] for f in b])
+
+
+def test_guardar_cargar_y_desactualizado(dataset: Path, tmp_path: Path):
+    cubo = build_cube(dataset)
+    path = cubo.guardar(tmp_path / "cube.npz")
+    cargado = Cubo.cargar(path)
+    assert cargado.meta["rows"] == 600
+    assert cargado.consultar(["Category", "IsActive"]) == cubo.consultar(["Category", "IsActive"])
+    assert not cargado.desactualizado()
+    generate_dataset(10, seed=1).to_csv(dataset, index=False)
+    assert cargado.desactualizado()
+
+
+def test_parse_filtros():
+    assert parse_filtros(["Category=Food, Beverage", "Supplier=null", "Category=Other"]) == {
+        "Category": ["Food", "Beverage", "Other"],
+        "Supplier": [None],
+    }
+    with pytest.raises(ValueError):
+        parse_filtros(["Category"])
+
+
+def test_cli_build_y_query(dataset: Path, tmp_path: Path, capsys):
+    cube = tmp_path / "cube.npz"
+    assert main(["build", "--path", str(dataset), "--out", str(cube), "--chunksize", "100"]) == 0
+    assert "Cube saved to" in capsys.readouterr().out
+
+    out = tmp_path / "slice.json"
+    args = ["query", "--cube", str(cube), "--by", "IsActive", "--where", "Category=Food", "--measures", "Cost", "--json-out", str(out)]
+    assert main(args) == 0
+    salida = capsys.readouterr().out
+    assert "IsActive" in salida and "WARNING" not in salida
+    filas = json.loads(out.read_text(encoding="utf-8"))
+    assert sum(f["count"] for f in filas) == int((pd.read_csv(dataset)["Category"] == "Food").sum())
+
+    assert main(["query", "--cube", str(cube), "--by", "Color"]) == 1
+    assert main(["query", "--cube", str(tmp_path / "nada.npz")]) == 1
+    assert main(["build", "--path", str(tmp_path / "nada.csv")]) == 1
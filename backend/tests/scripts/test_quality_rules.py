@@ -0,0 +1,208 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from app.scripts import check_dataset_integrity
+from app.scripts.create_product_dataset import generate_dataset
+from app.scripts.quality_rules import (
+    ErrorDeConfiguracion,
+    EvaluadorReglas,
+    cargar_reglas,
+    check_rules,
+    compilar,
+    default_rules_path,
+    evaluar,
+    main,
+)
+
+REGLAS = {
+    "columns": {
+        "Id": {"type": "str", "required": True, "nullable": False, "unique": True},
+        "Code": {"regex": "^P\\d+$"},
+        "Category": {"allowed": ["A", "B"]},
+        "IsActive": {"type": "bool"},
+        "DiscontinuedAt": {"type": "datetime"},
+        "Cost": {"type": "float", "min": 0, "max": 100},
+        "Price": {"type": "float"},
+        "ShelfLife": {"type": "duration", "gt": "0 days"},
+    },
+    "rules": [
+        {
+            "name": "discontinued_only_when_inactive",
+            "when": {"column": "IsActive", "equals": True},
+            "then": {"column": "DiscontinuedAt", "is_null": True},
+        },
+        {"name": "price_over_cost", "then": {"any": [{"column": "Price", "op": ">=", "other": "Cost"}, {"column": "Price", "is_null": True}]}},
+    ],
+}
+
+
+def _df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Id": ["1", "2", "3", None, "2"],
+            "Code": ["P1", "P2", "X3", "P4", None],
+            "Category": ["A", "B", "C", None, "A"],
+            "IsActive": [True, False, True, "no", True],
+            "DiscontinuedAt": [None, "2024-01-01", "2024-02-01", None, "nunca"],
+            "Cost": [10, -1, 150, "abc", None],
+            "Price": [12, 5, 100, 1, None],
+            "ShelfLife": ["10 days", "0 days", "x", "5 days", None],
+        }
+    )
+
+
+def _violaciones(resultado: dict) -> dict[str, int]:
+    return {r["rule"]: r["violations"] for r in resultado["rules"] if r["violations"]}
+
+
+def test_reglas_de_columna_y_entre_columnas():
+    resultado = evaluar(_df(), REGLAS)
+
+    assert _violaciones(resultado) == {
+        "Id.nullable": 1,
+        "Id.unique": 1,
+        "Code.regex": 1,
+        "Category.allowed": 1,
+        "IsActive.type": 1,
+        "DiscontinuedAt.type": 1,
+        "Cost.type": 1,
+        "Cost.min": 1,
+        "Cost.max": 1,
+        "ShelfLife.type": 1,
+        "ShelfLife.gt": 1,
+        # Fila 2: activa con fecha; fila 4: "nunca" no es fecha pero no es nulo
+        "discontinued_only_when_inactive": 2,
+        # Fila 2: 100 < 150; fila 3: Cost inválido (NaN) no cumple la comparación
+        "price_over_cost": 2,
+    }
+    por_regla = {r["rule"]: r for r in resultado["rules"]}
+    assert por_regla["discontinued_only_when_inactive"]["examples"] == [2, 4]
+    assert por_regla["Id.unique"]["examples"] == [4]
+    assert resultado["total_violations"] == 15
+
+
+def test_una_sola_pasada_por_bloques_igual_que_en_memoria():
+    df = _df()
+    evaluador = EvaluadorReglas(compilar(REGLAS))
+    for inicio in range(0, len(df), 2):
+        evaluador.consumir(df.iloc[inicio : inicio + 2])
+
+    assert _violaciones(evaluador.resultado()) == _violaciones(evaluar(df, REGLAS))
+
+
+def test_reglas_compiladas_reutilizables_entre_pasadas():
+    compiladas = compilar(REGLAS)
+    primera, segunda = EvaluadorReglas(compiladas), EvaluadorReglas(compiladas)
+    primera.consumir(_df())
+    segunda.consumir(_df())
+
+    assert primera.resultado() == segunda.resultado() == evaluar(_df(), REGLAS)
+
+
+def test_columnas_faltantes():
+    resultado = evaluar(_df().drop(columns=["Id", "Price"]), REGLAS)
+
+    assert resultado["missing_columns"] == ["Id"]
+    omitidas = {r["rule"] for r in resultado["rules"] if not r["evaluated"]}
+    assert omitidas == {"Id.nullable", "Id.unique", "Price.type", "price_over_cost"}
+
+
+@pytest.mark.parametrize(
+    "spec, mensaje",
+    [
+        ({"columns": {"Cost": {"type": "money"}}}, "Tipo desconocido"),
+        ({"columns": {"Cost": {"minimum": 0}}}, "Claves desconocidas"),
+        ({"columns": {"Cost": {"type": "float", "min": "cero"}}}, "no compatible"),
+        ({"rules": [{"name": "x", "when": {"column": "A", "equals": 1}}]}, "necesita 'then'"),
+        ({"rules": [{"then": {"column": "A", "like": "x"}}]}, "Predicados desconocidos"),
+        ({"rules": [{"then": {"column": "A", "op": "=~", "other": "B"}}]}, "'op' necesita"),
+        ({"rules": [{"then": {"all": []}}]}, "al menos una"),
+        ({"rules": [{"name": "r", "then": {"column": "A", "is_null": True}}] * 2}, "Regla repetida"),
+    ],
+)
+def test_errores_de_compilacion(spec, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        compilar(spec)
+
+
+def test_reglas_por_defecto_sobre_el_dataset_generado(tmp_path: Path):
+    df = generate_dataset(300, seed=5)
+    df.loc[3, "Cost"] = -2.0
+    df.loc[7, "Category"] = "Toys"
+    csv = tmp_path / "productos.csv"
+    df.to_csv(csv, index=False)
+
+    resultado = check_rules(csv, default_rules_path(), chunksize=64)
+
+    violaciones = _violaciones(resultado)
+    assert violaciones.pop("Cost.min") == 1
+    assert violaciones.pop("Category.allowed") == 1
+    esperadas = int((df["IsActive"] & df["DiscontinuedAt"].notna()).sum())
+    assert violaciones == ({"discontinued_only_when_inactive": esperadas} if esperadas else {})
+
+
+def test_reglas_json_y_cli(tmp_path: Path, capsys):
+    csv, reglas = tmp_path / "datos.csv", tmp_path / "reglas.json"
+    _df().to_csv(csv, index=False)
+    reglas.write_text(json.dumps(REGLAS), encoding="utf-8")
+    assert cargar_reglas(reglas) == REGLAS
+
+    salida_json = tmp_path / "out" / "reglas.json"
+    assert main(["--path", str(csv), "--rules", str(reglas), "--json-out", str(salida_json)]) == 0
+    assert "Id.unique: 1 violations" in capsys.readouterr().out
+    assert json.loads(salida_json.read_text(encoding="utf-8"))["total_violations"] == 15
+    assert main(["--path", str(csv), "--rules", str(reglas), "--strict"]) == 1
+    assert main(["--path", str(csv), "--rules", str(tmp_path / "no.yaml")]) == 1
+
+
+def test_integridad_con_reglas(tmp_path: Path, capsys):
+    csv = tmp_path / "productos.csv"
+    generate_dataset(50, seed=6).assign(Category="Toys").to_csv(csv, index=False)
+
+    code = check_dataset_integrity.main(["--path", str(csv), "--rules", str(default_rules_path()), "--strict"])
+
+    assert code == 1
+    salida = capsys.readouterr().out
+    assert "Category.allowed: 50 violations" in salida
+    assert "rule_violations:" in salida
+
+
+def test_integridad_con_reglas_lee_las_claves_como_texto(tmp_path: Path, capsys):
+    # Con bloques de 2, inferido, el segundo Id "7" llega como 7.0 (por el vacío) y no choca con el primero
+    csv, reglas = tmp_path / "datos.csv", tmp_path / "reglas.json"
+    pd.DataFrame({"Id": ["7", "8", None, "7"], "Name": list("abcd")}).to_csv(csv, index=False)
+    reglas.write_text(json.dumps({"columns": {"Id": {"unique": True}}}), encoding="utf-8")
+
+    argv = ["--path", str(csv), "--rules", str(reglas), "--chunksize", "2", "--duplicates", "off"]
+    assert check_dataset_integrity.main(argv) == 0
+    assert "Id.unique: 1 violations" in capsys.readouterr().out
+    assert check_rules(csv, reglas, chunksize=2)["total_violations"] == 1
+
+
+def test_integridad_no_reporta_errores_de_reglas_como_lectura(tmp_path: Path, monkeypatch):
+    csv = tmp_path / "productos.csv"
+    generate_dataset(5, seed=1).to_csv(csv, index=False)
+
+    def fallar(self, chunk):
+        raise KeyError("bug en una regla")
+
+    monkeypatch.setattr(EvaluadorReglas, "consumir", fallar)
+    with pytest.raises(KeyError):
+        check_dataset_integrity.main(["--path", str(csv), "--rules", str(default_rules_path())])
+    assert check_dataset_integrity.main(["--path", str(tmp_path)]) == 1  # un directorio sí es error de lectura
+
+
+def test_op_entre_tipos_incompatibles_es_error_de_configuracion(tmp_path: Path, capsys):
+    spec = {"columns": {"Cost": {"type": "float"}}, "rules": [{"name": "cost_vs_code", "then": {"column": "Cost", "op": "<", "other": "Code"}}]}
+    with pytest.raises(ErrorDeConfiguracion, match="cost_vs_code"):
+        evaluar(pd.DataFrame({"Cost": [1.0], "Code": ["P1"]}), spec)
+
+    csv, reglas = tmp_path / "datos.csv", tmp_path / "reglas.json"
+    pd.DataFrame({"Cost": [1.0], "Code": ["P1"]}).to_csv(csv, index=False)
+    reglas.write_text(json.dumps(spec), encoding="utf-8")
+    assert main(["--path", str(csv), "--rules", str(reglas)]) == 1
+    assert check_dataset_integrity.main(["--path", str(csv), "--rules", str(reglas), "--duplicates", "off"]) == 1
+    assert capsys.readouterr().out.count("cost_vs_code") == 2
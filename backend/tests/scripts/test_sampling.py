@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.scripts.sampling import intervalo_media, muestra_por_bloques, muestra_reservorio
+
+
+def _csv_ordenado(path: Path, filas: int) -> None:
+    # Ordenado por Cost, como los exports que hacen inútil al head
+    pd.DataFrame({"Id": range(filas), "Cost": np.linspace(0, 100, filas)}).to_csv(path, index=False)
+
+
+def test_reservorio_es_uniforme(tmp_path: Path):
+    csv = tmp_path / "datos.csv"
+    _csv_ordenado(csv, 1_000)
+
+    apariciones = np.zeros(1_000)
+    for seed in range(200):
+        muestra = muestra_reservorio(csv, 100, seed=seed, chunksize=64)
+        assert len(muestra.datos) == 100 and muestra.poblacion == 1_000
+        assert muestra.datos["Id"].is_monotonic_increasing  # conserva el orden del archivo
+        apariciones[muestra.datos["Id"]] += 1
+
+    # Cada fila debería aparecer ~20 veces (200 * 100/1000); por décimos, ~2000
+    por_decimo = apariciones.reshape(10, 100).sum(axis=1)
+    assert np.all(np.abs(por_decimo - 2_000) < 200)
+
+
+def test_reservorio_mas_grande_que_el_archivo(tmp_path: Path):
+    csv = tmp_path / "datos.csv"
+    _csv_ordenado(csv, 30)
+    muestra = muestra_reservorio(csv, 100, seed=0, chunksize=7)
+    assert muestra.datos["Id"].tolist() == list(range(30))
+
+
+def test_bloques_y_error_por_conglomerados(tmp_path: Path):
+    csv = tmp_path / "datos.csv"
+    _csv_ordenado(csv, 20_000)
+
+    muestra = muestra_por_bloques(csv, 1_000, seed=1, filas_por_bloque=100)
+    assert len(muestra.datos) == 1_000
+    assert len(muestra.grupos) == len(muestra.datos)
+    assert not muestra.poblacion_exacta and muestra.poblacion == pytest.approx(20_000, rel=0.1)
+    assert muestra.datos["Id"].is_unique
+
+    por_bloques = intervalo_media(muestra.datos["Cost"], grupos=muestra.grupos)
+    ingenuo = intervalo_media(muestra.datos["Cost"])
+    assert por_bloques["stderr"] > 3 * ingenuo["stderr"]  # filas de un tramo están correlacionadas
+    assert por_bloques["low"] <= 50 <= por_bloques["high"]
+
+
+def test_bloques_devuelve_n_filas_y_no_relega_el_principio(tmp_path: Path):
+    csv = tmp_path / "datos.csv"
+    _csv_ordenado(csv, 100)
+
+    apariciones = np.zeros(100)
+    for seed in range(400):
+        muestra = muestra_por_bloques(csv, 20, seed=seed, filas_por_bloque=5)
+        assert len(muestra.datos) == 20 and muestra.datos["Id"].is_unique
+        apariciones[muestra.datos["Id"]] += 1
+
+    # Cada fila debería aparecer ~80 veces (400 * 20/100); por décimos, ~800
+    por_decimo = apariciones.reshape(10, 10).sum(axis=1)
+    assert np.all(np.abs(por_decimo - 800) < 120)
+
+
+def test_bloques_mas_grande_que_el_archivo(tmp_path: Path):
+    csv = tmp_path / "datos.csv"
+    _csv_ordenado(csv, 30)
+    muestra = muestra_por_bloques(csv, 100, seed=0, filas_por_bloque=7)
+    assert muestra.datos["Id"].tolist() == list(range(30))
+
+
+def test_intervalo_media_cobertura_y_casos_borde():
+    rng = np.random.default_rng(0)
+    cubre = sum(
+        (ic := intervalo_media(rng.normal(10, 2, 200)))["low"] <= 10 <= ic["high"] for _ in range(400)
+    )
+    assert 360 <= cubre <= 396  # ~95%
+
+    # Población finita: muestrear todo no deja incertidumbre
+    assert intervalo_media([1.0, 2.0, 3.0], poblacion=3)["stderr"] == 0
+    assert intervalo_media([np.nan])["estimate"] is None
+    assert intervalo_media([5.0])["low"] is None
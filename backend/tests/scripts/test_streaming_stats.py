@@ -0,0 +1,69 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.scripts.streaming_stats import EstadisticasStreaming, Momentos, SketchKLL
+
+
+def _bloques(valores: np.ndarray, tam: int):
+    for i in range(0, len(valores), tam):
+        yield valores[i : i + tam]
+
+
+def test_momentos_por_bloques_igual_a_numpy():
+    rng = np.random.default_rng(1)
+    datos = rng.normal(1e6, 3.0, size=50_000)  # media grande: pone a prueba la estabilidad
+    m = Momentos()
+    for bloque in _bloques(datos, 7_000):
+        m.actualizar(bloque)
+
+    assert m.n == len(datos)
+    assert m.media == pytest.approx(datos.mean(), rel=1e-12)
+    assert m.desvio == pytest.approx(datos.std(ddof=1), rel=1e-9)
+    assert (m.minimo, m.maximo) == (datos.min(), datos.max())
+
+
+@pytest.mark.parametrize("epsilon", [0.01, 0.005])
+def test_sketch_respeta_el_error_de_rango(epsilon):
+    rng = np.random.default_rng(2)
+    datos = rng.lognormal(size=300_000)
+    ordenados = np.sort(datos)
+    sketch = SketchKLL(epsilon, seed=3)
+    for bloque in _bloques(datos, 20_000):
+        sketch.actualizar(bloque)
+
+    qs = np.linspace(0.01, 0.99, 99)
+    rangos = np.searchsorted(ordenados, sketch.cuantiles(qs)) / len(datos)
+    assert np.max(np.abs(rangos - qs)) <= epsilon
+    assert sketch.tamanio < len(datos) / 50
+
+
+def test_combinar_entre_procesos_equivale_a_una_pasada():
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame({"Cost": rng.uniform(0, 100, 40_000), "BaseYield": rng.normal(50, 5, 40_000)})
+    df.loc[::10, "Cost"] = np.nan
+
+    partes = []
+    for mitad in (df.iloc[:25_000], df.iloc[25_000:]):
+        stats = EstadisticasStreaming(["Cost", "BaseYield"], epsilon=0.01, seed=5)
+        stats.actualizar(mitad)
+        partes.append(pickle.loads(pickle.dumps(stats)))  # como si viniera de otro proceso
+    total = partes[0].combinar(partes[1]).resumen(percentiles=[50], bins=4)
+
+    cost = total["Cost"]
+    assert cost["count"] == df["Cost"].count()
+    assert cost["nulls"] == 4_000
+    assert cost["std"] == pytest.approx(df["Cost"].std(), rel=1e-9)
+    assert abs((df["Cost"] <= cost["percentiles"]["p50"]).sum() / cost["count"] - 0.5) <= 0.01
+    assert sum(total["BaseYield"]["histogram"]["counts"]) == len(df)
+
+
+def test_columna_vacia_no_falla():
+    stats = EstadisticasStreaming(["Cost"])
+    stats.actualizar(pd.DataFrame({"Cost": [None, "x"]}))
+    resumen = stats.resumen()["Cost"]
+    assert resumen["count"] == 0 and resumen["nulls"] == 2
+    assert resumen["mean"] is None and resumen["histogram"] is None
+    assert resumen["percentiles"]["p50"] is None
@@ -0,0 +1,166 @@
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models.base import EntityBase
+from app.db.models.job import JobORM
+from app.domain.models.job import CANCELADO, COMPLETADO, FALLIDO
+from app.repositories.job_repository import JobRepository
+from app.services import tareas
+from app.services.jobs import GestorJobs, LimiteDeJobsAlcanzado
+
+
+@pytest.fixture
+def gestor(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    EntityBase.metadata.create_all(bind=engine)
+    gestor = GestorJobs(sessionmaker(bind=engine), max_workers=1, max_activos=3,
+                        directorio=tmp_path / "jobs", intervalo=0.05)
+    yield gestor
+    gestor.apagar()
+    engine.dispose()
+
+
+def _esperar(gestor, job_id, estados, timeout=120.0):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        gestor.sincronizar()
+        with gestor.session_factory() as db:
+            job = JobRepository(db).get_job(job_id)
+        if job.estado in estados:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"El job {job_id} no llegó a {estados}: {job}")
+
+
+def test_generate_y_luego_metrics_sobre_su_salida(gestor):
+    generado = gestor.encolar("generate", {"num_samples": 250, "seed": 7}, "admin")
+    assert generado.estado == "pendiente"
+
+    job = _esperar(gestor, generado.id, {COMPLETADO})
+    csv = Path(job.resultado_path)
+    assert job.progreso == 1.0 and job.resultado == {"rows": 250}
+    assert csv.is_file() and sum(1 for _ in csv.open()) == 251
+    assert job.iniciado is not None and job.finalizado is not None
+
+    relativo = str(csv.relative_to(gestor.directorio))
+    metricas = _esperar(gestor, gestor.encolar("metrics", {"path": relativo}).id, {COMPLETADO})
+    assert json.loads(Path(metricas.resultado_path).read_text())["by_category"]
+    assert metricas.resultado["average_base_yield"] > 0
+
+
+def test_cancelar_job_pendiente_y_en_curso(gestor):
+    largo = gestor.encolar("generate", {"num_samples": 3_000_000})
+    en_cola = gestor.encolar("generate", {"num_samples": 10})
+    _esperar(gestor, largo.id, {"en_curso"})
+
+    assert gestor.cancelar(en_cola.id).estado in ("pendiente", CANCELADO)
+    assert gestor.cancelar(largo.id).cancelacion_solicitada
+
+    assert _esperar(gestor, en_cola.id, {CANCELADO}).estado == CANCELADO
+    cancelado = _esperar(gestor, largo.id, {CANCELADO})
+    assert cancelado.progreso < 1.0
+
+
+def test_limite_de_jobs_activos_y_rutas_invalidas(gestor, tmp_path):
+    for _ in range(3):
+        gestor.encolar("generate", {"num_samples": 10})
+    with pytest.raises(LimiteDeJobsAlcanzado):
+        gestor.encolar("generate", {"num_samples": 10})
+
+    with pytest.raises(ValueError):
+        gestor.encolar("metrics", {"path": "../../etc/passwd"})
+    with pytest.raises(ValueError):
+        gestor.encolar("integrity", {"path": "no-existe.csv"})
+    with pytest.raises(ValueError):
+        gestor.encolar("borrar-todo", {})
+
+
+def test_jobs_huerfanos_no_bloquean_ni_quedan_colgados(gestor):
+    with gestor.session_factory() as db:
+        repo = JobRepository(db)
+        huerfanos = [repo.create_job("generate", {"num_samples": 10}, propietario="proceso-muerto") for _ in range(4)]
+        # Sin latido desde hace rato: el proceso que los corría ya no existe
+        db.query(JobORM).update({JobORM.latido: datetime.now(timezone.utc) - timedelta(minutes=10)})
+        db.commit()
+
+    cancelado = gestor.cancelar(huerfanos[0].id)
+    assert cancelado.estado == CANCELADO and cancelado.finalizado is not None
+
+    job = gestor.encolar("generate", {"num_samples": 10})
+    with gestor.session_factory() as db:
+        repo = JobRepository(db)
+        assert {repo.get_job(j.id).estado for j in huerfanos[1:]} == {FALLIDO}
+        assert repo.contar_activos() == 1
+    assert _esperar(gestor, job.id, {COMPLETADO}).estado == COMPLETADO
+
+
+def test_monitor_registra_los_errores_de_sincronizacion(gestor, monkeypatch, caplog):
+    def _falla():
+        gestor._detener.set()
+        raise RuntimeError("base caída")
+
+    monkeypatch.setattr(gestor, "sincronizar", _falla)
+    with caplog.at_level("ERROR", logger="app.jobs"):
+        gestor._vigilar()
+
+    assert "base caída" in caplog.text
+
+
+def test_pool_roto_al_encolar_cierra_el_job_y_se_recrea(gestor, monkeypatch):
+    submit = ProcessPoolExecutor.submit
+    llamadas = []
+
+    def _submit_roto_una_vez(pool, *args, **kwargs):
+        llamadas.append(pool)
+        if len(llamadas) == 1:
+            raise BrokenProcessPool("un worker murió")
+        return submit(pool, *args, **kwargs)
+
+    monkeypatch.setattr(ProcessPoolExecutor, "submit", _submit_roto_una_vez)
+
+    fallido = gestor.encolar("generate", {"num_samples": 10})
+    assert fallido.estado == FALLIDO and "BrokenProcessPool" in fallido.error
+    assert gestor._pool is None
+
+    job = gestor.encolar("generate", {"num_samples": 10})
+    assert llamadas[1] is not llamadas[0]
+    assert _esperar(gestor, job.id, {COMPLETADO}).estado == COMPLETADO
+
+
+def test_tarea_integrity_lee_el_csv_por_bloques(tmp_path, monkeypatch):
+    from app.scripts.check_dataset_integrity import check_integrity
+
+    df = pd.DataFrame({
+        "Id": ["1", "2", "3", "1", "5"],
+        "Name": ["a", None, "c", "d", "e"],
+        "Code": ["P1", "P2", "P3", "P4", "P5"],
+        "Category": ["A", "A", "B", None, "B"],
+        "IsActive": [True] * 5,
+        "BaseYield": [1.0, -2.0, 3.0, 4.0, 5.0],
+        "NutritionalValue": [1.0] * 5,
+        "Cost": [1.0, 2.0, None, 4.0, 5.0],
+        "EnvironmentalImpact": [1.0] * 5,
+        "ShelfLife": ["10 days", "0 days", "x", "5 days", "5 days"],
+    })
+    csv = tmp_path / "productos.csv"
+    df.to_csv(csv, index=False)
+    monkeypatch.setattr(tareas, "BLOQUE_LECTURA", 2)
+    lecturas = []
+    monkeypatch.setattr(pd, "read_csv", lambda *a, _leer=pd.read_csv, **kw: lecturas.append(kw) or _leer(*a, **kw))
+    compartido = {}
+
+    resultado = tareas._integridad({"path": str(csv)}, tmp_path, tareas.Progreso(compartido, 1))
+
+    assert lecturas and all(kw.get("nrows") == 0 or kw.get("chunksize") == 2 for kw in lecturas)
+    esperado = {**check_integrity(df.astype({"Id": str, "Code": str})), "duplicate_ids": 1, "duplicate_codes": 0}
+    assert json.loads(Path(resultado["resultado_path"]).read_text(encoding="utf-8")) == esperado
+    assert compartido[("progreso", 1)][0] == 0.75
@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models.base import EntityBase
+from app.db.models.movimiento import MovimientoStockORM
+from app.db.models.producto import ProductoORM
+from app.schemas.movimiento import MovimientoLoteItem
+from app.services.movimientos_coalescer import CoalescedorMovimientos
+
+
+def test_coalescedor_agrupa_movimientos_concurrentes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'movs.db'}", connect_args={"check_same_thread": False})
+    EntityBase.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add(ProductoORM(nombre="Harina", sku="HAR1", stock=100, stock_minimo=0))
+        db.commit()
+        producto_id = db.query(ProductoORM.id).scalar()
+
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(1))
+
+    coalescedor = CoalescedorMovimientos(Session, ventana_ms=50)
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        resultados = list(pool.map(
+            lambda _: coalescedor.aplicar(MovimientoLoteItem(producto_id=producto_id, cantidad=-1)),
+            range(60),
+        ))
+
+    assert all(r.error is None for r in resultados)
+    assert len(commits) < 60
+    with Session() as db:
+        assert db.get(ProductoORM, producto_id).stock == 40
+        assert db.query(MovimientoStockORM).count() == 60
+    engine.dispose()
+
+
+def test_coalescedor_nunca_deja_stock_negativo(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'movs.db'}", connect_args={"check_same_thread": False})
+    EntityBase.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add(ProductoORM(nombre="Sal", sku="SAL1", stock=5, stock_minimo=0))
+        db.commit()
+        producto_id = db.query(ProductoORM.id).scalar()
+
+    coalescedor = CoalescedorMovimientos(Session)
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        resultados = list(pool.map(
+            lambda _: coalescedor.aplicar(MovimientoLoteItem(producto_id=producto_id, cantidad=-1)),
+            range(12),
+        ))
+
+    assert sum(r.error is None for r in resultados) == 5
+    with Session() as db:
+        assert db.get(ProductoORM, producto_id).stock == 0
+    engine.dispose()